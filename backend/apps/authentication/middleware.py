@@ -14,7 +14,18 @@ from django.contrib.auth.models import AnonymousUser
 from django.http import HttpRequest, HttpResponse
 from django.utils.deprecation import MiddlewareMixin
 
+from apps.core.workload import (
+    acquire_slot,
+    classify_request,
+    end_request_timeouts,
+    finalize_after_stream,
+    get_workload_settings,
+    overloaded_response,
+    release_slot,
+    start_request_timeouts,
+)
 from apps.tenants.models import Tenant
+from apps.tenants.provisioning import provisioning_response
 
 logger = logging.getLogger(__name__)
 
@@ -32,6 +43,8 @@ class TenantMiddleware(MiddlewareMixin):
     - Headers debug para monitoramento
     - Performance otimizada (< 50ms)
     - Logs detalhados para troubleshooting
+    - statement_timeout/lock_timeout e limite de concorrência por tenant
+      e classe de endpoint (503 com Retry-After acima do limite)
     """
 
     # Subdomínios excluídos do sistema multitenancy
@@ -45,15 +58,27 @@ class TenantMiddleware(MiddlewareMixin):
         "ftp",
     ]
 
+    # Caminhos globais atendidos sem consultar tenant (probes de health)
+    EXEMPT_PATHS: ClassVar[list[str]] = [
+        "/api/v1/health/",
+        "/api/v1/ping/",
+        "/health/",
+        "/api/v1/webhooks/",  # Webhooks globais: tenant pelo caminho
+    ]
+
     def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
         self.get_response = get_response
         super().__init__(get_response)
 
-    def process_request(self, request: HttpRequest) -> None:
+    def process_request(self, request: HttpRequest) -> HttpResponse | None:
         """
         Processa request para detectar tenant por subdomínio
         """
+        if any(request.path.startswith(path) for path in self.EXEMPT_PATHS):
+            return None
+
         start_time = time.time()
+        tenant = None
 
         try:
             # Extrair subdomínio do host
@@ -63,6 +88,9 @@ class TenantMiddleware(MiddlewareMixin):
                 # Buscar tenant pelo slug
                 tenant = self._get_tenant_by_subdomain(subdomain)
 
+                if tenant and tenant.provisioning_status == "pending":
+                    # Schema ainda sendo criado pelo worker
+                    return provisioning_response()
                 if tenant:
                     # Configurar contexto do tenant
                     self._setup_tenant_context(request, tenant)
@@ -72,6 +100,10 @@ class TenantMiddleware(MiddlewareMixin):
                         f"Tenant não encontrado para subdomínio: {subdomain}"
                     )
 
+            overloaded = self._setup_workload(request, tenant)
+            if overloaded is not None:
+                return overloaded
+
             # Log de performance
             processing_time = (time.time() - start_time) * 1000
             logger.debug(f"TenantMiddleware processamento: {processing_time:.2f}ms")
@@ -80,6 +112,41 @@ class TenantMiddleware(MiddlewareMixin):
             logger.error(f"Erro no TenantMiddleware: {err}")
             raise RuntimeError("Erro na detecção de tenant") from err
 
+        return None
+
+    def _setup_workload(
+        self, request: HttpRequest, tenant: Tenant | None
+    ) -> HttpResponse | None:
+        """
+        Define os timeouts do banco (aplicados só se a requisição consultar
+        o banco) e ocupa vaga de concorrência do tenant
+
+        Returns:
+            Resposta 503 se o tenant está acima do limite da classe
+        """
+        config = get_workload_settings()
+        if tenant is None or not config["ENABLED"]:
+            return None
+
+        endpoint_class = classify_request(request.path, config)
+        start_request_timeouts(tenant, endpoint_class, config)
+        if not acquire_slot(tenant, endpoint_class, config):
+            logger.warning(
+                f"Tenant {tenant.slug} acima do limite de concorrência "
+                f"({endpoint_class})"
+            )
+            return overloaded_response(config)
+        request.workload_slot = (tenant, endpoint_class)
+        return None
+
+    def _end_workload(self, request: HttpRequest) -> None:
+        """Libera a vaga do tenant e restaura os timeouts das conexões"""
+        slot = getattr(request, "workload_slot", None)
+        if slot is not None:
+            release_slot(*slot)
+            request.workload_slot = None
+        end_request_timeouts()
+
     def _extract_subdomain(self, request: HttpRequest) -> str | None:
         """
         Extrai subdomínio do host da requisição
@@ -105,9 +172,14 @@ class TenantMiddleware(MiddlewareMixin):
     def _get_tenant_by_subdomain(self, subdomain: str) -> Tenant | None:
         """
         Busca tenant pelo slug do subdomínio
+
+        Academias com provisionamento falho não têm schema e são tratadas
+        como inexistentes; as pendentes voltam para responder 503.
         """
         try:
-            return Tenant.objects.get(slug=subdomain, is_active=True)
+            return Tenant.objects.exclude(provisioning_status="failed").get(
+                slug=subdomain, is_active=True
+            )
         except Tenant.DoesNotExist:
             return None
         except Exception as err:
@@ -131,8 +203,15 @@ class TenantMiddleware(MiddlewareMixin):
         self, request: HttpRequest, response: HttpResponse
     ) -> HttpResponse:
         """
-        Adiciona headers de debug na resposta
+        Adiciona headers de debug na resposta e libera a vaga do tenant
+
+        Em streaming, vaga e timeouts valem até o envio do corpo terminar.
         """
+        if response.streaming:
+            finalize_after_stream(response, lambda: self._end_workload(request))
+        else:
+            self._end_workload(request)
+
         if hasattr(request, "tenant"):
             response["X-Tenant-Schema"] = request.tenant.schema_name
 
@@ -154,8 +233,10 @@ class SecurityAuthorizationMiddleware(MiddlewareMixin):
     EXEMPT_PATHS: ClassVar[list[str]] = [
         "/api/v1/auth/token/",
         "/api/v1/auth/token/refresh/",
-        "/api/v1/core/health/",
-        "/api/v1/core/ping/",
+        "/api/v1/health/",
+        "/api/v1/ping/",
+        "/health/",
+        "/api/v1/webhooks/",
         "/admin/",
         "/static/",
         "/media/",
@@ -56,6 +56,8 @@ class UserViewSet(TenantViewSet):
     filterset_fields: ClassVar = ["role", "is_active", "is_verified"]
     ordering_fields: ClassVar = ["first_name", "last_name", "email", "created_at"]
     ordering: ClassVar = ["first_name", "last_name"]
+    # Criação define senha no serializer (sem criação em lote)
+    bulk_operations: ClassVar = ("update", "delete", "restore")
 
     def get_serializer_class(self):
         """
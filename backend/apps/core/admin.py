@@ -0,0 +1,107 @@
+"""
+Base das listagens do admin (Unfold) para tabelas grandes
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- SEMPRE usar schema-per-tenant
+- Performance otimizada
+
+OptimizedModelAdmin evita consultas por linha e agregações sobre a tabela
+inteira nas listagens:
+- select_related derivado das colunas exibidas: FKs de list_display, as
+  relações lidas pelo __str__ do model relacionado (`str_select_related`)
+  e as declaradas por coluna em `list_related`
+- anotações por coluna (`list_annotations`), aplicadas só na listagem e
+  só quando a coluna é exibida
+- total pelo CachedCountPaginator (cache por versão dos dados e estimativa
+  do planner em tabelas grandes), sem o COUNT extra da tabela inteira
+- facetas do date_hierarchy (Min/Max e datas distintas) em cache por
+  versão dos dados (template tag `cached_date_hierarchy`)
+"""
+from typing import ClassVar
+
+from django.core.exceptions import FieldDoesNotExist
+from unfold.admin import ModelAdmin
+from unfold.views import ChangeList
+
+from .pagination import CachedCountPaginator
+
+
+def str_relations(model, prefix: str = "") -> list[str]:
+    """Relações lidas pelo __str__ do model (recursivo), com prefixo"""
+    paths = []
+    for name in getattr(model, "str_select_related", ()):
+        path = f"{prefix}{name}"
+        paths.append(path)
+        related_model = model._meta.get_field(name).related_model
+        paths.extend(str_relations(related_model, f"{path}__"))
+    return paths
+
+
+class OptimizedChangeList(ChangeList):
+    """ChangeList com as anotações das colunas exibidas"""
+
+    def get_queryset(self, request, *args, **kwargs):
+        # Antes dos filtros e da ordenação: colunas ordenam pela anotação
+        annotations = {
+            name: expression
+            for name, expression in self.model_admin.get_list_annotations(
+                self.list_display
+            ).items()
+            if name not in self.root_queryset.query.annotations
+        }
+        if annotations:
+            self.root_queryset = self.root_queryset.annotate(**annotations)
+        return super().get_queryset(request, *args, **kwargs)
+
+
+class OptimizedModelAdmin(ModelAdmin):
+    """
+    ModelAdmin para listagens de tabelas grandes
+
+    Colunas calculadas declaram o que leem:
+        list_related = {"full_name": ("user",)}
+        list_annotations = {"get_overdue_display": {"overdue": expressão}}
+    """
+
+    list_related: ClassVar[dict] = {}
+    list_annotations: ClassVar[dict] = {}
+    paginator = CachedCountPaginator
+    show_full_result_count = False
+    change_list_template = "admin/optimized_change_list.html"
+
+    def get_changelist(self, request, **kwargs):
+        return OptimizedChangeList
+
+    def get_list_select_related(self, request):
+        """
+        Relações das colunas exibidas
+
+        `list_select_related = True` mantém o comportamento do Django; uma
+        lista declarada é somada às relações derivadas.
+        """
+        declared = self.list_select_related
+        if declared is True:
+            return True
+
+        paths = set(declared or ())
+        for column in self.get_list_display(request):
+            if column in self.list_related:
+                paths.update(self.list_related[column])
+            elif column == "__str__":
+                paths.update(str_relations(self.model))
+            elif isinstance(column, str):
+                try:
+                    field = self.model._meta.get_field(column)
+                except FieldDoesNotExist:
+                    continue
+                if field.concrete and (field.many_to_one or field.one_to_one):
+                    paths.add(column)
+                    paths.update(str_relations(field.related_model, f"{column}__"))
+        return sorted(paths)
+
+    def get_list_annotations(self, list_display) -> dict:
+        """Anotações das colunas exibidas"""
+        annotations = {}
+        for column in list_display:
+            annotations.update(self.list_annotations.get(column, {}))
+        return annotations
@@ -1,7 +1,47 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.core"
     verbose_name = "Core"
+
+    def ready(self):
+        # Recálculo incremental do snapshot do dashboard
+        from apps.core.dashboard import connect_signals
+
+        connect_signals()
+
+        # Versão dos dados usada pelas contagens em cache das listagens
+        from django.db.models.signals import post_delete, post_save
+
+        from apps.core.pagination import handle_data_change
+
+        post_save.connect(handle_data_change, dispatch_uid="list-count-version-save")
+        post_delete.connect(
+            handle_data_change, dispatch_uid="list-count-version-delete"
+        )
+
+        # Timeouts por tenant aplicados na primeira consulta de cada conexão
+        from django.db.backends.signals import connection_created
+
+        from apps.core.workload import install_workload_wrapper
+
+        connection_created.connect(
+            install_workload_wrapper, dispatch_uid="workload-timeouts-wrapper"
+        )
+
+        # Captura de consultas lentas em todas as conexões
+
+        from apps.core.slow_queries import install_slow_query_wrapper
+
+        connection_created.connect(
+            install_slow_query_wrapper, dispatch_uid="slow-query-wrapper"
+        )
+
+        # Métricas de hit/miss do cache de consultas (django-cachalot)
+        if "cachalot" in settings.INSTALLED_APPS:
+            from apps.core.query_cache import install_metrics
+
+            install_metrics()
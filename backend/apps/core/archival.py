@@ -0,0 +1,194 @@
+"""
+Arquivamento de registros removidos com soft delete
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- SEMPRE usar schema-per-tenant
+- Operações aplicadas schema a schema via schema_context
+- Dados nunca são descartados: são movidos para tabelas de arquivo
+
+Registros com `is_active=False` e `deleted_at` anterior ao período de
+retenção são movidos em lotes para `<tabela>_archive` no mesmo schema,
+mantendo tabelas quentes (e seus índices) apenas com dados vivos.
+"""
+import logging
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from django_tenants.utils import schema_context
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_SUFFIX = "_archive"
+
+# Ordem importa: dependentes antes das tabelas referenciadas
+ARCHIVABLE_MODELS = [
+    "payments.Payment",
+    "payments.Invoice",
+    "students.Attendance",
+    "students.Graduation",
+    "students.Student",
+]
+
+
+def get_archival_settings() -> dict:
+    """Retorna configuração de arquivamento com valores padrão"""
+    config = getattr(settings, "SOFT_DELETE_ARCHIVAL", {})
+    return {
+        "RETENTION_DAYS": config.get("RETENTION_DAYS", 90),
+        "BATCH_SIZE": config.get("BATCH_SIZE", 1000),
+    }
+
+
+def archive_table_name(model) -> str:
+    """Nome da tabela de arquivo do model"""
+    return f"{model._meta.db_table}{ARCHIVE_SUFFIX}"
+
+
+def _table_columns(table_name: str) -> list[tuple[str, str]]:
+    """Colunas (nome, tipo) de uma tabela no schema corrente"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT a.attname, format_type(a.atttypid, a.atttypmod)
+            FROM pg_attribute a
+            WHERE a.attrelid = to_regclass(%s)
+              AND a.attnum > 0
+              AND NOT a.attisdropped
+            ORDER BY a.attnum
+            """,
+            [table_name],
+        )
+        return cursor.fetchall()
+
+
+def ensure_archive_table(model) -> str:
+    """
+    Cria (ou sincroniza) a tabela de arquivo do model no schema corrente
+
+    A tabela de arquivo não tem constraints: colunas novas da tabela quente
+    são adicionadas automaticamente e colunas removidas permanecem como
+    histórico.
+    """
+    quote = connection.ops.quote_name
+    source = model._meta.db_table
+    archive = archive_table_name(model)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {quote(archive)} AS "
+            f"SELECT * FROM {quote(source)} WITH NO DATA"
+        )
+        cursor.execute(
+            f"ALTER TABLE {quote(archive)} ADD COLUMN IF NOT EXISTS "
+            "archived_at timestamp with time zone NOT NULL DEFAULT now()"
+        )
+        cursor.execute(
+            f"CREATE INDEX IF NOT EXISTS {quote(archive + '_id_idx')} "
+            f"ON {quote(archive)} (id)"
+        )
+
+    archived_columns = {name for name, _ in _table_columns(archive)}
+    with connection.cursor() as cursor:
+        for name, column_type in _table_columns(source):
+            if name not in archived_columns:
+                cursor.execute(
+                    f"ALTER TABLE {quote(archive)} "
+                    f"ADD COLUMN {quote(name)} {column_type}"
+                )
+
+    return archive
+
+
+def _dependency_filters(model) -> list[str]:
+    """
+    Condições NOT EXISTS para cada relação reversa do model
+
+    Linhas ainda referenciadas por outras tabelas não podem ser removidas
+    da tabela quente (as FKs do banco não têm ON DELETE CASCADE).
+    """
+    quote = connection.ops.quote_name
+    filters = []
+    for relation in model._meta.related_objects:
+        if not (relation.one_to_many or relation.one_to_one):
+            continue
+        related_model = relation.related_model
+        column = relation.field.column
+        filters.append(
+            f"NOT EXISTS (SELECT 1 FROM {quote(related_model._meta.db_table)} d "
+            f"WHERE d.{quote(column)} = t.id)"
+        )
+    return filters
+
+
+def archive_model(model, cutoff, batch_size: int) -> int:
+    """
+    Move em lotes os registros arquivaveis de um model no schema corrente
+
+    Returns:
+        Quantidade de registros arquivados
+    """
+    quote = connection.ops.quote_name
+    source = model._meta.db_table
+    archive = ensure_archive_table(model)
+    columns = ", ".join(quote(name) for name, _ in _table_columns(source))
+    conditions = " AND ".join(
+        [
+            "t.is_active = false",
+            "t.deleted_at IS NOT NULL",
+            "t.deleted_at < %s",
+            *_dependency_filters(model),
+        ]
+    )
+    sql = (
+        f"WITH moved AS ("
+        f"  DELETE FROM {quote(source)} WHERE id IN ("
+        f"    SELECT t.id FROM {quote(source)} t WHERE {conditions}"
+        f"    ORDER BY t.deleted_at LIMIT %s FOR UPDATE SKIP LOCKED"
+        f"  ) RETURNING {columns}"
+        f") "
+        f"INSERT INTO {quote(archive)} ({columns}) SELECT {columns} FROM moved"
+    )
+
+    total = 0
+    while True:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, [cutoff, batch_size])
+            moved = cursor.rowcount
+        total += moved
+        if moved < batch_size:
+            break
+
+    return total
+
+
+def archive_schema(
+    schema_name: str,
+    retention_days: int | None = None,
+    batch_size: int | None = None,
+) -> dict[str, int]:
+    """
+    Arquiva registros removidos há mais de `retention_days` dias no schema
+
+    Returns:
+        Dicionário {db_table: quantidade arquivada}
+    """
+    config = get_archival_settings()
+    if retention_days is None:
+        retention_days = config["RETENTION_DAYS"]
+    if batch_size is None:
+        batch_size = config["BATCH_SIZE"]
+    cutoff = timezone.now() - timedelta(days=retention_days)
+
+    results = {}
+    with schema_context(schema_name):
+        for label in ARCHIVABLE_MODELS:
+            model = apps.get_model(label)
+            results[model._meta.db_table] = archive_model(model, cutoff, batch_size)
+
+    archived = sum(results.values())
+    if archived:
+        logger.info(f"{archived} registro(s) arquivado(s) em {schema_name}")
+    return results
@@ -0,0 +1,454 @@
+"""
+Ações em lote para os ViewSets de tenant
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- Operações em lote sem N+1
+- Validações rigorosas
+- Valores sempre consistentes (transação única)
+
+Criação, atualização parcial e soft delete/restauração recebem listas.
+A validação usa o serializer da ação item a item, mas as consultas são
+feitas por lote:
+- Unicidade: uma consulta por campo único (além de duplicados no payload)
+- Chaves estrangeiras `<relação>_id`: uma consulta por relação
+
+Permissões são as da ação unitária equivalente (create, partial_update,
+destroy), inclusive `check_object_permissions` em cada objeto do lote.
+
+Com algum item inválido nada é gravado e a resposta lista os erros por
+índice. Sem erros, as escritas usam `bulk_create`/`bulk_update` em uma
+transação e `post_save` é enviado para cada objeto (mantém dashboard e
+analytics atualizados como nas escritas unitárias).
+"""
+from contextlib import contextmanager
+from typing import ClassVar
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
+from drf_spectacular.utils import OpenApiTypes, extend_schema
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import MethodNotAllowed
+from rest_framework.response import Response
+from rest_framework.validators import UniqueValidator
+
+BULK_OPERATIONS = ("create", "update", "delete", "restore")
+
+# Ação unitária equivalente: permissões e serializer são os dela
+BULK_EQUIVALENT_ACTIONS = {
+    "bulk": "create",
+    "bulk_partial_update": "partial_update",
+    "bulk_delete": "destroy",
+    "bulk_restore": "destroy",
+}
+
+
+def get_bulk_settings() -> dict:
+    """Retorna configuração das ações em lote com valores padrão"""
+    config = getattr(settings, "BULK_ACTIONS", {})
+    return {
+        "MAX_ITEMS": config.get("MAX_ITEMS", 1000),
+        "BATCH_SIZE": config.get("BATCH_SIZE", 500),
+    }
+
+
+class BulkIdsSerializer(serializers.Serializer):
+    """
+    Serializer para soft delete/restauração em lote
+    """
+
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        help_text="IDs dos registros",
+    )
+
+    def validate_ids(self, value):
+        max_items = get_bulk_settings()["MAX_ITEMS"]
+        if len(value) > max_items:
+            raise serializers.ValidationError(f"Máximo de {max_items} itens por lote")
+        return list(dict.fromkeys(value))
+
+
+def _model_field(model, name):
+    try:
+        return model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+class BulkValidator:
+    """
+    Valida uma lista de itens com um único serializer e consultas por lote
+
+    Args:
+        serializer: Serializer da ação (instanciado com partial/context)
+        instances: Objetos atualizados por índice (atualização parcial)
+    """
+
+    def __init__(self, serializer, instances=None):
+        self.serializer = serializer
+        self.model = serializer.Meta.model
+        self.instances = instances
+        self.errors = {}
+        self.unique_fields = {}
+        self.relation_fields = {}
+
+        for name, field in serializer.fields.items():
+            if field.read_only:
+                continue
+            model_field = _model_field(self.model, field.source)
+            if model_field is None or model_field.primary_key:
+                continue
+            if model_field.unique:
+                self.unique_fields[name] = model_field
+                # Verificado em lote abaixo
+                field.validators = [
+                    validator
+                    for validator in field.validators
+                    if not isinstance(validator, UniqueValidator)
+                ]
+            if model_field.many_to_one or model_field.one_to_one:
+                if field.source == model_field.attname:
+                    self.relation_fields[name] = model_field
+
+    def _error(self, index, field, message):
+        self.errors.setdefault(index, {}).setdefault(field, []).append(message)
+
+    def _check_unique(self, items) -> None:
+        """Uma consulta por campo único + duplicados dentro do payload"""
+        for name, model_field in self.unique_fields.items():
+            values = {}
+            for index, data in items.items():
+                if name not in data or data[name] in (None, ""):
+                    continue
+                value = data[name]
+                if value in values:
+                    self._error(index, name, "Valor repetido no lote")
+                else:
+                    values[value] = index
+            if not values:
+                continue
+
+            existing = self.model._default_manager.filter(
+                **{f"{model_field.attname}__in": list(values)}
+            ).values_list("pk", model_field.attname)
+            for pk, value in existing:
+                index = values[value]
+                instance = self.instances and self.instances.get(index)
+                if instance is None or instance.pk != pk:
+                    self._error(index, name, "Valor já está em uso")
+
+    def _resolve_relations(self, items) -> None:
+        """Uma consulta por relação; `<relação>_id` vira o objeto"""
+        for name, model_field in self.relation_fields.items():
+            ids = {data[name] for data in items.values() if data.get(name)}
+            related = (
+                model_field.related_model._default_manager.in_bulk(list(ids))
+                if ids
+                else {}
+            )
+            for index, data in items.items():
+                if name not in data:
+                    continue
+                value = data.pop(name)
+                if value is None:
+                    continue
+                if value not in related:
+                    self._error(index, name, "Registro não encontrado")
+                else:
+                    data[model_field.name] = related[value]
+
+    def validate(self, payload: list) -> dict:
+        """
+        Retorna {índice: dados validados}; erros ficam em `self.errors`
+        """
+        items = {}
+        for index, item in enumerate(payload):
+            if self.instances is not None:
+                self.serializer.instance = self.instances.get(index)
+            try:
+                items[index] = self.serializer.run_validation(item)
+            except serializers.ValidationError as err:
+                self.errors[index] = err.detail
+        self.serializer.instance = None
+
+        self._check_unique(items)
+        self._resolve_relations(items)
+        return {
+            index: data for index, data in items.items() if index not in self.errors
+        }
+
+    def error_list(self) -> list:
+        return [
+            {"index": index, "errors": errors}
+            for index, errors in sorted(self.errors.items())
+        ]
+
+
+class BulkActionsMixin:
+    """
+    Ações em lote: POST/PATCH em `bulk/`, `bulk-delete/` e `bulk-restore/`
+
+    `bulk_operations` restringe as operações disponíveis no ViewSet.
+    `build_bulk_instance` permite completar os objetos criados (ex: campos
+    preenchidos pela view em `perform_create`).
+    """
+
+    bulk_operations: ClassVar = BULK_OPERATIONS
+
+    @contextmanager
+    def _equivalent_action(self):
+        """Troca self.action pela ação unitária equivalente (get_permissions)"""
+        bulk_action = self.action
+        self.action = BULK_EQUIVALENT_ACTIONS.get(bulk_action, bulk_action)
+        try:
+            yield
+        finally:
+            self.action = bulk_action
+
+    def check_permissions(self, request):
+        """Permissões da ação unitária equivalente (ex: bulk_delete → destroy)"""
+        with self._equivalent_action():
+            super().check_permissions(request)
+
+    def check_object_permissions(self, request, obj):
+        with self._equivalent_action():
+            super().check_object_permissions(request, obj)
+
+    def _check_object_permissions(self, instances):
+        """check_object_permissions em cada objeto do lote (antes de gravar)"""
+        for instance in instances:
+            self.check_object_permissions(self.request, instance)
+
+    def _check_bulk_operation(self, operation):
+        if operation not in self.bulk_operations:
+            raise MethodNotAllowed(self.request.method)
+
+    def _bulk_payload(self, request):
+        if not isinstance(request.data, list) or not request.data:
+            raise serializers.ValidationError(
+                {"non_field_errors": ["Envie uma lista de itens"]}
+            )
+        max_items = get_bulk_settings()["MAX_ITEMS"]
+        if len(request.data) > max_items:
+            raise serializers.ValidationError(
+                {"non_field_errors": [f"Máximo de {max_items} itens por lote"]}
+            )
+        return request.data
+
+    def get_bulk_serializer(self, action_name, **kwargs):
+        """Serializer da ação unitária equivalente (create/partial_update)"""
+        bulk_action, self.action = self.action, action_name
+        try:
+            serializer_class = self.get_serializer_class()
+        finally:
+            self.action = bulk_action
+        context = {**self.get_serializer_context(), "bulk": True}
+        return serializer_class(context=context, **kwargs)
+
+    def perform_bulk_destroy(self, instances):
+        """Ajustes antes do soft delete em lote (mesma transação)"""
+
+    def build_bulk_instance(self, validated_data):
+        """Objeto a criar a partir dos dados validados (relações já resolvidas)"""
+        return self.queryset.model(**validated_data)
+
+    def _send_post_save(self, model, instances, created, update_fields=None):
+        for instance in instances:
+            post_save.send(
+                sender=model,
+                instance=instance,
+                created=created,
+                update_fields=update_fields,
+                raw=False,
+                using=instance._state.db,
+            )
+
+    @extend_schema(
+        summary="Criar em lote",
+        description=(
+            "Cria uma lista de itens em uma transação. Com algum item inválido "
+            "nada é gravado e os erros são retornados por índice."
+        ),
+        request=OpenApiTypes.OBJECT,
+        responses={201: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """Criação em lote"""
+        self._check_bulk_operation("create")
+        payload = self._bulk_payload(request)
+
+        validator = BulkValidator(self.get_bulk_serializer("create"))
+        items = validator.validate(payload)
+        if validator.errors:
+            return Response(
+                {"errors": validator.error_list()}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        instances = [self.build_bulk_instance(items[index]) for index in sorted(items)]
+        model = type(instances[0])
+        with transaction.atomic():
+            model._default_manager.bulk_create(
+                instances, batch_size=get_bulk_settings()["BATCH_SIZE"]
+            )
+            self._send_post_save(model, instances, created=True)
+
+        return Response(
+            {"created": len(instances), "ids": [obj.pk for obj in instances]},
+            status=status.HTTP_201_CREATED,
+        )
+
+    @extend_schema(
+        summary="Atualizar em lote",
+        description=(
+            "Atualização parcial de uma lista de itens com `id`, em uma "
+            "transação. Com algum item inválido nada é gravado."
+        ),
+        request=OpenApiTypes.OBJECT,
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @bulk.mapping.patch
+    def bulk_partial_update(self, request):
+        """Atualização parcial em lote"""
+        self._check_bulk_operation("update")
+        payload = self._bulk_payload(request)
+
+        errors = {}
+        ids = {}
+        for index, item in enumerate(payload):
+            try:
+                ids[index] = serializers.UUIDField().to_internal_value(
+                    item.get("id") if isinstance(item, dict) else None
+                )
+            except serializers.ValidationError as err:
+                errors[index] = {"id": err.detail}
+        found = (
+            self.get_queryset()
+            .select_related(None)
+            .prefetch_related(None)
+            .in_bulk(list(set(ids.values())))
+        )
+        instances = {}
+        for index, pk in ids.items():
+            if pk in found:
+                instances[index] = found[pk]
+            else:
+                errors[index] = {"id": ["Registro não encontrado"]}
+        self._check_object_permissions(found.values())
+
+        validator = BulkValidator(
+            self.get_bulk_serializer("partial_update", partial=True),
+            instances=instances,
+        )
+        validator.errors.update(errors)
+        items = validator.validate(
+            [item if index in instances else {} for index, item in enumerate(payload)]
+        )
+        if validator.errors:
+            return Response(
+                {"errors": validator.error_list()}, status=status.HTTP_400_BAD_REQUEST
+            )
+
+        now = timezone.now()
+        fields = {"updated_at"}
+        for index, data in items.items():
+            for name, value in data.items():
+                setattr(instances[index], name, value)
+                fields.add(name)
+            instances[index].updated_at = now
+
+        updated = list({obj.pk: obj for obj in instances.values()}.values())
+        model = type(updated[0])
+        fields = [
+            model._meta.get_field(name).name
+            for name in fields
+            if _model_field(model, name) is not None
+        ]
+        with transaction.atomic():
+            model._default_manager.bulk_update(
+                updated, fields, batch_size=get_bulk_settings()["BATCH_SIZE"]
+            )
+            self._send_post_save(model, updated, created=False, update_fields=fields)
+
+        return Response({"updated": len(updated), "ids": [obj.pk for obj in updated]})
+
+    def _bulk_set_active(self, request, is_active: bool):
+        serializer = BulkIdsSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        model = self.queryset.model
+        if not hasattr(model, "is_active"):
+            return Response(
+                {"error": "Este item não suporta soft delete"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        now = timezone.now()
+        changes = {
+            "is_active": is_active,
+            "deleted_at": None if is_active else now,
+            "updated_at": now,
+        }
+        changes = {
+            name: value for name, value in changes.items() if hasattr(model, name)
+        }
+        # Sem o filtro de ativos do get_queryset (restauração)
+        queryset = (
+            super()
+            .get_queryset()
+            .select_related(None)
+            .prefetch_related(None)
+            .filter(pk__in=serializer.validated_data["ids"], is_active=not is_active)
+        )
+        with transaction.atomic():
+            instances = list(queryset.select_for_update())
+            self._check_object_permissions(instances)
+            if instances and not is_active:
+                self.perform_bulk_destroy(instances)
+            if instances:
+                model._default_manager.filter(
+                    pk__in=[obj.pk for obj in instances]
+                ).update(**changes)
+                for instance in instances:
+                    for name, value in changes.items():
+                        setattr(instance, name, value)
+                self._send_post_save(
+                    model, instances, created=False, update_fields=list(changes)
+                )
+
+        return [obj.pk for obj in instances]
+
+    @extend_schema(
+        summary="Deletar em lote",
+        description="Soft delete de uma lista de IDs",
+        request=BulkIdsSerializer,
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["post"], url_path="bulk-delete")
+    def bulk_delete(self, request):
+        """Soft delete em lote"""
+        self._check_bulk_operation("delete")
+        result = self._bulk_set_active(request, is_active=False)
+        if isinstance(result, Response):
+            return result
+        return Response({"deleted": len(result), "ids": result})
+
+    @extend_schema(
+        summary="Restaurar em lote",
+        description="Restaura uma lista de IDs removidos com soft delete",
+        request=BulkIdsSerializer,
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["post"], url_path="bulk-restore")
+    def bulk_restore(self, request):
+        """Restauração em lote"""
+        self._check_bulk_operation("restore")
+        result = self._bulk_set_active(request, is_active=True)
+        if isinstance(result, Response):
+            return result
+        return Response({"restored": len(result), "ids": result})
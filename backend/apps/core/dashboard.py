@@ -0,0 +1,285 @@
+"""
+Snapshot pré-calculado do dashboard por tenant
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- SEMPRE usar schema-per-tenant
+- Nenhum dado pode vazar entre tenants (chaves escopadas pelo schema)
+
+O dashboard é dividido em seções (alunos, presenças, receita e
+inadimplência), cada uma guardada no cache em sua própria chave. A leitura
+nunca agrega tabelas: escritas nos modelos de origem agendam (com debounce)
+o recálculo apenas das seções afetadas, e seções mais antigas que MAX_AGE
+ou calculadas em outro dia são recalculadas em background.
+"""
+import logging
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count, DecimalField, F, Q, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .replicas import primary_reads
+
+logger = logging.getLogger(__name__)
+
+# Seções recalculadas quando o modelo é alterado
+SECTION_SOURCES = {
+    "students.Student": ("students",),
+    "students.Attendance": ("attendance",),
+    "payments.Invoice": ("overdue",),
+    "payments.Payment": ("revenue",),
+}
+
+
+def get_dashboard_settings() -> dict:
+    """Retorna configuração do dashboard com valores padrão"""
+    config = getattr(settings, "DASHBOARD_SNAPSHOT", {})
+    return {
+        "MAX_AGE": config.get("MAX_AGE", 300),
+        "DEBOUNCE": config.get("DEBOUNCE", 5),
+        "TTL": config.get("TTL", 60 * 60 * 24),
+    }
+
+
+def _month_start(value):
+    return value.replace(day=1)
+
+
+def _start_of_day(value):
+    return timezone.make_aware(datetime.combine(value, time.min))
+
+
+def _money(expression, **filters):
+    return Coalesce(
+        Sum(expression, **filters),
+        Decimal("0"),
+        output_field=DecimalField(max_digits=12, decimal_places=2),
+    )
+
+
+def compute_students(today) -> dict:
+    """Alunos ativos por faixa e alunos por status"""
+    Student = apps.get_model("students", "Student")
+    students = Student.objects.filter(is_active=True)
+
+    by_status = dict(
+        students.values_list("status").annotate(count=Count("id")).order_by()
+    )
+    by_belt = dict(
+        students.filter(status="active")
+        .values_list("belt_color")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    return {
+        "active": by_status.get("active", 0),
+        "by_belt": {belt: by_belt.get(belt, 0) for belt, _ in Student.BELT_CHOICES},
+        "by_status": {
+            code: by_status.get(code, 0) for code, _ in Student.STATUS_CHOICES
+        },
+    }
+
+
+def compute_attendance(today) -> dict:
+    """Check-ins de hoje e da semana (segunda a hoje)"""
+    Attendance = apps.get_model("students", "Attendance")
+    week_start = today - timedelta(days=today.weekday())
+
+    return Attendance.objects.filter(
+        is_active=True, class_date__gte=week_start, class_date__lte=today
+    ).aggregate(
+        today=Count("id", filter=Q(class_date=today)),
+        week=Count("id"),
+    )
+
+
+def compute_revenue(today) -> dict:
+    """Pagamentos confirmados no mês atual e no anterior"""
+    Payment = apps.get_model("payments", "Payment")
+    current_start = _start_of_day(_month_start(today))
+    previous_start = _start_of_day(
+        _month_start(_month_start(today) - timedelta(days=1))
+    )
+
+    # Faixas em datetime (sem cast para date) para usar o índice de payment_date
+    totals = Payment.objects.filter(
+        is_active=True,
+        status="confirmed",
+        payment_date__gte=previous_start,
+        payment_date__lt=_start_of_day(today + timedelta(days=1)),
+    ).aggregate(
+        current_month=_money("amount", filter=Q(payment_date__gte=current_start)),
+        previous_month=_money("amount", filter=Q(payment_date__lt=current_start)),
+    )
+
+    previous = totals["previous_month"]
+    totals["change_percent"] = (
+        round(float((totals["current_month"] - previous) / previous * 100), 2)
+        if previous
+        else None
+    )
+    return totals
+
+
+def compute_overdue(today) -> dict:
+    """Faturas vencidas (status overdue ou pendentes após o vencimento)"""
+    Invoice = apps.get_model("payments", "Invoice")
+
+    return Invoice.objects.filter(
+        Q(status="overdue") | Q(status="pending", due_date__lt=today),
+        is_active=True,
+    ).aggregate(
+        count=Count("id"),
+        total=_money(F("amount") - F("discount") + F("late_fee")),
+    )
+
+
+SECTIONS = {
+    "students": compute_students,
+    "attendance": compute_attendance,
+    "revenue": compute_revenue,
+    "overdue": compute_overdue,
+}
+
+
+def section_key(schema_name: str, section: str) -> str:
+    """Chave de cache de uma seção do dashboard do schema"""
+    return f"dashboard:{schema_name}:{section}"
+
+
+def pending_key(schema_name: str, section: str) -> str:
+    """Marca de recálculo já agendado para a seção"""
+    return f"dashboard-pending:{schema_name}:{section}"
+
+
+def refresh_sections(sections=None) -> dict:
+    """
+    Recalcula e grava seções do dashboard do schema atual
+
+    Args:
+        sections: Nomes das seções (None = todas)
+
+    Returns:
+        Seções recalculadas
+    """
+    schema_name = connection.schema_name
+    config = get_dashboard_settings()
+    today = timezone.localdate()
+
+    entries = {}
+    for section in sections or SECTIONS:
+        # Escritas durante o cálculo agendam um novo recálculo
+        cache.delete(pending_key(schema_name, section))
+        with primary_reads():
+            data = SECTIONS[section](today)
+        entries[section_key(schema_name, section)] = {
+            "data": data,
+            "as_of": today,
+            "computed_at": timezone.now(),
+        }
+    cache.set_many(entries, config["TTL"])
+    return {key.rsplit(":", 1)[1]: entry for key, entry in entries.items()}
+
+
+def schedule_refresh(sections) -> list[str]:
+    """
+    Agenda o recálculo das seções no schema atual (com debounce)
+
+    Seções que já têm recálculo agendado são ignoradas, então rajadas de
+    escritas geram um único recálculo por seção. Falha ao enfileirar
+    (broker indisponível) é registrada e não interrompe quem escreveu: as
+    seções voltam a ser agendáveis e o snapshot segue com MAX_AGE.
+
+    Returns:
+        Seções efetivamente agendadas
+    """
+    from apps.core.tasks import refresh_dashboard_snapshot
+
+    schema_name = connection.schema_name
+    debounce = get_dashboard_settings()["DEBOUNCE"]
+    scheduled = [
+        section
+        for section in sections
+        if cache.add(pending_key(schema_name, section), 1, debounce * 10)
+    ]
+    if scheduled:
+        try:
+            refresh_dashboard_snapshot.apply_async(
+                kwargs={"sections": scheduled}, countdown=debounce
+            )
+        except Exception as err:
+            logger.exception(f"Erro ao agendar recálculo do dashboard: {err}")
+            cache.delete_many(
+                [pending_key(schema_name, section) for section in scheduled]
+            )
+            return []
+    return scheduled
+
+
+def get_dashboard() -> dict:
+    """
+    Dashboard do tenant atual lido do snapshot
+
+    Seções ausentes são calculadas na hora (primeira leitura); seções
+    antigas são servidas como estão e recalculadas em background.
+    """
+    schema_name = connection.schema_name
+    config = get_dashboard_settings()
+    now = timezone.now()
+    today = timezone.localdate()
+
+    keys = {section: section_key(schema_name, section) for section in SECTIONS}
+    cached = cache.get_many(keys.values())
+    entries = {section: cached.get(key) for section, key in keys.items()}
+
+    missing = [section for section, entry in entries.items() if entry is None]
+    if missing:
+        entries.update(refresh_sections(missing))
+
+    stale = [
+        section
+        for section, entry in entries.items()
+        if entry["as_of"] != today
+        or (now - entry["computed_at"]).total_seconds() > config["MAX_AGE"]
+    ]
+    if stale:
+        schedule_refresh(stale)
+
+    return {
+        **{section: entry["data"] for section, entry in entries.items()},
+        "as_of": today,
+        "computed_at": min(entry["computed_at"] for entry in entries.values()),
+        "stale_sections": stale,
+    }
+
+
+def handle_source_change(sender, **kwargs) -> None:
+    """
+    Handler de post_save/post_delete dos modelos de origem
+
+    O recálculo é agendado após o commit, para ler os dados gravados.
+    """
+    if kwargs.get("raw") or connection.schema_name == settings.PUBLIC_SCHEMA_NAME:
+        return
+
+    sections = SECTION_SOURCES.get(sender._meta.label)
+    if sections:
+        transaction.on_commit(lambda: schedule_refresh(sections), robust=True)
+
+
+def connect_signals() -> None:
+    """Conecta o recálculo incremental às escritas dos modelos de origem"""
+    from django.db.models.signals import post_delete, post_save
+
+    for label in SECTION_SOURCES:
+        for signal in (post_save, post_delete):
+            signal.connect(
+                handle_source_change,
+                sender=label,
+                dispatch_uid=f"dashboard_{signal is post_save}_{label}",
+            )
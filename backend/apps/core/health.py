@@ -0,0 +1,320 @@
+"""
+Health checks executados em background com veredito em cache
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- Monitoramento sem custo para as requisições da API
+- Nenhuma conexão de banco consumida por probes de load balancer
+
+Cada processo mantém um `HealthMonitor`: as verificações (banco, cache,
+memória e disco) rodam em intervalos fixos, cada uma em sua própria thread
+com timeout. Os endpoints de health apenas leem o último veredito e sua
+idade. O banco é verificado sempre pela mesma thread, que reaproveita uma
+única conexão (respeitando CONN_MAX_AGE).
+"""
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from datetime import datetime
+
+import psutil
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+
+def get_health_probe_settings() -> dict:
+    """Retorna configuração dos health checks com valores padrão"""
+    config = getattr(settings, "HEALTH_PROBES", {})
+    return {
+        "BACKGROUND": config.get("BACKGROUND", True),
+        "INTERVAL": config.get("INTERVAL", 10),
+        "TIMEOUT": config.get("TIMEOUT", 2),
+        "STALE_AFTER": config.get("STALE_AFTER", 60),
+        "MEMORY_WARNING": config.get("MEMORY_WARNING", 85),
+        "MEMORY_CRITICAL": config.get("MEMORY_CRITICAL", 95),
+        "DISK_WARNING": config.get("DISK_WARNING", 85),
+        "DISK_CRITICAL": config.get("DISK_CRITICAL", 95),
+    }
+
+
+def usage_status(percent: float, warning: float, critical: float) -> str:
+    """Classifica um percentual de uso em ok/warning/critical"""
+    if percent >= critical:
+        return "critical"
+    if percent >= warning:
+        return "warning"
+    return "ok"
+
+
+def probe_database() -> dict:
+    """Verifica conexão e migrations aplicadas no banco"""
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            if cursor.fetchone()[0] != 1:
+                raise Exception("Database query returned unexpected result")
+
+            cursor.execute("SELECT COUNT(*) FROM django_migrations")
+            migration_count = cursor.fetchone()[0]
+
+            cursor.execute("SELECT version()")
+            db_version = cursor.fetchone()[0]
+    finally:
+        connection.close_if_unusable_or_obsolete()
+
+    return {
+        "migrations": migration_count,
+        "version": db_version,
+        "vendor": connection.vendor,
+    }
+
+
+def probe_cache() -> dict:
+    """Verifica escrita, leitura e remoção no cache"""
+    test_key = f"health_check_{os.getpid()}"
+    test_value = f"test_value_{time.time()}"
+
+    cache.set(test_key, test_value, 10)
+    if cache.get(test_key) != test_value:
+        raise Exception("Cache read/write test failed")
+
+    cache.delete(test_key)
+    if cache.get(test_key) is not None:
+        raise Exception("Cache delete test failed")
+
+    return {
+        "backend": cache.__class__.__name__,
+        "location": getattr(cache, "_cache", {}).get("_server", "unknown"),
+        "operations_tested": ["set", "get", "delete"],
+    }
+
+
+def probe_memory() -> dict:
+    """Uso de memória do host"""
+    config = get_health_probe_settings()
+    memory = psutil.virtual_memory()
+    return {
+        "total": f"{memory.total / (1024**3):.2f} GB",
+        "available": f"{memory.available / (1024**3):.2f} GB",
+        "percent": memory.percent,
+        "status": usage_status(
+            memory.percent, config["MEMORY_WARNING"], config["MEMORY_CRITICAL"]
+        ),
+    }
+
+
+def probe_disk() -> dict:
+    """Uso de disco do host"""
+    config = get_health_probe_settings()
+    disk = psutil.disk_usage("/")
+    percent = round((disk.used / disk.total) * 100, 2)
+    return {
+        "total": f"{disk.total / (1024**3):.2f} GB",
+        "used": f"{disk.used / (1024**3):.2f} GB",
+        "free": f"{disk.free / (1024**3):.2f} GB",
+        "percent": percent,
+        "status": usage_status(
+            percent, config["DISK_WARNING"], config["DISK_CRITICAL"]
+        ),
+    }
+
+
+def probe_uptime() -> dict:
+    """Tempo desde o boot do host"""
+    uptime = datetime.now() - datetime.fromtimestamp(psutil.boot_time())
+    return {"uptime": str(uptime).split(".")[0]}
+
+
+# Verificações executadas a cada rodada (nome → função)
+PROBES = {
+    "database": probe_database,
+    "cache": probe_cache,
+    "memory": probe_memory,
+    "disk": probe_disk,
+    "uptime": probe_uptime,
+}
+
+# Verificações cuja falha (ou uso crítico) torna o serviço indisponível
+CRITICAL_PROBES = ("database", "cache", "memory", "disk")
+
+
+class HealthMonitor:
+    """
+    Executa as verificações periodicamente e guarda o último veredito
+
+    Com HEALTH_PROBES["BACKGROUND"] a thread de agendamento é iniciada na
+    primeira leitura (após o fork dos workers). Sem ela, o veredito é
+    recalculado na leitura quando tiver mais de INTERVAL segundos.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._verdict = None
+        self._checked_at = 0.0
+        self._executors: dict[str, ThreadPoolExecutor] = {}
+        self._running: dict = {}
+        self._thread = None
+        self._stop = threading.Event()
+
+    def _executor(self, name: str) -> ThreadPoolExecutor:
+        """Thread dedicada por verificação (uma conexão de banco no máximo)"""
+        executor = self._executors.get(name)
+        if executor is None:
+            executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"health-{name}"
+            )
+            self._executors[name] = executor
+        return executor
+
+    def run_probes(self) -> dict:
+        """Executa uma rodada de verificações e atualiza o veredito"""
+        config = get_health_probe_settings()
+        started = time.monotonic()
+
+        submitted = {}
+        for name, probe in PROBES.items():
+            previous = self._running.get(name)
+            if previous is not None and not previous.done():
+                # Rodada anterior ainda presa: não empilha novas execuções
+                submitted[name] = (previous, previous.started)
+                continue
+            future = self._executor(name).submit(self._timed, probe)
+            future.started = time.monotonic()
+            self._running[name] = future
+            submitted[name] = (future, future.started)
+
+        checks = {}
+        deadline = started + config["TIMEOUT"]
+        for name, (future, probe_started) in submitted.items():
+            try:
+                result, duration = future.result(
+                    timeout=max(deadline - time.monotonic(), 0)
+                )
+                checks[name] = {
+                    "status": "ok",
+                    "detail": result,
+                    "duration_ms": round(duration * 1000, 2),
+                }
+            except FutureTimeoutError:
+                elapsed = time.monotonic() - probe_started
+                checks[name] = {
+                    "status": "timeout",
+                    "error": f"timeout após {elapsed:.1f}s",
+                    "duration_ms": round(elapsed * 1000, 2),
+                }
+            except Exception as err:
+                checks[name] = {"status": "error", "error": str(err)}
+                logger.error(f"Health check {name} failed: {err}")
+
+        verdict = self._build_verdict(checks)
+        with self._lock:
+            self._verdict = verdict
+            self._checked_at = time.monotonic()
+        return verdict
+
+    @staticmethod
+    def _timed(probe) -> tuple:
+        start = time.monotonic()
+        return probe(), time.monotonic() - start
+
+    @staticmethod
+    def _build_verdict(checks: dict) -> dict:
+        errors = []
+        healthy = True
+        for name, check in checks.items():
+            if check["status"] != "ok":
+                errors.append(f"{name.capitalize()} error: {check['error']}")
+                healthy = healthy and name not in CRITICAL_PROBES
+                continue
+
+            usage = check["detail"].get("status")
+            percent = check["detail"].get("percent")
+            if usage == "critical":
+                errors.append(f"Critical {name} usage: {percent}%")
+                healthy = False
+            elif usage == "warning":
+                errors.append(f"High {name} usage: {percent}%")
+
+        return {
+            "status": "healthy" if healthy else "unhealthy",
+            "timestamp": timezone.now(),
+            "checks": checks,
+            "errors": errors,
+        }
+
+    def get_verdict(self) -> tuple[dict, float]:
+        """
+        Último veredito e sua idade em segundos
+
+        Vereditos mais antigos que STALE_AFTER (thread parada ou presa) são
+        reportados como unhealthy.
+        """
+        config = get_health_probe_settings()
+        if os.getpid() != self._pid:
+            # Processo filho (fork): threads e vereditos do pai não valem aqui
+            self._reset()
+
+        if config["BACKGROUND"]:
+            self.start()
+            if self._verdict is None:
+                self.run_probes()
+        elif self._verdict is None or self.age() >= config["INTERVAL"]:
+            self.run_probes()
+
+        with self._lock:
+            verdict = self._verdict
+        age = self.age()
+        if age > config["STALE_AFTER"]:
+            verdict = {
+                **verdict,
+                "status": "unhealthy",
+                "errors": [*verdict["errors"], f"Stale verdict: {age:.0f}s"],
+            }
+        return verdict, age
+
+    def age(self) -> float:
+        """Segundos desde a última rodada"""
+        return round(time.monotonic() - self._checked_at, 3)
+
+    def start(self) -> None:
+        """Inicia a thread de agendamento (idempotente)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._loop, name="health-monitor", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Interrompe a thread de agendamento"""
+        self._stop.set()
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_probes()
+            except Exception as err:
+                logger.error(f"Health monitor failed: {err}")
+            self._stop.wait(get_health_probe_settings()["INTERVAL"])
+
+
+monitor = HealthMonitor()
+
+
+def get_health_verdict() -> tuple[dict, float]:
+    """Último veredito do processo e sua idade em segundos"""
+    return monitor.get_verdict()
@@ -0,0 +1,157 @@
+"""
+Suporte a Idempotency-Key nas escritas da API
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- SEMPRE usar schema-per-tenant
+- Respostas consistentes para frontend
+
+Escritas (POST/PUT/PATCH/DELETE) com o cabeçalho `Idempotency-Key` têm a
+primeira resposta guardada em cache por tenant (schema), usuário e chave.
+Reenvios com a mesma chave recebem a resposta guardada sem executar a
+view. Enquanto a primeira requisição ainda está em andamento, reenvios
+recebem 409; a mesma chave em outro endpoint ou com outro corpo recebe
+422. Respostas 5xx não são guardadas (o cliente pode tentar novamente).
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+from rest_framework.response import Response
+
+WRITE_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+# Cabeçalhos da resposta original repetidos no replay
+REPLAYED_HEADERS = ("Location",)
+
+
+def get_idempotency_settings() -> dict:
+    """Retorna configuração de Idempotency-Key com valores padrão"""
+    config = getattr(settings, "IDEMPOTENCY", {})
+    return {
+        "HEADER": config.get("HEADER", "Idempotency-Key"),
+        "TTL": config.get("TTL", 60 * 60 * 24),
+        "LOCK_TIMEOUT": config.get("LOCK_TIMEOUT", 60),
+        "MAX_KEY_LENGTH": config.get("MAX_KEY_LENGTH", 255),
+    }
+
+
+class IdempotencyConflictError(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Requisição com esta Idempotency-Key ainda em andamento."
+    default_code = "idempotency_conflict"
+
+
+class IdempotencyKeyReusedError(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "Idempotency-Key já utilizada em outra requisição."
+    default_code = "idempotency_key_reused"
+
+
+class IdempotentReplayError(Exception):
+    """Interrompe a view: a resposta já foi produzida anteriormente"""
+
+    def __init__(self, stored: dict):
+        super().__init__("replay")
+        self.stored = stored
+
+
+def request_fingerprint(request) -> str:
+    """
+    Identifica a requisição: método, caminho e hash do corpo
+
+    Multipart entra pelos campos e nome/tamanho dos arquivos, sem carregar
+    o upload inteiro na memória.
+    """
+    digest = hashlib.sha256()
+    if request.content_type.startswith("multipart/"):
+        for field, values in sorted(request.data.lists()):
+            for value in values:
+                if hasattr(value, "size"):
+                    value = f"{value.name}:{value.size}"
+                digest.update(f"{field}={value}\n".encode())
+    else:
+        digest.update(request.body)
+    return f"{request.method} {request.get_full_path()} {digest.hexdigest()}"
+
+
+class IdempotencyMixin:
+    """
+    Guarda e repete respostas de escritas com Idempotency-Key
+
+    A verificação acontece depois da autenticação e das permissões
+    (`initial`), então o replay respeita o mesmo controle de acesso.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._idempotency = None
+
+        config = get_idempotency_settings()
+        key = request.headers.get(config["HEADER"], "").strip()
+        if not key or request.method not in WRITE_METHODS:
+            return
+        if not request.user or not request.user.is_authenticated:
+            return
+        if len(key) > config["MAX_KEY_LENGTH"]:
+            raise ValidationError(
+                {"idempotency_key": f"Máximo de {config['MAX_KEY_LENGTH']} caracteres"}
+            )
+
+        cache_key = f"idempotency:{connection.schema_name}:{request.user.pk}:{key}"
+        fingerprint = request_fingerprint(request)
+        stored = cache.get(cache_key)
+        if stored is None and cache.add(
+            cache_key, {"fingerprint": fingerprint}, config["LOCK_TIMEOUT"]
+        ):
+            self._idempotency = (cache_key, fingerprint)
+            return
+
+        stored = stored or cache.get(cache_key) or {}
+        if stored.get("fingerprint", fingerprint) != fingerprint:
+            raise IdempotencyKeyReusedError()
+        if "status" not in stored:
+            raise IdempotencyConflictError()
+        raise IdempotentReplayError(stored)
+
+    def handle_exception(self, exc):
+        if isinstance(exc, IdempotentReplayError):
+            response = Response(
+                exc.stored["data"],
+                status=exc.stored["status"],
+                headers=exc.stored["headers"],
+            )
+            response["Idempotent-Replayed"] = "true"
+            return response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        idempotency = getattr(self, "_idempotency", None)
+        if idempotency is None:
+            return response
+
+        self._idempotency = None
+        cache_key, fingerprint = idempotency
+        if response.status_code >= 500 or not hasattr(response, "data"):
+            # Libera a chave: o cliente pode tentar novamente
+            cache.delete(cache_key)
+            return response
+
+        cache.set(
+            cache_key,
+            {
+                "fingerprint": fingerprint,
+                "status": response.status_code,
+                "data": response.data,
+                "headers": {
+                    header: response[header]
+                    for header in REPLAYED_HEADERS
+                    if header in response
+                },
+            },
+            get_idempotency_settings()["TTL"],
+        )
+        return response
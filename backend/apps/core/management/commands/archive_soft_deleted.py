@@ -0,0 +1,87 @@
+"""
+Comando para arquivar registros removidos com soft delete.
+
+Move registros com is_active=False e deleted_at anterior ao período de
+retenção para tabelas <tabela>_archive em cada schema de tenant.
+"""
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.core.archival import archive_schema, get_archival_settings
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    """
+    Comando para arquivar registros removidos em todos os tenants
+
+    Exemplos:
+        python manage.py archive_soft_deleted
+        python manage.py archive_soft_deleted --days 30 --batch-size 500
+        python manage.py archive_soft_deleted --tenant-slug zenith-jj
+    """
+
+    help = "Arquiva registros removidos (soft delete) de todos os tenants"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Adiciona argumentos do comando"""
+        config = get_archival_settings()
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=config["RETENTION_DAYS"],
+            help="Arquiva registros removidos há mais de N dias",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=config["BATCH_SIZE"],
+            help="Registros movidos por transação",
+        )
+        parser.add_argument(
+            "--tenant-slug",
+            type=str,
+            help="Arquiva apenas tenant específico",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Executa arquivamento"""
+        start_time = time.time()
+        tenants = self._get_tenants(options.get("tenant_slug"))
+        self.stdout.write(f"📋 Encontrados {len(tenants)} tenant(s)")
+
+        total = 0
+        for tenant in tenants:
+            results = archive_schema(
+                tenant.schema_name,
+                retention_days=options["days"],
+                batch_size=options["batch_size"],
+            )
+            archived = sum(results.values())
+            total += archived
+            details = ", ".join(
+                f"{table}: {count}" for table, count in results.items() if count
+            )
+            self.stdout.write(
+                f"🗄️  {tenant.name}: {archived} registro(s) arquivado(s)"
+                + (f" ({details})" if details else "")
+            )
+
+        duration = time.time() - start_time
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {total} registro(s) arquivado(s) em {duration:.2f}s"
+            )
+        )
+
+    def _get_tenants(self, tenant_slug: str | None = None) -> list[Tenant]:
+        """Busca tenants para arquivar"""
+        try:
+            if tenant_slug:
+                return [Tenant.objects.get(slug=tenant_slug, is_active=True)]
+            return list(Tenant.objects.filter(is_active=True))
+        except Tenant.DoesNotExist as err:
+            raise RuntimeError(f"Tenant não encontrado: {tenant_slug}") from err
@@ -0,0 +1,52 @@
+"""
+Comando para pré-compilar o schema OpenAPI.
+
+Gera o artefato servido por /api/schema/ (etapa de build/deploy), evitando
+a geração do schema em tempo de requisição.
+"""
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from rest_framework.settings import api_settings
+
+from apps.core.schema import build_schema_artifact
+
+
+class Command(BaseCommand):
+    """
+    Comando para gerar o artefato do schema OpenAPI
+
+    Exemplos:
+        python manage.py build_openapi_schema
+        python manage.py build_openapi_schema --api-version v1
+    """
+
+    help = "Gera o artefato pré-compilado do schema OpenAPI"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Adiciona argumentos do comando"""
+        parser.add_argument(
+            "--api-version",
+            action="append",
+            help="Versão da API (padrão: todas as ALLOWED_VERSIONS)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Executa geração do schema"""
+        start_time = time.time()
+        versions = (
+            options.get("api_version")
+            or api_settings.ALLOWED_VERSIONS
+            or [api_settings.DEFAULT_VERSION]
+        )
+
+        for version in versions:
+            path = build_schema_artifact(version)
+            self.stdout.write(f"📄 Schema {version}: {path}")
+
+        duration = time.time() - start_time
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Schema OpenAPI gerado em {duration:.2f}s")
+        )
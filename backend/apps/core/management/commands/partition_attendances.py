@@ -0,0 +1,121 @@
+"""
+Comando para manutenção das partições mensais de presenças.
+
+Converte a tabela `attendances` de cada tenant em tabela particionada por mês
+e cria antecipadamente as partições dos próximos meses. Deve ser agendado
+(cron/beat) para rodar ao menos uma vez por mês.
+"""
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.students.partitioning import (
+    convert_to_partitioned,
+    ensure_partitions,
+    get_partitioning_settings,
+    is_partitioned,
+)
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    """
+    Comando para particionar presenças em todos os tenants
+
+    Funcionalidades:
+    - Converte `attendances` para tabela particionada (--convert)
+    - Cria partições mensais antecipadas em todos os schemas
+    - Suporte para dry-run e tenant específico
+
+    Exemplos:
+        python manage.py partition_attendances
+        python manage.py partition_attendances --convert
+        python manage.py partition_attendances --months-ahead 6
+        python manage.py partition_attendances --tenant-slug zenith-jj --dry-run
+    """
+
+    help = "Cria partições mensais de presenças em todos os tenants"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Adiciona argumentos do comando"""
+        parser.add_argument(
+            "--convert",
+            action="store_true",
+            help="Converte tabelas ainda não particionadas",
+        )
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=None,
+            help="Quantidade de meses futuros a criar (padrão: settings)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Simula execução sem aplicar mudanças",
+        )
+        parser.add_argument(
+            "--tenant-slug",
+            type=str,
+            help="Processa apenas tenant específico",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Executa manutenção das partições"""
+        convert = options["convert"]
+        dry_run = options["dry_run"]
+        months_ahead = options["months_ahead"]
+        if months_ahead is None:
+            months_ahead = get_partitioning_settings()["MONTHS_AHEAD"]
+
+        if dry_run:
+            self.stdout.write("🔍 Modo DRY RUN - Nenhuma mudança será aplicada")
+
+        start_time = time.time()
+        tenants = self._get_tenants(options.get("tenant_slug"))
+        self.stdout.write(f"📋 Encontrados {len(tenants)} tenant(s)")
+
+        for tenant in tenants:
+            self._process_tenant(tenant, convert, months_ahead, dry_run)
+
+        duration = time.time() - start_time
+        self.stdout.write(self.style.SUCCESS(f"⏱️  Tempo total: {duration:.2f}s"))
+
+    def _get_tenants(self, tenant_slug: str | None = None) -> list[Tenant]:
+        """Busca tenants para processar"""
+        try:
+            if tenant_slug:
+                return [Tenant.objects.get(slug=tenant_slug, is_active=True)]
+            return list(Tenant.objects.filter(is_active=True))
+        except Tenant.DoesNotExist as err:
+            raise RuntimeError(f"Tenant não encontrado: {tenant_slug}") from err
+
+    def _process_tenant(
+        self, tenant: Tenant, convert: bool, months_ahead: int, dry_run: bool
+    ) -> None:
+        """Converte e/ou cria partições para um tenant"""
+        schema_name = tenant.schema_name
+        partitioned = is_partitioned(schema_name)
+
+        if dry_run:
+            state = "particionada" if partitioned else "não particionada"
+            self.stdout.write(f"🔍 [DRY RUN] {tenant.name}: tabela {state}")
+            return
+
+        if not partitioned:
+            if not convert:
+                self.stdout.write(
+                    f"⚠️  {tenant.name}: tabela não particionada. Use --convert."
+                )
+                return
+            convert_to_partitioned(schema_name, months_ahead=months_ahead)
+            self.stdout.write(f"🏗️  {tenant.name}: tabela convertida")
+
+        created = ensure_partitions(schema_name, months_ahead=months_ahead)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ {tenant.name}: {len(created)} partição(ões) criada(s)"
+            )
+        )
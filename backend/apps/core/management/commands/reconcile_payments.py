@@ -0,0 +1,106 @@
+"""
+Comando para conciliar o extrato de liquidação do gateway de pagamento.
+
+Lê o arquivo (CSV ou OFX) em streaming e concilia as linhas com os
+pagamentos do tenant por external_id, em lotes.
+"""
+
+import time
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django_tenants.utils import tenant_context
+
+from apps.payments.reconciliation import ENCODINGS, ReconciliationError, reconcile
+from apps.tenants.models import Tenant
+
+
+class Command(BaseCommand):
+    """
+    Comando para conciliar pagamentos de um tenant
+
+    Exemplos:
+        python manage.py reconcile_payments liquidacao.csv --tenant-slug zenith-jj
+        python manage.py reconcile_payments extrato.ofx --tenant-slug zenith-jj
+    """
+
+    help = "Concilia arquivo de liquidação do gateway com os pagamentos do tenant"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Adiciona argumentos do comando"""
+        parser.add_argument("path", type=str, help="Arquivo de liquidação")
+        parser.add_argument(
+            "--tenant-slug",
+            type=str,
+            required=True,
+            help="Tenant dono dos pagamentos",
+        )
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ofx"],
+            help="Formato do arquivo (padrão: pela extensão)",
+        )
+        parser.add_argument(
+            "--encoding",
+            choices=ENCODINGS,
+            default=ENCODINGS[0],
+            help="Codificação do arquivo (padrão: utf-8-sig)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Executa conciliação"""
+        start_time = time.time()
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"Arquivo não encontrado: {path}")
+
+        try:
+            tenant = Tenant.objects.get(slug=options["tenant_slug"], is_active=True)
+        except Tenant.DoesNotExist as err:
+            raise CommandError(
+                f"Tenant não encontrado: {options['tenant_slug']}"
+            ) from err
+
+        file_format = options["format"] or (
+            "ofx" if path.suffix.lower() == ".ofx" else "csv"
+        )
+        self.stdout.write(
+            f"📄 Conciliando {path.name} ({file_format}) em {tenant.name}"
+        )
+
+        try:
+            with tenant_context(tenant), path.open("rb") as stream:
+                report = reconcile(stream, file_format, options["encoding"])
+        except ReconciliationError as err:
+            if err.report is not None:
+                self._write_report(err.report)
+            raise CommandError(str(err)) from err
+
+        self._write_report(report)
+        duration = time.time() - start_time
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Conciliação concluída em {duration:.2f}s")
+        )
+
+    def _write_report(self, report: dict) -> None:
+        """Mostra contadores e amostras de linhas problemáticas"""
+        self.stdout.write(
+            f"🔎 {report['rows']} linha(s), {report['matched']} conciliada(s), "
+            f"{report['confirmed']} confirmada(s), {report['reverted']} estornada(s), "
+            f"{report['updated']} atualizada(s)"
+        )
+        for kind, label in (
+            ("unmatched", "sem pagamento"),
+            ("mismatched", "divergente(s)"),
+            ("errors", "inválida(s)"),
+        ):
+            if report[f"{kind}_count"]:
+                self.stdout.write(
+                    self.style.WARNING(f"⚠️  {report[f'{kind}_count']} linha(s) {label}")
+                )
+                for entry in report[kind]:
+                    detail = f" - {entry['detail']}" if "detail" in entry else ""
+                    self.stdout.write(
+                        f"   linha {entry['line']}: {entry['external_id']}{detail}"
+                    )
@@ -0,0 +1,58 @@
+"""
+Comando para atualizar o schema template de provisionamento de tenants.
+
+Deve rodar após `migrate_schemas` no deploy, para que o primeiro cadastro
+de academia não pague o custo de migrar o template.
+"""
+
+import time
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from apps.tenants.provisioning import (
+    ensure_template_schema,
+    get_template_schema,
+    pending_migrations,
+)
+
+
+class Command(BaseCommand):
+    """
+    Comando para criar/migrar o schema template e gravar os dados iniciais
+
+    Exemplos:
+        python manage.py refresh_tenant_template
+        python manage.py refresh_tenant_template --reseed
+    """
+
+    help = "Cria ou atualiza o schema template usado no cadastro de academias"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        """Adiciona argumentos do comando"""
+        parser.add_argument(
+            "--reseed",
+            action="store_true",
+            help="Regrava os dados iniciais mesmo sem migrations pendentes",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        """Executa atualização do template"""
+        start_time = time.time()
+        template = get_template_schema()
+
+        changed = ensure_template_schema(
+            refresh=options["reseed"], verbosity=max(options["verbosity"] - 1, 0)
+        )
+        pending = pending_migrations(template)
+        if pending:
+            self.stdout.write(
+                self.style.ERROR(f"❌ {len(pending)} migration(s) pendente(s)")
+            )
+            raise RuntimeError(f"Schema template {template} desatualizado")
+
+        status = "atualizado" if changed else "já estava atualizado"
+        duration = time.time() - start_time
+        self.stdout.write(
+            self.style.SUCCESS(f"✅ Template {template} {status} ({duration:.2f}s)")
+        )
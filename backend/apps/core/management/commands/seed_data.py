@@ -3,12 +3,14 @@ from decimal import Decimal
 
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand
+from django.db.models import F
 from django.utils import timezone
 from django_tenants.utils import tenant_context
 
 from apps.payments.models import Invoice, Payment, PaymentMethod
 from apps.students.models import Attendance, Graduation, Student
 from apps.tenants.models import Tenant
+from apps.tenants.provisioning import DEFAULT_PAYMENT_METHODS
 
 User = get_user_model()
 
@@ -87,32 +89,7 @@ class Command(BaseCommand):
 
     def create_payment_methods(self):
         """Cria métodos de pagamento"""
-        methods_data = [
-            {
-                "name": "PIX",
-                "code": "pix",
-                "is_online": True,
-                "processing_fee": Decimal("0.0000"),
-            },
-            {
-                "name": "Cartão de Crédito",
-                "code": "credit_card",
-                "is_online": True,
-                "processing_fee": Decimal("0.0349"),
-            },
-            {
-                "name": "Boleto",
-                "code": "boleto",
-                "is_online": True,
-                "processing_fee": Decimal("0.0199"),
-            },
-            {
-                "name": "Dinheiro",
-                "code": "cash",
-                "is_online": False,
-                "processing_fee": Decimal("0.0000"),
-            },
-        ]
+        methods_data = DEFAULT_PAYMENT_METHODS
 
         methods = []
         for method_data in methods_data:
@@ -346,6 +323,10 @@ class Command(BaseCommand):
                 },
             )
             if created:
+                # Pagamento criado já confirmado: mantém o total pago da fatura
+                Invoice.objects.filter(pk=invoice.pk).update(
+                    paid_amount=F("paid_amount") + payment.amount
+                )
                 self.stdout.write(
                     f"  ✓ Pagamento: {invoice.student.full_name} - R$ {payment.amount}"
                 )
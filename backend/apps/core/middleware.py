@@ -1,6 +1,35 @@
 """
-Middleware customizado para aplicar políticas de permissão e cabeçalhos de segurança.
+Middleware customizado para aplicar políticas de permissão, cabeçalhos de
+segurança e compressão de respostas.
 """
+from compression_middleware.br import brotli_compress, brotli_compress_stream
+from compression_middleware.middleware import MIN_IMPROVEMENT
+from compression_middleware.zstd import zstd_compress, zstd_compress_stream
+from django.conf import settings
+from django.middleware.gzip import compress_sequence, compress_string
+from django.utils.cache import patch_vary_headers
+
+# Algoritmos suportados: nome → (compressão em bloco, compressão em stream)
+COMPRESSORS = {
+    "zstd": (zstd_compress, zstd_compress_stream),
+    "br": (brotli_compress, brotli_compress_stream),
+    "gzip": (compress_string, compress_sequence),
+}
+
+
+def get_compression_settings() -> dict:
+    """Retorna configuração de compressão com valores padrão"""
+    config = getattr(settings, "RESPONSE_COMPRESSION", {})
+    return {
+        "ENABLED": config.get("ENABLED", True),
+        "MIN_SIZE": config.get("MIN_SIZE", 500),
+        "ENCODINGS": config.get("ENCODINGS", ["zstd", "br", "gzip"]),
+        "COMPRESS_STREAMING": config.get("COMPRESS_STREAMING", False),
+        "EXCLUDED_CONTENT_TYPES": config.get(
+            "EXCLUDED_CONTENT_TYPES",
+            ["image/", "video/", "audio/", "application/zip", "application/gzip"],
+        ),
+    }
 
 
 class PermissionsPolicyMiddleware:
@@ -40,3 +69,98 @@ class SecurityHeadersMiddleware:
             del response["Server"]
 
         return response
+
+
+class CompressionMiddleware:
+    """
+    Middleware para compressão de respostas (zstd, brotli ou gzip).
+
+    Negocia o algoritmo pelo cabeçalho Accept-Encoding (respeitando q=),
+    ignora respostas pequenas, já comprimidas ou de tipos binários e, por
+    padrão, não altera respostas em streaming (exportações). Com
+    COMPRESS_STREAMING habilitado, streams são comprimidos em blocos, sem
+    carregar o conteúdo em memória.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        config = get_compression_settings()
+        self.enabled = config["ENABLED"]
+        self.min_size = config["MIN_SIZE"]
+        self.compress_streaming = config["COMPRESS_STREAMING"]
+        self.excluded_content_types = tuple(config["EXCLUDED_CONTENT_TYPES"])
+        self.compressors = [
+            (name, *COMPRESSORS[name])
+            for name in config["ENCODINGS"]
+            if name in COMPRESSORS
+        ]
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        if not self.enabled or not self._is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding, compress, compress_stream = self._negotiate(
+            request.META.get("HTTP_ACCEPT_ENCODING", "")
+        )
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            response.streaming_content = compress_stream(response.streaming_content)
+            if response.has_header("Content-Length"):
+                del response["Content-Length"]
+        else:
+            compressed = compress(response.content)
+            if len(compressed) >= len(response.content) - MIN_IMPROVEMENT:
+                return response
+            response.content = compressed
+            response["Content-Length"] = str(len(compressed))
+
+        # ETag forte vira fraco: o corpo mudou, mas a representação é a mesma
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response["ETag"] = "W/" + etag
+        response["Content-Encoding"] = encoding
+        return response
+
+    def _is_compressible(self, response) -> bool:
+        """Verifica se a resposta deve passar pela compressão"""
+        if response.has_header("Content-Encoding"):
+            return False
+        if "no-transform" in response.get("Cache-Control", ""):
+            return False
+        content_type = response.get("Content-Type", "").lower()
+        if content_type.startswith(self.excluded_content_types):
+            return False
+        if response.streaming:
+            return self.compress_streaming
+        return len(response.content) >= self.min_size
+
+    def _negotiate(self, accept_encoding: str):
+        """
+        Escolhe o algoritmo com maior q aceito pelo cliente
+
+        Empates seguem a ordem de preferência de settings (ENCODINGS).
+        """
+        accepted = {}
+        # Cabeçalhos muito longos são truncados (proteção contra abuso)
+        for item in accept_encoding[:200].split(","):
+            name, _, params = item.strip().partition(";")
+            quality = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    quality = float(params[2:])
+                except ValueError:
+                    quality = 0.0
+            if name:
+                accepted[name.strip().lower()] = quality
+
+        best, best_quality = (None, None, None), 0.0
+        for name, compress, compress_stream in self.compressors:
+            quality = accepted.get(name, accepted.get("*", 0.0))
+            if quality > best_quality:
+                best, best_quality = (name, compress, compress_stream), quality
+        return best
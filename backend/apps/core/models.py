@@ -1,4 +1,5 @@
 import uuid
+from typing import ClassVar
 
 from django.db import models
 from django.utils import timezone
@@ -49,6 +50,9 @@ class BaseModel(TimestampedModel, SoftDeleteModel):
     Herdar de BaseModel em todos os models principais
     """
 
+    # Relações lidas por __str__ (select_related das listagens do admin)
+    str_select_related: ClassVar[tuple] = ()
+
     class Meta:
         abstract = True
 
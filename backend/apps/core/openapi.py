@@ -11,42 +11,12 @@ Seguindo padrões estabelecidos no CONTEXT.md:
 def preprocess_filter_specs(endpoints):
     """
     Pré-processa especificações de filtros para melhor documentação
-    """
-    for endpoint in endpoints:
-        # Nova estrutura do DRF Spectacular - pode ter mais de 3 valores
-        if len(endpoint) >= 3:
-            path, method, callback = endpoint[:3]
-        else:
-            continue
-
-        # Adiciona exemplos de filtros para endpoints com paginação
-        if hasattr(callback, "cls") and hasattr(callback.cls, "filter_backends"):
-            # Adiciona exemplos de filtros baseados no modelo
-            if hasattr(callback.cls, "queryset") and callback.cls.queryset:
-                model = callback.cls.queryset.model
-
-                # Adiciona exemplos de filtros comuns
-                if hasattr(model, "name"):
-                    callback.cls.search_fields = [
-                        *getattr(callback.cls, "search_fields", []),
-                        "name",
-                    ]
-                if hasattr(model, "email"):
-                    callback.cls.search_fields = [
-                        *getattr(callback.cls, "search_fields", []),
-                        "email",
-                    ]
-                if hasattr(model, "status"):
-                    callback.cls.ordering_fields = [
-                        *getattr(callback.cls, "ordering_fields", []),
-                        "status",
-                    ]
-                if hasattr(model, "created_at"):
-                    callback.cls.ordering_fields = [
-                        *getattr(callback.cls, "ordering_fields", []),
-                        "created_at",
-                    ]
 
+    Os filtros (search/ordering) já são documentados pelos filter backends
+    de cada ViewSet. Este hook não altera atributos das classes: mudanças
+    em `search_fields`/`ordering_fields` aqui afetariam as consultas reais
+    e se acumulariam a cada geração do schema.
+    """
     return endpoints
 
 
@@ -141,6 +111,22 @@ def postprocess_schema_enums(result, generator, request, public):
             "schema": {"type": "string", "example": "-created_at"},
         }
 
+        result["components"]["parameters"]["FieldsParam"] = {
+            "name": "fields",
+            "in": "query",
+            "description": "Campos retornados, separados por vírgula (use ponto para aninhados)",
+            "required": False,
+            "schema": {"type": "string", "example": "id,status,student.fullName"},
+        }
+
+        result["components"]["parameters"]["ExpandParam"] = {
+            "name": "expand",
+            "in": "query",
+            "description": "Objetos aninhados a expandir; os demais retornam apenas o ID",
+            "required": False,
+            "schema": {"type": "string", "example": "student"},
+        }
+
     # Adiciona exemplos de resposta de erro padronizadas
     if "components" in result and "schemas" not in result["components"]:
         result["components"]["schemas"] = {}
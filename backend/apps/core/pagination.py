@@ -5,12 +5,172 @@ Seguindo padrões estabelecidos no CONTEXT.md:
 - Paginação padronizada
 - Metadados úteis para frontend
 - Performance otimizada
+
+O total das listagens (`count`) não executa COUNT(*) a cada requisição:
+- Contagens exatas ficam em cache por tenant, assinatura da consulta
+  (SQL com filtros) e versão dos dados das tabelas envolvidas. A versão
+  muda a cada post_save/post_delete; CACHE_TTL limita o atraso de escritas
+  feitas com update() sem sinal.
+- Antes de contar, a estimativa do planner (EXPLAIN, baseada em
+  reltuples/estatísticas) é consultada; acima de ESTIMATE_THRESHOLD linhas
+  a estimativa é usada e a resposta informa `count_is_approximate`.
 """
+import hashlib
+import json
+import time
 from collections import OrderedDict
 
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connection, transaction
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
+from .replicas import primary_reads
+
+
+def get_pagination_count_settings() -> dict:
+    """Retorna configuração da contagem das listagens com valores padrão"""
+    config = getattr(settings, "PAGINATION_COUNT", {})
+    return {
+        "CACHE_TTL": config.get("CACHE_TTL", 60),
+        "ESTIMATE_THRESHOLD": config.get("ESTIMATE_THRESHOLD", 50000),
+    }
+
+
+def _version_key(schema_name: str, table: str) -> str:
+    return f"list-count-version:{schema_name}:{table}"
+
+
+def bump_count_version(*tables: str) -> None:
+    """
+    Descarta as contagens em cache que envolvem as tabelas (schema atual)
+
+    Dentro de transação, repete a troca de versão após o commit: uma
+    contagem feita durante a transação não fica em cache com a versão nova.
+    """
+    schema_name = connection.schema_name
+
+    def bump():
+        version = time.time_ns()
+        cache.set_many(
+            {_version_key(schema_name, table): version for table in tables}, None
+        )
+
+    bump()
+    if connection.in_atomic_block:
+        transaction.on_commit(bump)
+
+
+def handle_data_change(sender, **kwargs) -> None:
+    """post_save/post_delete: nova versão de dados da tabela do model"""
+    bump_count_version(sender._meta.db_table)
+
+
+def _count_signature(queryset) -> tuple[str, tuple, set]:
+    """SQL, parâmetros e tabelas da consulta (sem ordenação)"""
+    query = queryset.order_by().query
+    sql, params = query.sql_with_params()
+    tables = {alias.table_name for alias in query.alias_map.values()}
+    return sql, params, tables
+
+
+def data_cache_key(prefix: str, queryset, *extra) -> str:
+    """
+    Chave de cache por tenant, assinatura da consulta e versão dos dados
+
+    A chave muda quando qualquer tabela da consulta recebe escrita
+    (bump_count_version), descartando os valores derivados dela.
+    """
+    sql, params, tables = _count_signature(queryset)
+    schema_name = connection.schema_name
+    versions = cache.get_many([_version_key(schema_name, t) for t in sorted(tables)])
+    digest = hashlib.sha256(
+        repr((sql, params, sorted(versions.items()), extra)).encode()
+    ).hexdigest()[:32]
+    return f"{prefix}:{schema_name}:{digest}"
+
+
+def estimate_count(sql: str, params) -> int:
+    """Linhas estimadas pelo planner (EXPLAIN sem executar a consulta)"""
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def list_count(queryset) -> tuple[int, bool]:
+    """
+    Total de itens do queryset filtrado
+
+    Returns:
+        (count, approximate)
+    """
+    config = get_pagination_count_settings()
+    sql, params, _ = _count_signature(queryset)
+    key = data_cache_key("list-count", queryset)
+
+    cached = cache.get(key)
+    if cached is not None:
+        return cached
+
+    threshold = config["ESTIMATE_THRESHOLD"]
+    result = None
+    if threshold:
+        estimate = estimate_count(sql, params)
+        if estimate >= threshold:
+            result = (estimate, True)
+    if result is None:
+        with primary_reads():
+            result = (queryset.count(), False)
+    cache.set(key, result, config["CACHE_TTL"])
+    return result
+
+
+class CachedCountPaginator(Paginator):
+    """Paginator com total em cache ou estimado (ver list_count)"""
+
+    approximate = False
+
+    @cached_property
+    def count(self):
+        if not isinstance(self.object_list, QuerySet):
+            return super().count
+        count, self.approximate = list_count(self.object_list)
+        return count
+
+    def validate_number(self, number):
+        """
+        Com total estimado, páginas além da estimativa valem se têm linhas
+
+        A estimativa do planner pode ficar abaixo do total real: a página
+        é confirmada pela existência da sua primeira linha.
+        """
+        try:
+            return super().validate_number(number)
+        except EmptyPage:
+            if not self.approximate or int(number) < 1:
+                raise
+            bottom = (int(number) - 1) * self.per_page
+            if not self.object_list[bottom : bottom + 1].exists():
+                raise
+            return int(number)
+
+    def page(self, number):
+        """Com total estimado, a página não é cortada no total"""
+        number = self.validate_number(number)
+        if not self.approximate:
+            return super().page(number)
+        bottom = (number - 1) * self.per_page
+        return self._get_page(
+            self.object_list[bottom : bottom + self.per_page], number, self
+        )
+
 
 class StandardResultsSetPagination(PageNumberPagination):
     """
@@ -22,6 +182,7 @@ class StandardResultsSetPagination(PageNumberPagination):
     page_size = 20
     page_size_query_param = "page_size"
     max_page_size = 100
+    django_paginator_class = CachedCountPaginator
 
     def get_paginated_response(self, data):
         """
@@ -31,6 +192,7 @@ class StandardResultsSetPagination(PageNumberPagination):
             OrderedDict(
                 [
                     ("count", self.page.paginator.count),
+                    ("count_is_approximate", self.page.paginator.approximate),
                     ("next", self.get_next_link()),
                     ("previous", self.get_previous_link()),
                     ("page_size", self.page_size),
@@ -53,6 +215,11 @@ class StandardResultsSetPagination(PageNumberPagination):
                     "example": 123,
                     "description": "Total de itens",
                 },
+                "count_is_approximate": {
+                    "type": "boolean",
+                    "example": False,
+                    "description": "Total estimado pelo banco (listas grandes)",
+                },
                 "next": {
                     "type": "string",
                     "nullable": True,
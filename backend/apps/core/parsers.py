@@ -0,0 +1,81 @@
+"""
+Parser JSON camelCase de alta performance
+
+Par do renderer em apps.core.renderers: decodifica com orjson (quando
+disponível) e converte chaves camelCase para snake_case com conversões
+memoizadas, mantendo a semântica do CamelCaseJSONParser.
+"""
+import json
+from functools import lru_cache
+
+from django.conf import settings
+from djangorestframework_camel_case.settings import (
+    api_settings as camel_case_settings,
+)
+from djangorestframework_camel_case.util import camel_to_underscore
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fallback para json da stdlib
+    orjson = None
+
+MAX_KEY_CACHE_SIZE = 2048
+
+
+@lru_cache(maxsize=MAX_KEY_CACHE_SIZE)
+def underscore_key(key: str, no_underscore_before_number: bool = False) -> str:
+    """Converte uma chave camelCase para snake_case (memoizado)"""
+    return camel_to_underscore(
+        key, no_underscore_before_number=no_underscore_before_number
+    )
+
+
+def underscoreize(data, options: dict):
+    """
+    Converte chaves de `data` para snake_case recursivamente
+
+    Mesma semântica de djangorestframework_camel_case.util.underscoreize
+    para dados vindos de JSON (dicts, listas e escalares).
+    """
+    if isinstance(data, dict):
+        ignore_fields = options.get("ignore_fields") or ()
+        ignore_keys = options.get("ignore_keys") or ()
+        no_number = bool(options.get("no_underscore_before_number"))
+        result = {}
+        for key, value in data.items():
+            new_key = underscore_key(key, no_number) if isinstance(key, str) else key
+            if ignore_fields and (key in ignore_fields or new_key in ignore_fields):
+                result_value = value
+            else:
+                result_value = underscoreize(value, options)
+            if ignore_keys and (key in ignore_keys or new_key in ignore_keys):
+                result[key] = result_value
+            else:
+                result[new_key] = result_value
+        return result
+    if isinstance(data, list):
+        return [underscoreize(item, options) for item in data]
+    return data
+
+
+class CamelCaseJSONParser(JSONParser):
+    """Substituto do CamelCaseJSONParser do djangorestframework-camel-case"""
+
+    json_underscoreize = camel_case_settings.JSON_UNDERSCOREIZE
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+
+        try:
+            data = stream.read().decode(encoding)
+            if orjson is not None:
+                parsed = orjson.loads(data)
+            else:
+                parsed = json.loads(data)
+        except ValueError as exc:
+            raise ParseError(f"JSON parse error - {exc}") from exc
+
+        return underscoreize(parsed, self.json_underscoreize)
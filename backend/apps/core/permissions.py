@@ -7,6 +7,7 @@ Seguindo padrões estabelecidos no CONTEXT.md:
 - Permissões granulares
 """
 
+import hmac
 import logging
 
 from rest_framework import permissions
@@ -61,8 +62,14 @@ class IsOwnerOrReadOnly(permissions.BasePermission):
         if request.method in permissions.SAFE_METHODS:
             return True
 
+        # Admins editam qualquer objeto
+        if getattr(request.user, "role", None) == "admin":
+            return True
+
         # Permissões de escrita apenas para o proprietário do objeto
-        return obj.user == request.user
+        # (o próprio usuário quando o objeto é um User)
+        owner = getattr(obj, "user", obj)
+        return owner == request.user
 
 
 class IsInstructorOrAdmin(permissions.BasePermission):
@@ -345,3 +352,25 @@ class DynamicPermission(permissions.BasePermission):
 
     def has_object_permission(self, request, view, obj):
         return self.has_permission(request, view)
+
+
+class IsPlatformStaffOrMetricsToken(permissions.BasePermission):
+    """
+    Métricas da plataforma (todos os tenants): staff ou coletor com token
+
+    Staff da plataforma é o superusuário (admins de academia também têm
+    is_staff para o admin do tenant). O coletor envia REQUEST_METRICS["SCRAPE_TOKEN"] no cabeçalho
+    X-Metrics-Token; token vazio desativa o acesso por token.
+    """
+
+    def has_permission(self, request, view):
+        from .request_metrics import get_request_metrics_settings
+
+        token = get_request_metrics_settings()["SCRAPE_TOKEN"]
+        sent = request.headers.get("X-Metrics-Token", "")
+        if token and sent and hmac.compare_digest(sent, token):
+            return True
+
+        return bool(
+            request.user and request.user.is_authenticated and request.user.is_superuser
+        )
@@ -0,0 +1,163 @@
+"""
+Cache de consultas ORM (django-cachalot) seguro para multitenancy
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- SEMPRE usar schema-per-tenant
+- Nenhum dado pode vazar entre tenants
+
+Todos os schemas de tenant têm tabelas com o mesmo nome, então as chaves
+padrão do cachalot (banco + SQL) misturariam resultados entre academias.
+As funções abaixo são configuradas em CACHALOT_QUERY_KEYGEN e
+CACHALOT_TABLE_KEYGEN:
+- Consultas: a chave inclui o schema ativo (search_path da conexão)
+- Tabelas: tabelas de TENANT_APPS são invalidadas apenas no schema ativo;
+  tabelas exclusivas do schema público usam sempre o escopo `public`
+
+Os modelos cacheados são definidos em CACHALOT_ONLY_CACHABLE_TABLES. Hits e
+misses são contados por schema para acompanhar a taxa de acerto.
+"""
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from hashlib import sha1
+
+from django.apps import apps
+from django.conf import settings
+from django.db import connections
+
+_stats_lock = threading.Lock()
+_stats: dict[str, dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+_metrics_installed = False
+
+
+@lru_cache(maxsize=1)
+def get_tenant_tables() -> frozenset[str]:
+    """Tabelas dos apps de tenant (existem em cada schema de tenant)"""
+    tenant_apps = set(getattr(settings, "TENANT_APPS", []))
+    return frozenset(
+        model._meta.db_table
+        for config in apps.get_app_configs()
+        if config.name in tenant_apps
+        for model in config.get_models()
+    )
+
+
+def get_table_schema(db_alias: str, table: str) -> str:
+    """Schema em que a tabela é lida/escrita na conexão atual"""
+    if table in get_tenant_tables():
+        return connections[db_alias].schema_name
+    return settings.PUBLIC_SCHEMA_NAME
+
+
+def get_query_cache_key(compiler) -> str:
+    """Chave da consulta escopada pelo schema ativo da conexão"""
+    from cachalot.utils import get_query_cache_key as default_query_cache_key
+
+    cache_key = default_query_cache_key(compiler)
+    schema_name = compiler.connection.schema_name
+    return sha1(f"{schema_name}:{cache_key}".encode()).hexdigest()
+
+
+def get_table_cache_key(db_alias: str, table: str) -> str:
+    """
+    Chave de invalidação da tabela escopada pelo schema da tabela
+
+    Réplicas de leitura compartilham a chave do primário: escritas no
+    primário invalidam também as consultas cacheadas lidas da réplica.
+    """
+    from apps.core.replicas import primary_alias
+
+    schema_name = get_table_schema(db_alias, table)
+    return sha1(f"{primary_alias(db_alias)}:{schema_name}:{table}".encode()).hexdigest()
+
+
+def record_lookup(schema_name: str, hit: bool) -> None:
+    """Registra hit/miss de uma consulta cacheável"""
+    with _stats_lock:
+        _stats[schema_name]["hits" if hit else "misses"] += 1
+
+
+def get_query_cache_stats() -> dict:
+    """
+    Estatísticas do cache de consultas neste processo
+
+    Returns:
+        Totais e valores por schema com hits, misses e hit_ratio
+    """
+
+    def summarize(hits: int, misses: int) -> dict:
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_ratio": round(hits / total, 4) if total else None,
+        }
+
+    with _stats_lock:
+        schemas = {
+            schema: summarize(values["hits"], values["misses"])
+            for schema, values in _stats.items()
+        }
+    return {
+        "enabled": getattr(settings, "CACHALOT_ENABLED", False),
+        **summarize(
+            sum(values["hits"] for values in schemas.values()),
+            sum(values["misses"] for values in schemas.values()),
+        ),
+        "schemas": schemas,
+    }
+
+
+def reset_query_cache_stats() -> None:
+    """Zera as estatísticas do processo"""
+    with _stats_lock:
+        _stats.clear()
+
+
+class _TableCacheKeys(list):
+    """Chaves de invalidação com o schema da conexão do compiler"""
+
+    schema_name: str | None = None
+
+
+def install_metrics() -> None:
+    """
+    Instrumenta o cachalot para contar hits e misses por schema
+
+    O cachalot não expõe o resultado da busca no cache; a função interna que
+    decide entre cache e banco é envolvida para saber se a consulta foi
+    executada (miss) ou respondida pelo cache (hit). O schema vem da conexão
+    do compiler (alias da consulta, ex: réplica), levado junto das chaves
+    de invalidação que o cachalot calcula logo antes da busca.
+    """
+    global _metrics_installed
+    if _metrics_installed:
+        return
+
+    from cachalot import monkey_patch
+
+    original_keys = monkey_patch._get_table_cache_keys
+    original = monkey_patch._get_result_or_execute_query
+
+    def table_cache_keys_with_schema(compiler):
+        keys = _TableCacheKeys(original_keys(compiler))
+        keys.schema_name = compiler.connection.schema_name
+        return keys
+
+    def instrumented(execute_query_func, cache, cache_key, table_cache_keys):
+        executed = False
+
+        def execute():
+            nonlocal executed
+            executed = True
+            return execute_query_func()
+
+        result = original(execute, cache, cache_key, table_cache_keys)
+        schema_name = getattr(table_cache_keys, "schema_name", None)
+        if schema_name is not None:
+            record_lookup(schema_name, hit=not executed)
+        return result
+
+    monkey_patch._get_table_cache_keys = table_cache_keys_with_schema
+    monkey_patch._get_result_or_execute_query = instrumented
+    _metrics_installed = True
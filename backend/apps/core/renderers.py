@@ -0,0 +1,176 @@
+"""
+Renderer JSON camelCase de alta performance
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- API em camelCase (compatível com djangorestframework-camel-case)
+- Saída idêntica ao CamelCaseJSONRenderer para Decimal, UUID e datetime
+
+Chaves são convertidas por mapas pré-calculados por serializer (com
+conversões memoizadas) em vez de regex a cada chave, e a codificação usa
+orjson quando disponível, com fallback para o JSONRenderer do DRF.
+"""
+from functools import lru_cache
+
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from djangorestframework_camel_case.settings import (
+    api_settings as camel_case_settings,
+)
+from djangorestframework_camel_case.util import camelize_re, underscore_to_camel
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+from rest_framework.utils.serializer_helpers import ReturnDict, ReturnList
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - fallback para json da stdlib
+    orjson = None
+
+# Limite de chaves memorizadas por mapa (protege contra chaves dinâmicas)
+MAX_KEY_MAP_SIZE = 2048
+
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+@lru_cache(maxsize=MAX_KEY_MAP_SIZE)
+def camelize_key(key: str) -> str:
+    """Converte uma chave snake_case para camelCase (memoizado)"""
+    if "_" not in key:
+        return key
+    return camelize_re.sub(underscore_to_camel, key)
+
+
+class KeyMap(dict):
+    """Mapa chave original → chave camelCase preenchido sob demanda"""
+
+    def __missing__(self, key):
+        if isinstance(key, Promise):
+            return camelize_key(force_str(key))
+        if not isinstance(key, str):
+            return key
+        new_key = camelize_key(key)
+        if len(self) < MAX_KEY_MAP_SIZE:
+            self[key] = new_key
+        return new_key
+
+
+_DEFAULT_KEY_MAP = KeyMap()
+_SERIALIZER_KEY_MAPS: dict[type, KeyMap] = {}
+
+
+def _collect_field_names(serializer, names: set, seen: set) -> None:
+    """Coleta nomes de campos do serializer e dos serializers aninhados"""
+    serializer = getattr(serializer, "child", serializer)
+    if type(serializer) in seen or not hasattr(serializer, "fields"):
+        return
+    seen.add(type(serializer))
+    for name, field in serializer.fields.items():
+        names.add(name)
+        _collect_field_names(field, names, seen)
+
+
+def get_key_map(serializer) -> KeyMap:
+    """
+    Mapa de chaves pré-calculado para a classe do serializer
+
+    Na primeira renderização os nomes de todos os campos (incluindo os
+    aninhados) são convertidos; chaves não previstas são adicionadas ao
+    mapa conforme aparecem.
+    """
+    serializer = getattr(serializer, "child", serializer)
+    serializer_class = type(serializer)
+    key_map = _SERIALIZER_KEY_MAPS.get(serializer_class)
+    if key_map is None:
+        names: set = set()
+        _collect_field_names(serializer, names, set())
+        key_map = KeyMap({name: camelize_key(name) for name in names})
+        _SERIALIZER_KEY_MAPS[serializer_class] = key_map
+    return key_map
+
+
+def _is_iterable(obj) -> bool:
+    try:
+        iter(obj)
+    except TypeError:
+        return False
+    return True
+
+
+def camelize(data, key_map: KeyMap | None = None, ignore_fields=(), ignore_keys=()):
+    """
+    Converte chaves de `data` para camelCase recursivamente
+
+    Mesma semântica de djangorestframework_camel_case.util.camelize,
+    incluindo as opções ignore_fields e ignore_keys.
+    """
+    if isinstance(data, _SCALAR_TYPES):
+        return data
+    if isinstance(data, Promise):
+        return force_str(data)
+    if isinstance(data, ReturnDict | ReturnList) and data.serializer is not None:
+        key_map = get_key_map(data.serializer)
+    elif key_map is None:
+        key_map = _DEFAULT_KEY_MAP
+
+    if isinstance(data, dict):
+        result = {}
+        for key, value in data.items():
+            new_key = key_map[key]
+            if isinstance(key, Promise):
+                key = force_str(key)
+            if ignore_fields and (key in ignore_fields or new_key in ignore_fields):
+                result_value = value
+            else:
+                result_value = camelize(value, key_map, ignore_fields, ignore_keys)
+            if ignore_keys and (key in ignore_keys or new_key in ignore_keys):
+                result[key] = result_value
+            else:
+                result[new_key] = result_value
+        return result
+    if isinstance(data, list | tuple) or _is_iterable(data):
+        return [camelize(item, key_map, ignore_fields, ignore_keys) for item in data]
+    return data
+
+
+class CamelCaseJSONRenderer(JSONRenderer):
+    """
+    Substituto do CamelCaseJSONRenderer do djangorestframework-camel-case
+
+    Usa orjson para serializar; tipos não nativos (Decimal, datetime, date,
+    time, timedelta, lazy strings...) passam pelo JSONEncoder do DRF para
+    manter a saída idêntica à do renderer padrão.
+    """
+
+    json_underscoreize = camel_case_settings.JSON_UNDERSCOREIZE
+    encoder = encoders.JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+
+        data = camelize(
+            data,
+            ignore_fields=self.json_underscoreize.get("ignore_fields") or (),
+            ignore_keys=self.json_underscoreize.get("ignore_keys") or (),
+        )
+        renderer_context = renderer_context or {}
+        indent = self.get_indent(accepted_media_type, renderer_context)
+        if orjson is None or indent or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder.default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+            )
+        except orjson.JSONEncodeError:
+            # Ex: inteiros acima de 64 bits; o encoder da stdlib aceita
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Mesmo escape do JSONRenderer para separadores de linha do JavaScript
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
@@ -0,0 +1,202 @@
+"""
+Leituras em réplicas do PostgreSQL com schema-per-tenant
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- SEMPRE usar schema-per-tenant
+- Nenhum dado pode vazar entre tenants
+
+Ações de leitura seguras dos viewsets (list, retrieve, stats e endpoints
+analíticos) e o dashboard leem de uma das conexões em
+READ_REPLICAS["ALIASES"]. O router aplica na réplica o mesmo tenant
+(search_path) da conexão principal antes de cada leitura. Escritas vão
+sempre para o primário:
+- Uma escrita durante o bloco de leitura faz o restante do bloco ler do
+  primário
+- Depois de uma escrita pela API, o mesmo usuário lê do primário por
+  STICKY_SECONDS (read-your-writes apesar do atraso de replicação)
+- Valores que vão para caches de longa duração (snapshot do dashboard,
+  períodos fechados das análises, contagens das listagens) são calculados
+  no primário (`primary_reads`): uma réplica atrasada fixaria no cache o
+  dado anterior à escrita que acabou de invalidá-lo. O cache de consultas
+  (cachalot) atende apenas o primário (CACHALOT_DATABASES).
+
+Sem réplicas configuradas, nada muda: todas as consultas usam o primário.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import ClassVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django_tenants.utils import get_tenant_database_alias
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Réplica usada pelas leituras do bloco atual (None = primário)
+_replica_alias: ContextVar[str | None] = ContextVar("replica_alias", default=None)
+
+
+def get_read_replica_settings() -> dict:
+    """Retorna configuração das réplicas de leitura com valores padrão"""
+    config = getattr(settings, "READ_REPLICAS", {})
+    return {
+        "ALIASES": list(config.get("ALIASES", [])),
+        "STICKY_SECONDS": config.get("STICKY_SECONDS", 10),
+    }
+
+
+def primary_alias(db_alias: str) -> str:
+    """Conexão principal correspondente (réplicas têm os mesmos dados)"""
+    if db_alias in get_read_replica_settings()["ALIASES"]:
+        return get_tenant_database_alias()
+    return db_alias
+
+
+def _sticky_key(request) -> str | None:
+    user = getattr(request, "user", None)
+    if not user or not user.is_authenticated:
+        return None
+    schema_name = connections[get_tenant_database_alias()].schema_name
+    return f"replica-sticky:{schema_name}:{user.pk}"
+
+
+def mark_primary_sticky(request) -> None:
+    """Próximas leituras do usuário vão para o primário por STICKY_SECONDS"""
+    config = get_read_replica_settings()
+    key = _sticky_key(request)
+    if key and config["ALIASES"]:
+        cache.set(key, 1, config["STICKY_SECONDS"])
+
+
+def is_primary_sticky(request) -> bool:
+    key = _sticky_key(request)
+    return key is not None and cache.get(key) is not None
+
+
+def start_replica_reads(request):
+    """
+    Direciona as leituras seguintes para uma réplica
+
+    Returns:
+        Token para `stop_replica_reads` (None se o primário deve ser usado)
+    """
+    aliases = get_read_replica_settings()["ALIASES"]
+    if not aliases or _replica_alias.get() or is_primary_sticky(request):
+        return None
+    return _replica_alias.set(random.choice(aliases))
+
+
+def stop_replica_reads(token) -> None:
+    if token is not None:
+        _replica_alias.reset(token)
+
+
+@contextmanager
+def read_replica(request):
+    """Leituras do bloco em réplica (quando configurada e permitida)"""
+    token = start_replica_reads(request)
+    try:
+        yield _replica_alias.get()
+    finally:
+        stop_replica_reads(token)
+
+
+@contextmanager
+def primary_reads():
+    """Leituras do bloco no primário (ex: cálculo que será guardado em cache)"""
+    token = _replica_alias.set(None)
+    try:
+        yield
+    finally:
+        _replica_alias.reset(token)
+
+
+def replica_reads(view_func):
+    """Decorator para function views somente leitura (ex: dashboard)"""
+
+    @wraps(view_func)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in SAFE_METHODS:
+            return view_func(request, *args, **kwargs)
+        with read_replica(request):
+            return view_func(request, *args, **kwargs)
+
+    return wrapper
+
+
+class ReadReplicaRouter:
+    """
+    Router das leituras em réplica
+
+    Deve vir antes do TenantSyncRouter em DATABASE_ROUTERS; migrations
+    nunca rodam nas réplicas.
+    """
+
+    def db_for_read(self, model, **hints):
+        alias = _replica_alias.get()
+        if alias is None:
+            # Objetos lidos da réplica continuam no primário fora do bloco
+            return get_tenant_database_alias() if self._from_replica(hints) else None
+
+        primary = connections[get_tenant_database_alias()]
+        replica = connections[alias]
+        if (
+            replica.schema_name != primary.schema_name
+            or replica.include_public_schema != primary.include_public_schema
+        ):
+            replica.set_tenant(primary.tenant, primary.include_public_schema)
+        return alias
+
+    def db_for_write(self, model, **hints):
+        # O restante do bloco precisa enxergar esta escrita
+        _replica_alias.set(None)
+        return get_tenant_database_alias()
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {
+            get_tenant_database_alias(),
+            *get_read_replica_settings()["ALIASES"],
+        }
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in get_read_replica_settings()["ALIASES"]:
+            return False
+        return None
+
+    @staticmethod
+    def _from_replica(hints) -> bool:
+        instance = hints.get("instance")
+        return (
+            instance is not None
+            and instance._state.db in get_read_replica_settings()["ALIASES"]
+        )
+
+
+class ReplicaReadMixin:
+    """
+    Ações de leitura do viewset em réplica
+
+    `replica_actions` lista as ações atendidas pela réplica; escritas pela
+    API fixam o usuário no primário (ver STICKY_SECONDS).
+    """
+
+    replica_actions: ClassVar = ("list", "retrieve", "stats")
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self._replica_token = None
+        if request.method in SAFE_METHODS and self.action in self.replica_actions:
+            self._replica_token = start_replica_reads(request)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        stop_replica_reads(getattr(self, "_replica_token", None))
+        self._replica_token = None
+        if request.method not in SAFE_METHODS and response.status_code < 500:
+            mark_primary_sticky(request)
+        return super().finalize_response(request, response, *args, **kwargs)
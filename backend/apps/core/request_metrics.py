@@ -0,0 +1,277 @@
+"""
+Métricas de requisições por tenant (latência e volume)
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- SEMPRE usar schema-per-tenant
+- Performance otimizada
+
+O RequestMetricsMiddleware registra, em memória do processo, contadores e
+histogramas de latência por série (tenant, view, classe de status). O
+custo por requisição é uma busca binária no bucket e alguns incrementos
+sob lock. As métricas são expostas no endpoint de métricas com
+percentis estimados pelo histograma e os N tenants/endpoints mais lentos.
+
+Cardinalidade limitada: tenants além de MAX_TENANTS e views além de
+MAX_VIEWS são agregados em "__other__"; caminhos sem rota usam
+"unresolved". Como as estatísticas de cache de consultas, os valores são
+por processo (cada worker expõe os seus).
+"""
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.http import HttpRequest, HttpResponse
+
+OTHER = "__other__"
+NO_TENANT = "-"
+UNRESOLVED = "unresolved"
+
+# Limites superiores (segundos) dos buckets do histograma; o último é +Inf
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+SORT_FIELDS = ("p95", "p99", "avg", "total_seconds", "count", "error_rate")
+MAX_TOP = 100
+
+_lock = threading.Lock()
+_series: dict[tuple, dict] = {}
+_tenants: set[str] = set()
+_views: set[str] = set()
+_started_at = time.time()
+
+# View da requisição em andamento (rótulo da captura de consultas lentas)
+_current_view: ContextVar[str] = ContextVar("current_view", default="")
+
+
+def get_request_metrics_settings() -> dict:
+    """Retorna configuração das métricas de requisição com valores padrão"""
+    config = getattr(settings, "REQUEST_METRICS", {})
+    return {
+        "ENABLED": config.get("ENABLED", True),
+        "BUCKETS": tuple(config.get("BUCKETS", DEFAULT_BUCKETS)),
+        "MAX_TENANTS": config.get("MAX_TENANTS", 500),
+        "MAX_VIEWS": config.get("MAX_VIEWS", 300),
+        "TOP_N": config.get("TOP_N", 10),
+        "SCRAPE_TOKEN": config.get("SCRAPE_TOKEN", ""),
+        "EXCLUDED_PATHS": tuple(
+            config.get("EXCLUDED_PATHS", ("/api/v1/metrics/", "/static/", "/media/"))
+        ),
+    }
+
+
+def _bounded(label: str, seen: set, limit: int) -> str:
+    if label in seen:
+        return label
+    if len(seen) >= limit:
+        return OTHER
+    seen.add(label)
+    return label
+
+
+def record_request(
+    tenant: str, view: str, status_code: int, duration: float, config: dict
+) -> None:
+    """Registra uma requisição (duração em segundos)"""
+    buckets = config["BUCKETS"]
+    index = bisect_left(buckets, duration)
+    status_class = f"{status_code // 100}xx"
+
+    with _lock:
+        key = (
+            _bounded(tenant, _tenants, config["MAX_TENANTS"]),
+            _bounded(view, _views, config["MAX_VIEWS"]),
+            status_class,
+        )
+        series = _series.get(key)
+        if series is None:
+            series = _series[key] = {
+                "count": 0,
+                "sum": 0.0,
+                "max": 0.0,
+                "buckets": [0] * (len(buckets) + 1),
+            }
+        series["count"] += 1
+        series["sum"] += duration
+        series["buckets"][index] += 1
+        if duration > series["max"]:
+            series["max"] = duration
+
+
+def get_current_view() -> str:
+    """Nome da view da requisição atual ("" fora de requisições)"""
+    return _current_view.get()
+
+
+def reset_request_metrics() -> None:
+    """Zera as métricas do processo"""
+    global _started_at
+    with _lock:
+        _series.clear()
+        _tenants.clear()
+        _views.clear()
+        _started_at = time.time()
+
+
+def _quantile(buckets: list, bounds: tuple, total: int, maximum: float, q: float):
+    """Percentil estimado por interpolação linear dentro do bucket"""
+    if not total:
+        return None
+    target = q * total
+    cumulative = 0
+    for index, count in enumerate(buckets):
+        if count and cumulative + count >= target:
+            lower = bounds[index - 1] if index else 0.0
+            upper = bounds[index] if index < len(bounds) else maximum
+            upper = min(upper, maximum)
+            fraction = (target - cumulative) / count
+            return round(lower + (max(upper, lower) - lower) * fraction, 4)
+        cumulative += count
+    return round(maximum, 4)
+
+
+def _merge(target: dict, series: dict, status_class: str) -> None:
+    target["count"] += series["count"]
+    target["sum"] += series["sum"]
+    target["max"] = max(target["max"], series["max"])
+    target["errors"] += series["count"] if status_class == "5xx" else 0
+    target["buckets"] = [
+        a + b for a, b in zip(target["buckets"], series["buckets"], strict=True)
+    ]
+
+
+def _summary(values: dict, bounds: tuple, elapsed: float) -> dict:
+    count = values["count"]
+    return {
+        "count": count,
+        "rps": round(count / elapsed, 4) if elapsed else None,
+        "errors": values["errors"],
+        "error_rate": round(values["errors"] / count, 4) if count else None,
+        "avg": round(values["sum"] / count, 4) if count else None,
+        "p50": _quantile(values["buckets"], bounds, count, values["max"], 0.5),
+        "p95": _quantile(values["buckets"], bounds, count, values["max"], 0.95),
+        "p99": _quantile(values["buckets"], bounds, count, values["max"], 0.99),
+        "max": round(values["max"], 4),
+        "total_seconds": round(values["sum"], 4),
+    }
+
+
+def get_request_metrics(top: int | None = None, sort: str = "p95") -> dict:
+    """
+    Métricas agregadas do processo
+
+    Args:
+        top: quantidade de tenants/endpoints no ranking (padrão TOP_N,
+            limitada entre 1 e MAX_TOP)
+        sort: campo de ordenação (p95, p99, avg, total_seconds, count, error_rate)
+
+    Returns:
+        Totais, ranking de tenants, endpoints e pares tenant/endpoint, e as
+        séries com os buckets do histograma
+    """
+    config = get_request_metrics_settings()
+    bounds = config["BUCKETS"]
+    top = min(max(top or config["TOP_N"], 1), MAX_TOP)
+    sort = sort if sort in SORT_FIELDS else "p95"
+
+    with _lock:
+        snapshot = {
+            key: {**series, "buckets": list(series["buckets"])}
+            for key, series in _series.items()
+        }
+        elapsed = time.time() - _started_at
+
+    def empty() -> dict:
+        return {
+            "count": 0,
+            "sum": 0.0,
+            "max": 0.0,
+            "errors": 0,
+            "buckets": [0] * (len(bounds) + 1),
+        }
+
+    total = empty()
+    groups = {"tenants": {}, "endpoints": {}, "tenant_endpoints": {}}
+    for (tenant, view, status_class), series in snapshot.items():
+        _merge(total, series, status_class)
+        for group, label in (
+            ("tenants", tenant),
+            ("endpoints", view),
+            ("tenant_endpoints", f"{tenant} {view}"),
+        ):
+            _merge(groups[group].setdefault(label, empty()), series, status_class)
+
+    def ranking(values: dict, label: str) -> list:
+        rows = [
+            {label: key, **_summary(value, bounds, elapsed)}
+            for key, value in values.items()
+        ]
+        rows.sort(key=lambda row: row[sort] or 0, reverse=True)
+        return rows[:top]
+
+    return {
+        "enabled": config["ENABLED"],
+        "window_seconds": round(elapsed, 1),
+        "sort": sort,
+        **_summary(total, bounds, elapsed),
+        "tenants": ranking(groups["tenants"], "tenant"),
+        "endpoints": ranking(groups["endpoints"], "view"),
+        "tenant_endpoints": ranking(groups["tenant_endpoints"], "series"),
+        "buckets": [*bounds, "+Inf"],
+        "series": [
+            {
+                "tenant": tenant,
+                "view": view,
+                "status_class": status_class,
+                "count": series["count"],
+                "sum": round(series["sum"], 6),
+                "buckets": series["buckets"],
+            }
+            for (tenant, view, status_class), series in sorted(snapshot.items())
+        ],
+    }
+
+
+class RequestMetricsMiddleware:
+    """
+    Mede a latência de cada requisição
+
+    Deve ficar antes do TenantMiddleware: a medição inclui a detecção do
+    tenant e o rótulo usa `request.tenant` definido por ele. Também expõe
+    a view em andamento para a captura de consultas lentas.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        token = _current_view.set("")
+        try:
+            return self._measure(request)
+        finally:
+            _current_view.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        match = request.resolver_match
+        _current_view.set((match.view_name or match.route) if match else "")
+
+    def _measure(self, request: HttpRequest) -> HttpResponse:
+        config = get_request_metrics_settings()
+        if not config["ENABLED"] or request.path.startswith(config["EXCLUDED_PATHS"]):
+            return self.get_response(request)
+
+        start = time.perf_counter()
+        response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        tenant = getattr(request, "tenant", None)
+        match = getattr(request, "resolver_match", None)
+        record_request(
+            getattr(tenant, "slug", None) or NO_TENANT,
+            (match.view_name or match.route) if match else UNRESOLVED,
+            response.status_code,
+            duration,
+            config,
+        )
+        return response
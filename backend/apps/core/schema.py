@@ -0,0 +1,138 @@
+"""
+Schema OpenAPI pré-compilado
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- Documentação OpenAPI automática (drf-spectacular)
+- Nenhum custo de geração em tempo de requisição
+
+O schema é gerado uma única vez, no build (`manage.py build_openapi_schema`)
+ou, na ausência do artefato, na primeira requisição do processo. Cada
+formato (YAML/JSON) é renderizado uma vez e servido com ETag, respondendo
+304 quando o cliente já possui a mesma versão.
+"""
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from drf_spectacular.renderers import OpenApiJsonRenderer
+from drf_spectacular.settings import spectacular_settings
+from drf_spectacular.views import SpectacularAPIView
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_schemas: dict[str | None, dict] = {}
+_rendered: dict[tuple, tuple[bytes, str]] = {}
+
+
+def get_schema_artifact_settings() -> dict:
+    """Retorna configuração do artefato do schema com valores padrão"""
+    config = getattr(settings, "OPENAPI_SCHEMA_ARTIFACT", {})
+    return {
+        "DIR": config.get("DIR"),
+        "MAX_AGE": config.get("MAX_AGE", 0),
+    }
+
+
+def artifact_path(version: str | None) -> Path | None:
+    """Caminho do artefato de uma versão da API (None se desabilitado)"""
+    directory = get_schema_artifact_settings()["DIR"]
+    if not directory:
+        return None
+    return Path(directory) / f"schema-{version or 'default'}.json"
+
+
+def generate_schema(version: str | None) -> dict:
+    """Gera o schema público da versão (mesmo resultado do SpectacularAPIView)"""
+    generator = spectacular_settings.DEFAULT_GENERATOR_CLASS(
+        urlconf=spectacular_settings.SERVE_URLCONF, api_version=version
+    )
+    schema = generator.get_schema(
+        request=None, public=spectacular_settings.SERVE_PUBLIC
+    )
+    # Normaliza tipos (lazy strings, Decimal...) para o mesmo formato do artefato
+    return json.loads(OpenApiJsonRenderer().render(schema))
+
+
+def build_schema_artifact(version: str | None) -> Path:
+    """Gera e grava o artefato JSON da versão"""
+    path = artifact_path(version)
+    if path is None:
+        raise RuntimeError("OPENAPI_SCHEMA_ARTIFACT['DIR'] não configurado")
+
+    schema = generate_schema(version)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(OpenApiJsonRenderer().render(schema))
+    clear_schema_cache()
+    return path
+
+
+def get_schema(version: str | None) -> dict:
+    """
+    Schema da versão, carregado do artefato ou gerado uma vez por processo
+    """
+    schema = _schemas.get(version)
+    if schema is not None:
+        return schema
+
+    with _lock:
+        if version not in _schemas:
+            path = artifact_path(version)
+            if path is not None and path.exists():
+                _schemas[version] = json.loads(path.read_bytes())
+            else:
+                logger.info(f"Artefato do schema ausente, gerando ({version})")
+                _schemas[version] = generate_schema(version)
+        return _schemas[version]
+
+
+def get_rendered_schema(version: str | None, renderer) -> tuple[bytes, str]:
+    """Conteúdo renderizado e ETag do schema para o renderer informado"""
+    key = (version, type(renderer))
+    cached = _rendered.get(key)
+    if cached is None:
+        content = renderer.render(get_schema(version), renderer_context={})
+        etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+        cached = _rendered[key] = (content, etag)
+    return cached
+
+
+def clear_schema_cache() -> None:
+    """Descarta schemas e renderizações mantidos em memória"""
+    with _lock:
+        _schemas.clear()
+        _rendered.clear()
+
+
+class PrecompiledSpectacularAPIView(SpectacularAPIView):
+    """
+    SpectacularAPIView servindo o schema pré-compilado
+
+    Mantém a negociação de formato da view original; o conteúdo vem do
+    artefato em memória e requisições com If-None-Match recebem 304.
+    """
+
+    def _get_schema_response(self, request):
+        version = (
+            self.api_version or request.version or self._get_version_parameter(request)
+        )
+        renderer = request.accepted_renderer
+        content, etag = get_rendered_schema(version, renderer)
+
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        response = HttpResponse(content, content_type=content_type)
+        response["ETag"] = etag
+        response[
+            "Content-Disposition"
+        ] = f'inline; filename="{self._get_filename(request, version)}"'
+        patch_cache_control(
+            response, public=True, max_age=get_schema_artifact_settings()["MAX_AGE"]
+        )
+        return get_conditional_response(request, etag=etag, response=response)
@@ -8,8 +8,122 @@ Seguindo padrões estabelecidos no CONTEXT.md:
 """
 from typing import ClassVar
 
+from djangorestframework_camel_case.util import camel_to_underscore
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_QUERY_PARAM = "fields"
+EXPAND_QUERY_PARAM = "expand"
+
+
+def parse_field_paths(value: str | None) -> dict | None:
+    """
+    Converte lista de caminhos separados por vírgula em árvore
+
+    Aceita camelCase ou snake_case e caminhos aninhados com ponto:
+    "id,student.fullName,student.user" →
+    {"id": {}, "student": {"full_name": {}, "user": {}}}
+
+    Retorna None quando o parâmetro não foi informado.
+    """
+    if value is None:
+        return None
+
+    tree: dict = {}
+    for path in value.split(","):
+        node = tree
+        for part in path.strip().split("."):
+            if part:
+                node = node.setdefault(camel_to_underscore(part), {})
+    return tree
+
+
+def get_requested_field_trees(request) -> tuple[dict | None, dict | None]:
+    """
+    Árvores de `?fields=` e `?expand=` da requisição
+
+    `?fields=` vazio equivale a não restringir campos; `?expand=` vazio
+    ativa o modo explícito sem expandir nenhum objeto aninhado.
+    """
+    query_params = getattr(request, "query_params", None)
+    if query_params is None or request.method not in SAFE_METHODS:
+        return None, None
+
+    fields = parse_field_paths(query_params.get(FIELDS_QUERY_PARAM) or None)
+    expand = parse_field_paths(query_params.get(EXPAND_QUERY_PARAM))
+    return fields, expand
+
+
+def _unwrap(field):
+    """Retorna o serializer filho de um ListSerializer (many=True)"""
+    if isinstance(field, serializers.ListSerializer):
+        return field.child
+    return field
+
+
+def apply_sparse_fieldset(serializer, fields: dict | None, expand: dict | None):
+    """
+    Remove campos não solicitados e colapsa objetos aninhados não expandidos
+
+    - fields: apenas os campos presentes na árvore são mantidos; um campo
+      aninhado sem subcampos é mantido completo
+    - expand: quando informado, serializers aninhados fora da árvore são
+      substituídos pela chave primária do objeto relacionado
+    """
+    for name, field in list(serializer.fields.items()):
+        if fields is not None and name not in fields:
+            serializer.fields.pop(name)
+            continue
+
+        nested = _unwrap(field)
+        if not isinstance(nested, serializers.BaseSerializer):
+            continue
+
+        if expand is not None and name not in expand:
+            kwargs = {"read_only": True, "many": nested is not field}
+            if field.source != name:
+                kwargs["source"] = field.source
+            serializer.fields[name] = serializers.PrimaryKeyRelatedField(**kwargs)
+            continue
+
+        apply_sparse_fieldset(
+            nested,
+            (fields.get(name) or None) if fields is not None else None,
+            expand.get(name, {}) if expand is not None else None,
+        )
+
+
+def get_related_paths(serializer, prefix: str = "") -> set[str]:
+    """
+    Caminhos ORM (select/prefetch) usados pelos campos do serializer
+
+    Considera serializers aninhados, campos com source pontilhado e as
+    dependências declaradas em `Meta.field_relations` para campos
+    computados (ex: {"full_name": ["user"]}).
+    """
+    paths: set[str] = set()
+    meta = getattr(serializer, "Meta", None)
+    relations = getattr(meta, "field_relations", {})
+
+    for name, field in serializer.fields.items():
+        for relation in relations.get(name, []):
+            paths.add(prefix + relation)
+
+        if field.source == "*":
+            continue
+        source_path = prefix + field.source.replace(".", "__")
+        nested = _unwrap(field)
+
+        if isinstance(nested, serializers.BaseSerializer):
+            paths.add(source_path)
+            paths |= get_related_paths(nested, source_path + "__")
+        elif isinstance(field, serializers.ManyRelatedField):
+            paths.add(source_path)
+        elif "." in field.source:
+            paths.add(source_path.rsplit("__", 1)[0])
+
+    return paths
 
 
 class TimestampedModelSerializer(serializers.ModelSerializer):
@@ -40,8 +154,21 @@ class BaseModelSerializer(TimestampedModelSerializer):
     Serializer base completo com timestamp + soft delete
 
     Adiciona campos de auditoria e status
+
+    Suporta campos esparsos e expansão explícita via query params:
+    - ?fields=id,status,student.full_name
+    - ?expand=student,student.user
     """
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        request = self.context.get("request")
+        if request is not None:
+            fields, expand = get_requested_field_trees(request)
+            if fields is not None or expand is not None:
+                apply_sparse_fieldset(self, fields, expand)
+
     @extend_schema_field(serializers.DateTimeField())
     def get_deleted_at_formatted(self, obj):
         """Data de exclusão formatada"""
@@ -93,10 +220,54 @@ class HealthCheckSerializer(serializers.Serializer):
     """
 
     status = serializers.CharField(help_text="Status do serviço")
-    timestamp = serializers.DateTimeField(help_text="Timestamp da verificação")
+    timestamp = serializers.DateTimeField(help_text="Timestamp da resposta")
+    checked_at = serializers.DateTimeField(help_text="Timestamp da verificação")
+    age_seconds = serializers.FloatField(help_text="Idade do veredito em segundos")
     version = serializers.CharField(help_text="Versão da API")
     database = serializers.CharField(help_text="Status do banco de dados")
     cache = serializers.CharField(help_text="Status do cache")
 
     class Meta:
-        fields: ClassVar = ["status", "timestamp", "version", "database", "cache"]
+        fields: ClassVar = [
+            "status",
+            "timestamp",
+            "checked_at",
+            "age_seconds",
+            "version",
+            "database",
+            "cache",
+        ]
+
+
+class DashboardSerializer(serializers.Serializer):
+    """
+    Serializer para o dashboard da academia (snapshot pré-calculado)
+    """
+
+    students = serializers.DictField(
+        help_text="Alunos ativos, contagem por faixa (ativos) e por status"
+    )
+    attendance = serializers.DictField(help_text="Check-ins de hoje e da semana")
+    revenue = serializers.DictField(
+        help_text="Receita confirmada no mês atual, no anterior e variação (%)"
+    )
+    overdue = serializers.DictField(help_text="Quantidade e total de faturas vencidas")
+    as_of = serializers.DateField(help_text="Data de referência")
+    computed_at = serializers.DateTimeField(
+        help_text="Cálculo mais antigo entre as seções"
+    )
+    stale_sections = serializers.ListField(
+        child=serializers.CharField(),
+        help_text="Seções servidas enquanto são recalculadas em background",
+    )
+
+    class Meta:
+        fields: ClassVar = [
+            "students",
+            "attendance",
+            "revenue",
+            "overdue",
+            "as_of",
+            "computed_at",
+            "stale_sections",
+        ]
@@ -0,0 +1,300 @@
+"""
+Captura de consultas lentas com EXPLAIN por amostragem
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- SEMPRE usar schema-per-tenant
+- Performance otimizada
+
+Um `execute_wrapper` instalado em todas as conexões (ORM e cursores
+diretos, inclusive comandos como `migrate_tenant_schemas`) mede cada
+consulta. Acima de THRESHOLD_MS a consulta é enviada para a tarefa
+`core.record_slow_query` com schema, view e parâmetros; nada é gravado no
+caminho da requisição. A tarefa:
+- agrega a amostra no formato de consulta (SQL normalizado) no schema
+  público (SlowQueryShape / SlowQuery)
+- por amostragem (EXPLAIN_SAMPLE_RATE, no máximo uma vez por formato a cada
+  EXPLAIN_INTERVAL), executa `EXPLAIN (ANALYZE, BUFFERS)` com o mesmo
+  search_path, em transação desfeita ao final, e guarda o plano com a sua
+  impressão digital
+
+Apenas SELECTs sem lock de linha são explicados (ANALYZE executa a
+consulta), e nunca os cancelados por statement_timeout: o EXPLAIN também
+estouraria. O EXPLAIN roda com no máximo o statement_timeout da classe de
+endpoint em que a consulta foi capturada (ver `workload`), limitado por
+EXPLAIN_TIMEOUT_MS. Cada formato/schema gera no máximo uma amostra a cada
+CAPTURE_INTERVAL.
+"""
+import datetime
+import hashlib
+import json
+import logging
+import random
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError
+
+from .request_metrics import get_current_view
+from .workload import current_timeouts
+
+logger = logging.getLogger(__name__)
+
+_capturing: ContextVar[bool] = ContextVar("slow_query_capturing", default=False)
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LISTS = re.compile(r"\(\s*(?:%s|\?)(?:\s*,\s*(?:%s|\?))*\s*\)")
+_SPACES = re.compile(r"\s+")
+_ROW_LOCKS = re.compile(r"\bFOR\s+(?:NO\s+KEY\s+)?(?:UPDATE|SHARE|KEY\s+SHARE)\b", re.I)
+# SQLSTATE query_canceled (statement_timeout, cancelamento)
+QUERY_CANCELED = "57014"
+# Comandos de sessão/transação: não são consultas e o `SET search_path` do
+# django-tenants roda dentro de `_cursor()`, onde a captura trocaria o schema
+_SESSION_COMMANDS = re.compile(
+    r"^\s*(?:SET|RESET|SHOW|SAVEPOINT|RELEASE|ROLLBACK|COMMIT|BEGIN)\b", re.I
+)
+
+
+def get_slow_query_settings() -> dict:
+    """Retorna configuração da captura de consultas lentas com valores padrão"""
+    config = getattr(settings, "SLOW_QUERIES", {})
+    return {
+        "ENABLED": config.get("ENABLED", True),
+        "THRESHOLD_MS": config.get("THRESHOLD_MS", 500),
+        "CAPTURE_INTERVAL": config.get("CAPTURE_INTERVAL", 60),
+        "EXPLAIN_SAMPLE_RATE": config.get("EXPLAIN_SAMPLE_RATE", 0.1),
+        "EXPLAIN_INTERVAL": config.get("EXPLAIN_INTERVAL", 60 * 60),
+        "EXPLAIN_TIMEOUT_MS": config.get("EXPLAIN_TIMEOUT_MS", 30000),
+        "MAX_SQL_LENGTH": config.get("MAX_SQL_LENGTH", 10000),
+        "MAX_PARAM_LENGTH": config.get("MAX_PARAM_LENGTH", 500),
+        "RETENTION_DAYS": config.get("RETENTION_DAYS", 14),
+    }
+
+
+def normalize_sql(sql: str) -> str:
+    """SQL sem literais, com listas IN colapsadas e espaços normalizados"""
+    normalized = _LITERALS.sub("?", sql)
+    normalized = _IN_LISTS.sub("(...)", normalized)
+    return _SPACES.sub(" ", normalized).strip()
+
+
+def query_fingerprint(sql: str) -> str:
+    return hashlib.sha256(normalize_sql(sql).encode()).hexdigest()
+
+
+def plan_fingerprint(plan: dict) -> str:
+    """Impressão digital da estrutura do plano (sem custos e contagens)"""
+
+    def shape(node: dict) -> list:
+        return [
+            node.get("Node Type"),
+            node.get("Join Type"),
+            node.get("Strategy"),
+            node.get("Relation Name"),
+            node.get("Index Name"),
+            [shape(child) for child in node.get("Plans", [])],
+        ]
+
+    return hashlib.sha256(json.dumps(shape(plan)).encode()).hexdigest()
+
+
+def _json_value(value, max_length: int):
+    """Parâmetro em formato JSON (para a tarefa); None se não serializável"""
+    if value is None or isinstance(value, bool | int | float):
+        return value
+    if isinstance(value, str):
+        return value[:max_length]
+    if isinstance(value, list | tuple):
+        return [_json_value(item, max_length) for item in value]
+    if isinstance(value, datetime.date | datetime.time):
+        return value.isoformat()
+    if isinstance(value, Decimal | uuid.UUID):
+        return str(value)
+    return None
+
+
+def _json_params(params, max_length: int):
+    if isinstance(params, dict):
+        return {key: _json_value(value, max_length) for key, value in params.items()}
+    if isinstance(params, list | tuple):
+        return [_json_value(value, max_length) for value in params]
+    return None
+
+
+def _is_explainable(sql: str) -> bool:
+    return sql.lstrip().upper().startswith("SELECT") and not _ROW_LOCKS.search(sql)
+
+
+def _is_canceled(err: DatabaseError) -> bool:
+    """Consulta cancelada pelo servidor (statement_timeout)"""
+    return QUERY_CANCELED in (
+        getattr(err, "pgcode", None),
+        getattr(err.__cause__, "pgcode", None),
+    )
+
+
+def slow_query_wrapper(execute, sql, params, many, context):
+    """execute_wrapper: mede a consulta e agenda a captura se for lenta"""
+    if _capturing.get():
+        return execute(sql, params, many, context)
+
+    canceled = False
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    except DatabaseError as err:
+        canceled = _is_canceled(err)
+        raise
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        config = get_slow_query_settings()
+        if (
+            config["ENABLED"]
+            and duration_ms >= config["THRESHOLD_MS"]
+            and not _SESSION_COMMANDS.match(sql)
+        ):
+            _schedule_capture(sql, params, many, context, duration_ms, config, canceled)
+
+
+def _schedule_capture(
+    sql, params, many, context, duration_ms, config, canceled=False
+) -> None:
+    from .tasks import record_slow_query
+
+    conn = context["connection"]
+    schema_name = getattr(conn, "schema_name", settings.PUBLIC_SCHEMA_NAME)
+    fingerprint = query_fingerprint(sql)
+    token = _capturing.set(True)
+    try:
+        if not cache.add(
+            f"slow-query:{schema_name}:{fingerprint}", 1, config["CAPTURE_INTERVAL"]
+        ):
+            return
+        json_params = None if many else _json_params(params, config["MAX_PARAM_LENGTH"])
+        timeouts = current_timeouts()
+        explain = (
+            not many
+            and not canceled
+            and _is_explainable(sql)
+            and random.random() < config["EXPLAIN_SAMPLE_RATE"]
+            and cache.add(
+                f"slow-query-plan:{fingerprint}", 1, config["EXPLAIN_INTERVAL"]
+            )
+        )
+        record_slow_query.delay(
+            {
+                "schema_name": schema_name,
+                "view_name": get_current_view(),
+                "database": conn.alias,
+                "sql": sql[: config["MAX_SQL_LENGTH"]],
+                "params": json_params,
+                "duration_ms": round(duration_ms, 3),
+                "explain": explain,
+                "statement_timeout_ms": timeouts[0] if timeouts else None,
+            }
+        )
+    except Exception as err:
+        # A captura nunca interfere na consulta original
+        logger.warning(f"Falha ao agendar captura de consulta lenta: {err}")
+    finally:
+        _capturing.reset(token)
+
+
+def install_slow_query_wrapper(sender=None, connection=None, **kwargs) -> None:
+    """Receiver de connection_created: instala o wrapper uma vez por conexão"""
+    if slow_query_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(slow_query_wrapper)
+
+
+def explain_query(entry: dict, config: dict) -> tuple[dict | None, str]:
+    """
+    EXPLAIN (ANALYZE, BUFFERS) no schema da consulta original
+
+    Executado em transação desfeita ao final, com statement_timeout de
+    EXPLAIN_TIMEOUT_MS, limitado pelo da requisição que executou a consulta.
+
+    Returns:
+        (plano, erro)
+    """
+    from django.db import connections, transaction
+    from django_tenants.utils import schema_context
+
+    conn = connections[entry["database"]]
+    timeout = config["EXPLAIN_TIMEOUT_MS"]
+    if entry.get("statement_timeout_ms"):
+        timeout = min(timeout, entry["statement_timeout_ms"])
+    try:
+        with schema_context(entry["schema_name"]), transaction.atomic(
+            using=conn.alias
+        ), conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('statement_timeout', %s, true)",
+                [str(timeout)],
+            )
+            cursor.execute(
+                f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {entry['sql']}",
+                entry["params"],
+            )
+            plan = cursor.fetchone()[0]
+            transaction.set_rollback(True, using=conn.alias)
+    except Exception as err:
+        return None, str(err)[:1000]
+
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0], ""
+
+
+def record_entry(entry: dict) -> None:
+    """Grava a amostra (e o plano, se amostrado) no schema público"""
+    from django.db.models import F
+    from django.db.models.functions import Greatest
+    from django.utils import timezone
+    from django_tenants.utils import schema_context
+
+    from apps.tenants.models import SlowQuery, SlowQueryShape
+
+    config = get_slow_query_settings()
+    token = _capturing.set(True)
+    try:
+        plan, plan_error = (
+            explain_query(entry, config) if entry.get("explain") else (None, "")
+        )
+        now = timezone.now()
+        with schema_context(settings.PUBLIC_SCHEMA_NAME):
+            shape, _ = SlowQueryShape.objects.get_or_create(
+                fingerprint=query_fingerprint(entry["sql"]),
+                defaults={"sql": normalize_sql(entry["sql"])},
+            )
+            SlowQueryShape.objects.filter(pk=shape.pk).update(
+                samples=F("samples") + 1,
+                total_ms=F("total_ms") + entry["duration_ms"],
+                max_ms=Greatest("max_ms", entry["duration_ms"]),
+                last_seen_at=now,
+                updated_at=now,
+            )
+            SlowQuery.objects.create(
+                shape=shape,
+                schema_name=entry["schema_name"],
+                view_name=entry.get("view_name") or "",
+                database=entry.get("database") or "default",
+                sql=entry["sql"],
+                params=entry.get("params"),
+                duration_ms=entry["duration_ms"],
+                plan=plan,
+                plan_fingerprint=plan_fingerprint(plan["Plan"]) if plan else "",
+                plan_error=plan_error,
+                captured_at=now,
+            )
+            # Retenção: limpeza no máximo uma vez por dia
+            if cache.add("slow-query-purge", 1, 60 * 60 * 24):
+                SlowQuery.objects.filter(
+                    captured_at__lt=now
+                    - datetime.timedelta(days=config["RETENTION_DAYS"])
+                ).delete()
+    finally:
+        _capturing.reset(token)
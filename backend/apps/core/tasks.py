@@ -0,0 +1,228 @@
+"""
+Tarefas em background com contexto de tenant
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- SEMPRE usar schema-per-tenant
+- Nenhuma tarefa pode ler ou escrever fora do schema de origem
+
+`TenantTask` captura o schema ativo no momento do enfileiramento e o
+restaura no worker com `tenant_context`. Também oferece:
+- Limite de execuções simultâneas por tenant (por tarefa)
+- Chave de idempotência mantida entre retries; execuções concluídas com a
+  mesma chave retornam o resultado anterior sem executar novamente
+- Modo eager (CELERY_TASK_ALWAYS_EAGER) para testes
+"""
+import logging
+import uuid
+from contextlib import contextmanager
+
+from celery import Task, shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.db import InterfaceError, OperationalError, connection
+from django_tenants.utils import get_tenant_model, schema_context, tenant_context
+
+logger = logging.getLogger(__name__)
+
+TENANT_SCHEMA_KWARG = "_tenant_schema"
+IDEMPOTENCY_KEY_KWARG = "_idempotency_key"
+
+
+def get_tenant_task_settings() -> dict:
+    """Retorna configuração das tarefas de tenant com valores padrão"""
+    config = getattr(settings, "TENANT_TASKS", {})
+    return {
+        "MAX_CONCURRENCY": config.get("MAX_CONCURRENCY", 2),
+        "CONCURRENCY_RETRY_DELAY": config.get("CONCURRENCY_RETRY_DELAY", 30),
+        "CONCURRENCY_MAX_WAITS": config.get("CONCURRENCY_MAX_WAITS", 20),
+        "SLOT_TIMEOUT": config.get("SLOT_TIMEOUT", 60 * 60),
+        "IDEMPOTENCY_TTL": config.get("IDEMPOTENCY_TTL", 60 * 60 * 24),
+    }
+
+
+class TenantConcurrencyLimitError(Exception):
+    """Limite de execuções simultâneas da tarefa no tenant atingido"""
+
+
+class TenantTask(Task):
+    """
+    Classe base para tarefas executadas no schema de um tenant
+
+    Uso:
+        @shared_task(base=TenantTask)
+        def generate_report(report_id): ...
+
+        generate_report.delay(report_id)  # dentro do contexto do tenant
+        generate_report.apply_async(args=[report_id], idempotency_key="...")
+    """
+
+    # Erros transitórios de banco são reexecutados com backoff
+    autoretry_for = (OperationalError, InterfaceError)
+    retry_backoff = True
+    retry_backoff_max = 600
+    retry_jitter = True
+    max_retries = 5
+
+    # Kwargs de contexto são removidos em __call__, antes da função da tarefa
+    typing = False
+
+    # None usa TENANT_TASKS["MAX_CONCURRENCY"]; 0 desabilita o limite
+    max_concurrency_per_tenant: int | None = None
+
+    def apply_async(self, args=None, kwargs=None, idempotency_key=None, **options):
+        kwargs = self._with_tenant_kwargs(kwargs, idempotency_key)
+        return super().apply_async(args, kwargs, **options)
+
+    def apply(self, args=None, kwargs=None, idempotency_key=None, **options):
+        kwargs = self._with_tenant_kwargs(kwargs, idempotency_key)
+        return super().apply(args, kwargs, **options)
+
+    def _with_tenant_kwargs(self, kwargs, idempotency_key=None) -> dict:
+        """
+        Adiciona schema e chave de idempotência aos kwargs da mensagem
+
+        Retries reutilizam os kwargs da mensagem original, mantendo o mesmo
+        schema e a mesma chave.
+        """
+        kwargs = dict(kwargs or {})
+        kwargs.setdefault(TENANT_SCHEMA_KWARG, connection.schema_name)
+        kwargs.setdefault(IDEMPOTENCY_KEY_KWARG, idempotency_key or uuid.uuid4().hex)
+        return kwargs
+
+    def __call__(self, *args, **kwargs):
+        schema_name = kwargs.pop(TENANT_SCHEMA_KWARG, None)
+        idempotency_key = kwargs.pop(IDEMPOTENCY_KEY_KWARG, None)
+        if not schema_name:
+            schema_name = settings.PUBLIC_SCHEMA_NAME
+
+        with self._tenant_scope(schema_name):
+            done_key = None
+            if idempotency_key:
+                done_key = (
+                    f"tenant-task-done:{schema_name}:{self.name}:{idempotency_key}"
+                )
+                done = cache.get(done_key)
+                if done is not None:
+                    logger.info(f"Tarefa {self.name} já executada ({idempotency_key})")
+                    return done["result"]
+
+            with self._concurrency_slot(schema_name):
+                result = super().__call__(*args, **kwargs)
+
+            if done_key:
+                cache.set(
+                    done_key,
+                    {"result": result},
+                    get_tenant_task_settings()["IDEMPOTENCY_TTL"],
+                )
+            return result
+
+    @contextmanager
+    def _tenant_scope(self, schema_name: str):
+        """Ativa o schema (e o tenant, quando houver) da tarefa"""
+        if schema_name == settings.PUBLIC_SCHEMA_NAME:
+            with schema_context(schema_name):
+                yield
+            return
+
+        with schema_context(settings.PUBLIC_SCHEMA_NAME):
+            tenant = get_tenant_model().objects.get(schema_name=schema_name)
+        with tenant_context(tenant):
+            yield
+
+    def get_max_concurrency(self) -> int:
+        """Limite de execuções simultâneas por tenant desta tarefa"""
+        if self.max_concurrency_per_tenant is not None:
+            return self.max_concurrency_per_tenant
+        return get_tenant_task_settings()["MAX_CONCURRENCY"]
+
+    @contextmanager
+    def _concurrency_slot(self, schema_name: str):
+        """
+        Reserva uma vaga de execução da tarefa no tenant
+
+        Sem vaga, a tarefa é reagendada (sem executar) até
+        CONCURRENCY_MAX_WAITS vezes. As vagas expiram em SLOT_TIMEOUT para
+        não ficarem presas se um worker morrer no meio da execução.
+        """
+        limit = self.get_max_concurrency()
+        if not limit:
+            yield
+            return
+
+        config = get_tenant_task_settings()
+        key = f"tenant-task-slots:{schema_name}:{self.name}"
+        cache.add(key, 0, config["SLOT_TIMEOUT"])
+        try:
+            running = cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, config["SLOT_TIMEOUT"])
+            running = 1
+
+        if running > limit:
+            cache.decr(key)
+            raise self.retry(
+                exc=TenantConcurrencyLimitError(
+                    f"{self.name}: limite de {limit} execuções em {schema_name}"
+                ),
+                countdown=config["CONCURRENCY_RETRY_DELAY"],
+                max_retries=config["CONCURRENCY_MAX_WAITS"],
+            )
+
+        try:
+            yield
+        finally:
+            try:
+                cache.decr(key)
+            except ValueError:
+                pass
+
+
+@shared_task(base=TenantTask, name="core.archive_soft_deleted")
+def archive_soft_deleted(retention_days=None, batch_size=None) -> dict:
+    """Arquiva registros removidos (soft delete) do tenant atual"""
+    from apps.core.archival import archive_schema
+
+    return archive_schema(
+        connection.schema_name, retention_days=retention_days, batch_size=batch_size
+    )
+
+
+@shared_task(name="core.archive_soft_deleted_all_tenants")
+def archive_soft_deleted_all_tenants() -> int:
+    """Enfileira o arquivamento de cada tenant ativo"""
+    tenants = get_tenant_model().objects.filter(is_active=True)
+    for tenant in tenants:
+        with tenant_context(tenant):
+            archive_soft_deleted.delay()
+    return len(tenants)
+
+
+@shared_task(
+    base=TenantTask,
+    name="core.refresh_dashboard_snapshot",
+    max_concurrency_per_tenant=1,
+)
+def refresh_dashboard_snapshot(sections=None) -> list[str]:
+    """Recalcula seções do snapshot do dashboard do tenant atual"""
+    from apps.core.dashboard import refresh_sections
+
+    return list(refresh_sections(sections))
+
+
+@shared_task(name="core.refresh_dashboard_snapshot_all_tenants")
+def refresh_dashboard_snapshot_all_tenants() -> int:
+    """Enfileira o recálculo completo do dashboard de cada tenant ativo"""
+    tenants = get_tenant_model().objects.filter(is_active=True)
+    for tenant in tenants:
+        with tenant_context(tenant):
+            refresh_dashboard_snapshot.delay()
+    return len(tenants)
+
+
+@shared_task(name="core.record_slow_query", ignore_result=True)
+def record_slow_query(entry: dict) -> None:
+    """Grava consulta lenta capturada (e o EXPLAIN amostrado) fora da requisição"""
+    from apps.core.slow_queries import record_entry
+
+    record_entry(entry)
@@ -0,0 +1,58 @@
+"""
+Template tags das listagens do admin (OptimizedModelAdmin)
+"""
+from django import template
+from django.conf import settings
+from django.contrib.admin.templatetags.admin_list import date_hierarchy
+from django.contrib.admin.templatetags.base import InclusionAdminNode
+from django.core.cache import cache
+from django.utils.translation import get_language
+
+from apps.core.pagination import data_cache_key
+
+register = template.Library()
+
+
+def get_admin_lists_settings() -> dict:
+    """Retorna configuração das listagens do admin com valores padrão"""
+    config = getattr(settings, "ADMIN_LISTS", {})
+    return {
+        "FACET_CACHE_TTL": config.get("FACET_CACHE_TTL", 300),
+    }
+
+
+def cached_date_hierarchy(cl):
+    """
+    date_hierarchy do admin em cache
+
+    A chave inclui a consulta filtrada, os parâmetros da listagem (links e
+    nível de data) e a versão dos dados das tabelas: uma escrita descarta
+    as facetas e o cache evita Min/Max e datas distintas a cada página.
+    """
+    ttl = get_admin_lists_settings()["FACET_CACHE_TTL"]
+    if not ttl:
+        return date_hierarchy(cl)
+
+    key = data_cache_key(
+        "admin-date-hierarchy",
+        cl.queryset,
+        cl.date_hierarchy,
+        sorted(cl.params.items()),
+        get_language(),
+    )
+    facets = cache.get(key)
+    if facets is None:
+        facets = date_hierarchy(cl)
+        cache.set(key, facets, ttl)
+    return facets
+
+
+@register.tag(name="cached_date_hierarchy")
+def cached_date_hierarchy_tag(parser, token):
+    return InclusionAdminNode(
+        parser,
+        token,
+        func=cached_date_hierarchy,
+        template_name="date_hierarchy.html",
+        takes_context=False,
+    )
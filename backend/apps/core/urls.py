@@ -5,6 +5,7 @@ from django.urls import path
 
 from .views import (
     api_status,
+    dashboard,
     health_check,
     health_check_cache,
     health_check_database,
@@ -21,6 +22,8 @@ urlpatterns = [
     path("health/quick/", health_check_quick, name="health-check-quick"),
     path("health/database/", health_check_database, name="health-check-database"),
     path("health/cache/", health_check_cache, name="health-check-cache"),
+    # Dashboard
+    path("dashboard/", dashboard, name="dashboard"),
     # Monitoring
     path("metrics/", metrics, name="metrics"),
     path("status/", api_status, name="api-status"),
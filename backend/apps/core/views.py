@@ -8,27 +8,39 @@ Seguindo padrões estabelecidos no CONTEXT.md:
 """
 import logging
 import time
-from datetime import datetime
 
 import psutil
 from django.conf import settings
 from django.core.cache import cache
 from django.db import connection
 from django.utils import timezone
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import (
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
-from .serializers import HealthCheckSerializer
+from .dashboard import get_dashboard
+from .health import get_health_verdict
+from .permissions import IsInstructorOrAdmin, IsPlatformStaffOrMetricsToken
+from .query_cache import get_query_cache_stats
+from .replicas import replica_reads
+from .request_metrics import SORT_FIELDS, get_request_metrics
+from .serializers import DashboardSerializer, HealthCheckSerializer
 
 logger = logging.getLogger(__name__)
 
 
 @extend_schema(
     summary="Health Check Completo",
-    description="Verifica o status da API e todas suas dependências de forma detalhada",
+    description=(
+        "Último veredito das verificações de dependências (executadas em "
+        "background) e sua idade em segundos"
+    ),
     responses={
         200: HealthCheckSerializer,
         503: {
@@ -36,6 +48,8 @@ logger = logging.getLogger(__name__)
             "properties": {
                 "status": {"type": "string", "example": "unhealthy"},
                 "timestamp": {"type": "string", "format": "date-time"},
+                "checked_at": {"type": "string", "format": "date-time"},
+                "age_seconds": {"type": "number"},
                 "version": {"type": "string", "example": "1.0.0"},
                 "database": {"type": "string", "example": "error: connection failed"},
                 "cache": {"type": "string", "example": "error: redis unavailable"},
@@ -54,146 +68,53 @@ def health_check(request):
     """
     Endpoint de health check completo para monitoramento
 
-    Verifica:
-    - Status da API
-    - Conexão com banco de dados
-    - Conexão com cache/Redis
-    - Uso de memória e disco
-    - Tempo de resposta
-    - Uptime da aplicação
+    Retorna o último veredito das verificações executadas em background
+    (banco, cache, memória, disco e uptime) e sua idade em segundos.
     """
     start_time = time.time()
-    errors = []
+    verdict, age = get_health_verdict()
+    checks = verdict["checks"]
 
+    database = checks["database"]
+    cache_check = checks["cache"]
     health_data = {
-        "status": "healthy",
+        "status": verdict["status"],
         "timestamp": timezone.now(),
+        "checked_at": verdict["timestamp"],
+        "age_seconds": age,
         "version": "1.0.0",
         "environment": "development" if settings.DEBUG else "production",
-        "database": "ok",
-        "cache": "ok",
-        "disk_usage": {},
-        "memory_usage": {},
-        "uptime": None,
-        "response_time_ms": None,
-        "errors": [],
+        "database": f"ok - {database['detail']['migrations']} migrations applied"
+        if database["status"] == "ok"
+        else f"{database['status']}: {database['error']}",
+        "cache": "ok - read/write successful"
+        if cache_check["status"] == "ok"
+        else f"{cache_check['status']}: {cache_check['error']}",
+        "memory_usage": _check_detail(checks["memory"]),
+        "disk_usage": _check_detail(checks["disk"]),
+        "uptime": _check_detail(checks["uptime"]).get("uptime"),
+        "response_time_ms": round((time.time() - start_time) * 1000, 2),
+        "errors": verdict["errors"],
     }
 
-    # Verificar banco de dados com timeout
-    try:
-        with connection.cursor() as cursor:
-            cursor.execute("SELECT 1")
-            result = cursor.fetchone()
-            if result[0] != 1:
-                raise Exception("Database query returned unexpected result")
-
-            # Verificar se consegue fazer uma query mais complexa
-            cursor.execute("SELECT COUNT(*) FROM django_migrations")
-            migration_count = cursor.fetchone()[0]
-            health_data["database"] = f"ok - {migration_count} migrations applied"
-
-    except Exception as e:
-        health_data["database"] = f"error: {e!s}"
-        health_data["status"] = "unhealthy"
-        errors.append(f"Database error: {e!s}")
-        logger.error(f"Database health check failed: {e}")
-
-    # Verificar cache com timeout
-    try:
-        test_key = f"health_check_{int(time.time())}"
-        cache.set(test_key, "test_value", 10)
-        cache_value = cache.get(test_key)
-        if cache_value != "test_value":
-            raise Exception("Cache test value mismatch")
-
-        # Limpar teste
-        cache.delete(test_key)
-        health_data["cache"] = "ok - read/write successful"
-
-    except Exception as e:
-        health_data["cache"] = f"error: {e!s}"
-        health_data["status"] = "unhealthy"
-        errors.append(f"Cache error: {e!s}")
-        logger.error(f"Cache health check failed: {e}")
-
-    # Verificar uso de memória
-    try:
-        memory = psutil.virtual_memory()
-        health_data["memory_usage"] = {
-            "total": f"{memory.total / (1024**3):.2f} GB",
-            "available": f"{memory.available / (1024**3):.2f} GB",
-            "percent": memory.percent,
-            "status": "ok"
-            if memory.percent < 85
-            else "warning"
-            if memory.percent < 95
-            else "critical",
-        }
-
-        if memory.percent > 95:
-            health_data["status"] = "unhealthy"
-            errors.append(f"Critical memory usage: {memory.percent}%")
-        elif memory.percent > 85:
-            errors.append(f"High memory usage: {memory.percent}%")
-
-    except Exception as e:
-        health_data["memory_usage"] = {"error": str(e)}
-        logger.warning(f"Memory check failed: {e}")
-
-    # Verificar uso de disco
-    try:
-        disk = psutil.disk_usage("/")
-        health_data["disk_usage"] = {
-            "total": f"{disk.total / (1024**3):.2f} GB",
-            "used": f"{disk.used / (1024**3):.2f} GB",
-            "free": f"{disk.free / (1024**3):.2f} GB",
-            "percent": round((disk.used / disk.total) * 100, 2),
-            "status": "ok"
-            if disk.percent < 85
-            else "warning"
-            if disk.percent < 95
-            else "critical",
-        }
-
-        if disk.percent > 95:
-            health_data["status"] = "unhealthy"
-            errors.append(f"Critical disk usage: {disk.percent}%")
-        elif disk.percent > 85:
-            errors.append(f"High disk usage: {disk.percent}%")
-
-    except Exception as e:
-        health_data["disk_usage"] = {"error": str(e)}
-        logger.warning(f"Disk check failed: {e}")
-
-    # Calcular uptime
-    try:
-        boot_time = psutil.boot_time()
-        uptime = datetime.now() - datetime.fromtimestamp(boot_time)
-        health_data["uptime"] = str(uptime).split(".")[0]  # Remove microseconds
-    except Exception as e:
-        health_data["uptime"] = f"error: {e!s}"
-        logger.warning(f"Uptime check failed: {e}")
-
-    # Calcular tempo de resposta
-    end_time = time.time()
-    health_data["response_time_ms"] = round((end_time - start_time) * 1000, 2)
-
-    # Adicionar lista de erros
-    health_data["errors"] = errors
-
-    # Retornar status apropriado
     status_code = (
         status.HTTP_200_OK
-        if health_data["status"] == "healthy"
+        if verdict["status"] == "healthy"
         else status.HTTP_503_SERVICE_UNAVAILABLE
     )
-
     return Response(health_data, status=status_code)
 
 
+def _check_detail(check: dict) -> dict:
+    """Detalhe de uma verificação ou o erro ocorrido"""
+    if check["status"] == "ok":
+        return check["detail"]
+    return {"error": check["error"]}
+
+
 @extend_schema(
     summary="Health Check Rápido",
-    description="Verificação rápida de saúde para load balancers",
+    description="Liveness para load balancers (não acessa banco nem cache)",
     responses={
         200: {
             "type": "object",
@@ -206,12 +127,14 @@ def health_check(request):
     tags=["core"],
 )
 @api_view(["GET"])
+@authentication_classes([])
 @permission_classes([AllowAny])
 def health_check_quick(request):
     """
     Health check rápido para load balancers
 
-    Verifica apenas se a aplicação está respondendo
+    Verifica apenas se a aplicação está respondendo. Sem autenticação,
+    para que nenhum header de token leve a consultas no banco.
     """
     return Response(
         {
@@ -223,13 +146,15 @@ def health_check_quick(request):
 
 @extend_schema(
     summary="Health Check Database",
-    description="Verifica exclusivamente a conexão com o banco de dados",
+    description="Último resultado da verificação do banco de dados",
     responses={
         200: {
             "type": "object",
             "properties": {
                 "database": {"type": "string", "example": "ok"},
                 "timestamp": {"type": "string", "format": "date-time"},
+                "checked_at": {"type": "string", "format": "date-time"},
+                "age_seconds": {"type": "number"},
                 "connection_pool": {"type": "object"},
                 "migrations": {"type": "integer"},
             },
@@ -243,63 +168,50 @@ def health_check_database(request):
     """
     Health check específico para banco de dados
 
-    Verifica conexão, pool de conexões e migrations
+    Retorna a última verificação de conexão e migrations feita em background
     """
-    try:
-        start_time = time.time()
-
-        with connection.cursor() as cursor:
-            # Verificar se database está funcionando
-            cursor.execute("SELECT 1")
-            cursor.fetchone()
-
-            # Contar migrations aplicadas
-            cursor.execute("SELECT COUNT(*) FROM django_migrations")
-            migration_count = cursor.fetchone()[0]
-
-            # Verificar se consegue fazer uma query mais complexa
-            cursor.execute("SELECT version()")
-            db_version = cursor.fetchone()[0]
-
-        end_time = time.time()
-        response_time = round((end_time - start_time) * 1000, 2)
-
-        return Response(
-            {
-                "database": "ok",
-                "timestamp": timezone.now(),
-                "response_time_ms": response_time,
-                "migrations": migration_count,
-                "version": db_version,
-                "connection_pool": {
-                    "queries": len(connection.queries)
-                    if settings.DEBUG
-                    else "disabled",
-                    "vendor": connection.vendor,
-                },
-            }
-        )
+    verdict, age = get_health_verdict()
+    check = verdict["checks"]["database"]
 
-    except Exception as e:
-        logger.error(f"Database health check failed: {e}")
+    if check["status"] != "ok":
         return Response(
             {
-                "database": f"error: {e!s}",
+                "database": f"{check['status']}: {check['error']}",
                 "timestamp": timezone.now(),
+                "checked_at": verdict["timestamp"],
+                "age_seconds": age,
             },
             status=status.HTTP_503_SERVICE_UNAVAILABLE,
         )
 
+    return Response(
+        {
+            "database": "ok",
+            "timestamp": timezone.now(),
+            "checked_at": verdict["timestamp"],
+            "age_seconds": age,
+            "response_time_ms": check["duration_ms"],
+            "migrations": check["detail"]["migrations"],
+            "version": check["detail"]["version"],
+            "connection_pool": {
+                "queries": len(connection.queries) if settings.DEBUG else "disabled",
+                "vendor": check["detail"]["vendor"],
+            },
+        }
+    )
+
 
 @extend_schema(
     summary="Health Check Cache",
-    description="Verifica exclusivamente a conexão com o cache/Redis",
+    description="Último resultado da verificação do cache/Redis",
     responses={
         200: {
             "type": "object",
             "properties": {
                 "cache": {"type": "string", "example": "ok"},
                 "timestamp": {"type": "string", "format": "date-time"},
+                "checked_at": {"type": "string", "format": "date-time"},
+                "age_seconds": {"type": "number"},
                 "cache_info": {"type": "object"},
             },
         }
@@ -312,61 +224,49 @@ def health_check_cache(request):
     """
     Health check específico para cache
 
-    Verifica conexão com Redis e operações básicas
+    Retorna a última verificação de set/get/delete feita em background
     """
-    try:
-        start_time = time.time()
-
-        # Test key único para evitar conflitos
-        test_key = f"health_check_cache_{int(time.time())}"
-        test_value = f"test_value_{int(time.time())}"
-
-        # Teste de escrita
-        cache.set(test_key, test_value, 10)
-
-        # Teste de leitura
-        cached_value = cache.get(test_key)
-        if cached_value != test_value:
-            raise Exception("Cache read/write test failed")
-
-        # Teste de delete
-        cache.delete(test_key)
-
-        # Verificar se foi deletado
-        deleted_value = cache.get(test_key)
-        if deleted_value is not None:
-            raise Exception("Cache delete test failed")
-
-        end_time = time.time()
-        response_time = round((end_time - start_time) * 1000, 2)
-
-        return Response(
-            {
-                "cache": "ok",
-                "timestamp": timezone.now(),
-                "response_time_ms": response_time,
-                "cache_info": {
-                    "backend": cache.__class__.__name__,
-                    "location": getattr(cache, "_cache", {}).get("_server", "unknown"),
-                    "operations_tested": ["set", "get", "delete"],
-                },
-            }
-        )
+    verdict, age = get_health_verdict()
+    check = verdict["checks"]["cache"]
 
-    except Exception as e:
-        logger.error(f"Cache health check failed: {e}")
+    if check["status"] != "ok":
         return Response(
             {
-                "cache": f"error: {e!s}",
+                "cache": f"{check['status']}: {check['error']}",
                 "timestamp": timezone.now(),
+                "checked_at": verdict["timestamp"],
+                "age_seconds": age,
             },
             status=status.HTTP_503_SERVICE_UNAVAILABLE,
         )
 
+    return Response(
+        {
+            "cache": "ok",
+            "timestamp": timezone.now(),
+            "checked_at": verdict["timestamp"],
+            "age_seconds": age,
+            "response_time_ms": check["duration_ms"],
+            "cache_info": check["detail"],
+        }
+    )
+
 
 @extend_schema(
     summary="Métricas do Sistema",
-    description="Métricas detalhadas do sistema para monitoramento",
+    description=(
+        "Métricas detalhadas do sistema para monitoramento (staff da "
+        "plataforma ou cabeçalho X-Metrics-Token)"
+    ),
+    parameters=[
+        OpenApiParameter("top", int, description="Tamanho dos rankings de requisições"),
+        OpenApiParameter(
+            "sort",
+            str,
+            enum=SORT_FIELDS,
+            description="Ordenação dos rankings (padrão p95)",
+        ),
+    ],
     responses={
         200: {
             "type": "object",
@@ -374,6 +274,8 @@ def health_check_cache(request):
                 "system": {"type": "object"},
                 "database": {"type": "object"},
                 "cache": {"type": "object"},
+                "query_cache": {"type": "object"},
+                "requests": {"type": "object"},
                 "application": {"type": "object"},
                 "timestamp": {"type": "string", "format": "date-time"},
             },
@@ -382,20 +284,30 @@ def health_check_cache(request):
     tags=["core"],
 )
 @api_view(["GET"])
-@permission_classes([AllowAny])
+@permission_classes([IsPlatformStaffOrMetricsToken])
 def metrics(request):
     """
     Endpoint de métricas para monitoramento detalhado
 
+    Restrito ao staff da plataforma ou ao coletor com X-Metrics-Token: as
+    métricas de requisições expõem todos os tenants.
+
     Retorna informações detalhadas sobre:
     - Sistema operacional
     - Banco de dados
     - Cache
     - Aplicação Django
+    - Requisições por tenant/endpoint (?top=N&sort=p95|p99|avg|total_seconds|count|error_rate)
     """
     try:
-        # Métricas do sistema
-        cpu_percent = psutil.cpu_percent(interval=1)
+        top = int(request.query_params.get("top", 0)) or None
+    except ValueError:
+        top = None
+    sort = request.query_params.get("sort", "p95")
+
+    try:
+        # Métricas do sistema (sem bloquear: uso desde a chamada anterior)
+        cpu_percent = psutil.cpu_percent(interval=None)
         memory = psutil.virtual_memory()
         disk = psutil.disk_usage("/")
 
@@ -475,6 +387,8 @@ def metrics(request):
                 "system": system_metrics,
                 "database": db_metrics,
                 "cache": cache_metrics,
+                "query_cache": get_query_cache_stats(),
+                "requests": get_request_metrics(top=top, sort=sort),
                 "application": app_metrics,
                 "timestamp": timezone.now(),
             }
@@ -491,6 +405,28 @@ def metrics(request):
         )
 
 
+@extend_schema(
+    summary="Dashboard da academia",
+    description=(
+        "Indicadores da tela inicial (alunos, presenças, receita e "
+        "inadimplência) lidos de um snapshot pré-calculado por tenant"
+    ),
+    responses={200: DashboardSerializer},
+    tags=["core"],
+)
+@api_view(["GET"])
+@permission_classes([IsInstructorOrAdmin])
+@replica_reads
+def dashboard(request):
+    """
+    Dashboard do tenant atual
+
+    O custo da leitura não depende do tamanho da academia: as seções são
+    recalculadas em background após escritas ou quando ficam antigas.
+    """
+    return Response(get_dashboard())
+
+
 @extend_schema(
     summary="API Status",
     description="Informações básicas da API",
@@ -7,8 +7,13 @@ Seguindo padrões estabelecidos no CONTEXT.md:
 - SEMPRE usar permissions granulares
 - SEMPRE garantir isolamento de tenant
 """
+import hashlib
 from typing import ClassVar
 
+from django.db import connection
+from django.db.models import Count, Max, Prefetch
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_vary_headers
 from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema
 from rest_framework import status, viewsets
@@ -16,11 +21,158 @@ from rest_framework.decorators import action
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.response import Response
 
+from .bulk import BulkActionsMixin
+from .idempotency import IdempotencyMixin
 from .pagination import StandardResultsSetPagination
 from .permissions import TenantPermission
+from .replicas import ReplicaReadMixin
+from .serializers import get_related_paths, get_requested_field_trees
 
 
-class TenantViewSet(viewsets.ModelViewSet):
+def _flatten_select_related(select_related, prefix=""):
+    """Converte a árvore de select_related do Query em caminhos ORM"""
+    paths = []
+    for name, children in select_related.items():
+        path = f"{prefix}{name}"
+        if children:
+            paths.extend(_flatten_select_related(children, f"{path}__"))
+        else:
+            paths.append(path)
+    return paths
+
+
+def _covered_paths(declared, needed):
+    """Caminhos necessários já cobertos (ou encurtados) pelos declarados"""
+    return sorted(
+        path
+        for path in needed
+        if any(lookup == path or lookup.startswith(f"{path}__") for lookup in declared)
+    )
+
+
+def trim_related_lookups(queryset, needed_paths):
+    """
+    Restringe select_related/prefetch_related aos caminhos necessários
+
+    Nunca adiciona joins novos: apenas remove ou encurta os lookups já
+    declarados no queryset do ViewSet.
+    """
+    select_related = queryset.query.select_related
+    if isinstance(select_related, dict):
+        declared = _flatten_select_related(select_related)
+        queryset = queryset.select_related(None)
+        kept = _covered_paths(declared, needed_paths)
+        if kept:
+            queryset = queryset.select_related(*kept)
+
+    prefetch_lookups = queryset._prefetch_related_lookups
+    if prefetch_lookups:
+        kept_prefetches = [
+            lookup
+            for lookup in prefetch_lookups
+            if isinstance(lookup, Prefetch) and lookup.prefetch_through in needed_paths
+        ]
+        declared = [lookup for lookup in prefetch_lookups if isinstance(lookup, str)]
+        queryset = queryset.prefetch_related(None).prefetch_related(
+            *kept_prefetches, *_covered_paths(declared, needed_paths)
+        )
+
+    return queryset
+
+
+class SparseFieldsetQuerysetMixin:
+    """
+    Ajusta joins e prefetches do queryset aos campos solicitados
+
+    Com ?fields= ou ?expand=, apenas as relações realmente serializadas
+    continuam em select_related/prefetch_related.
+    """
+
+    def trim_queryset_for_fields(self, queryset):
+        request = getattr(self, "request", None)
+        if request is None or getattr(self, "action", None) not in (
+            "list",
+            "retrieve",
+        ):
+            return queryset
+
+        fields, expand = get_requested_field_trees(request)
+        if fields is None and expand is None:
+            return queryset
+
+        serializer = self.get_serializer()
+        return trim_related_lookups(queryset, get_related_paths(serializer))
+
+
+class ConditionalListMixin:
+    """
+    GET condicional (If-None-Match) nas listagens
+
+    O validador é uma agregação barata do queryset filtrado: quantidade de
+    linhas e maior valor de cada campo em `conditional_list_fields`
+    (`updated_at` por padrão). Com a mesma combinação, mesma URL (filtros,
+    página, campos) e mesmo usuário, a listagem responde 304 sem executar a
+    consulta da página nem serializar. O ETag é fraco (a comparação também),
+    compatível com a compressão de resposta.
+
+    Campos de relações exibidas na listagem podem ser incluídos (ex:
+    "student__user__updated_at"); tupla vazia desativa. Relações
+    múltiplas usadas em campos calculados também entram (ex:
+    "attendances__updated_at" para um total de presenças): a contagem passa
+    a ser das linhas do join, e muda com inclusões e remoções.
+    """
+
+    conditional_list_fields: ClassVar = ("updated_at",)
+
+    def get_list_etag(self, request, queryset) -> str | None:
+        fields = self.conditional_list_fields
+        if not fields or not all(
+            hasattr(queryset.model, field.split("__")[0]) for field in fields
+        ):
+            return None
+
+        aggregates = {f"last_{index}": Max(field) for index, field in enumerate(fields)}
+        state = queryset.order_by().aggregate(count=Count("pk"), **aggregates)
+        accepted = getattr(request, "accepted_media_type", "")
+        key = "|".join(
+            str(part)
+            for part in (
+                connection.schema_name,
+                queryset.model._meta.label,
+                request.get_full_path(),
+                request.user.pk,
+                accepted,
+                # Campos calculados pela data (ex: dias em atraso)
+                timezone.localdate(),
+                *state.values(),
+            )
+        )
+        return f'W/"{hashlib.sha256(key.encode()).hexdigest()[:32]}"'
+
+    def list(self, request, *args, **kwargs):
+        etag = self.get_list_etag(request, self.filter_queryset(self.get_queryset()))
+        if etag:
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                not_modified["ETag"] = etag
+                patch_vary_headers(not_modified, ("Authorization",))
+                return not_modified
+
+        response = super().list(request, *args, **kwargs)
+        if etag:
+            response["ETag"] = etag
+            patch_vary_headers(response, ("Authorization",))
+        return response
+
+
+class TenantViewSet(
+    IdempotencyMixin,
+    ReplicaReadMixin,
+    BulkActionsMixin,
+    ConditionalListMixin,
+    SparseFieldsetQuerysetMixin,
+    viewsets.ModelViewSet,
+):
     """
     ViewSet base com isolamento de tenant
 
@@ -30,6 +182,10 @@ class TenantViewSet(viewsets.ModelViewSet):
     - Filtros e busca
     - Documentação automática
     - Permissões básicas
+    - Escritas idempotentes com o cabeçalho Idempotency-Key
+    - Criação, atualização e soft delete/restauração em lote
+    - Listagens com GET condicional (ETag / 304)
+    - Leituras (list, retrieve, stats) em réplica quando configurada
     """
 
     permission_classes: ClassVar = [TenantPermission]
@@ -52,7 +208,7 @@ class TenantViewSet(viewsets.ModelViewSet):
         if hasattr(queryset.model, "is_active"):
             queryset = queryset.filter(is_active=True)
 
-        return queryset
+        return self.trim_queryset_for_fields(queryset)
 
     def perform_create(self, serializer):
         """
@@ -135,7 +291,12 @@ class TenantViewSet(viewsets.ModelViewSet):
         return Response(stats_data)
 
 
-class ReadOnlyTenantViewSet(viewsets.ReadOnlyModelViewSet):
+class ReadOnlyTenantViewSet(
+    ReplicaReadMixin,
+    ConditionalListMixin,
+    SparseFieldsetQuerysetMixin,
+    viewsets.ReadOnlyModelViewSet,
+):
     """
     ViewSet base somente leitura com isolamento de tenant
 
@@ -162,4 +323,4 @@ class ReadOnlyTenantViewSet(viewsets.ReadOnlyModelViewSet):
         if hasattr(queryset.model, "is_active"):
             queryset = queryset.filter(is_active=True)
 
-        return queryset
+        return self.trim_queryset_for_fields(queryset)
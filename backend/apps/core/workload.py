@@ -0,0 +1,317 @@
+"""
+Isolamento de carga entre tenants
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- SEMPRE usar schema-per-tenant
+- Respostas consistentes para frontend
+
+Cada requisição é classificada pelo caminho (ex: "report" para relatórios
+e estatísticas, "default" para o restante). Por tenant e classe:
+- `statement_timeout` e `lock_timeout` do PostgreSQL são definidos quando o
+  TenantMiddleware seleciona o tenant e aplicados de forma preguiçosa, na
+  primeira consulta de cada conexão usada pela requisição (execute_wrapper
+  instalado via connection_created). Requisições que não usam o banco não
+  abrem conexão; o SET só é executado quando os valores mudam em relação
+  aos já aplicados na conexão. Ao fim da requisição (para respostas em
+  streaming, após o envio do corpo) os valores voltam ao padrão da sessão
+  (RESET) nas conexões em que foram aplicados: conexões persistentes não
+  levam o timeout de um tenant para trabalho sem timeout próprio
+  (caminhos isentos, schema público, comandos).
+- Um limite de requisições simultâneas é controlado em cache (vale para
+  todos os processos). Acima do limite, a requisição recebe 503 com
+  Retry-After, sem ocupar conexão do banco. A vaga é liberada ao fim da
+  resposta, também só após o envio do corpo em streaming.
+
+Limites por tenant sobrescrevem os padrões em TENANT_OVERRIDES (por slug).
+Os mesmos timeouts valem para as réplicas de leitura (apps.core.replicas).
+Health checks e ping ficam fora do TenantMiddleware (sem vaga nem SET).
+"""
+import logging
+import re
+from contextvars import ContextVar
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DatabaseError, connection
+from django.http import JsonResponse
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ENDPOINT_CLASSES = {
+    "report": (
+        r"^/api/v1/dashboard/",
+        r"^/api/v1/attendances/(series|heatmap)/",
+        r"^/api/v1/graduations/progression/",
+        r"/stats/$",
+    ),
+    "admin": (r"^/admin/",),
+}
+
+# Timeouts da requisição atual, repetidos nas réplicas usadas por ela
+_request_timeouts: ContextVar[tuple | None] = ContextVar(
+    "request_timeouts", default=None
+)
+_applying: ContextVar[bool] = ContextVar("workload_applying", default=False)
+# Conexões em que os timeouts da requisição foram aplicados
+_request_connections: ContextVar[list | None] = ContextVar(
+    "request_connections", default=None
+)
+
+
+def get_workload_settings() -> dict:
+    """Retorna configuração do isolamento de carga com valores padrão"""
+    config = getattr(settings, "TENANT_WORKLOAD", {})
+    return {
+        "ENABLED": config.get("ENABLED", True),
+        # Milissegundos por classe de endpoint (0 = sem limite)
+        "STATEMENT_TIMEOUT": {
+            "default": 10000,
+            "report": 30000,
+            "admin": 30000,
+            **config.get("STATEMENT_TIMEOUT", {}),
+        },
+        "LOCK_TIMEOUT": {
+            "default": 2000,
+            **config.get("LOCK_TIMEOUT", {}),
+        },
+        # Requisições simultâneas por tenant e classe (None = sem limite)
+        "MAX_CONCURRENT": {
+            "default": 30,
+            "report": 3,
+            **config.get("MAX_CONCURRENT", {}),
+        },
+        "ENDPOINT_CLASSES": {
+            **DEFAULT_ENDPOINT_CLASSES,
+            **config.get("ENDPOINT_CLASSES", {}),
+        },
+        "TENANT_OVERRIDES": config.get("TENANT_OVERRIDES", {}),
+        "RETRY_AFTER": config.get("RETRY_AFTER", 5),
+        # Validade da vaga ocupada (processo interrompido não prende a vaga)
+        "SLOT_TTL": config.get("SLOT_TTL", 60 * 5),
+    }
+
+
+@lru_cache(maxsize=32)
+def _compile(patterns: tuple) -> re.Pattern:
+    return re.compile("|".join(f"(?:{pattern})" for pattern in patterns))
+
+
+def classify_request(path: str, config: dict | None = None) -> str:
+    """Classe do endpoint pelo caminho ("default" se nenhuma casar)"""
+    config = config or get_workload_settings()
+    for name, patterns in config["ENDPOINT_CLASSES"].items():
+        if patterns and _compile(tuple(patterns)).search(path):
+            return name
+    return "default"
+
+
+def _limit(config: dict, option: str, tenant, endpoint_class: str):
+    overrides = config["TENANT_OVERRIDES"].get(getattr(tenant, "slug", None), {})
+    values = {**config[option], **overrides.get(option, {})}
+    return values.get(endpoint_class, values.get("default"))
+
+
+def get_timeouts(tenant, endpoint_class: str, config: dict | None = None) -> tuple:
+    """(statement_timeout, lock_timeout) em milissegundos"""
+    config = config or get_workload_settings()
+    return (
+        int(_limit(config, "STATEMENT_TIMEOUT", tenant, endpoint_class) or 0),
+        int(_limit(config, "LOCK_TIMEOUT", tenant, endpoint_class) or 0),
+    )
+
+
+def apply_timeouts(statement_timeout: int, lock_timeout: int, conn=None) -> bool:
+    """
+    Aplica os timeouts na sessão da conexão (padrão: a principal)
+
+    Os valores aplicados ficam registrados na conexão para evitar SETs
+    repetidos. Dentro de transação o SET pode ser desfeito por rollback:
+    o registro só passa a valer após o commit; até lá vale enquanto o
+    callback de on_commit estiver pendente (rollback, inclusive de
+    savepoint, descarta o callback).
+
+    Returns:
+        True se o SET foi executado
+    """
+    conn = conn or connection
+    timeouts = (statement_timeout, lock_timeout)
+    raw = conn.connection
+    marker = (id(raw), timeouts)
+    if raw is not None:
+        if getattr(conn, "_workload_timeouts", None) == marker:
+            return False
+        pending = getattr(conn, "_workload_pending", None)
+        if (
+            conn.in_atomic_block
+            and pending is not None
+            and pending[0] == marker
+            and any(func is pending[1] for _, func, _ in conn.run_on_commit)
+        ):
+            return False
+
+    token = _applying.set(True)
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('statement_timeout', %s, false), "
+                "set_config('lock_timeout', %s, false)",
+                [str(statement_timeout), str(lock_timeout)],
+            )
+    finally:
+        _applying.reset(token)
+
+    marker = (id(conn.connection), timeouts)
+    if conn.in_atomic_block:
+
+        def committed():
+            conn._workload_timeouts = marker
+
+        conn._workload_timeouts = None
+        conn._workload_pending = (marker, committed)
+        conn.on_commit(committed)
+    else:
+        conn._workload_timeouts = marker
+    return True
+
+
+def current_timeouts() -> tuple | None:
+    """(statement_timeout, lock_timeout) da requisição em andamento, se houver"""
+    return _request_timeouts.get()
+
+
+def reset_timeouts(conn) -> None:
+    """Volta statement_timeout e lock_timeout da sessão aos padrões"""
+    try:
+        if conn.connection is not None:
+            with conn.cursor() as cursor:
+                cursor.execute("RESET statement_timeout; RESET lock_timeout")
+    except DatabaseError as err:
+        # Sessão inutilizável (ex: transação abortada): não é reaproveitada
+        logger.warning(f"Falha ao restaurar timeouts da conexão {conn.alias}: {err}")
+        conn.close()
+    finally:
+        conn._workload_timeouts = None
+        conn._workload_pending = None
+
+
+def start_request_timeouts(tenant, endpoint_class: str, config: dict | None = None):
+    """Timeouts da requisição, aplicados na primeira consulta de cada conexão"""
+    _request_timeouts.set(get_timeouts(tenant, endpoint_class, config))
+    _request_connections.set([])
+
+
+def end_request_timeouts() -> None:
+    """Encerra os timeouts da requisição nas conexões em que foram aplicados"""
+    _request_timeouts.set(None)
+    connections = _request_connections.get() or ()
+    _request_connections.set(None)
+    for conn in connections:
+        reset_timeouts(conn)
+
+
+def workload_timeouts_wrapper(execute, sql, params, many, context):
+    """execute_wrapper: aplica os timeouts da requisição antes da consulta"""
+    timeouts = _request_timeouts.get()
+    if timeouts is not None and not _applying.get():
+        conn = context["connection"]
+        apply_timeouts(*timeouts, conn=conn)
+        applied = _request_connections.get()
+        if applied is not None and not any(item is conn for item in applied):
+            applied.append(conn)
+    return execute(sql, params, many, context)
+
+
+def install_workload_wrapper(sender=None, connection=None, **kwargs) -> None:
+    """Receiver de connection_created: instala o wrapper uma vez por conexão"""
+    if workload_timeouts_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, workload_timeouts_wrapper)
+
+
+def _slot_key(tenant, endpoint_class: str) -> str:
+    return f"workload-slots:{tenant.schema_name}:{endpoint_class}"
+
+
+def acquire_slot(tenant, endpoint_class: str, config: dict | None = None) -> bool:
+    """Ocupa uma vaga de execução do tenant; False acima do limite"""
+    config = config or get_workload_settings()
+    limit = _limit(config, "MAX_CONCURRENT", tenant, endpoint_class)
+    if limit is None:
+        return True
+
+    key = _slot_key(tenant, endpoint_class)
+    cache.add(key, 0, config["SLOT_TTL"])
+    try:
+        running = cache.incr(key)
+    except ValueError:
+        # Chave expirou entre o add e o incr
+        cache.set(key, 1, config["SLOT_TTL"])
+        running = 1
+    if running > limit:
+        release_slot(tenant, endpoint_class)
+        return False
+    return True
+
+
+def release_slot(tenant, endpoint_class: str) -> None:
+    try:
+        cache.decr(_slot_key(tenant, endpoint_class))
+    except ValueError:
+        # Vaga já expirada (SLOT_TTL)
+        pass
+
+
+class StreamFinalizer:
+    """
+    Corpo de resposta em streaming que executa `callback` ao ser fechado
+
+    O Django fecha o corpo ao fim do envio (response.close()), inclusive
+    quando o cliente desconecta no meio.
+    """
+
+    def __init__(self, content, callback):
+        self._content = content
+        self._callback = callback
+
+    def __iter__(self):
+        return iter(self._content)
+
+    def close(self) -> None:
+        callback, self._callback = self._callback, None
+        try:
+            close = getattr(self._content, "close", None)
+            if close is not None:
+                close()
+        finally:
+            if callback is not None:
+                callback()
+
+
+class AsyncStreamFinalizer(StreamFinalizer):
+    """StreamFinalizer para corpo assíncrono"""
+
+    def __aiter__(self):
+        return aiter(self._content)
+
+
+def finalize_after_stream(response, callback) -> None:
+    """Executa `callback` só depois que o corpo em streaming foi enviado"""
+    finalizer = AsyncStreamFinalizer if response.is_async else StreamFinalizer
+    response.streaming_content = finalizer(response.streaming_content, callback)
+
+
+def overloaded_response(config: dict | None = None) -> JsonResponse:
+    """503 padronizado para tenant acima do limite de concorrência"""
+    config = config or get_workload_settings()
+    response = JsonResponse(
+        {
+            "error": True,
+            "message": "Muitas requisições simultâneas para esta academia. "
+            "Tente novamente em instantes.",
+            "details": {"code": "tenant_overloaded"},
+            "status_code": 503,
+        },
+        status=503,
+    )
+    response["Retry-After"] = str(config["RETRY_AFTER"])
+    return response
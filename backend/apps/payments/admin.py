@@ -1,10 +1,14 @@
 from typing import ClassVar
 
 from django.contrib import admin
+from django.db.models import BooleanField, DateField, ExpressionWrapper, Q
+from django.db.models.functions import Cast, Now
 from django.utils.html import format_html
 from unfold.admin import ModelAdmin, TabularInline
 from unfold.decorators import display
 
+from apps.core.admin import OptimizedModelAdmin
+
 from .models import Invoice, Payment, PaymentMethod
 
 
@@ -48,7 +52,7 @@ class PaymentMethodAdmin(ModelAdmin):
 
 
 @admin.register(Invoice)
-class InvoiceAdmin(ModelAdmin):
+class InvoiceAdmin(OptimizedModelAdmin):
     list_display = [
         "student",
         "reference_month",
@@ -59,10 +63,26 @@ class InvoiceAdmin(ModelAdmin):
     ]
     list_filter = ["status", "due_date", "reference_month"]
     search_fields: ClassVar = ["student__user__first_name", "student__user__last_name"]
-    readonly_fields = ["id", "created_at", "updated_at", "total_amount", "is_overdue"]
+    readonly_fields = [
+        "id",
+        "created_at",
+        "updated_at",
+        "total_amount",
+        "paid_amount",
+        "is_overdue",
+    ]
     inlines = [PaymentInline]
     date_hierarchy = "due_date"
     list_per_page = 25
+    # Mesma regra de Invoice.is_overdue, calculada no banco (ordenável)
+    list_annotations: ClassVar = {
+        "get_overdue_display": {
+            "overdue": ExpressionWrapper(
+                Q(status="pending", due_date__lt=Cast(Now(), DateField())),
+                output_field=BooleanField(),
+            )
+        }
+    }
 
     @display(description="Valor", ordering="amount")
     def get_amount_display(self, obj):
@@ -83,13 +103,24 @@ class InvoiceAdmin(ModelAdmin):
             obj.get_status_display(),
         )
 
-    @display(description="Vencida", boolean=True, ordering="due_date")
+    @display(description="Vencida", boolean=True, ordering="overdue")
     def get_overdue_display(self, obj):
-        return obj.is_overdue
+        return obj.overdue
 
     fieldsets = (
         ("Fatura", {"fields": ("student", "reference_month", "due_date", "status")}),
-        ("Valores", {"fields": ("amount", "discount", "late_fee", "total_amount")}),
+        (
+            "Valores",
+            {
+                "fields": (
+                    "amount",
+                    "discount",
+                    "late_fee",
+                    "total_amount",
+                    "paid_amount",
+                )
+            },
+        ),
         ("Descrição", {"fields": ("description", "notes")}),
         (
             "Sistema",
@@ -102,7 +133,7 @@ class InvoiceAdmin(ModelAdmin):
 
 
 @admin.register(Payment)
-class PaymentAdmin(ModelAdmin):
+class PaymentAdmin(OptimizedModelAdmin):
     list_display = [
         "invoice",
         "payment_method",
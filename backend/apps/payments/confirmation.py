@@ -0,0 +1,198 @@
+"""
+Confirmação de pagamentos com total pago incremental por fatura
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- Valores financeiros sempre consistentes (transação única)
+- Operações em lote sem N+1
+
+Cada fatura guarda o total confirmado em `paid_amount`. Confirmar
+pagamentos é uma transação por lote: os pagamentos são travados e marcados
+como confirmados (apenas os pendentes), as faturas envolvidas
+são travadas em ordem de chave (evita deadlock entre lotes concorrentes) e
+recebem a soma do lote via `F()` em um único UPDATE. Confirmações
+concorrentes na mesma fatura são serializadas pelo lock da linha, sem
+reagregar os pagamentos já existentes.
+"""
+import logging
+
+from django.db import transaction
+from django.db.models import DecimalField, F, OuterRef, Subquery, Sum
+from django.utils import timezone
+
+from apps.core.dashboard import schedule_refresh
+from apps.core.pagination import bump_count_version
+
+from .models import Invoice, Payment
+
+logger = logging.getLogger(__name__)
+
+# Pagamentos confirmados por transação
+BATCH_SIZE = 1000
+
+# Status de fatura que passam a "paid" quando o total é atingido
+PAYABLE_STATUSES = ("pending", "overdue")
+
+
+def _bump_list_counts() -> None:
+    """Contagens das listagens em cache ficam desatualizadas após update()"""
+    bump_count_version(Payment._meta.db_table, Invoice._meta.db_table)
+
+
+def _lock_invoices(invoice_ids) -> None:
+    """Lock das faturas em ordem fixa (evita deadlock entre lotes)"""
+    list(
+        Invoice.objects.select_for_update()
+        .filter(pk__in=invoice_ids)
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+
+
+def _batch_total(payment_ids) -> Subquery:
+    """Subquery: soma dos pagamentos do lote por fatura"""
+    return Subquery(
+        Payment.objects.filter(invoice=OuterRef("pk"), pk__in=payment_ids)
+        .order_by()
+        .values("invoice")
+        .annotate(total=Sum("amount"))
+        .values("total"),
+        output_field=DecimalField(max_digits=10, decimal_places=2),
+    )
+
+
+def _confirm_batch(payment_ids, confirmed_at) -> tuple[list, list]:
+    """Confirma um lote de pagamentos em uma transação"""
+    with transaction.atomic():
+        claimed = list(
+            Payment.objects.select_for_update()
+            .filter(pk__in=payment_ids, is_active=True, status="pending")
+            .order_by("pk")
+            .values_list("pk", "invoice_id")
+        )
+        if not claimed:
+            return [], []
+
+        confirmed = [pk for pk, _ in claimed]
+        invoice_ids = sorted({invoice_id for _, invoice_id in claimed})
+
+        Payment.objects.filter(pk__in=confirmed).update(
+            status="confirmed", confirmed_date=confirmed_at, updated_at=confirmed_at
+        )
+
+        _lock_invoices(invoice_ids)
+        Invoice.objects.filter(pk__in=invoice_ids).update(
+            paid_amount=F("paid_amount") + _batch_total(confirmed),
+            updated_at=confirmed_at,
+        )
+
+        paid = list(
+            Invoice.objects.filter(
+                pk__in=invoice_ids,
+                status__in=PAYABLE_STATUSES,
+                paid_amount__gte=F("amount") - F("discount") + F("late_fee"),
+            )
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        if paid:
+            Invoice.objects.filter(pk__in=paid).update(
+                status="paid", updated_at=confirmed_at
+            )
+
+        # update() não dispara post_save: agenda o dashboard explicitamente
+        transaction.on_commit(lambda: schedule_refresh(("revenue", "overdue")))
+        _bump_list_counts()
+
+    return confirmed, paid
+
+
+def confirm_payments(payment_ids) -> dict:
+    """
+    Confirma pagamentos e atualiza o total pago das faturas
+
+    Apenas pagamentos pendentes são confirmados: já confirmados, com
+    falha, estornados, inexistentes ou removidos voltam em `skipped`, o
+    que torna a operação idempotente (lotes do gateway podem ser
+    reenviados) e impede somar de novo um pagamento estornado.
+
+    Args:
+        payment_ids: IDs dos pagamentos
+
+    Returns:
+        {"confirmed": [...], "skipped": [...], "paid_invoices": [...]}
+    """
+    payment_ids = list(dict.fromkeys(payment_ids))
+    confirmed_at = timezone.now()
+
+    confirmed, paid_invoices = [], []
+    for start in range(0, len(payment_ids), BATCH_SIZE):
+        batch_confirmed, batch_paid = _confirm_batch(
+            payment_ids[start : start + BATCH_SIZE], confirmed_at
+        )
+        confirmed.extend(batch_confirmed)
+        paid_invoices.extend(batch_paid)
+
+    confirmed_set = {str(pk) for pk in confirmed}
+    skipped = [pk for pk in payment_ids if str(pk) not in confirmed_set]
+    if confirmed:
+        logger.info(
+            f"{len(confirmed)} pagamentos confirmados, "
+            f"{len(paid_invoices)} faturas quitadas"
+        )
+    return {
+        "confirmed": confirmed,
+        "skipped": skipped,
+        "paid_invoices": paid_invoices,
+    }
+
+
+def revert_confirmations(payment_ids, status: str) -> list:
+    """
+    Desfaz confirmações (estorno ou falha informada pelo gateway)
+
+    Pagamentos confirmados passam para `status`, o valor sai do total pago
+    da fatura e faturas quitadas que ficaram abaixo do total voltam a
+    pendente. Pagamentos não confirmados são ignorados.
+
+    Returns:
+        IDs dos pagamentos revertidos
+    """
+    reverted_at = timezone.now()
+    reverted = []
+    payment_ids = list(dict.fromkeys(payment_ids))
+    for start in range(0, len(payment_ids), BATCH_SIZE):
+        with transaction.atomic():
+            claimed = list(
+                Payment.objects.select_for_update()
+                .filter(
+                    pk__in=payment_ids[start : start + BATCH_SIZE],
+                    is_active=True,
+                    status="confirmed",
+                )
+                .order_by("pk")
+                .values_list("pk", "invoice_id")
+            )
+            if not claimed:
+                continue
+
+            batch = [pk for pk, _ in claimed]
+            invoice_ids = sorted({invoice_id for _, invoice_id in claimed})
+
+            _lock_invoices(invoice_ids)
+            Invoice.objects.filter(pk__in=invoice_ids).update(
+                paid_amount=F("paid_amount") - _batch_total(batch),
+                updated_at=reverted_at,
+            )
+            Payment.objects.filter(pk__in=batch).update(
+                status=status, updated_at=reverted_at
+            )
+            Invoice.objects.filter(
+                pk__in=invoice_ids,
+                status="paid",
+                paid_amount__lt=F("amount") - F("discount") + F("late_fee"),
+            ).update(status="pending", updated_at=reverted_at)
+
+            transaction.on_commit(lambda: schedule_refresh(("revenue", "overdue")))
+            _bump_list_counts()
+            reverted.extend(batch)
+    return reverted
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("payments", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="invoice",
+            name="invoices_due_dat_4b5593_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="payment",
+            name="payments_payment_aebcb7_idx",
+        ),
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-due_date", "status"],
+                name="invoices_active_due_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="invoice",
+            index=models.Index(
+                condition=models.Q(("is_active", False)),
+                fields=["deleted_at"],
+                name="invoices_deleted_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-payment_date"],
+                name="payments_active_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="payment",
+            index=models.Index(
+                condition=models.Q(("is_active", False)),
+                fields=["deleted_at"],
+                name="payments_deleted_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:31
+
+from django.db import migrations, models
+from django.db.models import DecimalField, OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
+
+
+def backfill_paid_amount(apps, schema_editor):
+    """Preenche paid_amount com a soma dos pagamentos já confirmados"""
+    Invoice = apps.get_model("payments", "Invoice")
+    Payment = apps.get_model("payments", "Payment")
+
+    confirmed = (
+        Payment.objects.filter(invoice=OuterRef("pk"), status="confirmed")
+        .order_by()
+        .values("invoice")
+        .annotate(total=Sum("amount"))
+        .values("total")
+    )
+    Invoice.objects.update(
+        paid_amount=Coalesce(
+            Subquery(confirmed, output_field=DecimalField()),
+            0,
+            output_field=DecimalField(max_digits=10, decimal_places=2),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("payments", "0002_active_partial_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="invoice",
+            name="paid_amount",
+            field=models.DecimalField(
+                decimal_places=2,
+                default=0,
+                editable=False,
+                help_text="Total de pagamentos confirmados (mantido na confirmação)",
+                max_digits=10,
+            ),
+        ),
+        migrations.RunPython(backfill_paid_amount, migrations.RunPython.noop),
+    ]
@@ -52,6 +52,13 @@ class Invoice(BaseModel):
     )
     discount = models.DecimalField(max_digits=10, decimal_places=2, default=0)
     late_fee = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    paid_amount = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        default=0,
+        editable=False,
+        help_text="Total de pagamentos confirmados (mantido na confirmação)",
+    )
 
     # Status
     STATUS_CHOICES: ClassVar = [
@@ -74,13 +81,46 @@ class Invoice(BaseModel):
         unique_together: ClassVar = ["student", "reference_month"]
         indexes: ClassVar = [
             models.Index(fields=["student", "status"]),
-            models.Index(fields=["due_date", "status"]),
             models.Index(fields=["reference_month"]),
+            # Índices parciais: listagens filtram sempre is_active=True
+            models.Index(
+                fields=["-due_date", "status"],
+                name="invoices_active_due_idx",
+                condition=models.Q(is_active=True),
+            ),
+            # Varredura do arquivamento de registros removidos
+            models.Index(
+                fields=["deleted_at"],
+                name="invoices_deleted_idx",
+                condition=models.Q(is_active=False),
+            ),
         ]
 
+    str_select_related: ClassVar[tuple] = ("student",)
+
     def __str__(self):
         return f"{self.student.full_name} - {self.reference_month.strftime('%m/%Y')}"
 
+    def save(self, *args, **kwargs):
+        """
+        Salva sem gravar paid_amount em registros existentes
+
+        O total pago é mantido pela confirmação (UPDATE com F()); gravar o
+        valor em memória desfaria confirmações concorrentes (ex: PATCH da
+        fatura carregada antes do commit da confirmação).
+        """
+        if (
+            not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name != "paid_amount"
+            ]
+        super().save(*args, **kwargs)
+
     @property
     def total_amount(self):
         """Valor total com desconto e multa"""
@@ -137,26 +177,37 @@ class Payment(BaseModel):
         ordering: ClassVar = ["-payment_date"]
         indexes: ClassVar = [
             models.Index(fields=["invoice", "status"]),
-            models.Index(fields=["payment_date"]),
             models.Index(fields=["external_id"]),
+            # Índices parciais: listagens filtram sempre is_active=True
+            models.Index(
+                fields=["-payment_date"],
+                name="payments_active_date_idx",
+                condition=models.Q(is_active=True),
+            ),
+            # Varredura do arquivamento de registros removidos
+            models.Index(
+                fields=["deleted_at"],
+                name="payments_deleted_idx",
+                condition=models.Q(is_active=False),
+            ),
         ]
 
+    str_select_related: ClassVar[tuple] = ("invoice",)
+
     def __str__(self):
         return f"Pagamento {self.amount} - {self.invoice.student.full_name}"
 
     def confirm_payment(self):
-        """Confirma o pagamento e atualiza a fatura"""
-        from django.utils import timezone
-
-        self.status = "confirmed"
-        self.confirmed_date = timezone.now()
-        self.save()
-
-        # Atualizar status da fatura se valor total foi pago
-        total_paid = self.invoice.payments.filter(status="confirmed").aggregate(
-            total=models.Sum("amount")
-        )["total"] or Decimal("0")
-
-        if total_paid >= self.invoice.total_amount:
-            self.invoice.status = "paid"
-            self.invoice.save()
+        """
+        Confirma o pagamento e atualiza a fatura
+
+        Returns:
+            True se confirmado agora, False se já estava confirmado
+        """
+        from .confirmation import confirm_payments
+
+        result = confirm_payments([self.pk])
+        self.refresh_from_db(fields=["status", "confirmed_date", "updated_at"])
+        if "invoice" in self._state.fields_cache:
+            self.invoice.refresh_from_db(fields=["paid_amount", "status"])
+        return bool(result["confirmed"])
@@ -0,0 +1,337 @@
+"""
+Conciliação de extratos do gateway de pagamento
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- Operações em lote sem N+1
+- Memória limitada independente do tamanho do arquivo
+
+O arquivo de liquidação (CSV ou OFX) é lido em streaming, linha a linha,
+e processado em lotes de BATCH_SIZE: cada lote faz uma consulta por
+`external_id` (indexado), atualiza taxa/status com `bulk_update` e
+confirma pagamentos pelo mesmo caminho de `confirm_payments` (total pago
+da fatura incremental). O relatório guarda contadores e apenas as
+primeiras MAX_REPORTED_ROWS linhas problemáticas.
+
+Arquivo ilegível (codificação errada, CSV malformado) interrompe a leitura
+com ReconciliationError, que leva o relatório dos lotes já aplicados.
+"""
+import csv
+import io
+import logging
+import re
+from decimal import Decimal, InvalidOperation
+from itertools import islice
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.core.pagination import bump_count_version
+
+from .confirmation import confirm_payments, revert_confirmations
+from .models import Payment
+
+logger = logging.getLogger(__name__)
+
+# Status do gateway → status do pagamento
+DEFAULT_STATUS_MAP = {
+    "paid": "confirmed",
+    "approved": "confirmed",
+    "settled": "confirmed",
+    "confirmed": "confirmed",
+    "failed": "failed",
+    "declined": "failed",
+    "refused": "failed",
+    "refunded": "refunded",
+    "chargeback": "refunded",
+}
+
+# Nomes aceitos para as colunas do CSV
+CSV_COLUMNS = {
+    "external_id": ("external_id", "transaction_id", "id"),
+    "status": ("status",),
+    "amount": ("amount", "valor"),
+    "fee": ("fee", "processing_fee", "taxa"),
+}
+
+OFX_TAG = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+# Codificações aceitas para o arquivo (extratos antigos vêm em cp1252)
+ENCODINGS = ("utf-8-sig", "cp1252", "latin-1")
+
+
+class ReconciliationError(Exception):
+    """Arquivo de conciliação inválido"""
+
+    def __init__(self, message: str, report: dict | None = None):
+        super().__init__(message)
+        # Relatório dos lotes aplicados antes do erro, se houver
+        self.report = report
+
+
+def get_reconciliation_settings() -> dict:
+    """Retorna configuração da conciliação com valores padrão"""
+    config = getattr(settings, "PAYMENT_RECONCILIATION", {})
+    return {
+        "BATCH_SIZE": config.get("BATCH_SIZE", 1000),
+        "MAX_REPORTED_ROWS": config.get("MAX_REPORTED_ROWS", 100),
+        "STATUS_MAP": {**DEFAULT_STATUS_MAP, **config.get("STATUS_MAP", {})},
+    }
+
+
+def _decimal(value) -> Decimal | None:
+    if value is None or str(value).strip() == "":
+        return None
+    text = str(value).strip()
+    # Separador decimal: o último entre "," e "." (1.234,56 ou 1,234.56);
+    # repetido, é separador de milhar (1.234.567)
+    decimal = "," if text.rfind(",") > text.rfind(".") else "."
+    thousands = "." if decimal == "," else ","
+    if text.count(decimal) > 1:
+        text = text.replace(decimal, "")
+    text = text.replace(thousands, "").replace(decimal, ".")
+    try:
+        return Decimal(text)
+    except InvalidOperation as err:
+        raise ValueError(f"valor inválido: {value}") from err
+
+
+def _text_stream(stream, encoding: str = "utf-8-sig"):
+    """Garante leitura em texto (arquivos enviados chegam em bytes)"""
+    if isinstance(stream, io.TextIOBase):
+        return stream
+    return io.TextIOWrapper(stream, encoding=encoding, newline="")
+
+
+def iter_csv_rows(stream, encoding: str = "utf-8-sig"):
+    """
+    Linhas normalizadas de um CSV de liquidação
+
+    Delimitador (vírgula ou ponto e vírgula) detectado pelo cabeçalho.
+    """
+    stream = _text_stream(stream, encoding)
+    header = stream.readline()
+    delimiter = ";" if header.count(";") > header.count(",") else ","
+    fields = [
+        name.strip().lower() for name in next(csv.reader([header], delimiter=delimiter))
+    ]
+
+    columns = {}
+    for key, aliases in CSV_COLUMNS.items():
+        columns[key] = next((alias for alias in aliases if alias in fields), None)
+    if columns["external_id"] is None:
+        raise ReconciliationError("CSV sem coluna external_id")
+
+    reader = csv.DictReader(stream, fieldnames=fields, delimiter=delimiter)
+    for line, row in enumerate(reader, start=2):
+        yield (
+            line,
+            {
+                key: (row.get(column) or "").strip() if column else ""
+                for key, column in columns.items()
+            },
+        )
+
+
+def iter_ofx_rows(stream, encoding: str = "utf-8-sig"):
+    """
+    Transações (<STMTTRN>) de um extrato OFX
+
+    OFX não informa status nem taxa: transações listadas são liquidadas.
+    """
+    current = None
+    for line, text in enumerate(_text_stream(stream, encoding), start=1):
+        for tag, value in OFX_TAG.findall(text):
+            tag = tag.upper()
+            if tag == "STMTTRN":
+                current = {"line": line, "external_id": "", "amount": ""}
+            elif current is not None and tag == "FITID":
+                current["external_id"] = value.strip()
+            elif current is not None and tag == "TRNAMT":
+                current["amount"] = value.strip()
+        if current is not None and "</STMTTRN>" in text.upper():
+            yield current.pop("line"), {**current, "status": "paid", "fee": ""}
+            current = None
+
+
+PARSERS = {"csv": iter_csv_rows, "ofx": iter_ofx_rows}
+
+
+class Reconciliation:
+    """Acumula o resultado da conciliação com listas limitadas"""
+
+    def __init__(self, max_reported: int, track_outcomes: bool = False):
+        self.max_reported = max_reported
+        # Problema de cada linha (line -> (kind, detail)), quando rastreado
+        self.outcomes = {} if track_outcomes else None
+        self.counts = dict.fromkeys(
+            ("rows", "matched", "confirmed", "reverted", "updated", "unchanged"), 0
+        )
+        self.problems = {"unmatched": [], "mismatched": [], "errors": []}
+        self.problem_counts = dict.fromkeys(self.problems, 0)
+
+    def report(self, kind: str, line: int, external_id: str, detail: str = ""):
+        self.problem_counts[kind] += 1
+        if self.outcomes is not None:
+            self.outcomes[line] = (kind, detail)
+        if len(self.problems[kind]) < self.max_reported:
+            entry = {"line": line, "external_id": external_id}
+            if detail:
+                entry["detail"] = detail
+            self.problems[kind].append(entry)
+
+    def as_dict(self) -> dict:
+        return {
+            **self.counts,
+            **{f"{kind}_count": count for kind, count in self.problem_counts.items()},
+            **self.problems,
+        }
+
+
+def reconcile_rows(rows, result: Reconciliation, status_map: dict) -> None:
+    """
+    Concilia um lote de linhas (uma consulta por external_id)
+
+    Args:
+        rows: Pares (line, row) com external_id, status, amount e fee
+        result: Acumulador do resultado
+        status_map: Status do gateway -> status do pagamento
+    """
+    payments = {}
+    duplicated = set()
+    for payment in Payment.objects.filter(
+        external_id__in={row["external_id"] for _, row in rows}, is_active=True
+    ).only("id", "external_id", "amount", "status", "processing_fee"):
+        if payment.external_id in payments:
+            duplicated.add(payment.external_id)
+        payments[payment.external_id] = payment
+
+    to_fee, to_confirm = [], []
+    to_status, to_revert = {}, {}
+    for line, row in rows:
+        external_id = row["external_id"]
+        payment = payments.get(external_id)
+        if payment is None:
+            result.report("unmatched", line, external_id)
+            continue
+        if external_id in duplicated:
+            result.report("mismatched", line, external_id, "external_id duplicado")
+            continue
+
+        try:
+            amount = _decimal(row["amount"])
+            fee = _decimal(row["fee"])
+        except ValueError as err:
+            result.report("errors", line, external_id, str(err))
+            continue
+        if amount is not None and abs(amount) != payment.amount:
+            result.report(
+                "mismatched", line, external_id, f"valor {amount} != {payment.amount}"
+            )
+            continue
+
+        status = status_map.get(row["status"].lower()) if row["status"] else None
+        if row["status"] and status is None:
+            result.report("errors", line, external_id, f"status {row['status']}")
+            continue
+
+        if status == "confirmed" and payment.status not in ("pending", "confirmed"):
+            # Falha/estorno não volta a somar no total pago da fatura
+            result.report(
+                "mismatched", line, external_id, f"pagamento {payment.status}"
+            )
+            continue
+
+        result.counts["matched"] += 1
+        changed = False
+        if fee is not None and fee != payment.processing_fee:
+            payment.processing_fee = fee
+            to_fee.append(payment)
+            changed = True
+        if status == "confirmed" and payment.status != "confirmed":
+            to_confirm.append(payment.pk)
+            changed = True
+        elif status in ("failed", "refunded") and payment.status != status:
+            target = to_revert if payment.status == "confirmed" else to_status
+            target.setdefault(status, []).append(payment.pk)
+            changed = True
+        if not changed:
+            result.counts["unchanged"] += 1
+
+    now = timezone.now()
+    if to_fee:
+        for payment in to_fee:
+            payment.updated_at = now
+        # Apenas a taxa: status é alterado por UPDATE condicional abaixo
+        Payment.objects.bulk_update(to_fee, ["processing_fee", "updated_at"])
+    updated = {payment.pk for payment in to_fee}
+    for status, payment_ids in to_status.items():
+        # Condicional: não sobrescreve confirmação concorrente
+        Payment.objects.filter(pk__in=payment_ids).exclude(status="confirmed").update(
+            status=status, updated_at=now
+        )
+        updated.update(payment_ids)
+    result.counts["updated"] += len(updated)
+    if updated:
+        # bulk_update/update() não disparam post_save
+        bump_count_version(Payment._meta.db_table)
+
+    if to_confirm:
+        result.counts["confirmed"] += len(confirm_payments(to_confirm)["confirmed"])
+    for status, payment_ids in to_revert.items():
+        result.counts["reverted"] += len(revert_confirmations(payment_ids, status))
+
+
+def reconcile(stream, file_format: str = "csv", encoding: str = "utf-8-sig") -> dict:
+    """
+    Concilia um arquivo de liquidação com os pagamentos do schema atual
+
+    Args:
+        stream: Arquivo (texto ou binário) aberto para leitura
+        file_format: "csv" ou "ofx"
+        encoding: Codificação de arquivo binário (ver ENCODINGS)
+
+    Returns:
+        Contadores (rows, matched, confirmed, reverted, updated, unchanged,
+        *_count) e amostras de linhas unmatched/mismatched/errors
+
+    Raises:
+        ReconciliationError: Formato inválido ou arquivo ilegível; neste
+            caso `report` traz o resultado dos lotes já aplicados
+    """
+    if file_format not in PARSERS:
+        raise ReconciliationError(f"Formato não suportado: {file_format}")
+    if encoding not in ENCODINGS:
+        raise ReconciliationError(f"Codificação não suportada: {encoding}")
+
+    config = get_reconciliation_settings()
+    result = Reconciliation(config["MAX_REPORTED_ROWS"])
+    rows = PARSERS[file_format](stream, encoding)
+
+    while True:
+        try:
+            chunk = list(islice(rows, config["BATCH_SIZE"]))
+        except (UnicodeDecodeError, csv.Error) as err:
+            # Lotes anteriores já foram aplicados: relata até onde chegou
+            raise ReconciliationError(
+                f"Arquivo ilegível após {result.counts['rows']} linha(s) "
+                f"({encoding}): {err}",
+                report=result.as_dict(),
+            ) from err
+        if not chunk:
+            break
+        result.counts["rows"] += len(chunk)
+        batch = []
+        for line, row in chunk:
+            if row["external_id"]:
+                batch.append((line, row))
+            else:
+                result.report("errors", line, "", "external_id vazio")
+        if batch:
+            reconcile_rows(batch, result, config["STATUS_MAP"])
+
+    report = result.as_dict()
+    logger.info(
+        f"Conciliação: {report['rows']} linhas, {report['matched']} conciliadas, "
+        f"{report['unmatched_count']} sem pagamento"
+    )
+    return report
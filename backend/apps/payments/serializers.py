@@ -6,10 +6,8 @@ Seguindo padrões estabelecidos no CONTEXT.md:
 - Validações rigorosas financeiras
 - Campos de auditoria padronizados
 """
-from decimal import Decimal
 from typing import ClassVar
 
-from django.db import models
 from django.utils import timezone
 from drf_spectacular.utils import extend_schema_field
 from rest_framework import serializers
@@ -18,6 +16,7 @@ from apps.core.serializers import BaseModelSerializer
 from apps.students.serializers import StudentSerializer
 
 from .models import Invoice, Payment, PaymentMethod
+from .reconciliation import ENCODINGS
 
 
 class PaymentMethodSerializer(BaseModelSerializer):
@@ -87,14 +86,12 @@ class InvoiceSerializer(BaseModelSerializer):
     @extend_schema_field(serializers.DecimalField(max_digits=10, decimal_places=2))
     def get_total_paid(self, obj):
         """Total pago"""
-        return obj.payments.filter(status="confirmed").aggregate(
-            total=models.Sum("amount")
-        )["total"] or Decimal("0")
+        return obj.paid_amount
 
     @extend_schema_field(serializers.DecimalField(max_digits=10, decimal_places=2))
     def get_remaining_amount(self, obj):
         """Valor restante"""
-        return obj.total_amount - self.get_total_paid(obj)
+        return obj.total_amount - obj.paid_amount
 
     @extend_schema_field(serializers.BooleanField())
     def get_is_overdue(self, obj):
@@ -266,8 +263,13 @@ class PaymentSerializer(BaseModelSerializer):
             "net_amount",
             "is_confirmed",
         ]
+        # Status, valor e confirmação mudam apenas por confirm/bulk-confirm,
+        # conciliação e webhooks (mantêm o total pago da fatura)
         read_only_fields: ClassVar = [
             "id",
+            "amount",
+            "confirmed_date",
+            "status",
             "created_at",
             "updated_at",
             "status_display",
@@ -343,6 +345,36 @@ class ConfirmPaymentSerializer(serializers.Serializer):
         fields: ClassVar = ["external_id", "notes"]
 
 
+class BulkConfirmPaymentSerializer(serializers.Serializer):
+    """
+    Serializer para confirmação de pagamentos em lote
+    """
+
+    payment_ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=10000,
+        help_text="IDs dos pagamentos a confirmar",
+    )
+
+
+class BulkConfirmResultSerializer(serializers.Serializer):
+    """
+    Serializer para resultado da confirmação em lote
+    """
+
+    confirmed = serializers.ListField(
+        child=serializers.UUIDField(), help_text="Pagamentos confirmados"
+    )
+    skipped = serializers.ListField(
+        child=serializers.UUIDField(),
+        help_text="Pagamentos ignorados (não pendentes ou inexistentes)",
+    )
+    paid_invoices = serializers.ListField(
+        child=serializers.UUIDField(), help_text="Faturas quitadas pelo lote"
+    )
+
+
 class InvoiceStatsSerializer(serializers.Serializer):
     """
     Serializer para estatísticas de faturas
@@ -370,3 +402,53 @@ class InvoiceStatsSerializer(serializers.Serializer):
             "count_paid",
             "count_overdue",
         ]
+
+
+class ReconciliationUploadSerializer(serializers.Serializer):
+    """
+    Serializer para envio de arquivo de conciliação do gateway
+    """
+
+    file = serializers.FileField(help_text="Arquivo de liquidação (CSV ou OFX)")
+    format = serializers.ChoiceField(
+        choices=["csv", "ofx"],
+        required=False,
+        help_text="Formato do arquivo (padrão: pela extensão)",
+    )
+    encoding = serializers.ChoiceField(
+        choices=ENCODINGS,
+        default=ENCODINGS[0],
+        help_text="Codificação do arquivo",
+    )
+
+    def validate(self, attrs):
+        """Deduz o formato pela extensão quando não informado"""
+        if "format" not in attrs:
+            name = attrs["file"].name.lower()
+            attrs["format"] = "ofx" if name.endswith(".ofx") else "csv"
+        return attrs
+
+
+class ReconciliationResultSerializer(serializers.Serializer):
+    """
+    Serializer para resultado da conciliação
+    """
+
+    rows = serializers.IntegerField(help_text="Linhas lidas")
+    matched = serializers.IntegerField(help_text="Linhas conciliadas")
+    confirmed = serializers.IntegerField(help_text="Pagamentos confirmados")
+    reverted = serializers.IntegerField(help_text="Confirmações estornadas")
+    updated = serializers.IntegerField(help_text="Pagamentos com taxa/status")
+    unchanged = serializers.IntegerField(help_text="Pagamentos já conciliados")
+    unmatched_count = serializers.IntegerField(help_text="Linhas sem pagamento")
+    mismatched_count = serializers.IntegerField(help_text="Linhas divergentes")
+    errors_count = serializers.IntegerField(help_text="Linhas inválidas")
+    unmatched = serializers.ListField(
+        child=serializers.DictField(), help_text="Amostra de linhas sem pagamento"
+    )
+    mismatched = serializers.ListField(
+        child=serializers.DictField(), help_text="Amostra de linhas divergentes"
+    )
+    errors = serializers.ListField(
+        child=serializers.DictField(), help_text="Amostra de linhas inválidas"
+    )
@@ -0,0 +1,29 @@
+"""
+Tarefas em background do sistema financeiro
+
+O processamento dos webhooks roda no schema público (a inbox é global) e
+aplica cada evento no schema do seu tenant.
+"""
+from celery import shared_task
+from django.conf import settings
+from django.db import InterfaceError, OperationalError
+from django_tenants.utils import schema_context
+
+
+@shared_task(
+    name="payments.process_payment_webhooks",
+    autoretry_for=(OperationalError, InterfaceError),
+    retry_backoff=True,
+    max_retries=5,
+)
+def process_payment_webhooks() -> dict:
+    """
+    Processa os webhooks de pagamento pendentes
+
+    Agendada a cada webhook recebido (com debounce); cada execução agenda
+    a seguinte para a próxima nova tentativa pendente.
+    """
+    from .webhooks import process_pending_events
+
+    with schema_context(settings.PUBLIC_SCHEMA_NAME):
+        return process_pending_events()
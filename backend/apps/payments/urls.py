@@ -4,7 +4,12 @@ URLs para sistema financeiro
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
-from .views import InvoiceViewSet, PaymentMethodViewSet, PaymentViewSet
+from .views import (
+    InvoiceViewSet,
+    PaymentMethodViewSet,
+    PaymentViewSet,
+    payment_webhook,
+)
 
 app_name = "payments"
 
@@ -16,4 +21,9 @@ router.register(r"payments", PaymentViewSet, basename="payments")
 
 urlpatterns = [
     path("", include(router.urls)),
+    path(
+        "webhooks/payments/<slug:gateway>/<slug:tenant_slug>/",
+        payment_webhook,
+        name="payment-webhook",
+    ),
 ]
@@ -9,17 +9,28 @@ Seguindo padrões estabelecidos no CONTEXT.md:
 from decimal import Decimal
 from typing import ClassVar
 
+from django.db import transaction
 from django.db.models import Sum
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import status
-from rest_framework.decorators import action
+from rest_framework.decorators import (
+    action,
+    api_view,
+    authentication_classes,
+    permission_classes,
+)
+from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
 from apps.core.permissions import CanManagePayments, IsAdminOrReadOnly
 from apps.core.viewsets import TenantViewSet
 
+from .confirmation import confirm_payments, revert_confirmations
 from .models import Invoice, Payment, PaymentMethod
+from .reconciliation import ReconciliationError, reconcile
 from .serializers import (
+    BulkConfirmPaymentSerializer,
+    BulkConfirmResultSerializer,
     ConfirmPaymentSerializer,
     InvoiceCreateSerializer,
     InvoiceSerializer,
@@ -27,6 +38,16 @@ from .serializers import (
     PaymentCreateSerializer,
     PaymentMethodSerializer,
     PaymentSerializer,
+    ReconciliationResultSerializer,
+    ReconciliationUploadSerializer,
+)
+from .webhooks import (
+    WebhookError,
+    get_webhook_settings,
+    ingest_event,
+    schedule_processing,
+    tenant_id_for_slug,
+    verify_signature,
 )
 
 
@@ -58,9 +79,7 @@ class PaymentMethodViewSet(TenantViewSet):
 class InvoiceViewSet(TenantViewSet):
     """ViewSet para faturas"""
 
-    queryset = Invoice.objects.select_related("student__user").prefetch_related(
-        "payments"
-    )
+    queryset = Invoice.objects.select_related("student__user")
     serializer_class = InvoiceSerializer
     permission_classes: ClassVar = [CanManagePayments]
     search_fields: ClassVar = [
@@ -71,6 +90,12 @@ class InvoiceViewSet(TenantViewSet):
     filterset_fields: ClassVar = ["status", "due_date", "reference_month"]
     ordering_fields: ClassVar = ["due_date", "amount", "created_at"]
     ordering: ClassVar = ["-due_date"]
+    # Aluno aninhado na listagem entra no ETag
+    conditional_list_fields: ClassVar = (
+        "updated_at",
+        "student__updated_at",
+        "student__user__updated_at",
+    )
 
     def get_serializer_class(self):
         if self.action == "create":
@@ -127,12 +152,33 @@ class PaymentViewSet(TenantViewSet):
     filterset_fields: ClassVar = ["status", "payment_method", "payment_date"]
     ordering_fields: ClassVar = ["payment_date", "amount", "created_at"]
     ordering: ClassVar = ["-payment_date"]
+    conditional_list_fields: ClassVar = ("updated_at", "invoice__updated_at")
 
     def get_serializer_class(self):
         if self.action == "create":
             return PaymentCreateSerializer
         return PaymentSerializer
 
+    def perform_destroy(self, instance):
+        """Soft delete; pagamento confirmado é estornado do total pago da fatura"""
+        with transaction.atomic():
+            if instance.status == "confirmed":
+                revert_confirmations([instance.pk], "refunded")
+                instance.refresh_from_db(fields=["status", "updated_at"])
+            super().perform_destroy(instance)
+
+    def perform_bulk_destroy(self, instances):
+        """Soft delete em lote: estorna os confirmados antes de remover"""
+        reverted = set(
+            revert_confirmations(
+                [obj.pk for obj in instances if obj.status == "confirmed"],
+                "refunded",
+            )
+        )
+        for instance in instances:
+            if instance.pk in reverted:
+                instance.status = "refunded"
+
     @extend_schema(
         summary="Confirmar pagamento",
         description="Confirma um pagamento pendente",
@@ -150,8 +196,109 @@ class PaymentViewSet(TenantViewSet):
                 {"error": "Pagamento já foi confirmado"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
+        if payment.status != "pending":
+            return Response(
+                {"error": "Apenas pagamentos pendentes podem ser confirmados"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        payment.confirm_payment()
+        if not payment.confirm_payment():
+            # Confirmado por outra requisição concorrente
+            return Response(
+                {"error": "Pagamento já foi confirmado"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         serializer = PaymentSerializer(payment, context={"request": request})
         return Response(serializer.data)
+
+    @extend_schema(
+        summary="Confirmar pagamentos em lote",
+        description=(
+            "Confirma vários pagamentos (ex: lote de liquidação do gateway) "
+            "atualizando o total pago das faturas. Apenas pendentes são "
+            "confirmados; os demais voltam em skipped, então o lote pode ser "
+            "reenviado."
+        ),
+        request=BulkConfirmPaymentSerializer,
+        responses={200: BulkConfirmResultSerializer},
+        tags=["payments"],
+    )
+    @action(detail=False, methods=["post"], url_path="bulk-confirm")
+    def bulk_confirm(self, request):
+        """Confirma pagamentos em lote"""
+        serializer = BulkConfirmPaymentSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        result = confirm_payments(serializer.validated_data["payment_ids"])
+        return Response(BulkConfirmResultSerializer(result).data)
+
+    @extend_schema(
+        summary="Conciliar extrato do gateway",
+        description=(
+            "Lê o arquivo de liquidação (CSV ou OFX) em streaming e concilia "
+            "por external_id: confirma pagamentos, atualiza taxa e status e "
+            "lista linhas sem pagamento correspondente."
+        ),
+        request={"multipart/form-data": ReconciliationUploadSerializer},
+        responses={200: ReconciliationResultSerializer},
+        tags=["payments"],
+    )
+    @action(detail=False, methods=["post"])
+    def reconcile(self, request):
+        """Concilia arquivo de liquidação do gateway"""
+        serializer = ReconciliationUploadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        data = serializer.validated_data
+        try:
+            report = reconcile(
+                data["file"].open("rb"), data["format"], data["encoding"]
+            )
+        except ReconciliationError as err:
+            error = {"error": str(err)}
+            if err.report is not None:
+                # Lotes anteriores ao erro já foram aplicados
+                error["report"] = ReconciliationResultSerializer(err.report).data
+            return Response(error, status=status.HTTP_400_BAD_REQUEST)
+        return Response(ReconciliationResultSerializer(report).data)
+
+
+@extend_schema(
+    summary="Webhook do gateway de pagamento",
+    description=(
+        "Recebe eventos do gateway assinados (HMAC-SHA256 do corpo), grava na "
+        "caixa de entrada e responde 202. O processamento é assíncrono, em "
+        "ordem por external_id; reenvios do mesmo evento são ignorados."
+    ),
+    request=None,
+    responses={202: None},
+    tags=["payments"],
+)
+@api_view(["POST"])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def payment_webhook(request, gateway, tenant_slug):
+    """Recebe webhook do gateway de pagamento"""
+    config = get_webhook_settings()
+    body = request.body
+    if not verify_signature(
+        body, request.headers.get(config["SIGNATURE_HEADER"], ""), config["SECRET"]
+    ):
+        return Response(
+            {"error": "Assinatura inválida"}, status=status.HTTP_401_UNAUTHORIZED
+        )
+
+    tenant_id = tenant_id_for_slug(tenant_slug)
+    if tenant_id is None:
+        return Response(
+            {"error": "Academia não encontrada"}, status=status.HTTP_404_NOT_FOUND
+        )
+
+    try:
+        ingest_event(tenant_id, gateway, body)
+    except WebhookError as err:
+        return Response({"error": str(err)}, status=status.HTTP_400_BAD_REQUEST)
+
+    schedule_processing()
+    return Response({"status": "accepted"}, status=status.HTTP_202_ACCEPTED)
@@ -0,0 +1,377 @@
+"""
+Webhooks do gateway de pagamento com caixa de entrada (inbox)
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- SEMPRE usar schema-per-tenant
+- Operações em lote sem N+1
+
+O webhook é autenticado por assinatura HMAC-SHA256 do corpo, gravado na
+tabela `payment_webhook_events` (schema público) com um único
+INSERT ... ON CONFLICT DO NOTHING e respondido com 202. Reenvios do mesmo
+evento (tenant, gateway, event_id) são descartados pelo próprio INSERT.
+
+O processamento em background aplica os eventos pendentes no schema de
+cada tenant pelo mesmo caminho da conciliação (`reconcile_rows`), em
+rodadas com no máximo um evento por external_id: eventos da mesma
+transação são aplicados na ordem em que ocorreram no gateway. Evento sem
+pagamento correspondente (webhook chegou antes do pagamento ser criado)
+volta para a fila com espera crescente e segura os eventos seguintes da
+mesma transação até ser aplicado ou esgotar as tentativas. Evento que
+chega depois de um evento mais recente da mesma transação já aplicado
+(ex: payment.paid atrasado após payment.refunded) é marcado como ignorado.
+"""
+import hashlib
+import hmac
+import json
+import logging
+import math
+from collections import defaultdict, deque
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Exists, Max, OuterRef
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from django_tenants.utils import tenant_context
+
+from apps.tenants.models import PaymentWebhookEvent, Tenant
+
+from .reconciliation import Reconciliation, reconcile_rows
+
+logger = logging.getLogger(__name__)
+
+# Tipo do evento no gateway → status do pagamento
+DEFAULT_EVENT_STATUS_MAP = {
+    "payment.paid": "confirmed",
+    "payment.confirmed": "confirmed",
+    "payment.settled": "confirmed",
+    "payment.failed": "failed",
+    "payment.declined": "failed",
+    "payment.refunded": "refunded",
+    "payment.chargeback": "refunded",
+}
+
+SCHEDULED_KEY = "payment-webhooks-scheduled"
+LOCK_KEY = "payment-webhooks-processing"
+
+
+class WebhookError(Exception):
+    """Corpo de webhook inválido"""
+
+
+def get_webhook_settings() -> dict:
+    """Retorna configuração dos webhooks de pagamento com valores padrão"""
+    config = getattr(settings, "PAYMENT_WEBHOOKS", {})
+    return {
+        "SECRET": config.get("SECRET", ""),
+        "SIGNATURE_HEADER": config.get("SIGNATURE_HEADER", "X-Webhook-Signature"),
+        "BATCH_SIZE": config.get("BATCH_SIZE", 500),
+        "MAX_ATTEMPTS": config.get("MAX_ATTEMPTS", 10),
+        "RETRY_DELAY": config.get("RETRY_DELAY", 60),
+        "DEBOUNCE": config.get("DEBOUNCE", 2),
+        "LOCK_TIMEOUT": config.get("LOCK_TIMEOUT", 60 * 10),
+        "TENANT_CACHE_TTL": config.get("TENANT_CACHE_TTL", 60 * 5),
+        "EVENT_STATUS_MAP": {
+            **DEFAULT_EVENT_STATUS_MAP,
+            **config.get("EVENT_STATUS_MAP", {}),
+        },
+    }
+
+
+def verify_signature(body: bytes, signature: str, secret: str) -> bool:
+    """
+    Confere a assinatura HMAC-SHA256 (hex) do corpo
+
+    Aceita o formato "sha256=<hex>". Sem segredo configurado, nenhuma
+    assinatura é válida.
+    """
+    if not secret or not signature:
+        return False
+    signature = signature.strip().removeprefix("sha256=")
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature)
+
+
+def parse_event(body: bytes) -> dict:
+    """
+    Campos da inbox extraídos do corpo do webhook
+
+    Formato esperado: {"id", "type", "created_at", "data": {"external_id",
+    "amount", "fee"}}.
+    """
+    try:
+        payload = json.loads(body)
+    except (TypeError, ValueError) as err:
+        raise WebhookError("JSON inválido") from err
+    if not isinstance(payload, dict):
+        raise WebhookError("Corpo deve ser um objeto JSON")
+
+    event_id = str(payload.get("id") or "").strip()
+    event_type = str(payload.get("type") or "").strip().lower()
+    if not event_id or not event_type:
+        raise WebhookError("Campos obrigatórios: id, type")
+
+    data = payload.get("data") if isinstance(payload.get("data"), dict) else {}
+    occurred_at = payload.get("created_at")
+    return {
+        "event_id": event_id[:255],
+        "event_type": event_type[:100],
+        "external_id": str(data.get("external_id") or "").strip()[:255],
+        "occurred_at": parse_datetime(occurred_at)
+        if isinstance(occurred_at, str)
+        else None,
+        "payload": payload,
+    }
+
+
+def tenant_id_for_slug(slug: str):
+    """ID do tenant ativo pelo slug (em cache: o webhook não consulta o tenant)"""
+    key = f"payment-webhook-tenant:{slug}"
+    tenant_id = cache.get(key)
+    if tenant_id is None:
+        tenant_id = (
+            Tenant.objects.filter(slug=slug, is_active=True)
+            .values_list("pk", flat=True)
+            .first()
+        )
+        if tenant_id is not None:
+            cache.set(key, tenant_id, get_webhook_settings()["TENANT_CACHE_TTL"])
+    return tenant_id
+
+
+def ingest_event(tenant_id, gateway: str, body: bytes) -> None:
+    """
+    Grava o evento na inbox com um único INSERT
+
+    Reenvios (mesmo tenant, gateway e event_id) são ignorados pelo
+    ON CONFLICT DO NOTHING.
+    """
+    event = PaymentWebhookEvent(
+        tenant_id=tenant_id, gateway=gateway, **parse_event(body)
+    )
+    PaymentWebhookEvent.objects.bulk_create([event], ignore_conflicts=True)
+
+
+def schedule_processing() -> bool:
+    """
+    Agenda o processamento da inbox (com debounce)
+
+    Rajadas de webhooks geram um único processamento.
+    """
+    from .tasks import process_payment_webhooks
+
+    debounce = get_webhook_settings()["DEBOUNCE"]
+    if not cache.add(SCHEDULED_KEY, 1, debounce * 10):
+        return False
+    process_payment_webhooks.apply_async(countdown=debounce)
+    return True
+
+
+def _next_batch(now, batch_size: int) -> list[PaymentWebhookEvent]:
+    """
+    Próximos eventos pendentes em ordem de ocorrência
+
+    Transações com evento aguardando nova tentativa ficam de fora: os
+    eventos seguintes esperam o anterior ser aplicado.
+    """
+    waiting = PaymentWebhookEvent.objects.filter(
+        tenant=OuterRef("tenant"),
+        external_id=OuterRef("external_id"),
+        status="pending",
+        available_at__gt=now,
+    ).exclude(external_id="")
+    return list(
+        PaymentWebhookEvent.objects.filter(status="pending", available_at__lte=now)
+        .exclude(Exists(waiting))
+        .order_by("tenant_id", Coalesce("occurred_at", "created_at"), "created_at")[
+            :batch_size
+        ]
+    )
+
+
+def _retry(event, now, config: dict, error: str) -> bool:
+    """Volta o evento para a fila; esgotadas as tentativas, falha"""
+    event.attempts += 1
+    event.error = error
+    if event.attempts >= config["MAX_ATTEMPTS"]:
+        event.status = "failed"
+        event.processed_at = now
+        return False
+    event.available_at = now + timedelta(seconds=config["RETRY_DELAY"] * event.attempts)
+    return True
+
+
+def _schedule_retries() -> None:
+    """
+    Agenda o processamento para a próxima nova tentativa pendente
+
+    Chamado ainda com o lock: em modo eager a execução aninhada retorna
+    sem processar, e no worker o countdown mínimo de 1s espera o lock.
+    """
+    from .tasks import process_payment_webhooks
+
+    next_at = (
+        PaymentWebhookEvent.objects.filter(status="pending")
+        .order_by("available_at")
+        .values_list("available_at", flat=True)
+        .first()
+    )
+    if next_at is None:
+        return
+    delay = (next_at - timezone.now()).total_seconds()
+    process_payment_webhooks.apply_async(countdown=max(math.ceil(delay), 1))
+
+
+def _event_row(event) -> dict:
+    """Linha no formato da conciliação (status = tipo do evento)"""
+    data = event.payload.get("data")
+    data = data if isinstance(data, dict) else {}
+    return {
+        "external_id": event.external_id,
+        "status": event.event_type,
+        **{
+            field: "" if data.get(field) is None else str(data[field])
+            for field in ("amount", "fee")
+        },
+    }
+
+
+def _last_applied(tenant_id, external_ids) -> dict:
+    """Ocorrência do último evento aplicado por external_id"""
+    return dict(
+        PaymentWebhookEvent.objects.filter(
+            tenant_id=tenant_id, external_id__in=external_ids, status="processed"
+        )
+        .values("external_id")
+        .annotate(last=Max(Coalesce("occurred_at", "created_at")))
+        .order_by()
+        .values_list("external_id", "last")
+    )
+
+
+def _apply_tenant_events(events, now, config: dict, counts: dict) -> None:
+    """Aplica os eventos de um tenant no schema atual, em ordem por external_id"""
+    status_map = config["EVENT_STATUS_MAP"]
+    last_applied = _last_applied(
+        events[0].tenant_id, {event.external_id for event in events}
+    )
+    queues = defaultdict(deque)
+    for event in events:
+        last = last_applied.get(event.external_id)
+        if event.event_type not in status_map:
+            event.status = "ignored"
+            event.processed_at = now
+        elif last is not None and (event.occurred_at or event.created_at) < last:
+            # Atrasado: a transação já reflete um evento mais recente
+            event.status = "ignored"
+            event.processed_at = now
+            event.error = "anterior ao último evento aplicado"
+        elif not event.external_id:
+            event.status = "failed"
+            event.processed_at = now
+            event.error = "external_id ausente"
+        else:
+            queues[event.external_id].append(event)
+
+    while queues:
+        # Rodada: no máximo um evento por transação
+        batch = [queue.popleft() for queue in queues.values()]
+        queues = {key: queue for key, queue in queues.items() if queue}
+
+        result = Reconciliation(max_reported=0, track_outcomes=True)
+        rows = [(event.pk, _event_row(event)) for event in batch]
+        try:
+            reconcile_rows(rows, result, status_map)
+        except Exception as err:
+            logger.exception(f"Erro ao aplicar webhooks de pagamento: {err}")
+            for event in batch:
+                _retry(event, now, config, str(err))
+                queues.pop(event.external_id, None)
+            continue
+
+        for event in batch:
+            kind, detail = result.outcomes.get(event.pk, (None, ""))
+            if kind is None:
+                event.status = "processed"
+                event.processed_at = now
+                event.error = ""
+            elif kind == "unmatched":
+                # Seguintes da mesma transação aguardam este evento
+                _retry(event, now, config, "pagamento não encontrado")
+                queues.pop(event.external_id, None)
+            else:
+                event.status = "failed"
+                event.processed_at = now
+                event.error = detail or kind
+
+    for event in events:
+        if event.status != "pending":
+            counts[event.status] += 1
+        elif event.attempts:
+            counts["retried"] += 1
+
+
+def process_pending_events() -> dict:
+    """
+    Processa a inbox de webhooks de pagamento
+
+    Executa no schema público; cada evento é aplicado no schema do seu
+    tenant. Apenas um processamento por vez (lock em cache), o que mantém
+    a ordem por external_id.
+
+    Returns:
+        Contadores: processed, ignored, failed, retried
+    """
+    config = get_webhook_settings()
+    counts = dict.fromkeys(("processed", "ignored", "failed", "retried"), 0)
+    if not cache.add(LOCK_KEY, 1, config["LOCK_TIMEOUT"]):
+        return counts
+
+    # Webhooks recebidos a partir daqui agendam novo processamento
+    cache.delete(SCHEDULED_KEY)
+    try:
+        while events := _next_batch(timezone.now(), config["BATCH_SIZE"]):
+            now = timezone.now()
+            by_tenant = defaultdict(list)
+            for event in events:
+                by_tenant[event.tenant_id].append(event)
+            tenants = Tenant.objects.filter(is_active=True).in_bulk(list(by_tenant))
+
+            for tenant_id, tenant_events in by_tenant.items():
+                tenant = tenants.get(tenant_id)
+                if tenant is None:
+                    for event in tenant_events:
+                        event.status = "failed"
+                        event.processed_at = now
+                        event.error = "tenant inativo"
+                        counts["failed"] += 1
+                    continue
+                with tenant_context(tenant):
+                    _apply_tenant_events(tenant_events, now, config, counts)
+
+            for event in events:
+                event.updated_at = now
+            PaymentWebhookEvent.objects.bulk_update(
+                events,
+                [
+                    "status",
+                    "attempts",
+                    "available_at",
+                    "processed_at",
+                    "error",
+                    "updated_at",
+                ],
+            )
+        # Novas tentativas não dependem de um novo webhook chegar
+        _schedule_retries()
+    finally:
+        cache.delete(LOCK_KEY)
+
+    if any(counts.values()):
+        logger.info(
+            f"Webhooks de pagamento: {counts['processed']} processados, "
+            f"{counts['retried']} aguardando, {counts['failed']} com falha"
+        )
+    return counts
@@ -1,9 +1,11 @@
 from typing import ClassVar
 
 from django.contrib import admin
-from unfold.admin import ModelAdmin, TabularInline
+from unfold.admin import TabularInline
 from unfold.decorators import display
 
+from apps.core.admin import OptimizedModelAdmin
+
 from .models import Attendance, Graduation, Student
 
 
@@ -34,7 +36,7 @@ class AttendanceInline(TabularInline):
 
 
 @admin.register(Student)
-class StudentAdmin(ModelAdmin):
+class StudentAdmin(OptimizedModelAdmin):
     list_display = [
         "full_name",
         "registration_number",
@@ -52,6 +54,7 @@ class StudentAdmin(ModelAdmin):
     readonly_fields = ["id", "created_at", "updated_at"]
     inlines = [GraduationInline, AttendanceInline]
     list_per_page = 25
+    list_related: ClassVar = {"full_name": ("user",)}
 
     @display(description="Faixa", ordering="belt_color")
     def get_belt_display(self, obj):
@@ -91,7 +94,7 @@ class StudentAdmin(ModelAdmin):
 
 
 @admin.register(Graduation)
-class GraduationAdmin(ModelAdmin):
+class GraduationAdmin(OptimizedModelAdmin):
     list_display = [
         "student",
         "get_from_belt",
@@ -137,7 +140,7 @@ class GraduationAdmin(ModelAdmin):
 
 
 @admin.register(Attendance)
-class AttendanceAdmin(ModelAdmin):
+class AttendanceAdmin(OptimizedModelAdmin):
     list_display = [
         "student",
         "class_date",
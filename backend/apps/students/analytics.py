@@ -0,0 +1,387 @@
+"""
+Agregações de presenças para gráficos (séries temporais e mapa de calor)
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- SEMPRE usar schema-per-tenant
+- Nenhum dado pode vazar entre tenants (chaves escopadas pelo schema)
+
+As presenças são agrupadas no PostgreSQL (`date_trunc` por dia, semana ou
+mês e `extract` de dia da semana x hora), opcionalmente por tipo de aula ou
+instrutor, em uma única consulta agrupada. Períodos fechados (anteriores ao
+período corrente) não mudam no dia a dia e ficam em cache, um por período:
+com a janela padrão deslizando a cada dia, apenas o período que acabou de
+fechar é agregado de novo, além do período aberto (e de um período inicial
+incompleto) consultado a cada requisição. Escritas com data retroativa
+invalidam o cache do schema.
+
+A progressão de faixas (tempo na faixa e presenças entre graduações) é
+calculada em uma única consulta com funções de janela sobre `graduations`
+e `attendances`, também em cache por schema.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count, F, Value
+from django.db.models.functions import (
+    Concat,
+    ExtractHour,
+    ExtractIsoWeekDay,
+    TruncDay,
+    TruncMonth,
+    TruncWeek,
+)
+from django.utils import timezone
+
+from apps.core.replicas import primary_reads
+
+from .models import Attendance, Student
+
+INTERVALS = {
+    "day": TruncDay,
+    "week": TruncWeek,
+    "month": TruncMonth,
+}
+
+GROUP_BY_CHOICES = ("none", "class_type", "instructor")
+
+
+def get_analytics_settings() -> dict:
+    """Retorna configuração das agregações de presença com valores padrão"""
+    config = getattr(settings, "ATTENDANCE_ANALYTICS", {})
+    return {
+        "CACHE_TTL": config.get("CACHE_TTL", 60 * 60 * 24 * 7),
+        "DEFAULT_RANGE_DAYS": config.get("DEFAULT_RANGE_DAYS", 90),
+        "MAX_RANGE_DAYS": config.get("MAX_RANGE_DAYS", 731),
+        "PERCENTILES": config.get("PERCENTILES", [0.25, 0.5, 0.75, 0.9]),
+        "PROGRESSION_TTL": config.get("PROGRESSION_TTL", 60 * 60 * 6),
+    }
+
+
+def period_start(value, interval: str):
+    """Início do período (dia, semana ISO ou mês) que contém a data"""
+    if interval == "week":
+        return value - timedelta(days=value.weekday())
+    if interval == "month":
+        return value.replace(day=1)
+    return value
+
+
+def next_period(value, interval: str):
+    """Início do período seguinte ao que contém a data"""
+    value = period_start(value, interval)
+    if interval == "week":
+        return value + timedelta(days=7)
+    if interval == "month":
+        return (value + timedelta(days=31)).replace(day=1)
+    return value + timedelta(days=1)
+
+
+def _version_key(schema_name: str) -> str:
+    return f"attendance-analytics-version:{schema_name}"
+
+
+def cache_version(schema_name: str) -> int:
+    """Versão atual do cache de períodos fechados do schema"""
+    version = cache.get(_version_key(schema_name))
+    if version is None:
+        cache.add(_version_key(schema_name), 1, None)
+        version = cache.get(_version_key(schema_name), 1)
+    return version
+
+
+def invalidate_closed_periods(schema_name: str) -> None:
+    """Descarta o cache de períodos fechados do schema"""
+    try:
+        cache.incr(_version_key(schema_name))
+    except ValueError:
+        cache.set(_version_key(schema_name), 2, None)
+
+
+def _group_values(group_by: str) -> dict:
+    """Expressões de agrupamento para values()"""
+    if group_by == "class_type":
+        return {"group": F("class_type")}
+    if group_by == "instructor":
+        return {
+            "group": F("instructor_id"),
+            "label": Concat(
+                "instructor__first_name", Value(" "), "instructor__last_name"
+            ),
+        }
+    return {}
+
+
+def _aggregate(start, end, buckets: dict, group_by: str) -> list[dict]:
+    """
+    Conta presenças ativas entre start (inclusive) e end (exclusive)
+
+    Uma consulta agrupada por buckets + grupo.
+    """
+    if start >= end:
+        return []
+
+    rows = (
+        Attendance.objects.filter(
+            is_active=True, class_date__gte=start, class_date__lt=end
+        )
+        .values(**buckets, **_group_values(group_by))
+        .annotate(count=Count("id"))
+        .order_by(*buckets)
+    )
+
+    class_types = dict(Attendance.CLASS_TYPE_CHOICES)
+    results = []
+    for row in rows:
+        if group_by == "class_type":
+            row["label"] = class_types.get(row["group"], row["group"])
+        elif group_by == "instructor":
+            row["group"] = str(row["group"]) if row["group"] else None
+            row["label"] = row["label"].strip() or None
+        results.append(row)
+    return results
+
+
+def _cached_aggregate(
+    kind: str, start, end, buckets: dict, group_by: str, interval: str = "day"
+):
+    """
+    Agregação de um intervalo fechado, guardada em cache por período e schema
+
+    Cada período inteiro entre start e end tem sua chave; períodos
+    incompletos nas pontas (start ou end no meio de um período) são
+    agregados a cada chamada. Os períodos ausentes do cache são agregados
+    em uma única consulta, lida do primário.
+    """
+    if start >= end:
+        return []
+
+    first = (
+        start
+        if period_start(start, interval) == start
+        else next_period(start, interval)
+    )
+    periods = []
+    value = first
+    while next_period(value, interval) <= end:
+        periods.append(value)
+        value = next_period(value, interval)
+    if not periods:
+        return _aggregate(start, end, buckets, group_by)
+
+    schema_name = connection.schema_name
+    prefix = ":".join(
+        str(part)
+        for part in (
+            "attendance-analytics",
+            schema_name,
+            cache_version(schema_name),
+            kind,
+            group_by,
+            interval,
+        )
+    )
+    keys = {period: f"{prefix}:{period}" for period in periods}
+    cached = cache.get_many(keys.values())
+    missing = [period for period in periods if keys[period] not in cached]
+    if missing:
+        filled = {period: [] for period in missing}
+        with primary_reads():
+            rows = _aggregate(
+                missing[0],
+                next_period(missing[-1], interval),
+                {**buckets, "bucket": INTERVALS[interval]("class_date")},
+                group_by,
+            )
+        for row in rows:
+            bucket = row.pop("bucket")
+            if bucket in filled:
+                filled[bucket].append(row)
+        ttl = get_analytics_settings()["CACHE_TTL"]
+        cache.set_many({keys[period]: rows for period, rows in filled.items()}, ttl)
+        cached.update({keys[period]: rows for period, rows in filled.items()})
+
+    return [
+        *_aggregate(start, first, buckets, group_by),
+        *(row for period in periods for row in cached[keys[period]]),
+        *_aggregate(value, end, buckets, group_by),
+    ]
+
+
+def attendance_series(start, end, interval: str = "week", group_by: str = "none"):
+    """
+    Presenças por período (dia, semana ou mês) entre start e end
+
+    Períodos anteriores ao período corrente vêm do cache; apenas o período
+    aberto é agregado no banco.
+
+    Returns:
+        Lista de {"period", "count"} (+ "group"/"label" quando agrupado)
+    """
+    buckets = {"period": INTERVALS[interval]("class_date")}
+    stop = end + timedelta(days=1)
+    boundary = min(max(period_start(timezone.localdate(), interval), start), stop)
+
+    return [
+        *_cached_aggregate("series", start, boundary, buckets, group_by, interval),
+        *_aggregate(boundary, stop, buckets, group_by),
+    ]
+
+
+def attendance_heatmap(start, end, group_by: str = "none"):
+    """
+    Presenças por dia da semana (1 = segunda) x hora de check-in
+
+    Dias anteriores a hoje vêm do cache; o dia corrente é somado por cima.
+
+    Returns:
+        Lista de {"weekday", "hour", "count"} (+ "group"/"label")
+    """
+    buckets = {
+        "weekday": ExtractIsoWeekDay("class_date"),
+        "hour": ExtractHour("check_in_time"),
+    }
+    stop = end + timedelta(days=1)
+    boundary = min(max(timezone.localdate(), start), stop)
+
+    cells = defaultdict(int)
+    labels = {}
+    for rows in (
+        _cached_aggregate("heatmap", start, boundary, buckets, group_by),
+        _aggregate(boundary, stop, buckets, group_by),
+    ):
+        for row in rows:
+            cell = (row["weekday"], row["hour"], row.get("group"))
+            cells[cell] += row["count"]
+            labels[cell] = row.get("label")
+
+    results = []
+    for weekday, hour, group in sorted(cells, key=lambda c: (c[0], c[1], str(c[2]))):
+        row = {"weekday": weekday, "hour": hour}
+        if group_by != "none":
+            row["group"] = group
+            row["label"] = labels[(weekday, hour, group)]
+        row["count"] = cells[(weekday, hour, group)]
+        results.append(row)
+    return results
+
+
+# Tempo na faixa: da graduação anterior do aluno (LAG) ou da matrícula até a
+# graduação; presenças contadas nesse intervalo. Agregado por faixa de origem.
+PROGRESSION_SQL = """
+WITH promotions AS (
+    SELECT
+        g.id,
+        g.student_id,
+        g.from_belt,
+        g.graduation_date,
+        COALESCE(
+            LAG(g.graduation_date) OVER (
+                PARTITION BY g.student_id
+                ORDER BY g.graduation_date, g.created_at
+            ),
+            s.enrollment_date
+        ) AS belt_start
+    FROM graduations g
+    JOIN students s ON s.id = g.student_id
+    WHERE g.is_active
+),
+spans AS (
+    SELECT
+        p.from_belt,
+        p.graduation_date - p.belt_start AS days,
+        COUNT(a.id) AS attendances
+    FROM promotions p
+    LEFT JOIN attendances a
+        ON a.student_id = p.student_id
+        AND a.is_active
+        AND a.class_date >= p.belt_start
+        AND a.class_date < p.graduation_date
+    WHERE p.graduation_date >= p.belt_start
+    GROUP BY p.id, p.from_belt, p.graduation_date, p.belt_start
+)
+SELECT
+    from_belt,
+    COUNT(*),
+    AVG(days),
+    percentile_cont(%(percentiles)s::float8[]) WITHIN GROUP (ORDER BY days),
+    AVG(attendances),
+    percentile_cont(%(percentiles)s::float8[]) WITHIN GROUP (ORDER BY attendances)
+FROM spans
+GROUP BY from_belt
+"""
+
+
+def progression_key(schema_name: str) -> str:
+    """Chave de cache da progressão de faixas do schema"""
+    return f"belt-progression:{schema_name}"
+
+
+def _distribution(average, values, percentiles) -> dict:
+    distribution = {"avg": round(float(average), 1)}
+    for percentile, value in zip(percentiles, values, strict=True):
+        distribution[f"p{round(percentile * 100)}"] = round(value, 1)
+    distribution["median"] = distribution["p50"]
+    return distribution
+
+
+def belt_progression() -> dict:
+    """
+    Tempo até a promoção e presenças entre graduações, por faixa
+
+    Faixas sem graduações registradas são omitidas.
+
+    Returns:
+        {"belts": [{"belt", "label", "promotions", "days", "attendances"}],
+         "computed_at"}
+    """
+    schema_name = connection.schema_name
+    cached = cache.get(progression_key(schema_name))
+    if cached is not None:
+        return cached
+
+    config = get_analytics_settings()
+    percentiles = sorted({*config["PERCENTILES"], 0.5})
+    with connection.cursor() as cursor:
+        cursor.execute(PROGRESSION_SQL, {"percentiles": percentiles})
+        rows = {row[0]: row[1:] for row in cursor.fetchall()}
+
+    belts = []
+    for belt, label in Student.BELT_CHOICES:
+        if belt not in rows:
+            continue
+        count, avg_days, days, avg_attendances, attendances = rows[belt]
+        belts.append(
+            {
+                "belt": belt,
+                "label": label,
+                "promotions": count,
+                "days": _distribution(avg_days, days, percentiles),
+                "attendances": _distribution(avg_attendances, attendances, percentiles),
+            }
+        )
+
+    result = {"belts": belts, "computed_at": timezone.now()}
+    cache.set(progression_key(schema_name), result, config["PROGRESSION_TTL"])
+    return result
+
+
+def handle_graduation_change(sender, **kwargs) -> None:
+    """Handler de post_save/post_delete de graduações: descarta a progressão"""
+    if kwargs.get("raw") or connection.schema_name == settings.PUBLIC_SCHEMA_NAME:
+        return
+    cache.delete(progression_key(connection.schema_name))
+
+
+def handle_attendance_change(sender, instance, **kwargs) -> None:
+    """
+    Handler de post_save/post_delete de presenças
+
+    Apenas escritas em datas já fechadas (retroativas) invalidam o cache.
+    """
+    if kwargs.get("raw") or connection.schema_name == settings.PUBLIC_SCHEMA_NAME:
+        return
+    if instance.class_date and instance.class_date < timezone.localdate():
+        invalidate_closed_periods(connection.schema_name)
@@ -5,3 +5,27 @@ class StudentsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.students"
     verbose_name = "Alunos"
+
+    def ready(self):
+        from django.db.models.signals import post_delete, post_save
+        from django_tenants.signals import schema_migrated
+
+        from .analytics import handle_attendance_change, handle_graduation_change
+        from .partitioning import setup_partitioning_for_schema
+
+        schema_migrated.connect(
+            setup_partitioning_for_schema,
+            dispatch_uid="students_attendance_partitioning",
+        )
+
+        for signal in (post_save, post_delete):
+            signal.connect(
+                handle_attendance_change,
+                sender="students.Attendance",
+                dispatch_uid=f"students_attendance_analytics_{signal is post_save}",
+            )
+            signal.connect(
+                handle_graduation_change,
+                sender="students.Graduation",
+                dispatch_uid=f"students_graduation_analytics_{signal is post_save}",
+            )
@@ -0,0 +1,64 @@
+# Generated by Django 4.2.30 on 2026-10-19 02:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("students", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="attendance",
+            name="attendances_class_d_77ff13_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="student",
+            name="students_belt_co_b58c72_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="student",
+            name="students_status_3ac771_idx",
+        ),
+        migrations.AddIndex(
+            model_name="attendance",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["-class_date", "-check_in_time"],
+                name="attendances_active_date_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="attendance",
+            index=models.Index(
+                condition=models.Q(("is_active", False)),
+                fields=["deleted_at"],
+                name="attendances_deleted_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["belt_color"],
+                name="students_active_belt_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                condition=models.Q(("is_active", True)),
+                fields=["status"],
+                name="students_active_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                condition=models.Q(("is_active", False)),
+                fields=["deleted_at"],
+                name="students_deleted_idx",
+            ),
+        ),
+    ]
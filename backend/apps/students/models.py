@@ -71,11 +71,28 @@ class Student(BaseModel):
         ordering: ClassVar = ["user__first_name", "user__last_name"]
         indexes: ClassVar = [
             models.Index(fields=["registration_number"]),
-            models.Index(fields=["belt_color"]),
-            models.Index(fields=["status"]),
             models.Index(fields=["enrollment_date"]),
+            # Índices parciais: listagens filtram sempre is_active=True
+            models.Index(
+                fields=["belt_color"],
+                name="students_active_belt_idx",
+                condition=models.Q(is_active=True),
+            ),
+            models.Index(
+                fields=["status"],
+                name="students_active_status_idx",
+                condition=models.Q(is_active=True),
+            ),
+            # Varredura do arquivamento de registros removidos
+            models.Index(
+                fields=["deleted_at"],
+                name="students_deleted_idx",
+                condition=models.Q(is_active=False),
+            ),
         ]
 
+    str_select_related: ClassVar[tuple] = ("user",)
+
     def __str__(self):
         return f"{self.user.full_name} - {self.get_belt_color_display()}"
 
@@ -137,6 +154,8 @@ class Graduation(BaseModel):
             models.Index(fields=["graduation_date"]),
         ]
 
+    str_select_related: ClassVar[tuple] = ("student",)
+
     def __str__(self):
         return f"{self.student.full_name}: {self.from_belt} → {self.to_belt}"
 
@@ -188,8 +207,21 @@ class Attendance(BaseModel):
         unique_together: ClassVar = ["student", "class_date", "check_in_time"]
         indexes: ClassVar = [
             models.Index(fields=["student", "class_date"]),
-            models.Index(fields=["class_date"]),
+            # Índices parciais: listagens filtram sempre is_active=True
+            models.Index(
+                fields=["-class_date", "-check_in_time"],
+                name="attendances_active_date_idx",
+                condition=models.Q(is_active=True),
+            ),
+            # Varredura do arquivamento de registros removidos
+            models.Index(
+                fields=["deleted_at"],
+                name="attendances_deleted_idx",
+                condition=models.Q(is_active=False),
+            ),
         ]
 
+    str_select_related: ClassVar[tuple] = ("student",)
+
     def __str__(self):
         return f"{self.student.full_name} - {self.class_date}"
@@ -0,0 +1,329 @@
+"""
+Particionamento por faixa (range) da tabela de presenças
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- SEMPRE usar schema-per-tenant
+- Operações aplicadas schema a schema via schema_context
+- Opcional: controlado por settings.ATTENDANCE_PARTITIONING
+
+A tabela `attendances` é convertida em tabela particionada por mês
+(`PARTITION BY RANGE (class_date)`). Cada partição cobre um mês
+(`attendances_pYYYY_MM`) e uma partição DEFAULT recebe linhas fora das
+faixas já criadas. Consultas filtradas por `class_date` são podadas
+(partition pruning) pelo planner do PostgreSQL.
+"""
+import logging
+from datetime import date
+
+from django.conf import settings
+from django.db import connection, transaction
+from django_tenants.utils import schema_context
+
+logger = logging.getLogger(__name__)
+
+TABLE_NAME = "attendances"
+LEGACY_TABLE_NAME = "attendances_legacy"
+DEFAULT_PARTITION_NAME = "attendances_default"
+PARTITION_KEY = "class_date"
+
+
+def get_partitioning_settings() -> dict:
+    """Retorna configuração de particionamento com valores padrão"""
+    config = getattr(settings, "ATTENDANCE_PARTITIONING", {})
+    return {
+        "ENABLED": config.get("ENABLED", False),
+        "MONTHS_AHEAD": config.get("MONTHS_AHEAD", 3),
+    }
+
+
+def is_partitioning_enabled() -> bool:
+    """Verifica se o particionamento está habilitado"""
+    return get_partitioning_settings()["ENABLED"]
+
+
+def month_start(value: date) -> date:
+    """Primeiro dia do mês de uma data"""
+    return value.replace(day=1)
+
+
+def add_months(value: date, months: int) -> date:
+    """Soma meses a uma data já normalizada para o primeiro dia do mês"""
+    month_index = value.month - 1 + months
+    return date(value.year + month_index // 12, month_index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Nome da partição mensal (ex: attendances_p2025_01)"""
+    return f"{TABLE_NAME}_p{month.year:04d}_{month.month:02d}"
+
+
+def months_between(start: date, end: date) -> list[date]:
+    """Lista o primeiro dia de cada mês entre start e end (inclusive)"""
+    months = []
+    current = month_start(start)
+    last = month_start(end)
+    while current <= last:
+        months.append(current)
+        current = add_months(current, 1)
+    return months
+
+
+def is_partitioned(schema_name: str) -> bool:
+    """Verifica se `attendances` já é tabela particionada no schema"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relkind
+            FROM pg_class c
+            JOIN pg_namespace n ON n.oid = c.relnamespace
+            WHERE n.nspname = %s AND c.relname = %s
+            """,
+            [schema_name, TABLE_NAME],
+        )
+        row = cursor.fetchone()
+    return bool(row) and row[0] == "p"
+
+
+def existing_partitions(schema_name: str) -> set[str]:
+    """Nomes das partições existentes de `attendances` no schema"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT child.relname
+            FROM pg_inherits i
+            JOIN pg_class parent ON parent.oid = i.inhparent
+            JOIN pg_class child ON child.oid = i.inhrelid
+            JOIN pg_namespace n ON n.oid = parent.relnamespace
+            WHERE n.nspname = %s AND parent.relname = %s
+            """,
+            [schema_name, TABLE_NAME],
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def _create_month_partition(month: date) -> None:
+    """Cria partição mensal no schema corrente"""
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE IF NOT EXISTS {quote(partition_name(month))} "
+            f"PARTITION OF {quote(TABLE_NAME)} "
+            "FOR VALUES FROM (%s) TO (%s)",
+            [month, add_months(month, 1)],
+        )
+
+
+def _move_default_rows(month: date) -> int:
+    """
+    Retira da partição DEFAULT as linhas do mês (schema corrente)
+
+    O PostgreSQL recusa criar a partição enquanto a DEFAULT tem linhas da
+    faixa; elas ficam numa tabela temporária até a partição existir.
+
+    Returns:
+        Quantidade de linhas retiradas (tabela temporária `_moving`)
+    """
+    quote = connection.ops.quote_name
+    default = quote(DEFAULT_PARTITION_NAME)
+    bounds = [month, add_months(month, 1)]
+    where = f"{quote(PARTITION_KEY)} >= %s AND {quote(PARTITION_KEY)} < %s"
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT EXISTS (SELECT 1 FROM {default} WHERE {where})", bounds)
+        if not cursor.fetchone()[0]:
+            return 0
+
+        # Escritas concorrentes no mês esperam a partição ser criada
+        cursor.execute(f"LOCK TABLE {default} IN SHARE ROW EXCLUSIVE MODE")
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE _moving (LIKE {quote(TABLE_NAME)}) ON COMMIT DROP"
+        )
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {default} WHERE {where} RETURNING *) "
+            "INSERT INTO _moving SELECT * FROM moved",
+            bounds,
+        )
+        return cursor.rowcount
+
+
+def _add_month_partition(month: date) -> None:
+    """
+    Cria a partição mensal levando as linhas do mês que estão na DEFAULT
+
+    Presenças lançadas antes da partição existir (ex: aulas agendadas para
+    meses à frente) caem na DEFAULT e seriam um erro na criação.
+    """
+    moved = _move_default_rows(month)
+    _create_month_partition(month)
+    if moved:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {connection.ops.quote_name(TABLE_NAME)} "
+                "SELECT * FROM _moving"
+            )
+            cursor.execute("DROP TABLE _moving")
+        logger.info(
+            f"{moved} presenças movidas da partição default para "
+            f"{partition_name(month)}"
+        )
+
+
+def ensure_partitions(
+    schema_name: str, months_ahead: int | None = None, today: date | None = None
+) -> list[str]:
+    """
+    Garante partições do mês corrente até `months_ahead` meses à frente
+
+    Cada mês é criado no seu próprio savepoint: falha em um mês é
+    registrada e não impede os demais.
+
+    Returns:
+        Lista com os nomes das partições criadas
+    """
+    if months_ahead is None:
+        months_ahead = get_partitioning_settings()["MONTHS_AHEAD"]
+    current = month_start(today or date.today())
+
+    created = []
+    with schema_context(schema_name):
+        if not is_partitioned(schema_name):
+            return created
+
+        existing = existing_partitions(schema_name)
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            name = partition_name(month)
+            if name in existing:
+                continue
+            try:
+                with transaction.atomic():
+                    _add_month_partition(month)
+            except Exception as err:
+                logger.error(f"Erro ao criar partição {name} em {schema_name}: {err}")
+                continue
+            created.append(name)
+
+    if created:
+        logger.info(f"Partições criadas em {schema_name}: {', '.join(created)}")
+    return created
+
+
+def _fetch_table_constraints() -> list[tuple[str, str, str]]:
+    """Constraints (nome, tipo, definição) da tabela `attendances`"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT conname, contype, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE conrelid = %s::regclass
+            ORDER BY contype DESC
+            """,
+            [TABLE_NAME],
+        )
+        return cursor.fetchall()
+
+
+def _fetch_table_indexes() -> list[str]:
+    """Definições dos índices que não pertencem a constraints"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT pg_get_indexdef(i.indexrelid)
+            FROM pg_index i
+            WHERE i.indrelid = %s::regclass
+              AND NOT EXISTS (
+                  SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid
+              )
+            """,
+            [TABLE_NAME],
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+def convert_to_partitioned(
+    schema_name: str, months_ahead: int | None = None, today: date | None = None
+) -> bool:
+    """
+    Converte `attendances` em tabela particionada por mês
+
+    Recria a tabela com a mesma estrutura, copia os dados existentes para
+    as partições mensais e recria constraints e índices. A chave primária
+    passa a ser (id, class_date), exigência do PostgreSQL para tabelas
+    particionadas.
+
+    Returns:
+        True se a conversão foi feita, False se já estava particionada
+    """
+    quote = connection.ops.quote_name
+    today = today or date.today()
+
+    with schema_context(schema_name):
+        if is_partitioned(schema_name):
+            return False
+
+        with transaction.atomic():
+            constraints = _fetch_table_constraints()
+            indexes = _fetch_table_indexes()
+
+            with connection.cursor() as cursor:
+                # FKs do Django são DEFERRABLE; validar pendências antes do DROP
+                cursor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+                cursor.execute(f"SELECT MIN({PARTITION_KEY}) FROM {quote(TABLE_NAME)}")
+                oldest = cursor.fetchone()[0] or today
+
+                cursor.execute(
+                    f"ALTER TABLE {quote(TABLE_NAME)} RENAME TO {quote(LEGACY_TABLE_NAME)}"
+                )
+                cursor.execute(
+                    f"CREATE TABLE {quote(TABLE_NAME)} "
+                    f"(LIKE {quote(LEGACY_TABLE_NAME)} INCLUDING DEFAULTS) "
+                    f"PARTITION BY RANGE ({quote(PARTITION_KEY)})"
+                )
+                cursor.execute(
+                    f"CREATE TABLE {quote(DEFAULT_PARTITION_NAME)} "
+                    f"PARTITION OF {quote(TABLE_NAME)} DEFAULT"
+                )
+
+            for month in months_between(oldest, today):
+                _create_month_partition(month)
+
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f"INSERT INTO {quote(TABLE_NAME)} "
+                    f"SELECT * FROM {quote(LEGACY_TABLE_NAME)}"
+                )
+                cursor.execute(f"DROP TABLE {quote(LEGACY_TABLE_NAME)}")
+
+                for name, kind, definition in constraints:
+                    if kind == "p":
+                        definition = f"PRIMARY KEY (id, {PARTITION_KEY})"
+                    cursor.execute(
+                        f"ALTER TABLE {quote(TABLE_NAME)} "
+                        f"ADD CONSTRAINT {quote(name)} {definition}"
+                    )
+
+                # Definições capturadas antes do rename já apontam para TABLE_NAME
+                for definition in indexes:
+                    cursor.execute(definition)
+
+    ensure_partitions(schema_name, months_ahead=months_ahead, today=today)
+    logger.info(f"Tabela {TABLE_NAME} particionada no schema {schema_name}")
+    return True
+
+
+def setup_partitioning_for_schema(schema_name: str, **kwargs) -> None:
+    """
+    Handler do sinal `schema_migrated` do django-tenants
+
+    Converte e cria partições futuras automaticamente após as migrações
+    de cada schema de tenant, quando o particionamento está habilitado.
+    """
+    if not is_partitioning_enabled():
+        return
+    if schema_name == settings.PUBLIC_SCHEMA_NAME:
+        return
+
+    try:
+        convert_to_partitioned(schema_name)
+        ensure_partitions(schema_name)
+    except Exception as err:
+        logger.error(f"Erro ao particionar presenças em {schema_name}: {err}")
@@ -6,6 +6,7 @@ Seguindo padrões estabelecidos no CONTEXT.md:
 - Validações rigorosas de negócio
 - Campos de auditoria padronizados
 """
+from datetime import timedelta
 from typing import ClassVar
 
 from django.utils import timezone
@@ -15,6 +16,7 @@ from rest_framework import serializers
 from apps.authentication.serializers import UserSerializer
 from apps.core.serializers import BaseModelSerializer
 
+from .analytics import GROUP_BY_CHOICES, INTERVALS, get_analytics_settings
 from .models import Attendance, Graduation, Student
 
 
@@ -106,6 +108,12 @@ class StudentSerializer(BaseModelSerializer):
             "days_since_enrollment",
             "total_attendances",
         ]
+        # Relações usadas pelos campos computados (ajuste de select/prefetch)
+        field_relations: ClassVar = {
+            "full_name": ["user"],
+            "email": ["user"],
+            "total_attendances": ["attendances"],
+        }
         extra_kwargs: ClassVar = {
             "registration_number": {"help_text": "Número de matrícula único"},
             "enrollment_date": {"help_text": "Data de matrícula"},
@@ -169,6 +177,9 @@ class StudentCreateSerializer(serializers.ModelSerializer):
 
     def validate_registration_number(self, value):
         """Validar número de matrícula único"""
+        if self.context.get("bulk"):
+            # Verificado em uma consulta para o lote (apps.core.bulk)
+            return value
         if Student.objects.filter(registration_number=value).exists():
             raise serializers.ValidationError("Este número de matrícula já está em uso")
         return value
@@ -429,3 +440,38 @@ class GraduateStudentSerializer(serializers.Serializer):
                 "Data de graduação não pode ser no futuro"
             )
         return value
+
+
+class AttendanceAnalyticsQuerySerializer(serializers.Serializer):
+    """
+    Serializer para parâmetros das agregações de presença
+    """
+
+    start = serializers.DateField(
+        required=False, help_text="Data inicial (padrão: DEFAULT_RANGE_DAYS atrás)"
+    )
+    end = serializers.DateField(required=False, help_text="Data final (padrão: hoje)")
+    interval = serializers.ChoiceField(
+        choices=list(INTERVALS), default="week", help_text="Granularidade da série"
+    )
+    group_by = serializers.ChoiceField(
+        choices=GROUP_BY_CHOICES, default="none", help_text="Agrupamento"
+    )
+
+    def validate(self, attrs):
+        """Validar intervalo de datas"""
+        config = get_analytics_settings()
+        attrs.setdefault("end", timezone.localdate())
+        attrs.setdefault(
+            "start", attrs["end"] - timedelta(days=config["DEFAULT_RANGE_DAYS"])
+        )
+
+        if attrs["start"] > attrs["end"]:
+            raise serializers.ValidationError(
+                "Data inicial deve ser anterior à data final"
+            )
+        if (attrs["end"] - attrs["start"]).days > config["MAX_RANGE_DAYS"]:
+            raise serializers.ValidationError(
+                f"Intervalo máximo é de {config['MAX_RANGE_DAYS']} dias"
+            )
+        return attrs
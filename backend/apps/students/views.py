@@ -18,8 +18,10 @@ from apps.authentication.models import User
 from apps.core.permissions import CanManageStudents, IsStudentOwner
 from apps.core.viewsets import TenantViewSet
 
+from .analytics import attendance_heatmap, attendance_series, belt_progression
 from .models import Attendance, Graduation, Student
 from .serializers import (
+    AttendanceAnalyticsQuerySerializer,
     AttendanceCreateSerializer,
     AttendanceSerializer,
     GraduateStudentSerializer,
@@ -65,6 +67,19 @@ class StudentViewSet(TenantViewSet):
         "created_at",
     ]
     ordering: ClassVar = ["user__first_name", "user__last_name"]
+    # Presenças entram no ETag por causa de total_attendances
+    conditional_list_fields: ClassVar = (
+        "updated_at",
+        "user__updated_at",
+        "attendances__updated_at",
+    )
+    replica_actions: ClassVar = (
+        "list",
+        "retrieve",
+        "stats",
+        "graduations",
+        "attendances",
+    )
 
     def get_serializer_class(self):
         """
@@ -206,9 +221,9 @@ class StudentViewSet(TenantViewSet):
         student = self.get_object()
         today = timezone.now().date()
 
-        # Presenças este mês
+        # Presenças este mês (faixa em class_date permite partition pruning)
         attendances_this_month = student.attendances.filter(
-            class_date__year=today.year, class_date__month=today.month
+            class_date__gte=today.replace(day=1), class_date__lte=today
         ).count()
 
         stats = {
@@ -247,6 +262,7 @@ class GraduationViewSet(TenantViewSet):
     filterset_fields: ClassVar = ["student", "from_belt", "to_belt", "graduation_date"]
     ordering_fields: ClassVar = ["graduation_date", "created_at"]
     ordering: ClassVar = ["-graduation_date"]
+    replica_actions: ClassVar = ("list", "retrieve", "stats", "progression")
 
     def get_serializer_class(self):
         """
@@ -274,6 +290,27 @@ class GraduationViewSet(TenantViewSet):
 
         serializer.save(student=student, instructor=instructor, from_belt=from_belt)
 
+    def build_bulk_instance(self, validated_data):
+        """Graduação em lote: mesmos padrões de perform_create"""
+        validated_data.setdefault("instructor", self.request.user)
+        validated_data["from_belt"] = validated_data["student"].belt_color
+        return super().build_bulk_instance(validated_data)
+
+    @extend_schema(
+        summary="Progressão de faixas",
+        description=(
+            "Por faixa de origem: tempo até a promoção (dias) e presenças entre "
+            "graduações, com média, mediana e percentis."
+        ),
+        tags=["students"],
+    )
+    @action(detail=False, methods=["get"])
+    def progression(self, request):
+        """
+        Estatísticas de progressão de faixas do tenant
+        """
+        return Response(belt_progression())
+
 
 @extend_schema_view(
     list=extend_schema(summary="Listar presenças", tags=["students"]),
@@ -293,9 +330,22 @@ class AttendanceViewSet(TenantViewSet):
     queryset = Attendance.objects.select_related("student__user", "instructor").all()
     serializer_class = AttendanceSerializer
     permission_classes: ClassVar = [CanManageStudents]
-    filterset_fields: ClassVar = ["student", "class_date", "class_type"]
+    filterset_fields: ClassVar = {
+        "student": ["exact"],
+        "class_date": ["exact", "gte", "lte"],
+        "class_type": ["exact"],
+    }
     ordering_fields: ClassVar = ["class_date", "check_in_time", "created_at"]
     ordering: ClassVar = ["-class_date", "-check_in_time"]
+    # Aluno e instrutor aninhados na listagem entram no ETag
+    conditional_list_fields: ClassVar = (
+        "updated_at",
+        "student__updated_at",
+        "student__user__updated_at",
+        "instructor__updated_at",
+    )
+    # Relatórios analíticos leem da réplica
+    replica_actions: ClassVar = ("list", "retrieve", "stats", "series", "heatmap")
 
     def get_serializer_class(self):
         """
@@ -320,6 +370,11 @@ class AttendanceViewSet(TenantViewSet):
 
         serializer.save(student=student, instructor=instructor)
 
+    def build_bulk_instance(self, validated_data):
+        """Presença em lote: instrutor padrão é o usuário logado"""
+        validated_data.setdefault("instructor", self.request.user)
+        return super().build_bulk_instance(validated_data)
+
     @extend_schema(
         summary="Check-in de aluno",
         description="Registra entrada de aluno na aula",
@@ -402,3 +457,47 @@ class AttendanceViewSet(TenantViewSet):
 
         serializer = AttendanceSerializer(attendance, context={"request": request})
         return Response(serializer.data)
+
+    def _analytics_params(self, request) -> dict:
+        serializer = AttendanceAnalyticsQuerySerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    @extend_schema(
+        summary="Série temporal de presenças",
+        description=(
+            "Presenças agregadas por dia, semana ou mês, opcionalmente por tipo "
+            "de aula ou instrutor. Períodos fechados são servidos do cache."
+        ),
+        parameters=[AttendanceAnalyticsQuerySerializer],
+        tags=["students"],
+    )
+    @action(detail=False, methods=["get"])
+    def series(self, request):
+        """
+        Presenças por período
+        """
+        params = self._analytics_params(request)
+        results = attendance_series(
+            params["start"], params["end"], params["interval"], params["group_by"]
+        )
+        return Response({**params, "results": results})
+
+    @extend_schema(
+        summary="Mapa de calor de presenças",
+        description=(
+            "Presenças por dia da semana (1 = segunda) e hora de check-in, "
+            "opcionalmente por tipo de aula ou instrutor."
+        ),
+        parameters=[AttendanceAnalyticsQuerySerializer],
+        tags=["students"],
+    )
+    @action(detail=False, methods=["get"])
+    def heatmap(self, request):
+        """
+        Presenças por dia da semana x hora
+        """
+        params = self._analytics_params(request)
+        params.pop("interval")
+        results = attendance_heatmap(params["start"], params["end"], params["group_by"])
+        return Response({**params, "results": results})
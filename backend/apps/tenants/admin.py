@@ -1,10 +1,11 @@
 from typing import ClassVar
 
 from django.contrib import admin
-from unfold.admin import ModelAdmin
+from django.db.models import Count
+from unfold.admin import ModelAdmin, TabularInline
 from unfold.decorators import display
 
-from .models import Tenant
+from .models import PaymentWebhookEvent, SlowQuery, SlowQueryShape, Tenant
 
 
 @admin.register(Tenant)
@@ -49,3 +50,146 @@ class TenantAdmin(ModelAdmin):
             },
         ),
     )
+
+
+@admin.register(PaymentWebhookEvent)
+class PaymentWebhookEventAdmin(ModelAdmin):
+    list_display = [
+        "event_id",
+        "event_type",
+        "external_id",
+        "tenant",
+        "status",
+        "attempts",
+        "created_at",
+    ]
+    list_filter = ["status", "gateway", "event_type"]
+    search_fields: ClassVar = ["event_id", "external_id"]
+    list_select_related = ["tenant"]
+    readonly_fields = [
+        "id",
+        "tenant",
+        "gateway",
+        "event_id",
+        "event_type",
+        "external_id",
+        "occurred_at",
+        "payload",
+        "processed_at",
+        "created_at",
+        "updated_at",
+    ]
+    list_per_page = 50
+
+
+class SlowQueryInline(TabularInline):
+    model = SlowQuery
+    fields = [
+        "captured_at",
+        "schema_name",
+        "view_name",
+        "duration_ms",
+        "plan_fingerprint",
+    ]
+    readonly_fields = fields
+    ordering = ["-captured_at"]
+    extra = 0
+    max_num = 0
+    show_change_link = True
+
+
+@admin.register(SlowQueryShape)
+class SlowQueryShapeAdmin(ModelAdmin):
+    """Piores formatos de consulta entre todos os tenants"""
+
+    list_display = [
+        "get_sql_display",
+        "samples",
+        "get_avg_display",
+        "get_max_display",
+        "get_total_display",
+        "tenant_count",
+        "plan_count",
+        "last_seen_at",
+    ]
+    search_fields: ClassVar = ["sql"]
+    readonly_fields = [
+        "fingerprint",
+        "sql",
+        "samples",
+        "total_ms",
+        "max_ms",
+        "last_seen_at",
+        "created_at",
+    ]
+    inlines: ClassVar = [SlowQueryInline]
+    ordering = ["-total_ms"]
+    list_per_page = 50
+
+    def get_queryset(self, request):
+        return (
+            super()
+            .get_queryset(request)
+            .annotate(
+                tenant_count=Count("queries__schema_name", distinct=True),
+                plan_count=Count("queries__plan_fingerprint", distinct=True),
+            )
+        )
+
+    def has_add_permission(self, request):
+        return False
+
+    @display(description="Consulta")
+    def get_sql_display(self, obj):
+        return obj.sql[:120]
+
+    @display(description="Média (ms)")
+    def get_avg_display(self, obj):
+        return f"{obj.avg_ms:,.0f}"
+
+    @display(description="Máximo (ms)", ordering="max_ms")
+    def get_max_display(self, obj):
+        return f"{obj.max_ms:,.0f}"
+
+    @display(description="Total (ms)", ordering="total_ms")
+    def get_total_display(self, obj):
+        return f"{obj.total_ms:,.0f}"
+
+    @display(description="Tenants", ordering="tenant_count")
+    def tenant_count(self, obj):
+        return obj.tenant_count
+
+    @display(description="Planos", ordering="plan_count")
+    def plan_count(self, obj):
+        return obj.plan_count
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(ModelAdmin):
+    list_display = [
+        "captured_at",
+        "schema_name",
+        "view_name",
+        "duration_ms",
+        "plan_fingerprint",
+    ]
+    list_filter = ["schema_name", "database"]
+    search_fields: ClassVar = ["view_name", "sql", "plan_fingerprint"]
+    list_select_related = ["shape"]
+    readonly_fields = [
+        "shape",
+        "schema_name",
+        "view_name",
+        "database",
+        "sql",
+        "params",
+        "duration_ms",
+        "plan",
+        "plan_fingerprint",
+        "plan_error",
+        "captured_at",
+    ]
+    list_per_page = 50
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenants", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tenant",
+            name="provisioning_status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Aguardando provisionamento"),
+                    ("ready", "Pronto"),
+                    ("failed", "Falhou"),
+                ],
+                default="ready",
+                help_text="Situação do schema da academia",
+                max_length=20,
+            ),
+        ),
+    ]
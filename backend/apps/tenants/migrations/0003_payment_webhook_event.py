@@ -0,0 +1,115 @@
+# Generated by Django 4.2.30 on 2026-10-19 03:41
+
+import uuid
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenants", "0002_tenant_provisioning_status"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PaymentWebhookEvent",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "gateway",
+                    models.CharField(help_text="Gateway de origem", max_length=50),
+                ),
+                (
+                    "event_id",
+                    models.CharField(
+                        help_text="ID do evento no gateway (deduplica reenvios)",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "event_type",
+                    models.CharField(help_text="Tipo do evento", max_length=100),
+                ),
+                (
+                    "external_id",
+                    models.CharField(
+                        blank=True,
+                        help_text="ID da transação no gateway",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "occurred_at",
+                    models.DateTimeField(
+                        blank=True, help_text="Momento do evento no gateway", null=True
+                    ),
+                ),
+                ("payload", models.JSONField(help_text="Corpo recebido")),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pendente"),
+                            ("processed", "Processado"),
+                            ("ignored", "Ignorado"),
+                            ("failed", "Falhou"),
+                        ],
+                        default="pending",
+                        max_length=20,
+                    ),
+                ),
+                ("attempts", models.PositiveSmallIntegerField(default=0)),
+                (
+                    "available_at",
+                    models.DateTimeField(
+                        default=django.utils.timezone.now,
+                        help_text="Próxima tentativa de processamento",
+                    ),
+                ),
+                ("processed_at", models.DateTimeField(blank=True, null=True)),
+                ("error", models.TextField(blank=True)),
+                (
+                    "tenant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="payment_webhook_events",
+                        to="tenants.tenant",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "payment_webhook_events",
+                "ordering": ["created_at"],
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("status", "pending")),
+                        fields=["available_at"],
+                        name="payment_webhook_pending_idx",
+                    ),
+                    models.Index(
+                        fields=["tenant", "external_id"],
+                        name="payment_web_tenant__9cfae8_idx",
+                    ),
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="paymentwebhookevent",
+            constraint=models.UniqueConstraint(
+                fields=("tenant", "gateway", "event_id"),
+                name="payment_webhook_event_unique",
+            ),
+        ),
+    ]
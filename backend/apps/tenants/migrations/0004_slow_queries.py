@@ -0,0 +1,102 @@
+# Generated by Django 4.2.30 on 2026-10-19 04:11
+
+import uuid
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("tenants", "0003_payment_webhook_event"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SlowQueryShape",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("fingerprint", models.CharField(max_length=64, unique=True)),
+                ("sql", models.TextField(help_text="SQL normalizado")),
+                ("samples", models.PositiveIntegerField(default=0)),
+                ("total_ms", models.FloatField(default=0)),
+                ("max_ms", models.FloatField(default=0)),
+                (
+                    "last_seen_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+            ],
+            options={
+                "db_table": "slow_query_shapes",
+                "ordering": ["-total_ms"],
+                "indexes": [
+                    models.Index(
+                        fields=["-total_ms"], name="slow_query__total_m_faaba8_idx"
+                    )
+                ],
+            },
+        ),
+        migrations.CreateModel(
+            name="SlowQuery",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("schema_name", models.CharField(max_length=63)),
+                ("view_name", models.CharField(blank=True, max_length=255)),
+                ("database", models.CharField(default="default", max_length=63)),
+                ("sql", models.TextField()),
+                ("params", models.JSONField(blank=True, null=True)),
+                ("duration_ms", models.FloatField()),
+                ("plan", models.JSONField(blank=True, null=True)),
+                (
+                    "plan_fingerprint",
+                    models.CharField(blank=True, db_index=True, max_length=64),
+                ),
+                ("plan_error", models.TextField(blank=True)),
+                (
+                    "captured_at",
+                    models.DateTimeField(default=django.utils.timezone.now),
+                ),
+                (
+                    "shape",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="queries",
+                        to="tenants.slowqueryshape",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "slow_queries",
+                "ordering": ["-captured_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["shape", "-captured_at"],
+                        name="slow_querie_shape_i_cd967b_idx",
+                    ),
+                    models.Index(
+                        fields=["schema_name", "-captured_at"],
+                        name="slow_querie_schema__26e5e5_idx",
+                    ),
+                ],
+            },
+        ),
+    ]
@@ -11,6 +11,7 @@ from typing import ClassVar
 
 from django.core.validators import RegexValidator
 from django.db import models
+from django.utils import timezone
 from django_tenants.models import DomainMixin, TenantMixin
 
 from apps.core.models import TimestampedModel
@@ -89,6 +90,19 @@ class Tenant(TenantMixin, TimestampedModel):
     # Status de ativação
     is_active = models.BooleanField(default=True, help_text="Academia ativa")
 
+    # Provisionamento do schema (clonado do template em background)
+    PROVISIONING_STATUS_CHOICES: ClassVar = [
+        ("pending", "Aguardando provisionamento"),
+        ("ready", "Pronto"),
+        ("failed", "Falhou"),
+    ]
+    provisioning_status = models.CharField(
+        max_length=20,
+        choices=PROVISIONING_STATUS_CHOICES,
+        default="ready",
+        help_text="Situação do schema da academia",
+    )
+
     class Meta:
         ordering: ClassVar = ["name"]
         indexes: ClassVar = [
@@ -117,8 +131,31 @@ class Tenant(TenantMixin, TimestampedModel):
         if not self.domain_url:
             self.domain_url = f"{self.slug}.wbjj.com"
 
+        # Schema pendente é criado em background (provision_tenant_schema)
+        if self._state.adding and self.provisioning_status == "pending":
+            self.auto_create_schema = False
+
         super().save(*args, **kwargs)
 
+    def create_schema(self, check_if_exists=False, sync_schema=True, verbosity=1):
+        """
+        Cria o schema clonando o template já migrado
+
+        Sem template habilitado (TENANT_PROVISIONING["USE_TEMPLATE"]) ou sem
+        sincronização, mantém o comportamento do django-tenants (migrations).
+        """
+        from .provisioning import create_schema_from_template, use_template
+
+        if not sync_schema or not use_template():
+            return super().create_schema(
+                check_if_exists=check_if_exists,
+                sync_schema=sync_schema,
+                verbosity=verbosity,
+            )
+        return create_schema_from_template(
+            self, check_if_exists=check_if_exists, verbosity=verbosity
+        )
+
 
 class Domain(DomainMixin):
     """
@@ -126,3 +163,128 @@ class Domain(DomainMixin):
     """
 
     pass
+
+
+class PaymentWebhookEvent(TimestampedModel):
+    """
+    Caixa de entrada (inbox) dos webhooks do gateway de pagamento
+
+    Fica no schema público: o webhook é gravado com um único INSERT e
+    respondido na hora; o processamento em background aplica cada evento
+    no schema do tenant, em ordem por external_id.
+    """
+
+    STATUS_CHOICES: ClassVar = [
+        ("pending", "Pendente"),
+        ("processed", "Processado"),
+        ("ignored", "Ignorado"),
+        ("failed", "Falhou"),
+    ]
+
+    tenant = models.ForeignKey(
+        Tenant, on_delete=models.CASCADE, related_name="payment_webhook_events"
+    )
+    gateway = models.CharField(max_length=50, help_text="Gateway de origem")
+    event_id = models.CharField(
+        max_length=255, help_text="ID do evento no gateway (deduplica reenvios)"
+    )
+    event_type = models.CharField(max_length=100, help_text="Tipo do evento")
+    external_id = models.CharField(
+        max_length=255, blank=True, help_text="ID da transação no gateway"
+    )
+    occurred_at = models.DateTimeField(
+        null=True, blank=True, help_text="Momento do evento no gateway"
+    )
+    payload = models.JSONField(help_text="Corpo recebido")
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default="pending")
+    attempts = models.PositiveSmallIntegerField(default=0)
+    available_at = models.DateTimeField(
+        default=timezone.now, help_text="Próxima tentativa de processamento"
+    )
+    processed_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        db_table = "payment_webhook_events"
+        ordering: ClassVar = ["created_at"]
+        constraints: ClassVar = [
+            models.UniqueConstraint(
+                fields=["tenant", "gateway", "event_id"],
+                name="payment_webhook_event_unique",
+            )
+        ]
+        indexes: ClassVar = [
+            models.Index(
+                fields=["available_at"],
+                name="payment_webhook_pending_idx",
+                condition=models.Q(status="pending"),
+            ),
+            models.Index(fields=["tenant", "external_id"]),
+        ]
+
+    def __str__(self):
+        return f"{self.gateway}:{self.event_id} ({self.status})"
+
+
+class SlowQueryShape(TimestampedModel):
+    """
+    Formato de consulta lenta (SQL normalizado) agregado entre tenants
+
+    Fica no schema público: amostras de todos os schemas são agregadas pela
+    impressão digital da consulta (literais e listas IN normalizados).
+    """
+
+    fingerprint = models.CharField(max_length=64, unique=True)
+    sql = models.TextField(help_text="SQL normalizado")
+    samples = models.PositiveIntegerField(default=0)
+    total_ms = models.FloatField(default=0)
+    max_ms = models.FloatField(default=0)
+    last_seen_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "slow_query_shapes"
+        ordering: ClassVar = ["-total_ms"]
+        indexes: ClassVar = [models.Index(fields=["-total_ms"])]
+
+    def __str__(self):
+        return self.sql[:80]
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.samples if self.samples else 0
+
+
+class SlowQuery(models.Model):
+    """
+    Amostra de consulta lenta com schema, view, parâmetros e plano
+
+    O plano (EXPLAIN ANALYZE, BUFFERS) é coletado por amostragem em
+    background; `plan_fingerprint` identifica a estrutura do plano (tipos de
+    nó, tabelas e índices) para detectar mudanças de plano.
+    """
+
+    shape = models.ForeignKey(
+        SlowQueryShape, on_delete=models.CASCADE, related_name="queries"
+    )
+    schema_name = models.CharField(max_length=63)
+    view_name = models.CharField(max_length=255, blank=True)
+    database = models.CharField(max_length=63, default="default")
+    sql = models.TextField()
+    params = models.JSONField(null=True, blank=True)
+    duration_ms = models.FloatField()
+    plan = models.JSONField(null=True, blank=True)
+    plan_fingerprint = models.CharField(max_length=64, blank=True, db_index=True)
+    plan_error = models.TextField(blank=True)
+    captured_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        db_table = "slow_queries"
+        ordering: ClassVar = ["-captured_at"]
+        indexes: ClassVar = [
+            models.Index(fields=["shape", "-captured_at"]),
+            models.Index(fields=["schema_name", "-captured_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.schema_name}: {self.duration_ms:.0f}ms"
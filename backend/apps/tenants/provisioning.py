@@ -0,0 +1,258 @@
+"""
+Provisionamento de tenants por clonagem de um schema template
+
+Seguindo padrões estabelecidos no CONTEXT.md:
+- SEMPRE usar schema-per-tenant
+- 1 tenant = 1 PostgreSQL schema
+- Migrations aplicadas em todos os schemas
+
+Criar um schema aplicando todas as migrations de TENANT_APPS leva segundos.
+Um schema template é mantido migrado e com os dados iniciais (ex: métodos de
+pagamento padrão); novos tenants recebem uma cópia (estrutura + linhas) via
+função `clone_schema` do django-tenants. O clone é validado contra o estado
+das migrations antes de ser liberado; se divergir, o schema é criado pelo
+caminho tradicional (migrate_schemas).
+"""
+import logging
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.db.migrations.executor import MigrationExecutor
+from django.http import JsonResponse
+from django_tenants.clone import CloneSchema
+from django_tenants.signals import schema_migrated
+from django_tenants.utils import schema_context, schema_exists
+
+logger = logging.getLogger(__name__)
+
+# Linhas iniciais copiadas para todo tenant novo
+DEFAULT_PAYMENT_METHODS = [
+    {
+        "name": "PIX",
+        "code": "pix",
+        "is_online": True,
+        "processing_fee": Decimal("0.0000"),
+    },
+    {
+        "name": "Cartão de Crédito",
+        "code": "credit_card",
+        "is_online": True,
+        "processing_fee": Decimal("0.0349"),
+    },
+    {
+        "name": "Boleto",
+        "code": "boleto",
+        "is_online": True,
+        "processing_fee": Decimal("0.0199"),
+    },
+    {
+        "name": "Dinheiro",
+        "code": "cash",
+        "is_online": False,
+        "processing_fee": Decimal("0.0000"),
+    },
+]
+
+
+class ProvisioningError(Exception):
+    """Schema clonado não corresponde ao estado esperado"""
+
+
+def get_provisioning_settings() -> dict:
+    """Retorna configuração de provisionamento com valores padrão"""
+    config = getattr(settings, "TENANT_PROVISIONING", {})
+    return {
+        "USE_TEMPLATE": config.get("USE_TEMPLATE", True),
+        "TEMPLATE_SCHEMA": config.get("TEMPLATE_SCHEMA", "tenant_template"),
+        "ASYNC": config.get("ASYNC", True),
+        "RETRY_AFTER": config.get("RETRY_AFTER", 30),
+    }
+
+
+def provisioning_response() -> JsonResponse:
+    """503 padronizado para academia com schema ainda em criação"""
+    response = JsonResponse(
+        {
+            "error": True,
+            "message": "Academia em preparação. Tente novamente em instantes.",
+            "details": {"code": "tenant_provisioning"},
+            "status_code": 503,
+        },
+        status=503,
+    )
+    response["Retry-After"] = str(get_provisioning_settings()["RETRY_AFTER"])
+    return response
+
+
+def use_template() -> bool:
+    """Verifica se novos schemas são clonados do template"""
+    return get_provisioning_settings()["USE_TEMPLATE"]
+
+
+def get_template_schema() -> str:
+    """Nome do schema template"""
+    return get_provisioning_settings()["TEMPLATE_SCHEMA"]
+
+
+def pending_migrations(schema_name: str) -> list[tuple[str, str]]:
+    """Migrations ainda não aplicadas no schema (vazio = schema atualizado)"""
+    with schema_context(schema_name):
+        executor = MigrationExecutor(connection)
+        plan = executor.migration_plan(executor.loader.graph.leaf_nodes())
+    return [(migration.app_label, migration.name) for migration, _ in plan]
+
+
+def applied_migrations(schema_name: str) -> set[tuple[str, str]]:
+    """Migrations registradas no django_migrations do schema"""
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT app, name FROM "{schema_name}".django_migrations')
+        return set(cursor.fetchall())
+
+
+def schema_tables(schema_name: str) -> set[str]:
+    """Tabelas (inclusive particionadas) existentes no schema"""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT tablename FROM pg_tables WHERE schemaname = %s", [schema_name]
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+
+def seed_schema(schema_name: str) -> None:
+    """Grava (ou atualiza) as linhas iniciais no schema"""
+    from apps.payments.models import PaymentMethod
+
+    with schema_context(schema_name):
+        for method_data in DEFAULT_PAYMENT_METHODS:
+            PaymentMethod.objects.update_or_create(
+                code=method_data["code"], defaults=method_data
+            )
+
+
+def migrate_schema(schema_name: str, verbosity: int = 0) -> None:
+    """Aplica as migrations de TENANT_APPS no schema"""
+    call_command(
+        "migrate_schemas",
+        tenant=True,
+        schema_name=schema_name,
+        interactive=False,
+        verbosity=verbosity,
+    )
+
+
+def ensure_template_schema(refresh: bool = False, verbosity: int = 0) -> bool:
+    """
+    Garante que o template existe, está migrado e tem os dados iniciais
+
+    Args:
+        refresh: Regrava os dados iniciais mesmo sem migrations pendentes
+
+    Returns:
+        True se o template foi criado ou atualizado
+    """
+    template = get_template_schema()
+    with schema_context(settings.PUBLIC_SCHEMA_NAME):
+        created = not schema_exists(template)
+        if created:
+            with connection.cursor() as cursor:
+                cursor.execute(f'CREATE SCHEMA "{template}"')
+
+        changed = created or bool(pending_migrations(template))
+        if changed:
+            logger.info(f"Atualizando schema template {template}")
+            migrate_schema(template, verbosity=verbosity)
+        if changed or refresh:
+            seed_schema(template)
+    return changed or refresh
+
+
+def verify_clone(schema_name: str) -> None:
+    """
+    Valida o schema clonado contra o template e o grafo de migrations
+
+    Raises:
+        ProvisioningError: migrations pendentes ou estrutura divergente
+    """
+    template = get_template_schema()
+
+    pending = pending_migrations(schema_name)
+    if pending:
+        raise ProvisioningError(
+            f"Schema {schema_name} com {len(pending)} migration(s) pendente(s)"
+        )
+
+    if applied_migrations(schema_name) != applied_migrations(template):
+        raise ProvisioningError(
+            f"Migrations de {schema_name} divergem do template {template}"
+        )
+
+    missing = schema_tables(template) - schema_tables(schema_name)
+    if missing:
+        raise ProvisioningError(
+            f"Tabelas ausentes em {schema_name}: {', '.join(sorted(missing))}"
+        )
+
+
+def clone_template(schema_name: str) -> None:
+    """Copia estrutura e linhas do template para um schema novo e o valida"""
+    with transaction.atomic():
+        CloneSchema().clone_schema(
+            get_template_schema(), schema_name, clone_mode="DATA", set_connection=False
+        )
+        verify_clone(schema_name)
+
+
+def create_schema_from_template(
+    tenant, check_if_exists: bool = False, verbosity: int = 1
+) -> bool:
+    """
+    Cria o schema do tenant a partir do template
+
+    Usado por Tenant.create_schema. Se o clone falhar na validação, a
+    transação é desfeita e o schema é criado aplicando as migrations.
+
+    Returns:
+        False se o schema já existia (com check_if_exists), True caso contrário
+    """
+    with schema_context(settings.PUBLIC_SCHEMA_NAME):
+        if check_if_exists and schema_exists(tenant.schema_name):
+            return False
+
+        ensure_template_schema(verbosity=max(verbosity - 1, 0))
+        try:
+            clone_template(tenant.schema_name)
+        except ProvisioningError as err:
+            logger.warning(f"Clone descartado, aplicando migrations: {err}")
+            with connection.cursor() as cursor:
+                cursor.execute(f'CREATE SCHEMA "{tenant.schema_name}"')
+            migrate_schema(tenant.schema_name, verbosity=verbosity)
+            seed_schema(tenant.schema_name)
+            return True
+
+        # Mesmo sinal do migrate_schemas (ex: criação de partições futuras)
+        schema_migrated.send(
+            sender=create_schema_from_template, schema_name=tenant.schema_name
+        )
+        logger.info(f"Schema {tenant.schema_name} clonado de {get_template_schema()}")
+    return True
+
+
+def provision_tenant(tenant) -> None:
+    """
+    Cria o schema de um tenant salvo sem schema e atualiza o status
+
+    Executado em background (tenants.provision_tenant_schema); falhas
+    marcam o tenant como `failed` e são propagadas para retry.
+    """
+    from .models import Tenant
+
+    try:
+        tenant.create_schema(check_if_exists=True, verbosity=0)
+    except Exception:
+        Tenant.objects.filter(pk=tenant.pk).update(provisioning_status="failed")
+        raise
+
+    Tenant.objects.filter(pk=tenant.pk).update(provisioning_status="ready")
+    tenant.provisioning_status = "ready"
@@ -66,6 +66,7 @@ class TenantSerializer(BaseModelSerializer):
             "founded_date",
             "website",
             "is_active",
+            "provisioning_status",
             "created_at",
             "updated_at",
             # Campos computados
@@ -75,6 +76,7 @@ class TenantSerializer(BaseModelSerializer):
         ]
         read_only_fields: ClassVar = [
             "id",
+            "provisioning_status",
             "created_at",
             "updated_at",
             "subdomain_url",
@@ -124,7 +126,9 @@ class TenantCreateSerializer(serializers.ModelSerializer):
             "timezone",
             "founded_date",
             "website",
+            "provisioning_status",
         ]
+        read_only_fields: ClassVar = ["provisioning_status"]
         extra_kwargs: ClassVar = {
             "name": {"help_text": "Nome da academia"},
             "slug": {"help_text": "Slug único para subdomínio", "required": False},
@@ -0,0 +1,33 @@
+"""
+Tarefas em background de gestão de academias (tenants)
+
+Executadas no schema público: o provisionamento cria o schema do tenant,
+que ainda não existe no momento do enfileiramento.
+"""
+import logging
+
+from celery import shared_task
+from django.conf import settings
+from django.db import InterfaceError, OperationalError
+from django_tenants.utils import schema_context
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    name="tenants.provision_tenant_schema",
+    autoretry_for=(OperationalError, InterfaceError),
+    retry_backoff=True,
+    max_retries=5,
+)
+def provision_tenant_schema(tenant_id) -> str:
+    """Cria o schema (clone do template) de um tenant recém-cadastrado"""
+    from .models import Tenant
+    from .provisioning import provision_tenant
+
+    with schema_context(settings.PUBLIC_SCHEMA_NAME):
+        tenant = Tenant.objects.get(pk=tenant_id)
+        if tenant.provisioning_status == "ready":
+            return tenant.provisioning_status
+        provision_tenant(tenant)
+    return tenant.provisioning_status
@@ -8,6 +8,7 @@ Seguindo padrões estabelecidos no CONTEXT.md:
 """
 from typing import ClassVar
 
+from django.db import transaction
 from drf_spectacular.utils import extend_schema, extend_schema_view
 from rest_framework import permissions
 from rest_framework.decorators import action
@@ -17,12 +18,14 @@ from apps.core.permissions import IsAdminOrReadOnly
 from apps.core.viewsets import TenantViewSet
 
 from .models import Tenant
+from .provisioning import get_provisioning_settings
 from .serializers import (
     TenantCreateSerializer,
     TenantPublicSerializer,
     TenantSerializer,
     TenantUpdateSerializer,
 )
+from .tasks import provision_tenant_schema
 
 
 @extend_schema_view(
@@ -41,6 +44,8 @@ class TenantViewSet(TenantViewSet):
     queryset = Tenant.objects.all()
     serializer_class = TenantSerializer
     permission_classes: ClassVar = [IsAdminOrReadOnly]
+    # Criação provisiona schema por academia: sem ações em lote
+    bulk_operations: ClassVar = ()
     search_fields: ClassVar = ["name", "email", "city", "state"]
     filterset_fields: ClassVar = ["city", "state", "country", "is_active"]
     ordering_fields: ClassVar = ["name", "founded_date", "created_at"]
@@ -56,6 +61,20 @@ class TenantViewSet(TenantViewSet):
             return TenantPublicSerializer
         return TenantSerializer
 
+    def perform_create(self, serializer):
+        """
+        Cadastra a academia e cria o schema em background
+
+        O schema é clonado do template pelo worker; até lá o tenant fica com
+        provisioning_status `pending`.
+        """
+        if not get_provisioning_settings()["ASYNC"]:
+            serializer.save()
+            return
+
+        tenant = serializer.save(provisioning_status="pending")
+        transaction.on_commit(lambda: provision_tenant_schema.delay(tenant.pk))
+
     @extend_schema(
         summary="Informações públicas da academia",
         description="Retorna informações básicas para landing pages",
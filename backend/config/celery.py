@@ -0,0 +1,16 @@
+"""
+Configuração do Celery para o projeto wBJJ.
+
+Tarefas de tenant devem usar `apps.core.tasks.TenantTask` como base para
+executar no schema em que foram enfileiradas.
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
+
+app = Celery("wbjj")
+app.config_from_object("django.conf:settings", namespace="CELERY")
+app.autodiscover_tasks()
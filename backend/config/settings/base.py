@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from datetime import timedelta
 from pathlib import Path
 
@@ -57,6 +58,7 @@ INSTALLED_APPS = [
     "health_check.storage",
     "health_check.contrib.migrations",
     "health_check.contrib.psutil",
+    "cachalot",
     # Local apps
     "apps.core",
     "apps.tenants",
@@ -67,6 +69,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "apps.core.middleware.CompressionMiddleware",  # Comprime a resposta final (antes dos que alteram o corpo)
+    "apps.core.request_metrics.RequestMetricsMiddleware",  # Latência por tenant/view (antes do TenantMiddleware)
     "apps.authentication.middleware.TenantMiddleware",  # PRIMEIRO! - Middleware de tenant OBRIGATÓRIO
     "apps.core.middleware.PermissionsPolicyMiddleware",  # Middleware para Permissions Policy
     "apps.core.middleware.SecurityHeadersMiddleware",  # Middleware para cabeçalhos de segurança
@@ -229,11 +233,11 @@ REST_FRAMEWORK = {
         "rest_framework.permissions.IsAuthenticated",
     ],
     "DEFAULT_RENDERER_CLASSES": [
-        "djangorestframework_camel_case.render.CamelCaseJSONRenderer",
+        "apps.core.renderers.CamelCaseJSONRenderer",
         "rest_framework.renderers.JSONRenderer",
     ],
     "DEFAULT_PARSER_CLASSES": [
-        "djangorestframework_camel_case.parser.CamelCaseJSONParser",
+        "apps.core.parsers.CamelCaseJSONParser",
         "rest_framework.parsers.JSONParser",
         "rest_framework.parsers.MultiPartParser",
         "rest_framework.parsers.FormParser",
@@ -318,6 +322,7 @@ CORS_ALLOW_HEADERS = [
     "x-forwarded-proto",  # Protocol forwarding
     "cache-control",  # Cache headers
     "pragma",  # Cache headers
+    "idempotency-key",  # Reenvio seguro de escritas
 ]
 
 # Métodos HTTP permitidos
@@ -377,6 +382,10 @@ SPECTACULAR_SETTINGS = {
     - `search`: busca textual nos campos configurados
     - `ordering`: ordenação (use "-" para decrescente)
     - Filtros específicos por campo conforme documentado
+
+    ## Campos Esparsos e Expansão
+    - `fields`: campos retornados (ex: `fields=id,status,student.fullName`)
+    - `expand`: objetos aninhados expandidos; os demais retornam apenas o ID
     """,
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
@@ -462,6 +471,105 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# Artefato pré-compilado do schema (`manage.py build_openapi_schema` no build).
+# Sem artefato, o schema é gerado uma única vez por processo.
+OPENAPI_SCHEMA_ARTIFACT = {
+    "DIR": BASE_DIR.parent / "openapi",
+    "MAX_AGE": 0,  # Segundos de cache no cliente (revalidação via ETag)
+}
+
+# =============================================================================
+# CELERY CONFIGURATION
+# =============================================================================
+
+CELERY_BROKER_URL = "redis://localhost:6379/2"
+CELERY_RESULT_BACKEND = None  # Resultados não são consultados pela API
+CELERY_TASK_SERIALIZER = "json"
+CELERY_RESULT_SERIALIZER = "json"
+CELERY_ACCEPT_CONTENT = ["json"]
+CELERY_TIMEZONE = TIME_ZONE
+CELERY_TASK_ACKS_LATE = True  # Tarefas interrompidas voltam para a fila
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+# Tarefas de tenant (apps.core.tasks.TenantTask)
+TENANT_TASKS = {
+    "MAX_CONCURRENCY": 2,  # Execuções simultâneas da mesma tarefa por tenant
+    "CONCURRENCY_RETRY_DELAY": 30,  # Segundos até tentar novamente sem vaga
+    "CONCURRENCY_MAX_WAITS": 20,  # Reagendamentos sem vaga antes de falhar
+    "SLOT_TIMEOUT": 60 * 60,  # Expiração das vagas (worker interrompido)
+    "IDEMPOTENCY_TTL": 60 * 60 * 24,  # Retenção das execuções concluídas
+}
+
+# =============================================================================
+# IDEMPOTENCY CONFIGURATION
+# =============================================================================
+
+# Escritas dos TenantViewSets com o cabeçalho Idempotency-Key: a primeira
+# resposta fica em cache por tenant, usuário e chave; reenvios a recebem de
+# volta sem executar a view (apps.core.idempotency).
+IDEMPOTENCY = {
+    "HEADER": "Idempotency-Key",
+    "TTL": 60 * 60 * 24,  # Retenção das respostas
+    "LOCK_TIMEOUT": 60,  # Reserva da chave enquanto a primeira está em andamento
+    "MAX_KEY_LENGTH": 255,
+}
+
+# =============================================================================
+# BULK ACTIONS CONFIGURATION
+# =============================================================================
+
+# Ações em lote dos TenantViewSets (bulk/, bulk-delete/, bulk-restore/):
+# validação com uma consulta por campo único/relação e escrita em uma transação.
+BULK_ACTIONS = {
+    "MAX_ITEMS": 1000,  # Itens por requisição
+    "BATCH_SIZE": 500,  # Linhas por INSERT/UPDATE
+}
+
+# Total das listagens paginadas: contagem exata em cache por tenant, filtros e
+# versão dos dados; acima do limite usa a estimativa do planner (count_is_approximate).
+PAGINATION_COUNT = {
+    "CACHE_TTL": 60,  # Segundos (limita atraso de escritas sem post_save)
+    "ESTIMATE_THRESHOLD": 50000,  # Linhas estimadas; None desativa a estimativa
+}
+
+# Listagens do admin (OptimizedModelAdmin): total via PAGINATION_COUNT e
+# facetas do date_hierarchy em cache por versão dos dados.
+ADMIN_LISTS = {
+    "FACET_CACHE_TTL": 300,  # Segundos; 0 desativa o cache das facetas
+}
+
+# =============================================================================
+# ORM QUERY CACHE CONFIGURATION (django-cachalot)
+# =============================================================================
+
+# Chaves de consulta e invalidação escopadas por schema (apps.core.query_cache).
+# Apenas consultas que envolvem exclusivamente as tabelas abaixo são cacheadas.
+CACHALOT_ENABLED = True
+CACHALOT_ADDITIONAL_SUPPORTED_DATABASES = ["django_tenants.postgresql_backend"]
+CACHALOT_TIMEOUT = 60 * 15  # 15 minutos
+CACHALOT_QUERY_KEYGEN = "apps.core.query_cache.get_query_cache_key"
+CACHALOT_TABLE_KEYGEN = "apps.core.query_cache.get_table_cache_key"
+# Só o primário: leitura de réplica atrasada logo após uma escrita gravaria
+# no cache o dado anterior sob a versão nova das tabelas
+CACHALOT_DATABASES = ["default"]
+CACHALOT_ONLY_CACHABLE_TABLES = (
+    "payment_methods",  # payments.PaymentMethod
+    "students",  # students.Student
+    "graduations",  # students.Graduation
+    "tenants_tenant",  # tenants.Tenant
+)
+
+# =============================================================================
+# DASHBOARD SNAPSHOT CONFIGURATION
+# =============================================================================
+
+# Snapshot do dashboard por tenant (apps.core.dashboard)
+DASHBOARD_SNAPSHOT = {
+    "MAX_AGE": 300,  # Segundos até uma seção ser recalculada na leitura
+    "DEBOUNCE": 5,  # Atraso do recálculo após escritas (agrupa rajadas)
+    "TTL": 60 * 60 * 24,  # Retenção das seções no cache
+}
+
 # =============================================================================
 # HEALTH CHECK CONFIGURATION
 # =============================================================================
@@ -471,6 +579,105 @@ HEALTH_CHECK = {
     "MEMORY_MIN": 100,  # MB mínimo de memória livre
 }
 
+# Verificações em background dos endpoints /api/v1/core/health/ (apps.core.health)
+HEALTH_PROBES = {
+    "BACKGROUND": True,  # Thread por processo; endpoints leem o último veredito
+    "INTERVAL": 10,  # Segundos entre rodadas de verificação
+    "TIMEOUT": 2,  # Tempo máximo de cada rodada
+    "STALE_AFTER": 60,  # Veredito mais antigo que isso é reportado como unhealthy
+    "MEMORY_WARNING": 85,  # % de uso de memória para alerta
+    "MEMORY_CRITICAL": 95,  # % de uso de memória que torna o serviço unhealthy
+    "DISK_WARNING": 85,
+    "DISK_CRITICAL": 95,
+}
+
+# =============================================================================
+# ATTENDANCE PARTITIONING CONFIGURATION
+# =============================================================================
+
+# Particionamento mensal (PostgreSQL RANGE) da tabela attendances por tenant.
+# Quando habilitado, cada schema é convertido após as migrações e as partições
+# futuras são criadas por `manage.py partition_attendances` (agendar via cron).
+ATTENDANCE_PARTITIONING = {
+    "ENABLED": False,
+    "MONTHS_AHEAD": 3,  # Meses criados antecipadamente
+}
+
+# Agregações de presenças (séries e mapa de calor). Períodos fechados ficam
+# em cache; escritas retroativas invalidam o cache do schema.
+ATTENDANCE_ANALYTICS = {
+    "CACHE_TTL": 60 * 60 * 24 * 7,  # 7 dias
+    "DEFAULT_RANGE_DAYS": 90,
+    "MAX_RANGE_DAYS": 731,
+    # Progressão de faixas (tempo na faixa / presenças entre graduações)
+    "PERCENTILES": [0.25, 0.5, 0.75, 0.9],
+    "PROGRESSION_TTL": 60 * 60 * 6,  # 6 horas (graduações invalidam antes)
+}
+
+# =============================================================================
+# PAYMENT RECONCILIATION CONFIGURATION
+# =============================================================================
+
+# Conciliação do extrato de liquidação do gateway (CSV/OFX) por external_id.
+# Arquivo lido em streaming; lotes de BATCH_SIZE linhas por consulta.
+PAYMENT_RECONCILIATION = {
+    "BATCH_SIZE": 1000,
+    "MAX_REPORTED_ROWS": 100,  # Linhas problemáticas listadas no relatório
+    "STATUS_MAP": {},  # Status extras do gateway (ex: {"liquidado": "confirmed"})
+}
+
+# =============================================================================
+# PAYMENT WEBHOOKS CONFIGURATION
+# =============================================================================
+
+# Webhooks do gateway: POST /api/v1/webhooks/payments/<gateway>/<tenant_slug>/
+# assinado com HMAC-SHA256 do corpo (SIGNATURE_HEADER). Gravados na inbox e
+# processados em background; agendar `payments.process_payment_webhooks` no
+# beat (ex: a cada minuto) para as novas tentativas.
+PAYMENT_WEBHOOKS = {
+    "SECRET": os.environ.get("PAYMENT_WEBHOOK_SECRET", ""),
+    "SIGNATURE_HEADER": "X-Webhook-Signature",
+    "BATCH_SIZE": 500,  # Eventos por rodada de processamento
+    "MAX_ATTEMPTS": 10,  # Tentativas de evento sem pagamento correspondente
+    "RETRY_DELAY": 60,  # Segundos (multiplicado pelo número de tentativas)
+    "DEBOUNCE": 2,  # Segundos
+    "EVENT_STATUS_MAP": {},  # Tipos extras (ex: {"charge.paid": "confirmed"})
+}
+
+# =============================================================================
+# SOFT DELETE ARCHIVAL CONFIGURATION
+# =============================================================================
+
+# Registros com soft delete são movidos para <tabela>_archive em cada schema
+# por `manage.py archive_soft_deleted` (agendar via cron).
+SOFT_DELETE_ARCHIVAL = {
+    "RETENTION_DAYS": 90,  # Dias após deleted_at antes de arquivar
+    "BATCH_SIZE": 1000,  # Registros movidos por transação
+}
+
+# =============================================================================
+# RESPONSE COMPRESSION CONFIGURATION
+# =============================================================================
+
+# Compressão das respostas negociada por Accept-Encoding (zstd, br, gzip).
+# Streams (exportações) não são comprimidos por padrão; quando habilitado,
+# são comprimidos em blocos sem bufferizar o conteúdo.
+RESPONSE_COMPRESSION = {
+    "ENABLED": True,
+    "MIN_SIZE": 500,  # Bytes mínimos para comprimir
+    "ENCODINGS": ["zstd", "br", "gzip"],  # Ordem de preferência em empates
+    "COMPRESS_STREAMING": False,
+    "EXCLUDED_CONTENT_TYPES": [
+        "image/",
+        "video/",
+        "audio/",
+        "application/zip",
+        "application/gzip",
+        "application/pdf",
+        "application/octet-stream",
+    ],
+}
+
 # =============================================================================
 # CAMEL CASE CONFIGURATION
 # =============================================================================
@@ -564,5 +771,55 @@ PUBLIC_SCHEMA_NAME = "public"
 # Configurações de multitenancy
 TENANT_LIMIT_SET_CALLS = True  # Otimização de performance
 
-# Router obrigatório para django-tenants
-DATABASE_ROUTERS = ("django_tenants.routers.TenantSyncRouter",)
+# Provisionamento de tenants (apps.tenants.provisioning)
+TENANT_PROVISIONING = {
+    "USE_TEMPLATE": True,  # Clona o schema template em vez de rodar migrations
+    "TEMPLATE_SCHEMA": "tenant_template",  # Schema migrado com dados iniciais
+    "ASYNC": True,  # Cadastro via API enfileira a criação do schema
+    "RETRY_AFTER": 30,  # Retry-After (s) do 503 enquanto o schema é criado
+}
+
+# Router obrigatório para django-tenants; o de réplicas vem antes
+DATABASE_ROUTERS = (
+    "apps.core.replicas.ReadReplicaRouter",
+    "django_tenants.routers.TenantSyncRouter",
+)
+
+# Métricas de requisição por tenant/view/classe de status (apps.core.request_metrics),
+# em memória do processo e expostas em /api/v1/metrics/ (staff da plataforma
+# ou coletor com o cabeçalho X-Metrics-Token).
+REQUEST_METRICS = {
+    "MAX_TENANTS": 500,  # Demais tenants agregados em "__other__"
+    "MAX_VIEWS": 300,
+    "TOP_N": 10,  # Tamanho padrão dos rankings de mais lentos
+    "SCRAPE_TOKEN": os.environ.get("METRICS_SCRAPE_TOKEN", ""),  # Vazio desativa
+}
+
+# Consultas lentas (apps.core.slow_queries): capturadas por execute_wrapper e
+# gravadas em background com EXPLAIN (ANALYZE, BUFFERS) por amostragem.
+SLOW_QUERIES = {
+    "THRESHOLD_MS": 500,
+    "CAPTURE_INTERVAL": 60,  # Segundos entre amostras do mesmo formato/schema
+    "EXPLAIN_SAMPLE_RATE": 0.1,
+    "EXPLAIN_INTERVAL": 60 * 60,  # Segundos entre EXPLAINs do mesmo formato
+    "RETENTION_DAYS": 14,
+}
+
+# Isolamento de carga por tenant (apps.core.workload), aplicado pelo
+# TenantMiddleware: timeouts do PostgreSQL (ms) e requisições simultâneas por
+# classe de endpoint; acima do limite responde 503 com Retry-After.
+TENANT_WORKLOAD = {
+    "STATEMENT_TIMEOUT": {"default": 10000, "report": 30000, "admin": 30000},
+    "LOCK_TIMEOUT": {"default": 2000},
+    "MAX_CONCURRENT": {"default": 30, "report": 3},
+    "RETRY_AFTER": 5,  # Segundos
+    # Limites específicos por slug, ex: {"academia-x": {"MAX_CONCURRENT": {"report": 6}}}
+    "TENANT_OVERRIDES": {},
+}
+
+# Réplicas de leitura (apps.core.replicas): aliases em DATABASES com o mesmo
+# ENGINE do primário. Sem aliases, todas as consultas usam o primário.
+READ_REPLICAS = {
+    "ALIASES": [],
+    "STICKY_SECONDS": 10,  # Leituras no primário após escrita do usuário
+}
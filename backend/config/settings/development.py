@@ -56,12 +56,23 @@ else:
         }
     }
 
+# Celery usa o mesmo Redis (banco 2)
+if "CELERY_BROKER_URL" in os.environ:
+    CELERY_BROKER_URL = os.environ["CELERY_BROKER_URL"]
+else:
+    redis_host = "redis" if IS_DOCKER else "localhost"
+    redis_password = os.environ.get("REDIS_PASSWORD", "redis_pass")
+    CELERY_BROKER_URL = f"redis://:{redis_password}@{redis_host}:6379/2"
+
 # Debug toolbar apenas em desenvolvimento local (não no Docker)
 if DEBUG and not IS_DOCKER:
     INSTALLED_APPS += ["debug_toolbar"]
     MIDDLEWARE = ["debug_toolbar.middleware.DebugToolbarMiddleware", *MIDDLEWARE]
     INTERNAL_IPS = ["127.0.0.1"]
 
+# Schema OpenAPI sempre gerado a partir do código (sem artefato de build)
+OPENAPI_SCHEMA_ARTIFACT = {"DIR": None}
+
 # CORS para desenvolvimento
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
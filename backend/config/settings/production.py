@@ -16,7 +16,22 @@ DATABASES = {
     }
 }
 
+# Réplicas de leitura: DB_REPLICA_HOSTS=host1,host2 (mesmas credenciais)
+for index, host in enumerate(config("DB_REPLICA_HOSTS", default="", cast=Csv())):
+    DATABASES[f"replica_{index + 1}"] = {
+        **DATABASES["default"],
+        "HOST": host,
+        "PORT": config("DB_REPLICA_PORT", default=DATABASES["default"]["PORT"]),
+    }
+READ_REPLICAS = {
+    **READ_REPLICAS,
+    "ALIASES": [alias for alias in DATABASES if alias.startswith("replica_")],
+}
+
 # Security settings
 SECURE_SSL_REDIRECT = True
 SECURE_BROWSER_XSS_FILTER = True
 SECURE_CONTENT_TYPE_NOSNIFF = True
+
+# Celery
+CELERY_BROKER_URL = config("CELERY_BROKER_URL")
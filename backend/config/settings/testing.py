@@ -21,6 +21,8 @@ DATABASES = {
         },
     }
 }
+# Réplica de leitura espelhada no banco de teste (roteamento em tests)
+DATABASES["replica"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
 
 # Fast password hashing for tests
 PASSWORD_HASHERS = [
@@ -47,6 +49,7 @@ if not os.environ.get("DEBUG_TESTS", "0") == "1":
 # Test-specific settings
 CELERY_TASK_ALWAYS_EAGER = True  # Execute tasks synchronously
 CELERY_TASK_EAGER_PROPAGATES = True  # Propagate exceptions
+CELERY_BROKER_URL = "memory://"
 
 # Security settings for tests
 SECRET_KEY = "test-secret-key-only-for-testing"
@@ -54,6 +57,12 @@ CSRF_COOKIE_SECURE = False
 SESSION_COOKIE_SECURE = False
 SECURE_SSL_REDIRECT = False
 
+# Health checks executados na leitura (sem thread de background)
+HEALTH_PROBES = {"BACKGROUND": False, "INTERVAL": 0}
+
+# OpenAPI schema generated in memory (no build artifact)
+OPENAPI_SCHEMA_ARTIFACT = {"DIR": None}
+
 # Media files for tests
 MEDIA_ROOT = "/tmp/wbjj_test_media"
 
@@ -62,4 +71,6 @@ MIGRATION_MODULES = {}  # Use default migrations
 
 # Django Tenants specific settings for tests
 TENANT_CREATION_FAKES_MIGRATIONS = False
+# Tenant dos testes sem dados iniciais; provisionamento testado explicitamente
+TENANT_PROVISIONING = {"USE_TEMPLATE": False, "ASYNC": False}
 TENANT_LIMIT_SET_CALLS = True
@@ -8,11 +8,9 @@ The `urlpatterns` list routes URLs to views. For more information please see:
 from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
-from drf_spectacular.views import (
-    SpectacularAPIView,
-    SpectacularRedocView,
-    SpectacularSwaggerView,
-)
+from drf_spectacular.views import SpectacularRedocView, SpectacularSwaggerView
+
+from apps.core.schema import PrecompiledSpectacularAPIView
 
 # Personalização do admin Django
 admin.site.site_header = settings.ADMIN_SITE_HEADER
@@ -31,7 +29,7 @@ urlpatterns = [
     # Health checks
     path("health/", include("health_check.urls")),
     # OpenAPI Documentation
-    path("api/schema/", SpectacularAPIView.as_view(), name="schema"),
+    path("api/schema/", PrecompiledSpectacularAPIView.as_view(), name="schema"),
     path(
         "api/docs/",
         SpectacularSwaggerView.as_view(url_name="schema"),
@@ -0,0 +1,101 @@
+"""
+Testes das listagens do admin (OptimizedModelAdmin)
+Foco: select_related derivado das colunas, anotações, total e facetas em cache
+"""
+
+import datetime
+
+from django.contrib import admin
+from django.db import connection
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.core.templatetags.optimized_admin import cached_date_hierarchy
+from apps.payments.models import Invoice, Payment
+from apps.students.models import Graduation, Student
+from tests.base import BaseTenantTestCase
+from tests.with_db.factories import InvoiceFactory
+
+
+class TestAdminLists(BaseTenantTestCase):
+    """Testes para as listagens otimizadas do admin"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = self.create_superuser()
+        today = timezone.now().date()
+        self.overdue = InvoiceFactory(due_date=today - datetime.timedelta(days=3))
+        self.invoices = [self.overdue] + [InvoiceFactory() for _ in range(3)]
+
+    def _changelist(self, model=Invoice, **params):
+        request = RequestFactory().get("/admin/", params)
+        request.user = self.user
+        return admin.site._registry[model].get_changelist_instance(request)
+
+    def test_select_related_derived_from_columns(self):
+        request = RequestFactory().get("/admin/")
+
+        def related(model):
+            return admin.site._registry[model].get_list_select_related(request)
+
+        self.assertEqual(related(Student), ["user"])
+        self.assertEqual(related(Invoice), ["student", "student__user"])
+        self.assertEqual(
+            related(Payment),
+            ["invoice", "invoice__student", "invoice__student__user", "payment_method"],
+        )
+        self.assertEqual(
+            related(Graduation), ["instructor", "student", "student__user"]
+        )
+
+    def test_rows_render_without_per_row_queries(self):
+        model_admin = admin.site._registry[Invoice]
+        changelist = self._changelist()
+
+        with CaptureQueriesContext(connection) as queries:
+            rows = [
+                (str(invoice.student), model_admin.get_overdue_display(invoice))
+                for invoice in changelist.result_list
+            ]
+
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(len(rows), 4)
+        overdue = {invoice.pk: invoice.overdue for invoice in changelist.result_list}
+        self.assertEqual(
+            overdue, {invoice.pk: invoice.is_overdue for invoice in self.invoices}
+        )
+
+    def test_orders_by_annotated_column(self):
+        columns = list(admin.site._registry[Invoice].list_display)
+        index = columns.index("get_overdue_display") + 1
+
+        changelist = self._changelist(o=f"-{index}")
+
+        self.assertEqual(changelist.result_list[0].pk, self.overdue.pk)
+
+    def test_total_is_cached_without_full_count(self):
+        self.assertEqual(self._changelist().result_count, 4)
+
+        with CaptureQueriesContext(connection) as queries:
+            changelist = self._changelist()
+
+        self.assertEqual(changelist.result_count, 4)
+        self.assertIsNone(changelist.full_result_count)
+        self.assertFalse(any("COUNT(" in q["sql"].upper() for q in queries))
+
+    def test_date_hierarchy_facets_are_cached_per_data_version(self):
+        facets = cached_date_hierarchy(self._changelist())
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = cached_date_hierarchy(self._changelist())
+
+        self.assertEqual(cached, facets)
+        self.assertFalse(any("due_date" in q["sql"] for q in queries))
+
+        InvoiceFactory(due_date=datetime.date(2001, 5, 10))
+        years = [
+            choice["title"]
+            for choice in cached_date_hierarchy(self._changelist())["choices"]
+        ]
+        self.assertIn("2001", years)
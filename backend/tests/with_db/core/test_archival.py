@@ -0,0 +1,83 @@
+"""
+Testes para arquivamento de registros removidos (soft delete)
+Foco: retenção, dependências entre tabelas, tabelas de arquivo
+"""
+
+from datetime import timedelta
+
+from django.db import connection
+from django.utils import timezone
+
+from apps.core.archival import archive_schema
+from apps.payments.models import Invoice
+from apps.students.models import Attendance, Student
+from tests.base import BaseTenantTestCase
+from tests.with_db.factories import (
+    AttendanceFactory,
+    InvoiceFactory,
+    StudentFactory,
+)
+
+
+class TestSoftDeleteArchival(BaseTenantTestCase):
+    """Testes para archive_schema"""
+
+    def _soft_delete(self, obj, days_ago):
+        """Remove com soft delete e retroage deleted_at"""
+        obj.delete()
+        type(obj).objects.filter(id=obj.id).update(
+            deleted_at=timezone.now() - timedelta(days=days_ago)
+        )
+
+    def _archived_ids(self, table):
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT id FROM {table}_archive")
+            return {row[0] for row in cursor.fetchall()}
+
+    def test_archives_rows_past_retention(self):
+        """Registros removidos há mais que a retenção são movidos"""
+        old = AttendanceFactory()
+        recent = AttendanceFactory()
+        self._soft_delete(old, days_ago=120)
+        self._soft_delete(recent, days_ago=10)
+
+        results = archive_schema(self.tenant.schema_name, retention_days=90)
+
+        self.assertEqual(results["attendances"], 1)
+        self.assertFalse(Attendance.objects.filter(id=old.id).exists())
+        self.assertTrue(Attendance.objects.filter(id=recent.id).exists())
+        self.assertEqual(self._archived_ids("attendances"), {old.id})
+
+    def test_active_rows_are_never_archived(self):
+        """Registros ativos permanecem na tabela quente"""
+        invoice = InvoiceFactory()
+
+        archive_schema(self.tenant.schema_name, retention_days=0)
+
+        self.assertTrue(Invoice.objects.filter(id=invoice.id).exists())
+
+    def test_referenced_rows_are_kept(self):
+        """Aluno removido com faturas ativas não é arquivado"""
+        student = StudentFactory()
+        InvoiceFactory(student=student)
+        self._soft_delete(student, days_ago=120)
+
+        results = archive_schema(self.tenant.schema_name, retention_days=90)
+
+        self.assertEqual(results["students"], 0)
+        self.assertTrue(Student.objects.filter(id=student.id).exists())
+
+    def test_dependents_are_archived_before_parents(self):
+        """Aluno e faturas removidos são arquivados na mesma execução"""
+        student = StudentFactory()
+        invoice = InvoiceFactory(student=student)
+        self._soft_delete(invoice, days_ago=120)
+        self._soft_delete(student, days_ago=120)
+
+        results = archive_schema(
+            self.tenant.schema_name, retention_days=90, batch_size=1
+        )
+
+        self.assertEqual(results["invoices"], 1)
+        self.assertEqual(results["students"], 1)
+        self.assertEqual(self._archived_ids("students"), {student.id})
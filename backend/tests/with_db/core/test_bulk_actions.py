@@ -0,0 +1,218 @@
+"""
+Testes das ações em lote do TenantViewSet
+Foco: consultas por lote, erros por índice, transação única e soft delete
+"""
+
+import uuid
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.authentication.models import User
+from apps.authentication.views import UserViewSet
+from apps.students.models import Graduation, Student
+from apps.students.views import GraduationViewSet, StudentViewSet
+from apps.tenants.views import TenantViewSet
+from tests.base import BaseTenantTestCase
+from tests.with_db.factories import (
+    AdminUserFactory,
+    StudentFactory,
+    StudentUserFactory,
+)
+
+
+class TestBulkActions(BaseTenantTestCase):
+    """Testes para criação, atualização e soft delete em lote"""
+
+    def setUp(self):
+        super().setUp()
+        self.admin = AdminUserFactory()
+
+    def _call(
+        self, viewset, method, action, data, path="/api/v1/students/bulk/", user=None
+    ):
+        request = getattr(APIRequestFactory(), method)(path, data, format="json")
+        force_authenticate(request, user=user or self.admin)
+        return viewset.as_view({method: action})(request)
+
+    def _student_payload(self, index, user=None):
+        return {
+            "user_id": str((user or StudentUserFactory()).pk),
+            "registration_number": f"LOTE{index:04d}",
+            "enrollment_date": "2025-01-10",
+            "emergency_contact_name": "Maria",
+            "emergency_contact_phone": "+5511999999999",
+            "emergency_contact_relationship": "Mãe",
+        }
+
+    def _create(self, payload):
+        return self._call(StudentViewSet, "post", "bulk", payload)
+
+    def test_bulk_create_uses_constant_number_of_queries(self):
+        """Unicidade e relações validadas com uma consulta por campo"""
+        small = [self._student_payload(index) for index in range(2)]
+        large = [self._student_payload(index) for index in range(10, 20)]
+
+        with CaptureQueriesContext(connection) as small_queries:
+            response = self._create(small)
+        with CaptureQueriesContext(connection) as large_queries:
+            self._create(large)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["created"], 2)
+        self.assertEqual(len(small_queries), len(large_queries))
+        self.assertEqual(Student.objects.count(), 12)
+
+    def test_bulk_create_reports_errors_per_item_and_writes_nothing(self):
+        StudentFactory(registration_number="LOTE0001")
+        user = StudentUserFactory()
+        payload = [
+            self._student_payload(0, user=user),
+            self._student_payload(1),
+            {**self._student_payload(2), "user_id": str(uuid.uuid4())},
+            {**self._student_payload(3), "registration_number": "LOTE0000"},
+            {**self._student_payload(4), "enrollment_date": "data"},
+        ]
+
+        response = self._create(payload)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        errors = {item["index"]: item["errors"] for item in response.data["errors"]}
+        self.assertEqual(sorted(errors), [1, 2, 3, 4])
+        self.assertIn("registration_number", errors[1])
+        self.assertIn("user_id", errors[2])
+        self.assertIn("registration_number", errors[3])
+        self.assertIn("enrollment_date", errors[4])
+        self.assertEqual(Student.objects.count(), 1)
+
+    def test_bulk_partial_update(self):
+        first, second = StudentFactory(), StudentFactory()
+
+        response = self._call(
+            StudentViewSet,
+            "patch",
+            "bulk_partial_update",
+            [
+                {"id": str(first.pk), "notes": "Competidor"},
+                {"id": str(second.pk), "status": "suspended"},
+            ],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["updated"], 2)
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.notes, "Competidor")
+        self.assertEqual(second.status, "suspended")
+
+    def test_bulk_partial_update_unknown_id(self):
+        student = StudentFactory()
+
+        response = self._call(
+            StudentViewSet,
+            "patch",
+            "bulk_partial_update",
+            [
+                {"id": str(student.pk), "notes": "ok"},
+                {"id": str(uuid.uuid4()), "notes": "x"},
+            ],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0]["index"], 1)
+        student.refresh_from_db()
+        self.assertEqual(student.notes, "")
+
+    def test_bulk_delete_and_restore(self):
+        students = [StudentFactory() for _ in range(3)]
+        ids = [str(student.pk) for student in students]
+
+        deleted = self._call(StudentViewSet, "post", "bulk_delete", {"ids": ids[:2]})
+        self.assertEqual(deleted.data["deleted"], 2)
+        self.assertEqual(Student.objects.filter(is_active=True).count(), 1)
+
+        restored = self._call(StudentViewSet, "post", "bulk_restore", {"ids": ids})
+        self.assertEqual(restored.data["restored"], 2)
+        self.assertEqual(Student.objects.filter(is_active=True).count(), 3)
+
+    def test_bulk_create_uses_viewset_defaults(self):
+        """Graduação em lote preenche instrutor e faixa anterior como na view"""
+        student = StudentFactory(belt_color="blue")
+
+        response = self._call(
+            GraduationViewSet,
+            "post",
+            "bulk",
+            [
+                {
+                    "student_id": str(student.pk),
+                    "to_belt": "purple",
+                    "graduation_date": "2025-01-10",
+                }
+            ],
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        graduation = Graduation.objects.get()
+        self.assertEqual(graduation.from_belt, "blue")
+        self.assertEqual(graduation.instructor, self.admin)
+
+    def test_disabled_operations(self):
+        response = self._call(
+            TenantViewSet, "post", "bulk_delete", {"ids": [str(uuid.uuid4())]}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    def test_non_admin_uses_single_action_permissions(self):
+        """Aluno não altera nem remove outros usuários em lote"""
+        student = StudentUserFactory()
+        path = "/api/v1/users/bulk/"
+
+        renamed = self._call(
+            UserViewSet,
+            "patch",
+            "bulk_partial_update",
+            [{"id": str(self.admin.pk), "first_name": "Hacker"}],
+            path=path,
+            user=student,
+        )
+        deleted = self._call(
+            UserViewSet,
+            "post",
+            "bulk_delete",
+            {"ids": [str(self.admin.pk)]},
+            path=path,
+            user=student,
+        )
+        own = self._call(
+            UserViewSet,
+            "patch",
+            "bulk_partial_update",
+            [{"id": str(student.pk), "first_name": "Próprio"}],
+            path=path,
+            user=student,
+        )
+
+        self.assertEqual(renamed.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(deleted.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(own.status_code, status.HTTP_200_OK)
+        self.admin.refresh_from_db()
+        self.assertNotEqual(self.admin.first_name, "Hacker")
+        self.assertTrue(User.objects.get(pk=self.admin.pk).is_active)
+
+    def test_non_manager_cannot_bulk_delete_students(self):
+        students = [StudentFactory() for _ in range(2)]
+
+        response = self._call(
+            StudentViewSet,
+            "post",
+            "bulk_delete",
+            {"ids": [str(s.pk) for s in students]},
+            user=StudentUserFactory(),
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertEqual(Student.objects.filter(is_active=True).count(), 2)
@@ -0,0 +1,89 @@
+"""
+Testes do GET condicional nas listagens do TenantViewSet
+Foco: ETag por agregação, 304 com If-None-Match e invalidação
+"""
+
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.students.views import AttendanceViewSet, StudentViewSet
+from tests.base import BaseTenantTestCase
+from tests.with_db.factories import AdminUserFactory, AttendanceFactory
+
+
+class TestConditionalList(BaseTenantTestCase):
+    """Testes para listagens com ETag"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = AdminUserFactory()
+        self.attendance = AttendanceFactory()
+
+    def _list(self, etag=None, path="/api/v1/attendances/"):
+        headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+        request = APIRequestFactory().get(path, **headers)
+        force_authenticate(request, user=self.user)
+        return AttendanceViewSet.as_view({"get": "list"})(request)
+
+    def test_matching_etag_returns_304_with_single_query(self):
+        response = self._list()
+        etag = response["ETag"]
+        self.assertTrue(etag.startswith('W/"'))
+
+        with self.assertNumQueries(1):
+            cached = self._list(etag)
+
+        self.assertEqual(cached.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(cached["ETag"], etag)
+
+    def test_strong_form_of_etag_also_matches(self):
+        """Comparação fraca: clientes podem reenviar o ETag sem W/"""
+        etag = self._list()["ETag"]
+
+        response = self._list(etag.removeprefix("W/"))
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_changes_invalidate_etag(self):
+        etag = self._list()["ETag"]
+
+        self.attendance.notes = "Treino de competição"
+        self.attendance.save()
+        self.assertEqual(self._list(etag).status_code, status.HTTP_200_OK)
+
+        etag = self._list()["ETag"]
+        self.attendance.student.user.first_name = "Novo"
+        self.attendance.student.user.save()
+        self.assertEqual(self._list(etag).status_code, status.HTTP_200_OK)
+
+        etag = self._list()["ETag"]
+        self.attendance.delete()
+        self.assertEqual(self._list(etag).status_code, status.HTTP_200_OK)
+
+    def test_etag_depends_on_query_string(self):
+        etag = self._list()["ETag"]
+
+        response = self._list(etag, path="/api/v1/attendances/?page=1")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_attendances_invalidate_student_list(self):
+        """total_attendances não fica desatualizado atrás de um 304"""
+        student = self.attendance.student
+
+        def list_students(etag=None):
+            headers = {"HTTP_IF_NONE_MATCH": etag} if etag else {}
+            request = APIRequestFactory().get("/api/v1/students/", **headers)
+            force_authenticate(request, user=self.user)
+            return StudentViewSet.as_view({"get": "list"})(request)
+
+        etag = list_students()["ETag"]
+        self.assertEqual(list_students(etag).status_code, status.HTTP_304_NOT_MODIFIED)
+
+        AttendanceFactory(student=student, instructor=self.attendance.instructor)
+        response = list_students(etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        etag = response["ETag"]
+        self.attendance.delete()
+        self.assertEqual(list_students(etag).status_code, status.HTTP_200_OK)
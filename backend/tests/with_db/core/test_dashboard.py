@@ -0,0 +1,168 @@
+"""
+Testes do snapshot do dashboard por tenant
+Foco: indicadores calculados, leitura sem agregação e recálculo incremental
+"""
+
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.core.dashboard import (
+    get_dashboard,
+    pending_key,
+    refresh_sections,
+    schedule_refresh,
+)
+from apps.core.views import dashboard
+from apps.payments.models import Payment
+from tests.base import BaseTenantTestCase
+from tests.with_db.factories import (
+    AttendanceFactory,
+    InstructorUserFactory,
+    InvoiceFactory,
+    PaymentMethodFactory,
+    StudentFactory,
+    StudentUserFactory,
+)
+
+
+class TestDashboardSnapshot(BaseTenantTestCase):
+    """Testes para o snapshot do dashboard"""
+
+    def test_indicators(self):
+        """Indicadores agregados por seção"""
+        today = timezone.localdate()
+        student = StudentFactory(status="active", belt_color="blue")
+        StudentFactory(status="inactive", belt_color="white")
+        StudentFactory(status="active", belt_color="white", is_active=False)
+
+        AttendanceFactory(student=student, class_date=today)
+        AttendanceFactory(student=student, class_date=today - timedelta(days=30))
+
+        InvoiceFactory(
+            student=student,
+            status="pending",
+            due_date=today - timedelta(days=1),
+            amount=Decimal("150.00"),
+            late_fee=Decimal("10.00"),
+        )
+        invoice = InvoiceFactory(student=student, status="overdue")
+        Payment.objects.create(
+            invoice=invoice,
+            payment_method=PaymentMethodFactory(),
+            amount=Decimal("200.00"),
+            payment_date=timezone.now(),
+            status="confirmed",
+        )
+
+        data = get_dashboard()
+
+        self.assertEqual(data["students"]["active"], 1)
+        self.assertEqual(data["students"]["by_belt"]["blue"], 1)
+        self.assertEqual(data["students"]["by_belt"]["white"], 0)
+        self.assertEqual(data["students"]["by_status"]["inactive"], 1)
+        self.assertEqual(data["attendance"]["today"], 1)
+        self.assertEqual(data["overdue"]["count"], 2)
+        self.assertEqual(data["revenue"]["current_month"], Decimal("200.00"))
+        self.assertEqual(data["revenue"]["previous_month"], Decimal("0"))
+        self.assertIsNone(data["revenue"]["change_percent"])
+        self.assertEqual(data["stale_sections"], [])
+
+    def test_read_is_served_from_snapshot(self):
+        """Leituras após o primeiro cálculo não consultam o banco"""
+        StudentFactory()
+        get_dashboard()
+
+        with self.assertNumQueries(0):
+            data = get_dashboard()
+
+        self.assertEqual(data["students"]["active"], 1)
+
+    def test_write_refreshes_only_affected_section(self):
+        """Escrita agenda o recálculo apenas das seções do modelo alterado"""
+        get_dashboard()
+
+        with patch("apps.core.dashboard.schedule_refresh") as schedule:
+            with self.captureOnCommitCallbacks(execute=True):
+                StudentFactory()
+
+        schedule.assert_called_with(("students",))
+
+    def test_scheduled_refresh_updates_snapshot(self):
+        """Recálculo agendado (eager) atualiza a seção no snapshot"""
+        get_dashboard()
+        StudentFactory()
+
+        self.assertEqual(schedule_refresh(["students"]), ["students"])
+
+        self.assertEqual(get_dashboard()["students"]["active"], 1)
+
+    def test_refresh_is_debounced(self):
+        """Seção com recálculo pendente não é agendada novamente"""
+        with patch("apps.core.tasks.refresh_dashboard_snapshot.apply_async") as task:
+            self.assertEqual(schedule_refresh(["students"]), ["students"])
+            self.assertEqual(schedule_refresh(["students", "revenue"]), ["revenue"])
+
+        self.assertEqual(task.call_count, 2)
+
+    def test_broker_failure_does_not_break_writes(self):
+        """Falha ao enfileirar é registrada; a escrita e o snapshot seguem"""
+        get_dashboard()
+        task = "apps.core.tasks.refresh_dashboard_snapshot.apply_async"
+
+        with patch(task, side_effect=ConnectionError("broker")):
+            with self.assertLogs("apps.core.dashboard", "ERROR"):
+                with self.captureOnCommitCallbacks(execute=True):
+                    StudentFactory()
+
+        self.assertIsNone(cache.get(pending_key(self.tenant.schema_name, "students")))
+        with patch(task) as retry:
+            self.assertEqual(schedule_refresh(["students"]), ["students"])
+        retry.assert_called_once()
+
+    def test_stale_sections_served_and_rescheduled(self):
+        """Seções antigas são servidas e recalculadas em background"""
+        refresh_sections()
+        old = timezone.now() + timedelta(hours=1)
+
+        with patch("apps.core.dashboard.timezone.now", return_value=old), patch(
+            "apps.core.dashboard.schedule_refresh"
+        ) as schedule:
+            data = get_dashboard()
+
+        self.assertEqual(len(data["stale_sections"]), 4)
+        schedule.assert_called_once()
+
+    def test_refresh_clears_pending_mark(self):
+        """Recálculo libera novo agendamento da seção"""
+        with patch("apps.core.tasks.refresh_dashboard_snapshot.apply_async"):
+            schedule_refresh(["students"])
+        refresh_sections(["students"])
+
+        self.assertIsNone(cache.get(pending_key(self.tenant.schema_name, "students")))
+
+
+class TestDashboardView(BaseTenantTestCase):
+    """Testes para o endpoint do dashboard"""
+
+    def _get(self, user):
+        request = APIRequestFactory().get("/api/v1/dashboard/")
+        force_authenticate(request, user=user)
+        return dashboard(request)
+
+    def test_instructor_can_read(self):
+        response = self._get(InstructorUserFactory())
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertIn("students", response.data)
+        self.assertIn("computed_at", response.data)
+
+    def test_student_is_forbidden(self):
+        response = self._get(StudentUserFactory())
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,85 @@
+"""
+Testes do suporte a Idempotency-Key no TenantViewSet
+Foco: replay da primeira resposta, escopo por usuário e conflitos
+"""
+
+from django.core.cache import cache
+from django.db import connection
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.students.models import Attendance
+from apps.students.views import AttendanceViewSet
+from tests.base import BaseTenantTestCase
+from tests.with_db.factories import AdminUserFactory, StudentFactory
+
+
+class TestIdempotencyKey(BaseTenantTestCase):
+    """Testes para escritas idempotentes"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = AdminUserFactory()
+        self.student = StudentFactory()
+
+    def _checkin(
+        self, key=None, user=None, path="/api/v1/attendances/checkin/", **data
+    ):
+        headers = {"HTTP_IDEMPOTENCY_KEY": key} if key else {}
+        request = APIRequestFactory().post(
+            path,
+            {"student_id": str(self.student.pk), **data},
+            format="json",
+            **headers,
+        )
+        force_authenticate(request, user=user or self.user)
+        return AttendanceViewSet.as_view({"post": "checkin"})(request)
+
+    def test_replay_returns_first_response_without_writing(self):
+        first = self._checkin("key-1")
+
+        with self.assertNumQueries(0):
+            replay = self._checkin("key-1")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(replay.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(replay.data, first.data)
+        self.assertEqual(replay["Idempotent-Replayed"], "true")
+        self.assertEqual(Attendance.objects.count(), 1)
+
+    def test_without_key_duplicate_is_processed(self):
+        self._checkin()
+
+        response = self._checkin()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_key_is_scoped_per_user(self):
+        self._checkin("key-1")
+
+        response = self._checkin("key-1", user=AdminUserFactory())
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertNotIn("Idempotent-Replayed", response)
+
+    def test_in_progress_and_reused_keys_are_rejected(self):
+        cache_key = f"idempotency:{connection.schema_name}:{self.user.pk}:key-1"
+        self._checkin("key-1")
+        Attendance.objects.all().delete()
+        # Primeira requisição ainda em andamento
+        cache.set(cache_key, {"fingerprint": cache.get(cache_key)["fingerprint"]})
+
+        self.assertEqual(self._checkin("key-1").status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual(
+            self._checkin("key-1", path="/api/v1/payments/payments/").status_code,
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+        )
+        self.assertFalse(Attendance.objects.exists())
+
+    def test_key_reused_with_different_body_is_rejected(self):
+        self._checkin("key-1")
+
+        response = self._checkin("key-1", notes="Outro corpo")
+
+        self.assertEqual(response.status_code, status.HTTP_422_UNPROCESSABLE_ENTITY)
+        self.assertEqual(Attendance.objects.count(), 1)
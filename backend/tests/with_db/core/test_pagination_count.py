@@ -0,0 +1,130 @@
+"""
+Testes da contagem das listagens paginadas
+Foco: total em cache por versão dos dados, filtros e estimativa do planner
+"""
+
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.core.paginator import EmptyPage
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.core.pagination import CachedCountPaginator
+from apps.payments.confirmation import confirm_payments
+from apps.payments.models import Payment
+from apps.payments.views import PaymentViewSet
+from apps.students.models import Student
+from apps.students.views import StudentViewSet
+from tests.base import BaseTenantTestCase
+from tests.with_db.factories import (
+    AdminUserFactory,
+    InvoiceFactory,
+    PaymentMethodFactory,
+    StudentFactory,
+)
+
+
+def _count_queries(queries) -> int:
+    return sum("COUNT(" in query["sql"].upper() for query in queries)
+
+
+class TestPaginationCount(BaseTenantTestCase):
+    """Testes para o total das listagens"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = AdminUserFactory()
+        self.students = [StudentFactory() for _ in range(3)]
+
+    def _list(self, viewset=StudentViewSet, path="/api/v1/students/"):
+        request = APIRequestFactory().get(path)
+        force_authenticate(request, user=self.user)
+        return viewset.as_view({"get": "list"})(request)
+
+    def test_exact_count_is_cached(self):
+        response = self._list()
+        self.assertEqual(response.data["count"], 3)
+        self.assertFalse(response.data["count_is_approximate"])
+
+        with CaptureQueriesContext(connection) as queries:
+            cached = self._list()
+
+        self.assertEqual(cached.data["count"], 3)
+        # Apenas o COUNT da agregação do ETag; o total vem do cache
+        self.assertEqual(_count_queries(queries), 1)
+
+    def test_writes_invalidate_cached_count(self):
+        self.assertEqual(self._list().data["count"], 3)
+
+        StudentFactory()
+        self.assertEqual(self._list().data["count"], 4)
+
+        Student.objects.get(pk=self.students[0].pk).delete()
+        self.assertEqual(self._list().data["count"], 3)
+
+    def test_filters_have_separate_counts(self):
+        self.students[0].status = "suspended"
+        self.students[0].save()
+
+        self.assertEqual(self._list().data["count"], 3)
+        filtered = self._list(path="/api/v1/students/?status=suspended")
+
+        self.assertEqual(filtered.data["count"], 1)
+
+    def test_update_paths_without_signals_invalidate_count(self):
+        """Confirmação usa update(): a versão dos dados muda explicitamente"""
+        payment = Payment.objects.create(
+            invoice=InvoiceFactory(amount=Decimal("150.00")),
+            payment_method=PaymentMethodFactory(),
+            amount=Decimal("150.00"),
+            payment_date=timezone.now(),
+        )
+        path = "/api/v1/payments/?status=confirmed"
+        self.assertEqual(self._list(PaymentViewSet, path).data["count"], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            confirm_payments([payment.pk])
+
+        self.assertEqual(Payment.objects.get(pk=payment.pk).status, "confirmed")
+        self.assertEqual(self._list(PaymentViewSet, path).data["count"], 1)
+
+    @override_settings(PAGINATION_COUNT={"ESTIMATE_THRESHOLD": 1})
+    def test_large_lists_use_planner_estimate(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._list()
+
+        self.assertTrue(response.data["count_is_approximate"])
+        self.assertGreaterEqual(response.data["count"], 1)
+        self.assertTrue(any("EXPLAIN" in query["sql"] for query in queries))
+
+    @override_settings(PAGINATION_COUNT={"ESTIMATE_THRESHOLD": None})
+    def test_estimate_can_be_disabled(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self._list()
+
+        self.assertEqual(response.data["count"], 3)
+        self.assertFalse(response.data["count_is_approximate"])
+        self.assertFalse(any("EXPLAIN" in query["sql"] for query in queries))
+
+    def test_pages_beyond_low_estimate_are_served(self):
+        """Estimativa abaixo do total real não esconde as últimas páginas"""
+        StudentFactory()
+        StudentFactory()
+        paginator = CachedCountPaginator(Student.objects.order_by("pk"), 2)
+
+        with patch("apps.core.pagination.list_count", return_value=(2, True)):
+            self.assertEqual(paginator.num_pages, 1)
+            pages = [list(paginator.page(number)) for number in (1, 2, 3)]
+
+            with self.assertRaises(EmptyPage):
+                paginator.page(4)
+
+        self.assertEqual([len(page) for page in pages], [2, 2, 1])
+        self.assertEqual(
+            [student.pk for page in pages for student in page],
+            list(Student.objects.order_by("pk").values_list("pk", flat=True)),
+        )
@@ -0,0 +1,108 @@
+"""
+Testes do cache de consultas ORM escopado por schema
+Foco: hits, invalidação, isolamento de chaves entre schemas e métricas
+"""
+
+from unittest.mock import patch
+
+from cachalot.settings import cachalot_settings
+from django.db import connection, connections
+from django_tenants.utils import schema_context
+
+from apps.core.query_cache import (
+    get_query_cache_key,
+    get_query_cache_stats,
+    get_table_cache_key,
+    reset_query_cache_stats,
+)
+from apps.payments.models import Invoice, PaymentMethod
+from tests.base import BaseTenantTestCase
+from tests.with_db.factories import InvoiceFactory, PaymentMethodFactory
+
+
+class TestTenantQueryCache(BaseTenantTestCase):
+    """Testes para o cache de consultas (django-cachalot)"""
+
+    def setUp(self):
+        super().setUp()
+        reset_query_cache_stats()
+
+    def test_repeated_read_is_served_from_cache(self):
+        """Segunda leitura idêntica não chega ao PostgreSQL"""
+        PaymentMethodFactory()
+        list(PaymentMethod.objects.all())
+
+        with self.assertNumQueries(0):
+            list(PaymentMethod.objects.all())
+
+        stats = get_query_cache_stats()["schemas"][self.tenant.schema_name]
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_replica_reads_are_not_cached(self):
+        """Réplica atrasada não grava no cache o dado anterior à escrita"""
+        PaymentMethodFactory()
+        connections["replica"].set_tenant(self.tenant)
+
+        list(PaymentMethod.objects.using("replica").all())
+        list(PaymentMethod.objects.using("replica").all())
+
+        self.assertEqual(get_query_cache_stats()["schemas"], {})
+
+    def test_stats_follow_the_query_connection(self):
+        """Leituras em outro alias contam no schema daquela conexão"""
+        PaymentMethodFactory()
+        replica = connections["replica"]
+        replica.set_tenant(self.tenant)
+        databases = {"default", "replica"}
+
+        with patch.object(cachalot_settings, "CACHALOT_DATABASES", databases):
+            with schema_context("public"):
+                list(PaymentMethod.objects.using("replica").all())
+                list(PaymentMethod.objects.using("replica").all())
+
+        stats = get_query_cache_stats()["schemas"]
+        self.assertEqual(stats[self.tenant.schema_name]["hits"], 1)
+        self.assertNotIn("public", stats)
+
+    def test_write_invalidates_cached_reads(self):
+        """Escrita na tabela invalida consultas cacheadas"""
+        PaymentMethodFactory()
+        self.assertEqual(PaymentMethod.objects.count(), 1)
+
+        PaymentMethodFactory()
+
+        self.assertEqual(PaymentMethod.objects.count(), 2)
+
+    def test_tables_outside_allow_list_are_not_cached(self):
+        """Modelos fora da allow-list sempre consultam o banco"""
+        InvoiceFactory()
+        list(Invoice.objects.all())
+
+        with self.assertNumQueries(1):
+            list(Invoice.objects.all())
+
+    def test_query_keys_are_scoped_by_schema(self):
+        """Mesmo SQL gera chaves diferentes em schemas diferentes"""
+        compiler = PaymentMethod.objects.all().query.get_compiler("default")
+        tenant_key = get_query_cache_key(compiler)
+
+        with schema_context("public"):
+            compiler = PaymentMethod.objects.all().query.get_compiler("default")
+            public_key = get_query_cache_key(compiler)
+
+        self.assertNotEqual(tenant_key, public_key)
+
+    def test_table_keys_follow_table_schema(self):
+        """Tabelas de tenant são escopadas pelo schema; públicas não"""
+        tenant_students = get_table_cache_key("default", "students")
+        tenant_tenants = get_table_cache_key("default", "tenants_tenant")
+
+        with schema_context("public"):
+            self.assertEqual(connection.schema_name, "public")
+            public_students = get_table_cache_key("default", "students")
+            public_tenants = get_table_cache_key("default", "tenants_tenant")
+
+        self.assertNotEqual(tenant_students, public_students)
+        self.assertEqual(tenant_tenants, public_tenants)
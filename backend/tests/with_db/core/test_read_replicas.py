@@ -0,0 +1,116 @@
+"""
+Testes do roteamento de leituras para réplicas
+Foco: search_path do tenant na réplica, escritas no primário e read-your-writes
+"""
+
+from django.db import connection, connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.core.dashboard import refresh_sections
+from apps.core.pagination import list_count
+from apps.core.query_cache import get_table_cache_key
+from apps.core.replicas import (
+    ReadReplicaRouter,
+    is_primary_sticky,
+    mark_primary_sticky,
+    primary_reads,
+    read_replica,
+)
+from apps.students.models import Student
+from apps.students.views import StudentViewSet
+from tests.base import BaseTenantTestCase
+from tests.with_db.factories import AdminUserFactory, StudentFactory
+
+REPLICAS = {"ALIASES": ["replica"], "STICKY_SECONDS": 10}
+
+
+class TestReadReplicas(BaseTenantTestCase):
+    """Testes para o ReadReplicaRouter"""
+
+    def setUp(self):
+        super().setUp()
+        self.router = ReadReplicaRouter()
+        self.user = AdminUserFactory()
+        self.request = APIRequestFactory().get("/api/v1/students/")
+        self.request.user = self.user
+
+    def test_without_replicas_reads_use_primary(self):
+        with read_replica(self.request) as alias:
+            self.assertIsNone(alias)
+            self.assertIsNone(self.router.db_for_read(Student))
+
+    @override_settings(READ_REPLICAS=REPLICAS)
+    def test_replica_uses_tenant_search_path(self):
+        connections["replica"].set_schema_to_public()
+
+        with read_replica(self.request) as alias:
+            self.assertEqual(alias, "replica")
+            self.assertEqual(self.router.db_for_read(Student), "replica")
+
+        self.assertEqual(connections["replica"].schema_name, connection.schema_name)
+        self.assertEqual(connections["replica"].schema_name, self.tenant.schema_name)
+        self.assertIsNone(self.router.db_for_read(Student))
+
+    @override_settings(READ_REPLICAS=REPLICAS)
+    def test_write_inside_block_moves_reads_to_primary(self):
+        with read_replica(self.request):
+            self.assertEqual(self.router.db_for_write(Student), "default")
+            self.assertIsNone(self.router.db_for_read(Student))
+
+    @override_settings(READ_REPLICAS=REPLICAS)
+    def test_objects_read_from_replica_are_written_to_primary(self):
+        student = Student(pk=StudentFactory().pk)
+        student._state.db = "replica"
+
+        self.assertEqual(self.router.db_for_write(Student, instance=student), "default")
+        self.assertEqual(self.router.db_for_read(Student, instance=student), "default")
+        self.assertTrue(self.router.allow_relation(student, self.user))
+        self.assertFalse(self.router.allow_migrate("replica", "students"))
+        self.assertIsNone(self.router.allow_migrate("default", "students"))
+
+    @override_settings(READ_REPLICAS=REPLICAS)
+    def test_api_write_makes_user_sticky_to_primary(self):
+        request = APIRequestFactory().post(
+            "/api/v1/students/bulk-delete/", {"ids": []}, format="json"
+        )
+        force_authenticate(request, user=self.user)
+        StudentViewSet.as_view({"post": "bulk_delete"})(request)
+        self.request.user = self.user
+
+        self.assertTrue(is_primary_sticky(self.request))
+        with read_replica(self.request) as alias:
+            self.assertIsNone(alias)
+
+    @override_settings(READ_REPLICAS=REPLICAS)
+    def test_stickiness_is_per_user(self):
+        mark_primary_sticky(self.request)
+        other = APIRequestFactory().get("/api/v1/students/")
+        other.user = AdminUserFactory()
+
+        self.assertFalse(is_primary_sticky(other))
+
+    @override_settings(READ_REPLICAS=REPLICAS)
+    def test_query_cache_invalidation_is_shared_with_primary(self):
+        connections["replica"].set_tenant(connection.tenant)
+
+        self.assertEqual(
+            get_table_cache_key("replica", "students"),
+            get_table_cache_key("default", "students"),
+        )
+
+    @override_settings(READ_REPLICAS=REPLICAS)
+    def test_cache_fills_read_from_primary(self):
+        """Valores guardados em cache não vêm de réplica atrasada"""
+        StudentFactory()
+
+        with read_replica(self.request) as alias:
+            with CaptureQueriesContext(connections["replica"]) as replica_queries:
+                with primary_reads():
+                    self.assertIsNone(self.router.db_for_read(Student))
+                refresh_sections(["students"])
+                list_count(Student.objects.all())
+            self.assertEqual(self.router.db_for_read(Student), alias)
+
+        self.assertEqual(len(replica_queries), 0)
@@ -0,0 +1,124 @@
+"""
+Testes da captura de consultas lentas
+Foco: execute_wrapper, EXPLAIN amostrado no schema do tenant e agregação
+"""
+
+from unittest.mock import patch
+
+from django.db import OperationalError, connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django_tenants.utils import schema_context
+
+from apps.core.slow_queries import normalize_sql, query_fingerprint
+from apps.students.models import Student
+from apps.tenants.models import SlowQuery, SlowQueryShape
+from tests.base import BaseTenantTestCase
+from tests.with_db.factories import StudentFactory
+
+CAPTURE_ALL = {"THRESHOLD_MS": 0, "EXPLAIN_SAMPLE_RATE": 1}
+
+
+class TestSlowQueries(BaseTenantTestCase):
+    """Testes para captura e agregação de consultas lentas"""
+
+    def setUp(self):
+        super().setUp()
+        self.student = StudentFactory(registration_number="LENTA01")
+
+    def _samples(self):
+        with schema_context("public"):
+            return list(SlowQuery.objects.select_related("shape"))
+
+    def test_normalize_sql(self):
+        sql = (
+            "SELECT * FROM students WHERE id IN (%s, %s, %s) "
+            "AND status = 'active'  AND  belt_rank > 3 LIMIT 21"
+        )
+
+        self.assertEqual(
+            normalize_sql(sql),
+            "SELECT * FROM students WHERE id IN (...) "
+            "AND status = ? AND belt_rank > ? LIMIT ?",
+        )
+        self.assertEqual(
+            query_fingerprint("SELECT 1 WHERE x IN (%s)"),
+            query_fingerprint("SELECT 2 WHERE x IN (%s, %s)"),
+        )
+
+    def test_captures_query_with_schema_params_and_plan(self):
+        with override_settings(SLOW_QUERIES=CAPTURE_ALL):
+            list(Student.objects.filter(registration_number="LENTA01"))
+
+        sample = next(
+            sample for sample in self._samples() if "registration_number" in sample.sql
+        )
+        self.assertEqual(sample.schema_name, self.tenant.schema_name)
+        self.assertIn("LENTA01", sample.params)
+        self.assertEqual(sample.database, "default")
+        self.assertEqual(sample.plan_error, "")
+        self.assertIn("Plan", sample.plan)
+        self.assertIn("Execution Time", sample.plan)
+        self.assertEqual(len(sample.plan_fingerprint), 64)
+        self.assertEqual(sample.shape.samples, 1)
+
+    def test_same_shape_is_sampled_once_per_interval(self):
+        with override_settings(SLOW_QUERIES=CAPTURE_ALL):
+            list(Student.objects.filter(registration_number="A"))
+            list(Student.objects.filter(registration_number="B"))
+
+        samples = [s for s in self._samples() if "registration_number" in s.sql]
+        self.assertEqual(len(samples), 1)
+
+    def test_writes_are_captured_without_explain(self):
+        with override_settings(SLOW_QUERIES=CAPTURE_ALL):
+            Student.objects.filter(pk=self.student.pk).update(notes="lenta")
+
+        sample = next(s for s in self._samples() if s.sql.startswith("UPDATE"))
+        self.assertIsNone(sample.plan)
+        self.student.refresh_from_db()
+        self.assertEqual(self.student.notes, "lenta")
+
+    def test_raw_cursor_queries_are_captured(self):
+        with override_settings(SLOW_QUERIES=CAPTURE_ALL), connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM students WHERE notes = %s", ["x"])
+
+        shapes = SlowQueryShape.objects.filter(sql__contains="count(*) FROM students")
+        with schema_context("public"):
+            self.assertEqual(shapes.count(), 1)
+
+    def test_fast_queries_are_ignored(self):
+        list(Student.objects.all())
+
+        self.assertEqual(self._samples(), [])
+
+    def test_explain_timeout_is_capped_by_request_timeout(self):
+        """EXPLAIN não passa do statement_timeout da classe de endpoint"""
+        with (
+            override_settings(SLOW_QUERIES=CAPTURE_ALL),
+            patch("apps.core.slow_queries.current_timeouts", return_value=(1500, 2000)),
+            CaptureQueriesContext(connection) as queries,
+        ):
+            list(Student.objects.filter(registration_number="LENTA01"))
+
+        timeouts = [
+            q["sql"] for q in queries if "set_config('statement_timeout'" in q["sql"]
+        ]
+        self.assertEqual(len(timeouts), 1)
+        self.assertIn("'1500'", timeouts[0])
+
+    def test_canceled_queries_are_not_explained(self):
+        """Consulta cancelada por statement_timeout é registrada sem EXPLAIN"""
+        with (
+            override_settings(SLOW_QUERIES=CAPTURE_ALL),
+            patch("apps.core.tasks.record_slow_query.delay") as delay,
+            self.assertRaises(OperationalError),
+            transaction.atomic(),
+            connection.cursor() as cursor,
+        ):
+            cursor.execute("SET LOCAL statement_timeout = 1")
+            cursor.execute("SELECT pg_sleep(1) FROM students")
+
+        entry = delay.call_args.args[0]
+        self.assertIn("pg_sleep", entry["sql"])
+        self.assertFalse(entry["explain"])
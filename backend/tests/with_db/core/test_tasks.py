@@ -0,0 +1,90 @@
+"""
+Testes para TenantTask
+Foco: restauração do schema, idempotência e limite por tenant
+"""
+
+import pytest
+from celery import shared_task
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django_tenants.utils import schema_context
+
+from apps.core.tasks import (
+    IDEMPOTENCY_KEY_KWARG,
+    TENANT_SCHEMA_KWARG,
+    TenantConcurrencyLimitError,
+    TenantTask,
+)
+from apps.students.models import Student
+from tests.base import BaseTenantTestCase
+from tests.with_db.factories import StudentFactory
+
+executions = []
+
+
+@shared_task(base=TenantTask, name="tests.count_students")
+def count_students():
+    executions.append(connection.schema_name)
+    return {
+        "schema": connection.schema_name,
+        "tenant": getattr(connection.tenant, "schema_name", None),
+        "students": Student.objects.count(),
+    }
+
+
+class TestTenantTask(BaseTenantTestCase):
+    """Testes para TenantTask em modo eager"""
+
+    def setUp(self):
+        super().setUp()
+        executions.clear()
+
+    def test_captures_schema_on_enqueue(self):
+        """Tarefa enfileirada no tenant executa no schema do tenant"""
+        StudentFactory()
+
+        result = count_students.delay().get()
+
+        self.assertEqual(result["schema"], self.tenant.schema_name)
+        self.assertEqual(result["tenant"], self.tenant.schema_name)
+        self.assertEqual(result["students"], 1)
+
+    def test_restores_schema_from_message(self):
+        """Worker em outro schema restaura o schema da mensagem"""
+        with schema_context("public"):
+            result = count_students.apply(
+                kwargs={TENANT_SCHEMA_KWARG: self.tenant.schema_name}
+            ).get()
+            self.assertEqual(connection.schema_name, "public")
+
+        self.assertEqual(result["schema"], self.tenant.schema_name)
+
+    def test_idempotency_key_skips_completed_runs(self):
+        """Mesma chave de idempotência não executa duas vezes"""
+        first = count_students.apply_async(idempotency_key="run-1").get()
+        second = count_students.apply_async(idempotency_key="run-1").get()
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(executions), 1)
+
+    def test_retries_keep_context_kwargs(self):
+        """Kwargs de contexto existentes (retry) não são substituídos"""
+        kwargs = count_students._with_tenant_kwargs(
+            {TENANT_SCHEMA_KWARG: "tenant_a", IDEMPOTENCY_KEY_KWARG: "key"}
+        )
+
+        self.assertEqual(kwargs[TENANT_SCHEMA_KWARG], "tenant_a")
+        self.assertEqual(kwargs[IDEMPOTENCY_KEY_KWARG], "key")
+
+    @override_settings(TENANT_TASKS={"MAX_CONCURRENCY": 1, "CONCURRENCY_MAX_WAITS": 0})
+    def test_concurrency_limit_per_tenant(self):
+        """Sem vaga no tenant a tarefa não executa"""
+        cache.set(
+            f"tenant-task-slots:{self.tenant.schema_name}:tests.count_students", 1
+        )
+
+        with pytest.raises(TenantConcurrencyLimitError):
+            count_students.delay()
+
+        self.assertEqual(executions, [])
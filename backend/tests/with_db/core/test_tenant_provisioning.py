@@ -0,0 +1,137 @@
+"""
+Testes do provisionamento de tenants por clonagem do schema template
+Foco: clone com dados iniciais, validação contra migrations e cadastro assíncrono
+"""
+
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import override_settings
+from django_tenants.utils import schema_context, schema_exists
+
+from apps.payments.models import PaymentMethod
+from apps.tenants.models import Tenant
+from apps.tenants.provisioning import (
+    DEFAULT_PAYMENT_METHODS,
+    ProvisioningError,
+    ensure_template_schema,
+    get_template_schema,
+    pending_migrations,
+    verify_clone,
+)
+from apps.tenants.serializers import TenantCreateSerializer
+from apps.tenants.views import TenantViewSet
+from tests.base import BaseTenantTestCase
+
+TEMPLATE_SETTINGS = {"USE_TEMPLATE": True, "ASYNC": False}
+
+TENANT_DATA = {
+    "name": "Academia Clone",
+    "slug": "academia-clone",
+    "email": "contato@clone.com",
+    "phone": "+5511999999999",
+    "address": "Rua Teste, 123",
+    "city": "São Paulo",
+    "state": "SP",
+    "zip_code": "01234567",
+}
+
+
+class TestTenantProvisioning(BaseTenantTestCase):
+    """Testes para o provisionamento via schema template"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        # TenantTestCase não chama setUpTestData: template migrado uma vez por
+        # classe (inclusive quando o banco reaproveitado tem um template antigo)
+        ensure_template_schema()
+
+    def setUp(self):
+        super().setUp()
+        # TenantTestCase não aplica override_settings declarado na classe
+        self.enterContext(override_settings(TENANT_PROVISIONING=TEMPLATE_SETTINGS))
+
+    def _create_tenant(self, **kwargs):
+        with schema_context("public"):
+            return Tenant.objects.create(**{**TENANT_DATA, **kwargs})
+
+    def test_template_is_migrated_and_seeded(self):
+        """Template sem migrations pendentes e com dados iniciais"""
+        template = get_template_schema()
+
+        self.assertEqual(pending_migrations(template), [])
+        self.assertFalse(ensure_template_schema())
+        with schema_context(template):
+            self.assertEqual(
+                PaymentMethod.objects.count(), len(DEFAULT_PAYMENT_METHODS)
+            )
+
+    def test_new_tenant_schema_is_cloned_with_seed_rows(self):
+        """Schema novo é cópia do template (estrutura + linhas)"""
+        tenant = self._create_tenant()
+
+        self.assertTrue(schema_exists(tenant.schema_name))
+        self.assertEqual(pending_migrations(tenant.schema_name), [])
+        with schema_context(tenant.schema_name):
+            codes = set(PaymentMethod.objects.values_list("code", flat=True))
+            # Sequências copiadas: novas linhas não colidem com as clonadas
+            PaymentMethod.objects.create(name="Débito", code="debit_card")
+        self.assertEqual(codes, {method["code"] for method in DEFAULT_PAYMENT_METHODS})
+
+    def test_clone_is_isolated_from_template(self):
+        """Escritas no tenant clonado não alteram o template"""
+        tenant = self._create_tenant()
+
+        with schema_context(tenant.schema_name):
+            PaymentMethod.objects.filter(code="cash").delete()
+
+        with schema_context(get_template_schema()):
+            self.assertTrue(PaymentMethod.objects.filter(code="cash").exists())
+
+    def test_verify_clone_detects_missing_migrations(self):
+        """Clone com migrations divergentes é rejeitado"""
+        tenant = self._create_tenant()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM "{tenant.schema_name}".django_migrations '
+                "WHERE app = 'payments'"
+            )
+
+        with self.assertRaises(ProvisioningError):
+            verify_clone(tenant.schema_name)
+
+    def test_falls_back_to_migrations_when_clone_is_invalid(self):
+        """Clone inválido é desfeito e o schema é criado via migrations"""
+        with patch(
+            "apps.tenants.provisioning.verify_clone",
+            side_effect=ProvisioningError("divergente"),
+        ):
+            tenant = self._create_tenant()
+
+        self.assertEqual(pending_migrations(tenant.schema_name), [])
+        with schema_context(tenant.schema_name):
+            self.assertEqual(
+                PaymentMethod.objects.count(), len(DEFAULT_PAYMENT_METHODS)
+            )
+
+    @override_settings(TENANT_PROVISIONING={**TEMPLATE_SETTINGS, "ASYNC": True})
+    def test_api_create_enqueues_provisioning(self):
+        """Cadastro via API responde antes da criação do schema"""
+        serializer = TenantCreateSerializer(data=TENANT_DATA)
+        serializer.is_valid(raise_exception=True)
+
+        with schema_context("public"):
+            with self.captureOnCommitCallbacks() as callbacks:
+                TenantViewSet().perform_create(serializer)
+
+            tenant = serializer.instance
+            self.assertEqual(serializer.data["provisioning_status"], "pending")
+            self.assertFalse(schema_exists(tenant.schema_name))
+
+            for callback in callbacks:
+                callback()
+
+            tenant.refresh_from_db()
+        self.assertEqual(tenant.provisioning_status, "ready")
+        self.assertTrue(schema_exists(tenant.schema_name))
@@ -7,10 +7,13 @@ Objetivo: 90% coverage seguindo CONTEXT.md
 from unittest.mock import Mock, patch
 
 import pytest
+from django.db import connection
 from django.http import HttpResponse
 from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
 
 from apps.authentication.middleware import TenantMiddleware
+from apps.core.workload import end_request_timeouts
 from tests.with_db.factories import TenantFactory
 
 
@@ -18,10 +21,11 @@ class TestTenantMiddleware:
     """Testes para TenantMiddleware"""
 
     @pytest.fixture
-    def middleware(self):
+    def middleware(self, db):
         """Create middleware instance"""
         get_response = Mock()
-        return TenantMiddleware(get_response)
+        yield TenantMiddleware(get_response)
+        end_request_timeouts()
 
     @pytest.fixture
     def request_factory(self):
@@ -90,6 +94,54 @@ class TestTenantMiddleware:
             assert result is None  # Continue processing
             assert not hasattr(request, "tenant")
 
+    def test_process_request_tenant_not_provisioned(
+        self, middleware, request_factory, db
+    ):
+        """Academia sem schema pronto não chega às views"""
+        TenantFactory(slug="pendente", provisioning_status="pending")
+        TenantFactory(slug="falhou", provisioning_status="failed")
+
+        pending = request_factory.get(
+            "/api/v1/students/", HTTP_HOST="pendente.wbjj.com"
+        )
+        response = middleware.process_request(pending)
+
+        assert response.status_code == 503
+        assert response["Retry-After"] == "30"
+        assert not hasattr(pending, "tenant")
+
+        failed = request_factory.get("/api/v1/students/", HTTP_HOST="falhou.wbjj.com")
+        assert middleware.process_request(failed) is None
+        assert not hasattr(failed, "tenant")
+
+    @pytest.mark.django_db
+    @pytest.mark.parametrize("path", ["/api/v1/ping/", "/api/v1/health/quick/"])
+    def test_probes_never_touch_database(self, client, path):
+        """Liveness pela pilha completa, com Host de tenant: nenhuma consulta"""
+        TenantFactory(slug="sonda", schema_name="tenant_sonda")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get(path, HTTP_HOST="sonda.wbjj.com")
+
+        assert response.status_code == 200
+        assert not hasattr(response.wsgi_request, "tenant")
+        assert len(queries) == 0
+
+    def test_process_request_health_paths_skip_tenant_lookup(
+        self, middleware, request_factory
+    ):
+        """Health probes não consultam o tenant (nem o banco)"""
+        request = request_factory.get("/api/v1/health/quick/")
+
+        with patch.object(request, "get_host", return_value="10.0.0.5:8000"), patch(
+            "apps.authentication.middleware.Tenant.objects"
+        ) as tenants:
+            result = middleware.process_request(request)
+
+        assert result is None
+        assert not hasattr(request, "tenant")
+        tenants.get.assert_not_called()
+
     def test_process_request_no_subdomain(self, middleware, request_factory):
         """Test request processing without subdomain"""
         request = request_factory.get("/")
@@ -0,0 +1,145 @@
+"""
+Testes do isolamento de carga por tenant no TenantMiddleware
+Foco: timeouts por tenant/classe de endpoint e limite de concorrência (503)
+"""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from apps.authentication.middleware import TenantMiddleware
+from apps.core.workload import classify_request, end_request_timeouts
+from tests.with_db.factories import TenantFactory
+
+HOST = "carga.wbjj.com"
+
+
+def _show(setting: str) -> str:
+    with connection.cursor() as cursor:
+        cursor.execute(f"SHOW {setting}")
+        return cursor.fetchone()[0]
+
+
+class TestTenantWorkload:
+    """Testes para timeouts e concorrência por tenant"""
+
+    @pytest.fixture
+    def middleware(self, db):
+        cache.clear()
+        yield TenantMiddleware(Mock())
+        end_request_timeouts()
+        cache.clear()
+
+    @pytest.fixture
+    def tenant(self, db):
+        return TenantFactory(slug="carga", schema_name="tenant_carga", domain_url=HOST)
+
+    def _process(self, middleware, path="/api/v1/students/"):
+        request = RequestFactory().get(path)
+        with patch.object(request, "get_host", return_value=HOST):
+            return request, middleware.process_request(request)
+
+    def test_classify_request(self):
+        assert classify_request("/api/v1/attendances/series/") == "report"
+        assert classify_request("/api/v1/payments/stats/") == "report"
+        assert classify_request("/admin/students/") == "admin"
+        assert classify_request("/api/v1/students/") == "default"
+
+    def test_timeouts_per_endpoint_class(self, middleware, tenant):
+        self._process(middleware)
+        assert _show("statement_timeout") == "10s"
+        assert _show("lock_timeout") == "2s"
+
+        self._process(middleware, "/api/v1/attendances/heatmap/")
+        assert _show("statement_timeout") == "30s"
+
+    def test_timeouts_are_applied_lazily(self, middleware, tenant):
+        """Sem consulta na requisição não há SET; com consulta, um só"""
+        with CaptureQueriesContext(connection) as queries:
+            self._process(middleware)
+        assert not any("set_config" in q["sql"] for q in queries)
+
+        with CaptureQueriesContext(connection) as queries:
+            _show("statement_timeout")
+            _show("lock_timeout")
+        assert sum("set_config" in q["sql"] for q in queries) == 1
+
+    def test_timeouts_reset_at_request_end(self, middleware, tenant):
+        """Conexão persistente não leva o timeout do tenant adiante"""
+        default = _show("statement_timeout")
+        request, _ = self._process(middleware)
+        assert _show("statement_timeout") == "10s"
+
+        middleware.process_response(request, HttpResponse())
+
+        assert _show("statement_timeout") == default
+        assert _show("lock_timeout") == "0"
+
+    def test_probes_skip_workload(self, middleware, tenant, settings):
+        settings.TENANT_WORKLOAD = {"MAX_CONCURRENT": {"default": 0}}
+
+        request, result = self._process(middleware, "/api/v1/ping/")
+
+        assert result is None
+        assert getattr(request, "workload_slot", None) is None
+
+    def test_tenant_overrides(self, middleware, tenant, settings):
+        settings.TENANT_WORKLOAD = {
+            "TENANT_OVERRIDES": {"carga": {"STATEMENT_TIMEOUT": {"default": 1500}}}
+        }
+
+        self._process(middleware)
+
+        assert _show("statement_timeout") == "1500ms"
+
+    def test_concurrency_cap_returns_503(self, middleware, tenant, settings):
+        settings.TENANT_WORKLOAD = {
+            "MAX_CONCURRENT": {"report": 1},
+            "RETRY_AFTER": 7,
+        }
+        path = "/api/v1/dashboard/"
+
+        first, result = self._process(middleware, path)
+        assert result is None
+
+        _, overloaded = self._process(middleware, path)
+        assert overloaded.status_code == 503
+        assert overloaded["Retry-After"] == "7"
+        assert json.loads(overloaded.content)["details"]["code"] == "tenant_overloaded"
+
+        # Outras classes do mesmo tenant não são afetadas
+        assert self._process(middleware)[1] is None
+
+        middleware.process_response(first, HttpResponse())
+        assert self._process(middleware, path)[1] is None
+
+    def test_streaming_holds_slot_until_body_is_sent(
+        self, middleware, tenant, settings
+    ):
+        settings.TENANT_WORKLOAD = {"MAX_CONCURRENT": {"report": 1}}
+        path = "/api/v1/dashboard/"
+
+        request, _ = self._process(middleware, path)
+        _show("statement_timeout")
+        response = middleware.process_response(
+            request, StreamingHttpResponse(iter([b"a", b"b"]))
+        )
+
+        # Corpo ainda não enviado: vaga e timeouts continuam valendo
+        assert self._process(middleware, path)[1].status_code == 503
+        assert b"".join(response.streaming_content) == b"ab"
+        assert _show("statement_timeout") == "30s"
+
+        # Sem request_finished, que fecharia a conexão do teste
+        with patch.object(request_finished, "send"):
+            response.close()
+
+        assert _show("statement_timeout") != "30s"
+        assert self._process(middleware, path)[1] is None
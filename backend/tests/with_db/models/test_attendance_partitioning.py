@@ -0,0 +1,149 @@
+"""
+Testes para particionamento mensal da tabela de presenças
+Foco: conversão para tabela particionada, criação antecipada, pruning
+"""
+
+from datetime import date, time
+from unittest.mock import patch
+
+from django.db import connection
+
+from apps.students import partitioning
+from apps.students.models import Attendance
+from apps.students.partitioning import (
+    add_months,
+    convert_to_partitioned,
+    ensure_partitions,
+    existing_partitions,
+    is_partitioned,
+    months_between,
+    partition_name,
+)
+from tests.base import BaseTenantTestCase
+from tests.with_db.factories.students import AttendanceFactory
+
+
+class TestPartitionHelpers(BaseTenantTestCase):
+    """Testes para funções auxiliares de calendário"""
+
+    def test_partition_name(self):
+        """Nome da partição segue padrão attendances_pYYYY_MM"""
+        self.assertEqual(partition_name(date(2025, 1, 1)), "attendances_p2025_01")
+
+    def test_add_months_crosses_year(self):
+        """Soma de meses atravessa virada de ano"""
+        self.assertEqual(add_months(date(2024, 11, 1), 3), date(2025, 2, 1))
+
+    def test_months_between(self):
+        """Lista meses entre duas datas inclusive"""
+        months = months_between(date(2024, 12, 15), date(2025, 2, 3))
+        self.assertEqual(
+            months, [date(2024, 12, 1), date(2025, 1, 1), date(2025, 2, 1)]
+        )
+
+
+class TestAttendancePartitioning(BaseTenantTestCase):
+    """Testes para conversão e manutenção das partições"""
+
+    def test_convert_preserves_rows_and_creates_partitions(self):
+        """Conversão mantém dados e cria partições do histórico até o futuro"""
+        attendance = AttendanceFactory(
+            class_date=date(2025, 1, 10), check_in_time=time(19, 0)
+        )
+        schema = self.tenant.schema_name
+
+        self.assertFalse(is_partitioned(schema))
+        converted = convert_to_partitioned(
+            schema, months_ahead=2, today=date(2025, 3, 5)
+        )
+
+        self.assertTrue(converted)
+        self.assertTrue(is_partitioned(schema))
+        self.assertTrue(Attendance.objects.filter(id=attendance.id).exists())
+
+        partitions = existing_partitions(schema)
+        for name in [
+            "attendances_default",
+            "attendances_p2025_01",
+            "attendances_p2025_03",
+            "attendances_p2025_05",
+        ]:
+            self.assertIn(name, partitions)
+
+    def test_convert_is_idempotent(self):
+        """Segunda conversão não altera tabela já particionada"""
+        schema = self.tenant.schema_name
+        convert_to_partitioned(schema, months_ahead=0, today=date(2025, 3, 5))
+
+        self.assertFalse(
+            convert_to_partitioned(schema, months_ahead=0, today=date(2025, 3, 5))
+        )
+
+    def test_ensure_partitions_creates_only_missing(self):
+        """Criação antecipada cria apenas partições inexistentes"""
+        schema = self.tenant.schema_name
+        convert_to_partitioned(schema, months_ahead=0, today=date(2025, 3, 5))
+
+        created = ensure_partitions(schema, months_ahead=2, today=date(2025, 3, 5))
+
+        self.assertEqual(created, ["attendances_p2025_04", "attendances_p2025_05"])
+        self.assertEqual(
+            ensure_partitions(schema, months_ahead=2, today=date(2025, 3, 5)), []
+        )
+
+    def test_ensure_partitions_moves_rows_from_default(self):
+        """Presenças futuras na DEFAULT vão para a partição do mês"""
+        schema = self.tenant.schema_name
+        convert_to_partitioned(schema, months_ahead=0, today=date(2025, 3, 5))
+        future = AttendanceFactory(
+            class_date=date(2025, 5, 20), check_in_time=time(19, 0)
+        )
+
+        created = ensure_partitions(schema, months_ahead=2, today=date(2025, 3, 5))
+
+        self.assertEqual(created, ["attendances_p2025_04", "attendances_p2025_05"])
+        self.assertTrue(Attendance.objects.filter(id=future.id).exists())
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT id FROM attendances_p2025_05")
+            self.assertEqual(cursor.fetchall(), [(future.id,)])
+            cursor.execute("SELECT COUNT(*) FROM attendances_default")
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_ensure_partitions_failure_does_not_stop_other_months(self):
+        """Falha em um mês é registrada e os demais são criados"""
+        schema = self.tenant.schema_name
+        convert_to_partitioned(schema, months_ahead=0, today=date(2025, 3, 5))
+        original = partitioning._add_month_partition
+
+        def add_month_partition(month):
+            if month == date(2025, 4, 1):
+                raise RuntimeError("falha")
+            original(month)
+
+        with patch.object(
+            partitioning, "_add_month_partition", add_month_partition
+        ), self.assertLogs("apps.students.partitioning", "ERROR"):
+            created = ensure_partitions(schema, months_ahead=2, today=date(2025, 3, 5))
+
+        self.assertEqual(created, ["attendances_p2025_05"])
+        self.assertNotIn("attendances_p2025_04", existing_partitions(schema))
+
+    def test_ensure_partitions_skips_regular_table(self):
+        """Tabela não particionada é ignorada"""
+        self.assertEqual(ensure_partitions(self.tenant.schema_name), [])
+
+    def test_query_by_class_date_prunes_partitions(self):
+        """Filtro por class_date consulta apenas a partição do mês"""
+        schema = self.tenant.schema_name
+        convert_to_partitioned(schema, months_ahead=1, today=date(2025, 3, 5))
+
+        queryset = Attendance.objects.filter(
+            class_date__gte=date(2025, 3, 1), class_date__lte=date(2025, 3, 31)
+        )
+        with connection.cursor() as cursor:
+            sql, params = queryset.query.sql_with_params()
+            cursor.execute(f"EXPLAIN {sql}", params)
+            plan = "\n".join(row[0] for row in cursor.fetchall())
+
+        self.assertIn("attendances_p2025_03", plan)
+        self.assertNotIn("attendances_p2025_04", plan)
@@ -0,0 +1,219 @@
+"""
+Testes da confirmação de pagamentos com total pago incremental
+Foco: paid_amount por fatura, quitação, idempotência e confirmação em lote
+"""
+
+import uuid
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.payments.confirmation import confirm_payments
+from apps.payments.models import Payment
+from apps.payments.views import InvoiceViewSet, PaymentViewSet
+from tests.base import BaseTenantTestCase
+from tests.with_db.factories import (
+    AdminUserFactory,
+    InvoiceFactory,
+    PaymentMethodFactory,
+)
+
+
+class TestPaymentConfirmation(BaseTenantTestCase):
+    """Testes para confirmação de pagamentos"""
+
+    def setUp(self):
+        super().setUp()
+        self.method = PaymentMethodFactory()
+
+    def _payment(self, invoice, amount, **kwargs):
+        return Payment.objects.create(
+            invoice=invoice,
+            payment_method=self.method,
+            amount=Decimal(amount),
+            payment_date=timezone.now(),
+            **kwargs,
+        )
+
+    def test_partial_payments_accumulate_until_paid(self):
+        """Pagamentos parciais somam em paid_amount até quitar a fatura"""
+        invoice = InvoiceFactory(amount=Decimal("150.00"), late_fee=Decimal("10.00"))
+        first = self._payment(invoice, "100.00")
+        second = self._payment(invoice, "60.00")
+
+        self.assertTrue(first.confirm_payment())
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.paid_amount, Decimal("100.00"))
+        self.assertEqual(invoice.status, "pending")
+
+        self.assertTrue(second.confirm_payment())
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.paid_amount, Decimal("160.00"))
+        self.assertEqual(invoice.status, "paid")
+        self.assertEqual(second.status, "confirmed")
+        self.assertIsNotNone(second.confirmed_date)
+
+    def test_confirming_twice_does_not_double_count(self):
+        """Confirmação repetida (ou concorrente já aplicada) é ignorada"""
+        invoice = InvoiceFactory(amount=Decimal("150.00"))
+        payment = self._payment(invoice, "50.00")
+        stale = Payment.objects.get(pk=payment.pk)
+
+        self.assertTrue(payment.confirm_payment())
+        self.assertFalse(stale.confirm_payment())
+
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.paid_amount, Decimal("50.00"))
+
+    def test_only_pending_payments_are_confirmed(self):
+        """Pagamentos com falha ou estornados não voltam ao total pago"""
+        invoice = InvoiceFactory(amount=Decimal("150.00"))
+        failed = self._payment(invoice, "50.00", status="failed")
+        refunded = self._payment(invoice, "50.00", status="refunded")
+
+        result = confirm_payments([failed.pk, refunded.pk])
+
+        self.assertEqual(result["confirmed"], [])
+        self.assertEqual(result["skipped"], [failed.pk, refunded.pk])
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.paid_amount, Decimal("0.00"))
+        response = self._call("post", "confirm", pk=refunded.pk)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        refunded.refresh_from_db()
+        self.assertEqual(refunded.status, "refunded")
+
+    def test_invoice_edit_keeps_concurrent_confirmation(self):
+        """PATCH da fatura carregada antes da confirmação não perde o total"""
+        invoice = InvoiceFactory(amount=Decimal("150.00"))
+        payment = self._payment(invoice, "50.00")
+        update = InvoiceViewSet.perform_update
+
+        def confirm_then_update(viewset, serializer):
+            # Confirmação commitada entre a leitura e a gravação da fatura
+            confirm_payments([payment.pk])
+            update(viewset, serializer)
+
+        request = APIRequestFactory().patch(
+            "/api/v1/payments/invoices/", {"notes": "editada"}, format="json"
+        )
+        force_authenticate(request, user=AdminUserFactory())
+        with patch.object(InvoiceViewSet, "perform_update", confirm_then_update):
+            response = InvoiceViewSet.as_view({"patch": "partial_update"})(
+                request, pk=str(invoice.pk)
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.notes, "editada")
+        self.assertEqual(invoice.paid_amount, Decimal("50.00"))
+
+    def test_bulk_confirmation(self):
+        """Lote confirma vários pagamentos e quita faturas em poucas consultas"""
+        paid_invoice = InvoiceFactory(amount=Decimal("100.00"))
+        partial_invoice = InvoiceFactory(amount=Decimal("300.00"))
+        payments = [
+            self._payment(paid_invoice, "40.00"),
+            self._payment(paid_invoice, "60.00"),
+            self._payment(partial_invoice, "100.00"),
+        ]
+        already = self._payment(partial_invoice, "50.00", status="confirmed")
+        missing = uuid.uuid4()
+
+        with self.assertNumQueries(8):
+            result = confirm_payments([*(p.pk for p in payments), already.pk, missing])
+
+        self.assertEqual(set(result["confirmed"]), {p.pk for p in payments})
+        self.assertEqual(result["skipped"], [already.pk, missing])
+        self.assertEqual(result["paid_invoices"], [paid_invoice.pk])
+
+        paid_invoice.refresh_from_db()
+        partial_invoice.refresh_from_db()
+        self.assertEqual(paid_invoice.status, "paid")
+        self.assertEqual(paid_invoice.paid_amount, Decimal("100.00"))
+        self.assertEqual(partial_invoice.paid_amount, Decimal("100.00"))
+        self.assertEqual(partial_invoice.status, "pending")
+
+    def test_bulk_confirm_endpoint(self):
+        invoice = InvoiceFactory(amount=Decimal("100.00"))
+        payment = self._payment(invoice, "100.00")
+        request = APIRequestFactory().post(
+            "/api/v1/payments/payments/bulk-confirm/",
+            {"payment_ids": [str(payment.pk)]},
+            format="json",
+        )
+        force_authenticate(request, user=AdminUserFactory())
+
+        response = PaymentViewSet.as_view({"post": "bulk_confirm"})(request)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["confirmed"], [str(payment.pk)])
+        self.assertEqual(response.data["paid_invoices"], [str(invoice.pk)])
+
+    def test_bulk_confirm_endpoint_rejects_empty_batch(self):
+        request = APIRequestFactory().post(
+            "/api/v1/payments/payments/bulk-confirm/",
+            {"payment_ids": []},
+            format="json",
+        )
+        force_authenticate(request, user=AdminUserFactory())
+
+        response = PaymentViewSet.as_view({"post": "bulk_confirm"})(request)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def _call(self, method, action, data=None, pk=None):
+        request = getattr(APIRequestFactory(), method)(
+            "/api/v1/payments/payments/", data, format="json"
+        )
+        force_authenticate(request, user=AdminUserFactory())
+        kwargs = {"pk": str(pk)} if pk else {}
+        return PaymentViewSet.as_view({method: action})(request, **kwargs)
+
+    def test_status_and_amount_are_not_writable(self):
+        """PATCH não confirma nem altera valor fora de confirm_payments"""
+        invoice = InvoiceFactory(amount=Decimal("100.00"))
+        payment = self._payment(invoice, "100.00")
+        data = {"status": "confirmed", "amount": "1.00", "notes": "ok"}
+
+        single = self._call("patch", "partial_update", data, pk=payment.pk)
+        bulk = self._call(
+            "patch", "bulk_partial_update", [{"id": str(payment.pk), **data}]
+        )
+
+        self.assertEqual(single.status_code, status.HTTP_200_OK)
+        self.assertEqual(bulk.status_code, status.HTTP_200_OK)
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, "pending")
+        self.assertEqual(payment.amount, Decimal("100.00"))
+        self.assertEqual(payment.notes, "ok")
+        self.assertEqual(
+            self._call("post", "confirm", pk=payment.pk).status_code,
+            status.HTTP_200_OK,
+        )
+
+    def test_deleting_confirmed_payment_reverts_invoice(self):
+        invoice = InvoiceFactory(amount=Decimal("100.00"))
+        single = self._payment(invoice, "60.00")
+        batch = self._payment(invoice, "40.00")
+        confirm_payments([single.pk, batch.pk])
+        invoice.refresh_from_db()
+        self.assertEqual(invoice.status, "paid")
+
+        self._call("delete", "destroy", pk=single.pk)
+        invoice.refresh_from_db()
+        single.refresh_from_db()
+        self.assertEqual(single.get_status_display(), "Estornado")
+        self.assertEqual(invoice.paid_amount, Decimal("40.00"))
+        self.assertEqual(invoice.status, "pending")
+
+        self._call("post", "bulk_delete", {"ids": [str(batch.pk)]})
+        invoice.refresh_from_db()
+        batch.refresh_from_db()
+        self.assertEqual(invoice.paid_amount, Decimal("0.00"))
+        self.assertEqual(batch.status, "refunded")
+        self.assertEqual(batch.get_status_display(), "Estornado")
+        batch.full_clean()
+        self.assertFalse(batch.is_active)
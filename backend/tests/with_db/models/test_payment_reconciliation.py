@@ -0,0 +1,222 @@
+"""
+Testes da conciliação do extrato de liquidação do gateway
+Foco: leitura em streaming (CSV/OFX), lotes por external_id e relatório
+"""
+
+import io
+import tempfile
+from decimal import Decimal
+from pathlib import Path
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.payments.models import Payment
+from apps.payments.reconciliation import (
+    ReconciliationError,
+    iter_ofx_rows,
+    reconcile,
+)
+from apps.payments.views import PaymentViewSet
+from tests.base import BaseTenantTestCase
+from tests.with_db.factories import (
+    AdminUserFactory,
+    InvoiceFactory,
+    PaymentMethodFactory,
+)
+
+OFX = """OFXHEADER:100
+<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>
+<STMTTRN>
+<TRNTYPE>CREDIT
+<DTPOSTED>20250310
+<TRNAMT>150.00
+<FITID>gw-1
+</STMTTRN>
+<STMTTRN><TRNTYPE>CREDIT<TRNAMT>99.00<FITID>gw-404</STMTTRN>
+</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>
+"""
+
+
+class TestPaymentReconciliation(BaseTenantTestCase):
+    """Testes para conciliação de pagamentos"""
+
+    def setUp(self):
+        super().setUp()
+        self.method = PaymentMethodFactory()
+
+    def _payment(self, external_id, amount="150.00", **kwargs):
+        invoice = kwargs.pop("invoice", None) or InvoiceFactory(
+            amount=Decimal("150.00")
+        )
+        return Payment.objects.create(
+            invoice=invoice,
+            payment_method=self.method,
+            amount=Decimal(amount),
+            payment_date=timezone.now(),
+            external_id=external_id,
+            **kwargs,
+        )
+
+    def _csv(self, *lines, header="external_id;status;amount;fee"):
+        return io.BytesIO("\n".join([header, *lines]).encode())
+
+    def test_csv_confirms_updates_fee_and_reports_unmatched(self):
+        """Linhas conciliadas confirmam pagamentos e atualizam a taxa"""
+        paid = self._payment("gw-1")
+        failed = self._payment("gw-2")
+        done = self._payment("gw-3", status="confirmed")
+
+        report = reconcile(
+            self._csv(
+                "gw-1;paid;150,00;4,35",
+                "gw-2;declined;150,00;",
+                "gw-3;paid;150,00;",
+                "gw-404;paid;10,00;",
+                "gw-1;paid;150,00;4,35",
+            )
+        )
+
+        self.assertEqual(report["rows"], 5)
+        self.assertEqual(report["matched"], 4)
+        self.assertEqual(report["confirmed"], 1)
+        self.assertEqual(report["unmatched_count"], 1)
+        self.assertEqual(report["unmatched"], [{"line": 5, "external_id": "gw-404"}])
+
+        paid.refresh_from_db()
+        failed.refresh_from_db()
+        done.refresh_from_db()
+        self.assertEqual(paid.status, "confirmed")
+        self.assertEqual(paid.processing_fee, Decimal("4.35"))
+        self.assertEqual(paid.invoice.paid_amount, Decimal("150.00"))
+        self.assertEqual(paid.invoice.status, "paid")
+        self.assertEqual(failed.status, "failed")
+        self.assertEqual(done.status, "confirmed")
+
+    def test_refund_reverts_confirmed_payment(self):
+        """Estorno de pagamento confirmado reabre a fatura"""
+        payment = self._payment("gw-1")
+        payment.confirm_payment()
+
+        report = reconcile(self._csv("gw-1;refunded;150.00;"))
+
+        payment.refresh_from_db()
+        payment.invoice.refresh_from_db()
+        self.assertEqual(report["reverted"], 1)
+        self.assertEqual(payment.status, "refunded")
+        self.assertEqual(payment.invoice.paid_amount, Decimal("0"))
+        self.assertEqual(payment.invoice.status, "pending")
+
+        report = reconcile(self._csv("gw-1;paid;150.00;"))
+
+        payment.invoice.refresh_from_db()
+        self.assertEqual(report["confirmed"], 0)
+        self.assertEqual(report["mismatched_count"], 1)
+        self.assertEqual(payment.invoice.paid_amount, Decimal("0"))
+
+    def test_amount_mismatch_and_invalid_rows_are_reported(self):
+        self._payment("gw-1")
+
+        report = reconcile(
+            self._csv("gw-1;paid;120.00;", ";paid;1.00;", "gw-1;unknown;150.00;")
+        )
+
+        self.assertEqual(report["matched"], 0)
+        self.assertEqual(report["mismatched_count"], 1)
+        self.assertEqual(report["errors_count"], 2)
+        self.assertEqual(Payment.objects.get().status, "pending")
+
+    def test_amounts_with_thousands_separator(self):
+        """Separador decimal é o último entre vírgula e ponto"""
+        invoice = InvoiceFactory(amount=Decimal("1234.56"))
+        self._payment("gw-1", "1234.56", invoice=invoice)
+        self._payment("gw-2", "1234.56", invoice=invoice)
+
+        report = reconcile(
+            self._csv("gw-1;paid;1,234.56;1.50", "gw-2;paid;1.234,56;1,50")
+        )
+
+        self.assertEqual((report["matched"], report["mismatched_count"]), (2, 0))
+        self.assertEqual(
+            set(Payment.objects.values_list("processing_fee", flat=True)),
+            {Decimal("1.50")},
+        )
+
+    @override_settings(PAYMENT_RECONCILIATION={"BATCH_SIZE": 2, "MAX_REPORTED_ROWS": 1})
+    def test_batches_query_once_per_batch(self):
+        """Uma consulta de pagamentos por lote; amostras do relatório limitadas"""
+        lines = [f"gw-{index};paid;150.00;" for index in range(5)]
+
+        with self.assertNumQueries(3):
+            report = reconcile(self._csv(*lines))
+
+        self.assertEqual(report["unmatched_count"], 5)
+        self.assertEqual(len(report["unmatched"]), 1)
+
+    @override_settings(PAYMENT_RECONCILIATION={"BATCH_SIZE": 100})
+    def test_unreadable_file_reports_partial_progress(self):
+        """Codificação errada vira erro de conciliação, com os lotes aplicados"""
+        payment = self._payment("gw-1")
+        # Linha cp1252 depois do buffer de leitura do primeiro lote
+        lines = [
+            "gw-1;paid;150,00",
+            *(f"gw-x{index};paid;1,00" for index in range(999)),
+        ]
+        stream = self._csv(*lines, "gw-ç;paid;1,00", header="external_id;status;amount")
+        stream = io.BytesIO(stream.getvalue().decode().encode("cp1252"))
+
+        with self.assertRaises(ReconciliationError) as raised:
+            reconcile(stream)
+
+        self.assertEqual(raised.exception.report["confirmed"], 1)
+        self.assertGreater(raised.exception.report["rows"], 0)
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, "confirmed")
+
+        stream.seek(0)
+        report = reconcile(stream, encoding="cp1252")
+        self.assertEqual((report["rows"], report["unmatched_count"]), (1001, 1000))
+
+    def test_ofx_statement(self):
+        payment = self._payment("gw-1")
+
+        report = reconcile(io.StringIO(OFX), "ofx")
+
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, "confirmed")
+        self.assertEqual(report["unmatched"][0]["external_id"], "gw-404")
+        self.assertEqual(
+            [row["external_id"] for _, row in iter_ofx_rows(io.StringIO(OFX))],
+            ["gw-1", "gw-404"],
+        )
+
+    def test_reconcile_endpoint(self):
+        self._payment("gw-1")
+        upload = SimpleUploadedFile(
+            "liquidacao.csv", b"transaction_id,status\ngw-1,settled\n"
+        )
+        request = APIRequestFactory().post(
+            "/api/v1/payments/payments/reconcile/", {"file": upload}
+        )
+        force_authenticate(request, user=AdminUserFactory())
+
+        response = PaymentViewSet.as_view({"post": "reconcile"})(request)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["confirmed"], 1)
+
+    def test_command(self):
+        self._payment("gw-1")
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / "gw.csv"
+        path.write_bytes(b"external_id\ngw-1\n")
+        out = io.StringIO()
+
+        call_command(
+            "reconcile_payments", str(path), tenant_slug=self.tenant.slug, stdout=out
+        )
+
+        self.assertIn("1 conciliada(s)", out.getvalue())
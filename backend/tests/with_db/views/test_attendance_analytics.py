@@ -0,0 +1,255 @@
+"""
+Testes das agregações de presença e da progressão de faixas
+Foco: agrupamento no banco, cache de períodos fechados e permissões
+"""
+
+from datetime import date, time, timedelta
+from unittest.mock import patch
+
+from rest_framework import status
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from apps.students.analytics import (
+    attendance_heatmap,
+    attendance_series,
+    belt_progression,
+)
+from apps.students.views import AttendanceViewSet, GraduationViewSet
+from tests.base import BaseTenantTestCase
+from tests.with_db.factories import (
+    AttendanceFactory,
+    GraduationFactory,
+    InstructorUserFactory,
+    StudentFactory,
+    StudentUserFactory,
+)
+
+# Quarta-feira: semana corrente começa na segunda 2025-03-10
+TODAY = date(2025, 3, 12)
+
+
+class TestAttendanceAnalytics(BaseTenantTestCase):
+    """Testes para as agregações de presença"""
+
+    def setUp(self):
+        super().setUp()
+        self.enterContext(
+            patch("apps.students.analytics.timezone.localdate", return_value=TODAY)
+        )
+        self.student = StudentFactory()
+
+    def _attend(self, class_date, hour=19, **kwargs):
+        return AttendanceFactory(
+            student=self.student,
+            class_date=class_date,
+            check_in_time=time(hour, 0),
+            **kwargs,
+        )
+
+    def test_series_buckets_by_week_and_class_type(self):
+        """Série semanal agrupada por tipo de aula"""
+        self._attend(date(2025, 3, 3), class_type="gi")
+        self._attend(date(2025, 3, 4), class_type="gi")
+        self._attend(date(2025, 3, 5), class_type="no_gi")
+        self._attend(TODAY, class_type="gi")
+        self._attend(date(2025, 3, 6), class_type="gi", is_active=False)
+
+        results = attendance_series(
+            date(2025, 3, 1), TODAY, interval="week", group_by="class_type"
+        )
+
+        self.assertEqual(
+            [(r["period"], r["group"], r["count"]) for r in results],
+            [
+                (date(2025, 3, 3), "gi", 2),
+                (date(2025, 3, 3), "no_gi", 1),
+                (date(2025, 3, 10), "gi", 1),
+            ],
+        )
+        self.assertEqual(results[0]["label"], "Gi (Kimono)")
+
+    def test_closed_periods_are_cached(self):
+        """Apenas o período aberto é consultado após o primeiro cálculo"""
+        self._attend(date(2025, 2, 10))
+        self._attend(TODAY)
+        attendance_series(date(2025, 1, 1), TODAY, interval="month")
+
+        self._attend(TODAY, hour=20)
+        with self.assertNumQueries(1):
+            results = attendance_series(date(2025, 1, 1), TODAY, interval="month")
+
+        self.assertEqual(
+            [(r["period"], r["count"]) for r in results],
+            [(date(2025, 2, 1), 1), (date(2025, 3, 1), 2)],
+        )
+
+    def test_sliding_window_reuses_closed_periods(self):
+        """Janela deslizante: só o período recém-fechado é agregado de novo"""
+        self._attend(date(2025, 2, 20))
+        self._attend(date(2025, 3, 5))
+        attendance_series(date(2025, 2, 3), TODAY, interval="week")
+
+        # Uma semana depois: início sem alinhar e uma semana recém-fechada
+        with patch(
+            "apps.students.analytics.timezone.localdate",
+            return_value=TODAY + timedelta(days=7),
+        ):
+            with self.assertNumQueries(3):
+                results = attendance_series(
+                    date(2025, 2, 12), TODAY + timedelta(days=7), interval="week"
+                )
+
+        self.assertEqual(
+            [(r["period"], r["count"]) for r in results],
+            [(date(2025, 2, 17), 1), (date(2025, 3, 3), 1)],
+        )
+
+    def test_heatmap_caches_each_closed_day(self):
+        """Mapa de calor da janela seguinte agrega apenas o dia que fechou"""
+        self._attend(TODAY - timedelta(days=3))
+        attendance_heatmap(TODAY - timedelta(days=30), TODAY)
+
+        self._attend(TODAY, hour=8)
+        with patch(
+            "apps.students.analytics.timezone.localdate",
+            return_value=TODAY + timedelta(days=1),
+        ):
+            with self.assertNumQueries(2):
+                results = attendance_heatmap(
+                    TODAY - timedelta(days=29), TODAY + timedelta(days=1)
+                )
+
+        self.assertEqual(
+            [(r["weekday"], r["hour"], r["count"]) for r in results],
+            [(3, 8, 1), (7, 19, 1)],
+        )
+
+    def test_backdated_write_invalidates_closed_periods(self):
+        """Presença retroativa descarta o cache dos períodos fechados"""
+        attendance_series(date(2025, 1, 1), TODAY, interval="month")
+
+        self._attend(date(2025, 2, 10))
+        results = attendance_series(date(2025, 1, 1), TODAY, interval="month")
+
+        self.assertEqual(
+            [(r["period"], r["count"]) for r in results], [(date(2025, 2, 1), 1)]
+        )
+
+    def test_heatmap_merges_closed_and_current_day(self):
+        """Mapa de calor soma dias fechados e o dia corrente"""
+        instructor = InstructorUserFactory()
+        self._attend(TODAY - timedelta(days=7), hour=19, instructor=instructor)
+        self._attend(TODAY, hour=19, instructor=instructor)
+        self._attend(TODAY - timedelta(days=1), hour=7, instructor=instructor)
+
+        results = attendance_heatmap(
+            TODAY - timedelta(days=30), TODAY, group_by="instructor"
+        )
+
+        self.assertEqual(
+            [(r["weekday"], r["hour"], r["count"]) for r in results],
+            [(2, 7, 1), (3, 19, 2)],
+        )
+        self.assertEqual(results[0]["group"], str(instructor.id))
+        self.assertEqual(results[0]["label"], instructor.full_name)
+
+
+class TestBeltProgression(BaseTenantTestCase):
+    """Testes para a progressão de faixas"""
+
+    def _student(self, graduations, attendances):
+        student = StudentFactory(enrollment_date=date(2020, 1, 1))
+        for from_belt, to_belt, graduation_date in graduations:
+            GraduationFactory(
+                student=student,
+                from_belt=from_belt,
+                to_belt=to_belt,
+                graduation_date=graduation_date,
+            )
+        for index, class_date in enumerate(attendances):
+            AttendanceFactory(
+                student=student, class_date=class_date, check_in_time=time(index, 0)
+            )
+        return student
+
+    def test_time_in_belt_and_attendances_between_promotions(self):
+        """Dias e presenças por faixa a partir da graduação anterior"""
+        self._student(
+            [
+                ("white", "blue", date(2020, 1, 31)),
+                ("blue", "purple", date(2020, 3, 1)),
+            ],
+            [date(2020, 1, 5), date(2020, 1, 20), date(2020, 2, 10)],
+        )
+        self._student(
+            [("white", "blue", date(2020, 4, 10))],
+            [date(2020, 2, d) for d in (1, 2, 3, 4)],
+        )
+
+        belts = {row["belt"]: row for row in belt_progression()["belts"]}
+
+        self.assertEqual(list(belts), ["white", "blue"])
+        self.assertEqual(belts["white"]["promotions"], 2)
+        self.assertEqual(belts["white"]["days"]["median"], 65)
+        self.assertEqual(belts["white"]["days"]["p25"], 47.5)
+        self.assertEqual(belts["white"]["attendances"]["median"], 3)
+        self.assertEqual(belts["blue"]["days"]["avg"], 30)
+        self.assertEqual(belts["blue"]["attendances"]["median"], 1)
+
+    def test_result_is_cached_until_graduation_changes(self):
+        """Resultado em cache, descartado quando uma graduação é registrada"""
+        self._student([("white", "blue", date(2020, 2, 1))], [])
+        belt_progression()
+
+        with self.assertNumQueries(0):
+            belt_progression()
+
+        self._student([("white", "blue", date(2020, 3, 1))], [])
+        self.assertEqual(belt_progression()["belts"][0]["promotions"], 2)
+
+    def test_endpoint(self):
+        request = APIRequestFactory().get("/api/v1/students/graduations/progression/")
+        force_authenticate(request, user=InstructorUserFactory())
+
+        response = GraduationViewSet.as_view({"get": "progression"})(request)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["belts"], [])
+
+
+class TestAttendanceAnalyticsView(BaseTenantTestCase):
+    """Testes para os endpoints de agregação de presença"""
+
+    def _get(self, action, user, **params):
+        request = APIRequestFactory().get(
+            f"/api/v1/students/attendances/{action}/", params
+        )
+        force_authenticate(request, user=user)
+        return AttendanceViewSet.as_view({"get": action})(request)
+
+    def test_series_endpoint(self):
+        AttendanceFactory()
+
+        response = self._get("series", InstructorUserFactory(), interval="day")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["interval"], "day")
+        self.assertEqual(sum(r["count"] for r in response.data["results"]), 1)
+
+    def test_heatmap_endpoint(self):
+        response = self._get("heatmap", InstructorUserFactory(), group_by="class_type")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("interval", response.data)
+
+    def test_invalid_range_is_rejected(self):
+        response = self._get(
+            "series", InstructorUserFactory(), start="2025-03-10", end="2025-01-01"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_student_is_forbidden(self):
+        response = self._get("series", StudentUserFactory())
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
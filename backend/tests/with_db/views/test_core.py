@@ -7,9 +7,11 @@ Objetivo: 100% de cobertura para core/views.py
 import time
 from unittest.mock import Mock, patch
 
-from django.test import RequestFactory
+from django.test import RequestFactory, override_settings
 from rest_framework import status
+from rest_framework.test import force_authenticate
 
+from apps.core import health
 from apps.core.views import (
     api_status,
     health_check,
@@ -22,6 +24,8 @@ from apps.core.views import (
 from tests.base import BaseModelTestCase
 from tests.with_db.factories import UserFactory
 
+TOKEN = "segredo-do-coletor"
+
 
 class TestHealthCheckViews(BaseModelTestCase):
     """Testes para views de health check"""
@@ -32,234 +36,159 @@ class TestHealthCheckViews(BaseModelTestCase):
         super().setUp()
         self.factory = RequestFactory()
 
+    def _probes(self, **overrides):
+        """Substitui as verificações do HealthMonitor"""
+        probes = {
+            "database": lambda: {
+                "migrations": 42,
+                "version": "PostgreSQL 13.0",
+                "vendor": "postgresql",
+            },
+            "cache": lambda: {"backend": "RedisCache", "location": "unknown"},
+            "memory": lambda: {"percent": 50, "status": "ok"},
+            "disk": lambda: {"percent": 50, "status": "ok"},
+            "uptime": lambda: {"uptime": "1:00:00"},
+        }
+        probes.update(overrides)
+        return patch.dict("apps.core.health.PROBES", probes)
+
+    def _fail(self, message):
+        def probe():
+            raise Exception(message)
+
+        return probe
+
     def test_health_check_success(self):
         """Teste health_check com todas as verificações passando"""
-        # Mock psutil
-        mock_memory = Mock()
-        mock_memory.total = 16 * 1024**3  # 16GB
-        mock_memory.available = 8 * 1024**3  # 8GB
-        mock_memory.percent = 50
-
-        mock_disk = Mock()
-        mock_disk.total = 1024**3  # 1TB
-        mock_disk.used = 512 * 1024**2  # 512GB
-        mock_disk.free = 512 * 1024**2  # 512GB
-        mock_disk.percent = 50
-
-        # Mock database
-        mock_cursor = Mock()
-        mock_cursor.fetchone.side_effect = [[1], [42]]  # SELECT 1, migrations count
-        mock_cursor.execute = Mock()
-
-        # Mock cache
-        mock_cache = Mock()
-        mock_cache.set = Mock()
-        mock_cache.get.return_value = "test_value"
-        mock_cache.delete = Mock()
-
-        with patch("psutil.virtual_memory", return_value=mock_memory), patch(
-            "psutil.disk_usage", return_value=mock_disk
-        ), patch("psutil.boot_time", return_value=time.time() - 3600), patch(
-            "django.db.connection.cursor"
-        ) as mock_connection, patch("apps.core.views.cache", mock_cache):
-            mock_connection.return_value.__enter__.return_value = mock_cursor
-
+        with self._probes():
             request = self.factory.get("/api/health/")
             response = health_check(request)
 
-            # Verifica resposta de sucesso
-            self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(response.data["status"], "healthy")
-            self.assertIn("timestamp", response.data)
-            self.assertEqual(response.data["database"], "ok - 42 migrations applied")
-            self.assertEqual(response.data["cache"], "ok - read/write successful")
-            self.assertIn("memory_usage", response.data)
-            self.assertIn("disk_usage", response.data)
-            self.assertIn("uptime", response.data)
-            self.assertIn("response_time_ms", response.data)
-            self.assertEqual(response.data["errors"], [])
+        # Verifica resposta de sucesso
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["status"], "healthy")
+        self.assertIn("timestamp", response.data)
+        self.assertIn("checked_at", response.data)
+        self.assertIn("age_seconds", response.data)
+        self.assertEqual(response.data["database"], "ok - 42 migrations applied")
+        self.assertEqual(response.data["cache"], "ok - read/write successful")
+        self.assertIn("memory_usage", response.data)
+        self.assertIn("disk_usage", response.data)
+        self.assertEqual(response.data["uptime"], "1:00:00")
+        self.assertIn("response_time_ms", response.data)
+        self.assertEqual(response.data["errors"], [])
+
+    def test_health_check_real_probes(self):
+        """Teste health_check com as verificações reais"""
+        request = self.factory.get("/api/health/")
+        response = health_check(request)
+
+        self.assertEqual(response.data["errors"], [])
+        self.assertIn("migrations applied", response.data["database"])
 
     def test_health_check_database_error(self):
         """Teste health_check com erro no banco de dados"""
-        # Mock psutil normal
-        mock_memory = Mock()
-        mock_memory.total = 16 * 1024**3
-        mock_memory.available = 8 * 1024**3
-        mock_memory.percent = 50
-
-        mock_disk = Mock()
-        mock_disk.total = 1024**3
-        mock_disk.used = 512 * 1024**2
-        mock_disk.free = 512 * 1024**2
-        mock_disk.percent = 50
-
-        # Mock database com erro
-        def mock_cursor_context():
-            raise Exception("Database connection failed")
-
-        with patch("psutil.virtual_memory", return_value=mock_memory), patch(
-            "psutil.disk_usage", return_value=mock_disk
-        ), patch("psutil.boot_time", return_value=time.time() - 3600), patch(
-            "django.db.connection.cursor", side_effect=mock_cursor_context
-        ), patch("apps.core.views.cache") as mock_cache:
-            mock_cache.set = Mock()
-            mock_cache.get.return_value = "test_value"
-            mock_cache.delete = Mock()
-
+        with self._probes(database=self._fail("Database connection failed")):
             request = self.factory.get("/api/health/")
             response = health_check(request)
 
-            # Verifica resposta de erro
-            self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
-            self.assertEqual(response.data["status"], "unhealthy")
-            self.assertIn("Database connection failed", response.data["database"])
-            self.assertIn("Database error", str(response.data["errors"]))
-
-    # def test_health_check_cache_error(self):
-    #     """Teste health_check com erro no cache - desabilitado temporariamente"""
-    #     # Teste problemático com mock do cache - focar nos outros testes que funcionam
-    #     pass
+        # Verifica resposta de erro
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.data["status"], "unhealthy")
+        self.assertIn("Database connection failed", response.data["database"])
+        self.assertIn("Database error", str(response.data["errors"]))
 
     def test_health_check_high_memory_usage(self):
         """Teste health_check com uso alto de memória"""
-        # Mock memoria com uso alto
         mock_memory = Mock()
         mock_memory.total = 16 * 1024**3
         mock_memory.available = 1 * 1024**3
         mock_memory.percent = 96  # Crítico
 
-        mock_disk = Mock()
-        mock_disk.total = 1024**3
-        mock_disk.used = 512 * 1024**2
-        mock_disk.free = 512 * 1024**2
-        mock_disk.percent = 50
-
-        # Mock database normal
-        mock_cursor = Mock()
-        mock_cursor.fetchone.side_effect = [[1], [42]]
-        mock_cursor.execute = Mock()
-
-        # Mock cache normal
-        mock_cache = Mock()
-        mock_cache.set = Mock()
-        mock_cache.get.return_value = "test_value"
-        mock_cache.delete = Mock()
-
-        with patch("psutil.virtual_memory", return_value=mock_memory), patch(
-            "psutil.disk_usage", return_value=mock_disk
-        ), patch("psutil.boot_time", return_value=time.time() - 3600), patch(
-            "django.db.connection.cursor"
-        ) as mock_connection, patch("apps.core.views.cache", mock_cache):
-            mock_connection.return_value.__enter__.return_value = mock_cursor
-
+        with self._probes(memory=health.probe_memory), patch(
+            "psutil.virtual_memory", return_value=mock_memory
+        ):
             request = self.factory.get("/api/health/")
             response = health_check(request)
 
-            # Verifica resposta de erro por memória
-            self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
-            self.assertEqual(response.data["status"], "unhealthy")
-            self.assertIn("Critical memory usage", str(response.data["errors"]))
+        # Verifica resposta de erro por memória
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response.data["status"], "unhealthy")
+        self.assertEqual(response.data["memory_usage"]["status"], "critical")
+        self.assertIn("Critical memory usage", str(response.data["errors"]))
 
     def test_health_check_quick(self):
         """Teste health_check_quick - endpoint simples"""
-        request = self.factory.get("/api/health/quick/")
-        response = health_check_quick(request)
+        request = self.factory.get(
+            "/api/health/quick/", HTTP_AUTHORIZATION="Bearer token-invalido"
+        )
+        with self.assertNumQueries(0):
+            response = health_check_quick(request)
 
-        # Verifica resposta simples
+        # Verifica resposta simples (sem autenticação nem banco)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data["status"], "ok")
         self.assertIn("timestamp", response.data)
 
     def test_health_check_database_success(self):
         """Teste health_check_database com sucesso"""
-        # Mock database
-        mock_cursor = Mock()
-        mock_cursor.fetchone.side_effect = [
-            [1],  # SELECT 1
-            [42],  # migrations count
-            ["PostgreSQL 13.0"],  # version
-        ]
-        mock_cursor.execute = Mock()
-
-        with patch("django.db.connection.cursor") as mock_connection, patch(
-            "django.db.connection.vendor", "postgresql"
-        ):
-            mock_connection.return_value.__enter__.return_value = mock_cursor
-
+        with self._probes():
             request = self.factory.get("/api/health/database/")
-            response = health_check_database(request)
+            with self.assertNumQueries(0):
+                response = health_check_database(request)
 
-            # Verifica resposta de sucesso
-            self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(response.data["database"], "ok")
-            self.assertIn("timestamp", response.data)
-            self.assertIn("response_time_ms", response.data)
-            self.assertEqual(response.data["migrations"], 42)
-            self.assertEqual(response.data["version"], "PostgreSQL 13.0")
-            self.assertIn("connection_pool", response.data)
+        # Verifica resposta de sucesso
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["database"], "ok")
+        self.assertIn("timestamp", response.data)
+        self.assertIn("age_seconds", response.data)
+        self.assertIn("response_time_ms", response.data)
+        self.assertEqual(response.data["migrations"], 42)
+        self.assertEqual(response.data["version"], "PostgreSQL 13.0")
+        self.assertIn("connection_pool", response.data)
 
     def test_health_check_database_endpoint_error(self):
         """Teste health_check_database endpoint com erro"""
-
-        def mock_cursor_error():
-            raise Exception("Connection timeout")
-
-        with patch("django.db.connection.cursor", side_effect=mock_cursor_error):
+        with self._probes(database=self._fail("Connection timeout")):
             request = self.factory.get("/api/health/database/")
             response = health_check_database(request)
 
-            # Verifica resposta de erro
-            self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
-            self.assertIn("Connection timeout", response.data["database"])
-            self.assertIn("timestamp", response.data)
+        # Verifica resposta de erro
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn("Connection timeout", response.data["database"])
+        self.assertIn("timestamp", response.data)
 
     def test_health_check_cache_success(self):
-        """Teste health_check_cache com sucesso"""
-        # Mock cache
-        mock_cache = Mock()
-        mock_cache.set = Mock()
-        mock_cache.get.return_value = None  # Simula que foi deletado
-        mock_cache.delete = Mock()
-        mock_cache.__class__.__name__ = "RedisCache"
-
-        with patch("apps.core.views.cache", mock_cache):
-            # Simular o comportamento correto do cache
-            def mock_get(key):
-                if "health_check_cache_" in str(key):
-                    return (
-                        f"test_value_{int(time.time())}"
-                        if mock_cache.get.call_count == 1
-                        else None
-                    )
-                return None
-
-            mock_cache.get.side_effect = mock_get
-
+        """Teste health_check_cache com a verificação real do cache"""
+        with self._probes(cache=health.probe_cache):
             request = self.factory.get("/api/health/cache/")
             response = health_check_cache(request)
 
-            # Verifica resposta de sucesso
-            self.assertEqual(response.status_code, status.HTTP_200_OK)
-            self.assertEqual(response.data["cache"], "ok")
-            self.assertIn("timestamp", response.data)
-            self.assertIn("response_time_ms", response.data)
-            self.assertIn("cache_info", response.data)
+        # Verifica resposta de sucesso
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["cache"], "ok")
+        self.assertIn("timestamp", response.data)
+        self.assertIn("response_time_ms", response.data)
+        self.assertIn("cache_info", response.data)
 
     def test_health_check_cache_error(self):
         """Teste health_check_cache com erro"""
         mock_cache = Mock()
         mock_cache.set.side_effect = Exception("Redis not available")
 
-        with patch("apps.core.views.cache", mock_cache):
+        with self._probes(cache=health.probe_cache), patch(
+            "apps.core.health.cache", mock_cache
+        ):
             request = self.factory.get("/api/health/cache/")
             response = health_check_cache(request)
 
-            # Verifica resposta de erro
-            self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
-            self.assertIn("Redis not available", response.data["cache"])
-            self.assertIn("timestamp", response.data)
+        # Verifica resposta de erro
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn("Redis not available", response.data["cache"])
+        self.assertIn("timestamp", response.data)
 
 
+@override_settings(REQUEST_METRICS={"SCRAPE_TOKEN": TOKEN})
 class TestMetricsAndStatusViews(BaseModelTestCase):
     """Testes para views de métricas e status"""
 
@@ -269,6 +198,28 @@ class TestMetricsAndStatusViews(BaseModelTestCase):
         super().setUp()
         self.factory = RequestFactory()
 
+    def _metrics_request(self, **extra):
+        return self.factory.get(
+            "/api/metrics/", **{"HTTP_X_METRICS_TOKEN": TOKEN, **extra}
+        )
+
+    def test_metrics_requires_platform_staff_or_token(self):
+        """Métricas expõem todos os tenants: anônimo e usuário comum negados"""
+        anonymous = metrics(self.factory.get("/api/metrics/"))
+        wrong = metrics(self._metrics_request(HTTP_X_METRICS_TOKEN="errado"))
+        request = self.factory.get("/api/metrics/")
+        force_authenticate(request, user=UserFactory(role="admin", is_staff=True))
+        academy_admin = metrics(request)
+
+        self.assertIn(anonymous.status_code, (401, 403))
+        self.assertIn(wrong.status_code, (401, 403))
+        self.assertEqual(academy_admin.status_code, status.HTTP_403_FORBIDDEN)
+
+        request = self.factory.get("/api/metrics/", {"top": -5})
+        force_authenticate(request, user=UserFactory(is_staff=True, is_superuser=True))
+        staff = metrics(request)
+        self.assertEqual(staff.status_code, status.HTTP_200_OK)
+
     def test_metrics_success(self):
         """Teste metrics com sucesso"""
         # Mock psutil
@@ -310,8 +261,7 @@ class TestMetricsAndStatusViews(BaseModelTestCase):
         ):
             mock_connection.return_value.__enter__.return_value = mock_cursor
 
-            request = self.factory.get("/api/metrics/")
-            response = metrics(request)
+            response = metrics(self._metrics_request())
 
             # Verifica resposta de sucesso
             self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -345,8 +295,7 @@ class TestMetricsAndStatusViews(BaseModelTestCase):
     def test_metrics_error(self):
         """Teste metrics com erro geral"""
         with patch("psutil.cpu_percent", side_effect=Exception("System error")):
-            request = self.factory.get("/api/metrics/")
-            response = metrics(request)
+            response = metrics(self._metrics_request())
 
             # Verifica resposta de erro
             self.assertEqual(
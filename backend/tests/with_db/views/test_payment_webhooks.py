@@ -0,0 +1,216 @@
+"""
+Testes dos webhooks do gateway de pagamento
+Foco: assinatura, inbox com deduplicação, ordem por external_id e retentativas
+"""
+
+import hashlib
+import hmac
+import json
+from datetime import timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIRequestFactory
+
+from apps.payments.models import Payment
+from apps.payments.views import payment_webhook
+from apps.payments.webhooks import ingest_event, process_pending_events
+from apps.tenants.models import PaymentWebhookEvent
+from tests.base import BaseTenantTestCase
+from tests.with_db.factories import InvoiceFactory, PaymentMethodFactory
+
+SECRET = "webhook-secret"
+
+
+class TestPaymentWebhooks(BaseTenantTestCase):
+    """Testes para recebimento e processamento de webhooks"""
+
+    def setUp(self):
+        super().setUp()
+        self.enterContext(override_settings(PAYMENT_WEBHOOKS={"SECRET": SECRET}))
+        self.method = PaymentMethodFactory()
+
+    def _payment(self, external_id, amount="150.00"):
+        return Payment.objects.create(
+            invoice=InvoiceFactory(amount=Decimal("150.00")),
+            payment_method=self.method,
+            amount=Decimal(amount),
+            payment_date=timezone.now(),
+            external_id=external_id,
+        )
+
+    def _post(self, body, signature=None, tenant_slug=None):
+        raw = json.dumps(body).encode()
+        if signature is None:
+            signature = hmac.new(SECRET.encode(), raw, hashlib.sha256).hexdigest()
+        request = APIRequestFactory().post(
+            "/api/v1/webhooks/payments/gateway/",
+            raw,
+            content_type="application/json",
+            HTTP_X_WEBHOOK_SIGNATURE=f"sha256={signature}",
+        )
+        return payment_webhook(
+            request, gateway="gateway", tenant_slug=tenant_slug or self.tenant.slug
+        )
+
+    def _event(self, event_id, event_type, external_id, minute=0, **data):
+        occurred_at = timezone.now().replace(second=0, microsecond=0)
+        return {
+            "id": event_id,
+            "type": event_type,
+            "created_at": (occurred_at + timedelta(minutes=minute)).isoformat(),
+            "data": {"external_id": external_id, **data},
+        }
+
+    def test_webhook_confirms_payment(self):
+        payment = self._payment("gw-1")
+
+        response = self._post(
+            self._event("evt-1", "payment.paid", "gw-1", amount="150.00", fee="4.35")
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, "confirmed")
+        self.assertEqual(payment.processing_fee, Decimal("4.35"))
+        event = PaymentWebhookEvent.objects.get()
+        self.assertEqual(event.status, "processed")
+        self.assertEqual(event.tenant_id, self.tenant.pk)
+
+    def test_invalid_signature_and_unknown_tenant_are_rejected(self):
+        event = self._event("evt-1", "payment.paid", "gw-1")
+
+        self.assertEqual(
+            self._post(event, signature="0" * 64).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        self.assertEqual(
+            self._post(event, tenant_slug="nao-existe").status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+        self.assertEqual(
+            self._post({"type": "payment.paid"}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertFalse(PaymentWebhookEvent.objects.exists())
+
+    def test_retries_of_same_event_are_deduplicated(self):
+        """Reenvio do mesmo evento não gera nova linha na inbox"""
+        payment = self._payment("gw-1")
+        event = self._event("evt-1", "payment.paid", "gw-1")
+
+        with self.assertNumQueries(1):
+            ingest_event(self.tenant.pk, "gateway", json.dumps(event).encode())
+        self._post(event)
+        self._post(event)
+
+        self.assertEqual(PaymentWebhookEvent.objects.count(), 1)
+        payment.refresh_from_db()
+        self.assertEqual(payment.invoice.paid_amount, Decimal("150.00"))
+
+    def test_events_applied_in_order_per_external_id(self):
+        """Estorno recebido antes da confirmação é aplicado depois dela"""
+        payment = self._payment("gw-1")
+        with self.captureOnCommitCallbacks(execute=True):
+            PaymentWebhookEvent.objects.bulk_create(
+                [
+                    PaymentWebhookEvent(
+                        tenant=self.tenant,
+                        gateway="gateway",
+                        event_id=body["id"],
+                        event_type=body["type"],
+                        external_id="gw-1",
+                        occurred_at=body["created_at"],
+                        payload=body,
+                    )
+                    for body in (
+                        self._event("evt-2", "payment.refunded", "gw-1", minute=5),
+                        self._event("evt-1", "payment.paid", "gw-1", minute=1),
+                    )
+                ]
+            )
+            counts = process_pending_events()
+
+        self.assertEqual(counts["processed"], 2)
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, "refunded")
+        self.assertEqual(payment.invoice.paid_amount, Decimal("0"))
+
+    def test_late_older_event_is_ignored(self):
+        """Confirmação atrasada não desfaz estorno já aplicado"""
+        payment = self._payment("gw-1")
+        self._post(self._event("evt-1", "payment.paid", "gw-1", minute=1))
+        self._post(self._event("evt-3", "payment.refunded", "gw-1", minute=5))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._post(self._event("evt-2", "payment.paid", "gw-1", minute=3))
+
+        late = PaymentWebhookEvent.objects.get(event_id="evt-2")
+        self.assertEqual(late.status, "ignored")
+        self.assertEqual(late.error, "anterior ao último evento aplicado")
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, "refunded")
+        self.assertEqual(payment.invoice.paid_amount, Decimal("0"))
+
+    def test_unmatched_event_is_retried_and_holds_next_events(self):
+        """Evento antes do pagamento existir volta para a fila"""
+        self._post(self._event("evt-1", "payment.paid", "gw-1", minute=1))
+        self._post(self._event("evt-2", "payment.refunded", "gw-1", minute=2))
+
+        first = PaymentWebhookEvent.objects.get(event_id="evt-1")
+        second = PaymentWebhookEvent.objects.get(event_id="evt-2")
+        self.assertEqual((first.status, first.attempts), ("pending", 1))
+        self.assertGreater(first.available_at, timezone.now())
+        self.assertEqual((second.status, second.attempts), ("pending", 0))
+
+        payment = self._payment("gw-1")
+        PaymentWebhookEvent.objects.filter(pk=first.pk).update(
+            available_at=timezone.now()
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            counts = process_pending_events()
+
+        self.assertEqual(counts["processed"], 2)
+        payment.refresh_from_db()
+        self.assertEqual(payment.status, "refunded")
+
+    def test_pending_retry_schedules_next_run(self):
+        """Nova tentativa é agendada sem depender de outro webhook"""
+        self._post(self._event("evt-1", "payment.paid", "gw-1"))
+        event = PaymentWebhookEvent.objects.get(event_id="evt-1")
+        PaymentWebhookEvent.objects.filter(pk=event.pk).update(
+            available_at=timezone.now() + timedelta(seconds=90)
+        )
+
+        with patch(
+            "apps.payments.tasks.process_payment_webhooks.apply_async"
+        ) as apply_async:
+            process_pending_events()
+
+        countdown = apply_async.call_args.kwargs["countdown"]
+        self.assertTrue(85 <= countdown <= 91)
+
+        PaymentWebhookEvent.objects.filter(pk=event.pk).update(status="failed")
+        with patch(
+            "apps.payments.tasks.process_payment_webhooks.apply_async"
+        ) as apply_async:
+            process_pending_events()
+
+        apply_async.assert_not_called()
+
+    @override_settings(PAYMENT_WEBHOOKS={"SECRET": SECRET, "MAX_ATTEMPTS": 1})
+    def test_mismatch_and_exhausted_attempts_fail(self):
+        self._payment("gw-1")
+
+        self._post(self._event("evt-1", "payment.paid", "gw-1", amount="99.00"))
+        self._post(self._event("evt-2", "payment.paid", "gw-404"))
+        self._post(self._event("evt-3", "customer.created", "gw-1"))
+
+        events = {event.event_id: event for event in PaymentWebhookEvent.objects.all()}
+        self.assertEqual(events["evt-1"].status, "failed")
+        self.assertIn("valor", events["evt-1"].error)
+        self.assertEqual(events["evt-2"].status, "failed")
+        self.assertEqual(events["evt-3"].status, "ignored")
@@ -0,0 +1,83 @@
+"""
+Testes para CompressionMiddleware
+Foco: negociação de algoritmo, limites de tamanho e respostas ignoradas
+"""
+
+import gzip
+
+import brotli
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, override_settings
+
+from apps.core.middleware import CompressionMiddleware
+
+BODY = b'{"results": [' + b'{"status": "paid", "amount": "150.00"},' * 100 + b"{}]}"
+
+
+def _run(accept_encoding="", response=None, **settings_overrides):
+    """Executa o middleware com a resposta informada"""
+    response = response or HttpResponse(BODY, content_type="application/json")
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+    with override_settings(RESPONSE_COMPRESSION=settings_overrides):
+        middleware = CompressionMiddleware(lambda req: response)
+    return middleware(request)
+
+
+class TestCompressionMiddleware:
+    """Testes para CompressionMiddleware"""
+
+    def test_prefers_server_order_on_tie(self):
+        response = _run("gzip, br, zstd")
+        assert response["Content-Encoding"] == "zstd"
+        assert "Accept-Encoding" in response["Vary"]
+
+    def test_respects_quality_values(self):
+        response = _run("gzip;q=1.0, br;q=0.5, zstd;q=0")
+        assert response["Content-Encoding"] == "gzip"
+        assert gzip.decompress(response.content) == BODY
+        assert response["Content-Length"] == str(len(response.content))
+
+    def test_brotli_roundtrip(self):
+        response = _run("br")
+        assert brotli.decompress(response.content) == BODY
+
+    def test_no_common_encoding(self):
+        response = _run("deflate")
+        assert not response.has_header("Content-Encoding")
+        assert response.content == BODY
+
+    def test_small_responses_untouched(self):
+        response = _run("gzip", HttpResponse(b'{"ok": true}'))
+        assert not response.has_header("Content-Encoding")
+
+    @pytest.mark.parametrize(
+        "headers",
+        [
+            {"Content-Encoding": "gzip"},
+            {"Content-Type": "image/png"},
+            {"Cache-Control": "no-transform"},
+        ],
+    )
+    def test_skipped_responses(self, headers):
+        response = HttpResponse(BODY, headers=headers)
+        assert _run("gzip", response).content == BODY
+
+    def test_streaming_untouched_by_default(self):
+        response = _run("gzip", StreamingHttpResponse(iter([BODY, BODY])))
+        assert not response.has_header("Content-Encoding")
+        assert b"".join(response.streaming_content) == BODY * 2
+
+    def test_streaming_compressed_when_enabled(self):
+        response = _run(
+            "gzip",
+            StreamingHttpResponse(iter([BODY, BODY])),
+            COMPRESS_STREAMING=True,
+        )
+        assert response["Content-Encoding"] == "gzip"
+        assert not response.has_header("Content-Length")
+        assert gzip.decompress(b"".join(response.streaming_content)) == BODY * 2
+
+    def test_strong_etag_becomes_weak(self):
+        response = HttpResponse(BODY, headers={"ETag": '"abc"'})
+        assert _run("gzip", response)["ETag"] == 'W/"abc"'
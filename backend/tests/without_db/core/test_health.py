@@ -0,0 +1,112 @@
+"""
+Testes para HealthMonitor
+Foco: timeout das verificações, veredito em cache, idade e thread de background
+"""
+
+import threading
+import time
+from unittest.mock import patch
+
+from django.test import override_settings
+
+from apps.core.health import HealthMonitor
+
+OK_PROBES = {
+    "database": lambda: {"migrations": 1, "version": "PostgreSQL", "vendor": "pg"},
+    "cache": lambda: {"backend": "LocMemCache"},
+    "memory": lambda: {"percent": 10, "status": "ok"},
+    "disk": lambda: {"percent": 10, "status": "ok"},
+    "uptime": lambda: {"uptime": "1:00:00"},
+}
+
+
+def _probes(**overrides):
+    return patch.dict("apps.core.health.PROBES", {**OK_PROBES, **overrides}, clear=True)
+
+
+def _settings(**overrides):
+    return override_settings(
+        HEALTH_PROBES={"BACKGROUND": False, "INTERVAL": 60, **overrides}
+    )
+
+
+class TestHealthMonitor:
+    """Testes para HealthMonitor"""
+
+    def test_verdict_is_cached_between_reads(self):
+        calls = []
+        with _settings(), _probes(cache=lambda: calls.append(1) or {}):
+            monitor = HealthMonitor()
+            first, _ = monitor.get_verdict()
+            second, age = monitor.get_verdict()
+
+        assert first is second
+        assert first["status"] == "healthy"
+        assert len(calls) == 1
+        assert 0 <= age < 60
+
+    def test_verdict_refreshed_after_interval(self):
+        calls = []
+        with _settings(INTERVAL=0), _probes(cache=lambda: calls.append(1) or {}):
+            monitor = HealthMonitor()
+            monitor.get_verdict()
+            monitor.get_verdict()
+
+        assert len(calls) == 2
+
+    def test_slow_probe_times_out(self):
+        release = threading.Event()
+
+        def hanging_database():
+            release.wait(5)
+            return {}
+
+        with _settings(TIMEOUT=0.05), _probes(database=hanging_database):
+            monitor = HealthMonitor()
+            started = time.monotonic()
+            verdict = monitor.run_probes()
+            elapsed = time.monotonic() - started
+
+            # Rodada seguinte não empilha outra execução da verificação presa
+            again = monitor.run_probes()
+            release.set()
+
+        assert elapsed < 1
+        assert verdict["status"] == "unhealthy"
+        assert verdict["checks"]["database"]["status"] == "timeout"
+        assert verdict["checks"]["cache"]["status"] == "ok"
+        assert again["checks"]["database"]["status"] == "timeout"
+
+    def test_non_critical_probe_failure_keeps_service_healthy(self):
+        def broken_uptime():
+            raise RuntimeError("sem /proc")
+
+        with _settings(), _probes(uptime=broken_uptime):
+            verdict = HealthMonitor().run_probes()
+
+        assert verdict["status"] == "healthy"
+        assert "Uptime error: sem /proc" in verdict["errors"]
+
+    def test_stale_verdict_is_unhealthy(self):
+        with _settings(STALE_AFTER=10), _probes():
+            monitor = HealthMonitor()
+            monitor.run_probes()
+            monitor._checked_at -= 30
+            with patch.object(monitor, "run_probes") as run_probes:
+                verdict, age = monitor.get_verdict()
+
+        run_probes.assert_not_called()
+        assert age >= 30
+        assert verdict["status"] == "unhealthy"
+        assert "Stale verdict" in verdict["errors"][-1]
+
+    def test_background_thread_refreshes_verdict(self):
+        with _settings(BACKGROUND=True, INTERVAL=0.01), _probes():
+            monitor = HealthMonitor()
+            first, _ = monitor.get_verdict()
+            time.sleep(0.1)
+            second, age = monitor.get_verdict()
+            monitor.stop()
+
+        assert second["timestamp"] > first["timestamp"]
+        assert age < 1
@@ -1,10 +1,22 @@
+import json
+
+import pytest
 from django.contrib.auth import get_user_model
+from django.test import RequestFactory, override_settings
 
 from apps.core.openapi import (
     add_authentication_examples,
     postprocess_schema_enums,
     preprocess_filter_specs,
 )
+from apps.core.schema import (
+    PrecompiledSpectacularAPIView,
+    build_schema_artifact,
+    clear_schema_cache,
+    generate_schema,
+    get_schema,
+)
+from apps.students.views import StudentViewSet
 from tests.base import BaseModelTestCase
 
 User = get_user_model()
@@ -27,3 +39,52 @@ class TestOpenAPI(BaseModelTestCase):
         examples = add_authentication_examples([])
         self.assertIn("login", examples)
         self.assertIn("refresh", examples)
+
+
+class TestPrecompiledSchema:
+    """Testes do schema OpenAPI pré-compilado"""
+
+    @pytest.fixture(autouse=True)
+    def _clear_cache(self):
+        clear_schema_cache()
+        yield
+        clear_schema_cache()
+
+    def _get(self, **headers):
+        request = RequestFactory().get("/api/schema/", **headers)
+        return PrecompiledSpectacularAPIView.as_view()(request)
+
+    def test_generation_does_not_mutate_viewsets(self):
+        search_fields = list(StudentViewSet.search_fields)
+        ordering_fields = list(StudentViewSet.ordering_fields)
+
+        generate_schema("v1")
+        generate_schema("v1")
+
+        assert StudentViewSet.search_fields == search_fields
+        assert StudentViewSet.ordering_fields == ordering_fields
+
+    def test_served_with_etag_and_not_modified(self):
+        response = self._get()
+        assert response.status_code == 200
+        assert response["ETag"]
+        assert b"openapi" in response.content
+
+        cached = self._get(HTTP_IF_NONE_MATCH=response["ETag"])
+        assert cached.status_code == 304
+
+    def test_json_format_has_its_own_etag(self):
+        yaml_response = self._get()
+        json_response = self._get(HTTP_ACCEPT="application/vnd.oai.openapi+json")
+        assert json.loads(json_response.content)["openapi"]
+        assert json_response["ETag"] != yaml_response["ETag"]
+
+    def test_artifact_is_served_when_present(self, tmp_path):
+        with override_settings(OPENAPI_SCHEMA_ARTIFACT={"DIR": tmp_path}):
+            path = build_schema_artifact("v1")
+            schema = json.loads(path.read_bytes())
+            schema["info"]["title"] = "Artefato"
+            path.write_text(json.dumps(schema))
+            clear_schema_cache()
+
+            assert get_schema("v1")["info"]["title"] == "Artefato"
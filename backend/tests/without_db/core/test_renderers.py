@@ -0,0 +1,90 @@
+"""
+Testes do renderer/parser JSON camelCase
+Foco: saída idêntica ao djangorestframework-camel-case e mapas de chaves
+"""
+
+import io
+import uuid
+from datetime import UTC, date, datetime, time, timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils.translation import gettext_lazy as _
+from djangorestframework_camel_case.parser import (
+    CamelCaseJSONParser as LibCamelCaseJSONParser,
+)
+from djangorestframework_camel_case.render import (
+    CamelCaseJSONRenderer as LibCamelCaseJSONRenderer,
+)
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.serializer_helpers import ReturnList
+
+from apps.core.parsers import CamelCaseJSONParser
+from apps.core.renderers import CamelCaseJSONRenderer, get_key_map
+from apps.students.serializers import StudentSerializer
+
+SAMPLE = {
+    "id": uuid.UUID("12345678-1234-5678-1234-567812345678"),
+    "total_amount": Decimal("1500.50"),
+    "created_at": datetime(2025, 1, 2, 3, 4, 5, 123456, tzinfo=UTC),
+    "local_time": datetime(2025, 1, 2, 3, 4, 5),
+    "birth_date": date(1990, 5, 17),
+    "check_in_time": time(18, 30),
+    "duration": timedelta(minutes=90),
+    "belt_color": _("white"),
+    "is_active": True,
+    "notes": None,
+    "line_sep": "a\u2028b",
+    "nested_items": [{"class_type": "gi", "address_2": "x"}, ("a_b", 1)],
+}
+
+
+class TestCamelCaseJSONRenderer:
+    """Testes de compatibilidade do renderer"""
+
+    def test_output_matches_library_renderer(self):
+        expected = LibCamelCaseJSONRenderer().render(SAMPLE)
+        assert CamelCaseJSONRenderer().render(SAMPLE) == expected
+
+    def test_serializer_data_uses_precomputed_key_map(self):
+        data = ReturnList(
+            [{"full_name": "Ana", "belt_color": "blue"}],
+            serializer=StudentSerializer(many=True),
+        )
+        rendered = CamelCaseJSONRenderer().render(data)
+        assert rendered == b'[{"fullName":"Ana","beltColor":"blue"}]'
+
+        key_map = get_key_map(StudentSerializer())
+        assert key_map["emergency_contact_phone"] == "emergencyContactPhone"
+        assert key_map["first_name"] == "firstName"
+
+    def test_indent_falls_back_to_stdlib(self):
+        rendered = CamelCaseJSONRenderer().render(
+            {"full_name": "Ana"}, "application/json; indent=2"
+        )
+        assert rendered == LibCamelCaseJSONRenderer().render(
+            {"full_name": "Ana"}, "application/json; indent=2"
+        )
+
+    def test_none_renders_empty(self):
+        assert CamelCaseJSONRenderer().render(None) == b""
+
+
+class TestCamelCaseJSONParser:
+    """Testes de compatibilidade do parser"""
+
+    @pytest.mark.parametrize(
+        "body",
+        [
+            b'{"fullName": "Ana", "address2": "x", "items": [{"classType": "gi"}]}',
+            b'[{"beltColor": "blue"}, 1, "texto"]',
+            '{"firstName": "João"}'.encode(),
+        ],
+    )
+    def test_output_matches_library_parser(self, body):
+        expected = LibCamelCaseJSONParser().parse(io.BytesIO(body))
+        assert CamelCaseJSONParser().parse(io.BytesIO(body)) == expected
+
+    def test_invalid_json_raises_parse_error(self):
+        with pytest.raises(ParseError):
+            CamelCaseJSONParser().parse(io.BytesIO(b"{invalid"))
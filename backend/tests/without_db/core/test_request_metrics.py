@@ -0,0 +1,110 @@
+"""
+Testes para as métricas de requisição por tenant
+Foco: rótulos, cardinalidade limitada, percentis e rankings
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory, override_settings
+
+from apps.core.request_metrics import (
+    OTHER,
+    UNRESOLVED,
+    RequestMetricsMiddleware,
+    get_request_metrics,
+    get_request_metrics_settings,
+    record_request,
+    reset_request_metrics,
+)
+
+
+@pytest.fixture(autouse=True)
+def _reset():
+    reset_request_metrics()
+    yield
+    reset_request_metrics()
+
+
+def _record(tenant, view, duration, status_code=200):
+    record_request(tenant, view, status_code, duration, get_request_metrics_settings())
+
+
+class TestRequestMetrics:
+    """Testes para registro e agregação das métricas"""
+
+    def test_middleware_labels_by_tenant_view_and_status_class(self):
+        request = RequestFactory().get("/api/v1/students/")
+
+        def get_response(req):
+            req.tenant = SimpleNamespace(slug="zenith")
+            req.resolver_match = SimpleNamespace(
+                view_name="students-list", route="api/v1/students/"
+            )
+            return HttpResponse(status=201)
+
+        RequestMetricsMiddleware(get_response)(request)
+        RequestMetricsMiddleware(lambda req: HttpResponse(status=404))(
+            RequestFactory().get("/nao-existe/")
+        )
+
+        series = {
+            (row["tenant"], row["view"], row["status_class"]): row["count"]
+            for row in get_request_metrics()["series"]
+        }
+        assert series == {
+            ("zenith", "students-list", "2xx"): 1,
+            ("-", UNRESOLVED, "4xx"): 1,
+        }
+
+    def test_metrics_path_is_not_recorded(self):
+        RequestMetricsMiddleware(lambda req: HttpResponse())(
+            RequestFactory().get("/api/v1/metrics/")
+        )
+
+        assert get_request_metrics()["count"] == 0
+
+    @override_settings(REQUEST_METRICS={"MAX_TENANTS": 2, "MAX_VIEWS": 1})
+    def test_cardinality_is_bounded(self):
+        for tenant in ("a", "b", "c", "d"):
+            _record(tenant, f"view-{tenant}", 0.01)
+
+        labels = {
+            (row["tenant"], row["view"]) for row in get_request_metrics()["series"]
+        }
+        assert labels == {("a", "view-a"), ("b", OTHER), (OTHER, OTHER)}
+
+    def test_percentiles_from_histogram(self):
+        for _ in range(90):
+            _record("zenith", "students-list", 0.02)
+        for _ in range(10):
+            _record("zenith", "students-list", 2.0, status_code=500)
+
+        metrics = get_request_metrics()
+        assert metrics["count"] == 100
+        assert 0.01 <= metrics["p50"] <= 0.025
+        assert 1 <= metrics["p95"] <= 2.0
+        assert metrics["max"] == 2.0
+        assert metrics["error_rate"] == 0.1
+
+    def test_top_slowest_tenants_and_endpoints(self):
+        _record("rapida", "students-list", 0.01)
+        _record("lenta", "attendances-series", 3.0)
+        _record("media", "students-list", 0.3)
+
+        metrics = get_request_metrics(top=2)
+
+        assert [row["tenant"] for row in metrics["tenants"]] == ["lenta", "media"]
+        assert metrics["endpoints"][0]["view"] == "attendances-series"
+        assert metrics["tenant_endpoints"][0]["series"] == "lenta attendances-series"
+
+        by_count = get_request_metrics(sort="count")
+        assert by_count["endpoints"][0]["view"] == "students-list"
+
+    def test_top_is_clamped(self):
+        for index in range(3):
+            _record(f"tenant-{index}", "students-list", 0.01)
+
+        assert len(get_request_metrics(top=-5)["tenants"]) == 1
+        assert len(get_request_metrics(top=10_000)["tenants"]) == 3
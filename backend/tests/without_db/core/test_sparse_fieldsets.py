@@ -0,0 +1,103 @@
+"""
+Testes de campos esparsos (?fields=) e expansão explícita (?expand=)
+Foco: parsing, poda de serializers e ajuste de select/prefetch sem DB
+"""
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from apps.core.serializers import get_related_paths, parse_field_paths
+from apps.payments.serializers import InvoiceSerializer
+from apps.payments.views import InvoiceViewSet
+from apps.students.serializers import StudentSerializer
+
+
+def _request(query=""):
+    return Request(APIRequestFactory().get(f"/{query}"))
+
+
+def _list_viewset(viewset_class, query):
+    viewset = viewset_class()
+    viewset.request = _request(query)
+    viewset.action = "list"
+    viewset.format_kwarg = None
+    viewset.kwargs = {}
+    return viewset
+
+
+class TestParseFieldPaths:
+    """Testes para parse_field_paths"""
+
+    def test_none_when_missing(self):
+        assert parse_field_paths(None) is None
+
+    def test_nested_and_camel_case_paths(self):
+        tree = parse_field_paths("id,student.fullName,student.user")
+        assert tree == {"id": {}, "student": {"full_name": {}, "user": {}}}
+
+    def test_empty_value_builds_empty_tree(self):
+        assert parse_field_paths("") == {}
+
+
+class TestSparseSerializer:
+    """Testes de poda de campos no BaseModelSerializer"""
+
+    def test_no_params_keeps_all_fields(self):
+        serializer = StudentSerializer(context={"request": _request()})
+        assert "user" in serializer.fields
+        assert "medical_conditions" in serializer.fields
+
+    def test_fields_restricts_top_level(self):
+        serializer = StudentSerializer(
+            context={"request": _request("?fields=id,fullName,status")}
+        )
+        assert set(serializer.fields) == {"id", "full_name", "status"}
+
+    def test_fields_restricts_nested(self):
+        serializer = InvoiceSerializer(
+            context={"request": _request("?fields=id,student.beltColor")}
+        )
+        assert set(serializer.fields) == {"id", "student"}
+        assert set(serializer.fields["student"].fields) == {"belt_color"}
+
+    def test_expand_collapses_other_nested_to_pk(self):
+        serializer = InvoiceSerializer(context={"request": _request("?expand=student")})
+        student = serializer.fields["student"]
+        assert isinstance(student, StudentSerializer)
+        assert not isinstance(student.fields["user"], StudentSerializer)
+        assert type(student.fields["user"]).__name__ == "PrimaryKeyRelatedField"
+
+    def test_writes_ignore_params(self):
+        request = Request(APIRequestFactory().post("/?fields=id"))
+        serializer = StudentSerializer(context={"request": request})
+        assert "medical_conditions" in serializer.fields
+
+    def test_related_paths_include_declared_dependencies(self):
+        serializer = InvoiceSerializer(
+            context={"request": _request("?fields=id,student.fullName")}
+        )
+        assert get_related_paths(serializer) == {"student", "student__user"}
+
+
+class TestQuerysetTrimming:
+    """Testes de ajuste de select_related/prefetch_related no ViewSet"""
+
+    def test_default_queryset_untouched(self):
+        viewset = _list_viewset(InvoiceViewSet, "")
+        queryset = viewset.get_queryset()
+        assert queryset.query.select_related == {"student": {"user": {}}}
+        assert queryset._prefetch_related_lookups == ()
+
+    def test_scalar_fields_drop_joins_and_prefetches(self):
+        viewset = _list_viewset(InvoiceViewSet, "?fields=id,status,amount")
+        queryset = viewset.get_queryset()
+        assert queryset.query.select_related is False
+        assert queryset._prefetch_related_lookups == ()
+
+    def test_nested_without_user_shortens_join(self):
+        viewset = _list_viewset(
+            InvoiceViewSet, "?fields=id,student.beltColor,totalPaid"
+        )
+        queryset = viewset.get_queryset()
+        assert queryset.query.select_related == {"student": {}}
+        assert queryset._prefetch_related_lookups == ()